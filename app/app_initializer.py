@@ -35,6 +35,8 @@ class AppInitializer:
         self._initialize_handlers()
         logger.info("Настройка пользовательского интерфейса")
         self._setup_ui()
+        logger.info("Проверка прерванных пакетов переименования")
+        self._recover_interrupted_renames()
         logger.info("Обработка файлов из аргументов командной строки")
         self._process_files_from_args(files_from_args or [])
     
@@ -56,6 +58,12 @@ class AppInitializer:
         # Инициализация метаданных и конвертера
         self.app.metadata_extractor = MetadataExtractor()
         self.app.file_converter = FileConverter()
+        try:
+            from core.converter.conversion_cache import ConversionCache
+            from infrastructure.system.paths import get_conversion_cache_file_path
+            self.app.file_converter.conversion_cache = ConversionCache(get_conversion_cache_file_path())
+        except Exception as e:
+            logger.debug(f"Не удалось инициализировать кеш конвертации: {e}")
         
         # Инициализация менеджера методов (нужен metadata_extractor)
         self.app.methods_manager = MethodsManager(self.app.metadata_extractor)
@@ -114,8 +122,12 @@ class AppInitializer:
     
     def _initialize_optional_managers(self):
         """Инициализация опциональных менеджеров."""
-        # FileConverter уже инициализирован в _initialize_managers
-        pass
+        # FileConverter уже инициализирован в _initialize_managers.
+        # Проверяем возможности конвертера в фоне, чтобы вкладка конвертации
+        # получала готовую таблицу форматов без запуска процессов на каждый файл
+        file_converter = getattr(self.app, 'file_converter', None)
+        if file_converter is not None and hasattr(file_converter, 'capabilities'):
+            file_converter.capabilities.refresh_async()
     
     def _initialize_handlers(self):
         """Инициализация обработчиков UI."""
@@ -146,6 +158,47 @@ class AppInitializer:
         if hasattr(self.app, 'main_window'):
             self.app.main_window.show()
     
+    def _recover_interrupted_renames(self):
+        """Продолжение или откат пакетов переименования, прерванных сбоем."""
+        try:
+            from core.rename_journal import STATE_DONE, STATE_PENDING, find_interrupted
+        except ImportError:
+            return
+        parent = getattr(self.app, 'main_window', None)
+        for batch in find_interrupted():
+            summary = batch.summary()
+            done = summary.get(STATE_DONE, 0)
+            pending = summary.get(STATE_PENDING, 0)
+            if not pending and not done:
+                batch.discard()
+                continue
+            try:
+                from ui.components.dialogs import ConfirmationDialog, InfoDialog
+            except ImportError:
+                logger.warning(f"Прерванный пакет переименования оставлен без изменений: {batch.path}")
+                return
+            choice = ConfirmationDialog.askchoice(
+                parent, "Прерванное переименование",
+                f"Пакет переименования от {batch.created[:19].replace('T', ' ')} не был завершен.\n"
+                f"Переименовано: {done}, осталось: {pending}.",
+                ["Продолжить", "Откатить"], cancel_text="Позже"
+            )
+            if choice == 0:
+                count, errors = batch.resume()
+                action = "Продолжено"
+            elif choice == 1:
+                count, errors = batch.rollback()
+                action = "Откачено"
+            else:
+                continue
+            logger.info(f"{action} переименований: {count}, ошибок: {len(errors)} ({batch.path})")
+            if errors:
+                details = "\n".join(f"{pair.old_path}: {error}" for pair, error in errors[:10])
+                InfoDialog.showwarning(
+                    parent, "Прерванное переименование",
+                    f"{action}: {count}. Ошибок: {len(errors)}\n\n{details}"
+                )
+    
     def _process_files_from_args(self, files_from_args: List[str]):
         """Обработка файлов из аргументов командной строки."""
         if files_from_args and hasattr(self.app, 'main_window_handler'):
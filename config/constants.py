@@ -32,7 +32,7 @@ DEFAULT_JPEG_QUALITY = 95
 
 # Лимиты
 MAX_OPERATIONS_HISTORY = 100
-MAX_UNDO_STACK_SIZE = 50
+UNDO_MEMORY_BUDGET = 16 * 1024 * 1024  # Память стеков отмены и повтора (байты), старые записи вытесняются
 MAX_PATH_CACHE_SIZE = 10000  # Максимальный размер кеша путей
 WINDOWS_MAX_FILENAME_LENGTH = 255  # Максимальная длина имени файла в Windows
 WINDOWS_MAX_PATH_LENGTH = 260  # Максимальная длина пути в Windows (MAX_PATH)
@@ -63,6 +63,52 @@ LOG_FILE = "re-file-plus.log"
 SETTINGS_FILE = "re-file-plus_settings.json"
 TEMPLATES_FILE = "re-file-plus_templates.json"
 STATS_FILE = ".re_file_plus_stats.json"  # Файл статистики (хранится в домашней директории)
+CONVERSION_CACHE_FILE = "re-file-plus_conversion_cache.json"  # Кеш результатов конвертации
+
+# Кеш конвертации
+MAX_CONVERSION_CACHE_ENTRIES = 10000  # Максимальное количество записей кеша конвертации
+
+# COM сессии Word/PowerPoint
+COM_SESSION_MAX_DOCUMENTS = 50  # Документов на один экземпляр приложения до пересоздания
+
+# Выходные файлы конвертации
+MAX_OUTPUT_NAME_ATTEMPTS = 1000  # Максимальный номер суффикса _NNN при подборе свободного имени
+
+# Перемещение файлов между устройствами
+MOVE_CHUNK_SIZE = 8 * 1024 * 1024  # Размер блока копирования (байты), прогресс сообщается после каждого блока
+MOVE_WORKERS = 4  # Одновременных перемещений между устройствами
+
+# История операций
+HISTORY_FILE = ".re_file_plus_history.json"  # Имя файла истории в домашней папке (журнал - .jsonl рядом)
+MAX_HISTORY_ITEMS = 100  # Хранимых операций
+HISTORY_JOURNAL_CHUNK_SIZE = 1000  # Файлов операции в одной строке журнала (страница при чтении)
+HISTORY_COMPACT_SLACK = 50  # Лишних операций в журнале, после которых он переписывается
+
+# Журнал пакетного переименования (восстановление после сбоя)
+RENAME_JOURNAL_DIR = "rename_journal"  # Папка журналов в директории данных
+RENAME_JOURNAL_SYNC_EVERY = 256  # Отметок о выполнении между синхронизациями журнала на диск
+RENAME_JOURNAL_SYNC_INTERVAL = 1.0  # Максимальный интервал между синхронизациями (секунды)
+
+# Создание архивов
+ARCHIVE_WORKERS = None  # Потоков сжатия (None - по числу ядер)
+ARCHIVE_SPILL_THRESHOLD = 16 * 1024 * 1024  # Сжатые данные записи больше этого объема хранятся во временном файле
+# Размеры томов разбитого архива (название в интерфейсе -> байты, None - один файл)
+ARCHIVE_VOLUME_SIZES = {
+    "Не разбивать": None,
+    "100 МБ": 100 * 1024 * 1024,
+    "700 МБ (CD)": 700 * 1024 * 1024,
+    "4 ГБ (FAT32)": 4 * 1024 * 1024 * 1024 - 1,
+}
+ARCHIVE_BLOCK_SIZE = 8 * 1024 * 1024  # Блок tar архива, сжимаемый независимо в отдельном потоке
+# Пресеты скорость/сжатие: варианты (формат, уровень 0-9) по убыванию предпочтения
+ARCHIVE_PRESETS = {
+    "Быстро": [("tar.zst", 1), ("tar.gz", 1)],
+    "Баланс": [("tar.zst", 4), ("zip", 6)],
+    "Компактно": [("tar.xz", 6)],
+    "Максимум": [("tar.xz", 9)],
+}
+ARCHIVE_BENCHMARK_FILES = 30  # Файлов в выборке для сравнения форматов
+ARCHIVE_BENCHMARK_SIZE = 32 * 1024 * 1024  # Максимальный объем выборки (байты)
 
 # Для обратной совместимости - импортируем функции из infrastructure/system/paths.py
 # Эти функции перенесены в infrastructure/system/paths.py
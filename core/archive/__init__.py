@@ -0,0 +1,37 @@
+"""Создание архивов."""
+
+from .backends import (
+    ArchiveBackend,
+    available_backends,
+    create_backend,
+    resolve_preset,
+)
+from .benchmark import BenchmarkResult, run_benchmark, sample_entries
+from .parallel import ArchiveWriteError, ParallelZipArchiver, collect_entries
+from .policy import CompressionPolicy
+from .scanner import ArchiveEntry, EntryProducer, iter_entries
+from .update import ZipSource, ZipUpdater
+from .zip_writer import ArchiveOutput, CompressedEntry, SplitArchiveOutput, ZipWriter
+
+__all__ = [
+    'ArchiveBackend',
+    'available_backends',
+    'create_backend',
+    'resolve_preset',
+    'BenchmarkResult',
+    'run_benchmark',
+    'sample_entries',
+    'ArchiveEntry',
+    'ArchiveWriteError',
+    'EntryProducer',
+    'iter_entries',
+    'ParallelZipArchiver',
+    'collect_entries',
+    'CompressionPolicy',
+    'ArchiveOutput',
+    'CompressedEntry',
+    'SplitArchiveOutput',
+    'ZipWriter',
+    'ZipSource',
+    'ZipUpdater',
+]
@@ -0,0 +1,390 @@
+"""Форматы архивов.
+
+Каждый формат реализует общий интерфейс ArchiveBackend: записи
+(например, из EntryProducer), функция результата по записям, отмена и
+прогресс в байтах. ZIP создается ParallelZipArchiver. Для tar архивов
+поток tar разбивается на блоки, блоки сжимаются независимо в пуле
+потоков и записываются по порядку: результат - последовательность
+членов gzip, потоков xz или кадров zstd, которую читают стандартные
+программы распаковки.
+
+zstd доступен только при установленном пакете zstandard.
+"""
+
+import logging
+import lzma
+import os
+import tarfile
+import tempfile
+import zlib
+from abc import ABC, abstractmethod
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import BinaryIO, Callable, Deque, Dict, Iterable, List, Optional, Tuple, Type
+
+from .parallel import ArchiveWriteError, ParallelZipArchiver, default_workers, replace_archive
+from .scanner import ArchiveEntry
+from .update import ZipUpdater
+
+logger = logging.getLogger(__name__)
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    from config.constants import ARCHIVE_BLOCK_SIZE, ARCHIVE_PRESETS
+except ImportError:
+    ARCHIVE_BLOCK_SIZE = 8 * 1024 * 1024
+    ARCHIVE_PRESETS = {"Баланс": [("zip", 6)]}
+
+# Размер словаря xz по уровням (как в пресетах xz), ограничивается размером блока
+_XZ_DICT_SIZES = [256 * 1024, 1 << 20, 2 << 20, 4 << 20, 4 << 20, 8 << 20, 8 << 20, 16 << 20, 32 << 20, 64 << 20]
+
+
+class ArchiveCancelled(Exception):
+    """Создание архива отменено."""
+
+
+class ParallelBlockWriter:
+    """Поток записи, сжимающий данные независимыми блоками в пуле потоков."""
+
+    def __init__(
+        self,
+        output: BinaryIO,
+        compress_block: Callable[[bytes], bytes],
+        workers: int,
+        block_size: int = ARCHIVE_BLOCK_SIZE
+    ):
+        """Инициализация.
+
+        Args:
+            output: Поток для записи сжатых блоков
+            compress_block: Функция сжатия блока (выполняется в рабочем потоке)
+            workers: Потоков сжатия
+            block_size: Размер несжатого блока
+        """
+        self.output = output
+        self.compress_block = compress_block
+        self.block_size = block_size
+        # Не больше двух блоков на поток - память ограничена
+        self.window = workers * 2
+        self._buffer = bytearray()
+        self._pending: Deque[Future] = deque()
+        self._executor = ThreadPoolExecutor(max_workers=workers)
+        self._aborted = False
+
+    def write(self, data) -> int:
+        """Добавление данных; заполненные блоки отправляются на сжатие."""
+        if self._aborted:
+            return len(data)
+        self._buffer += data
+        while len(self._buffer) >= self.block_size:
+            block = bytes(self._buffer[:self.block_size])
+            del self._buffer[:self.block_size]
+            self._submit(block)
+        return len(data)
+
+    def finish(self) -> None:
+        """Сжатие остатка и запись всех блоков."""
+        if self._buffer:
+            self._submit(bytes(self._buffer))
+            self._buffer.clear()
+        while self._pending:
+            self.output.write(self._pending.popleft().result())
+        self._executor.shutdown()
+
+    def abort(self) -> None:
+        """Отмена сжатия без записи оставшихся блоков (дальнейшая запись игнорируется)."""
+        self._aborted = True
+        self._buffer.clear()
+        for future in self._pending:
+            future.cancel()
+        self._pending.clear()
+        self._executor.shutdown()
+
+    def _submit(self, block: bytes) -> None:
+        """Отправка блока на сжатие с записью готовых блоков по порядку."""
+        while len(self._pending) >= self.window:
+            self.output.write(self._pending.popleft().result())
+        self._pending.append(self._executor.submit(self.compress_block, block))
+
+
+class _ProgressReader:
+    """Чтение исходного файла с прогрессом и проверкой отмены."""
+
+    def __init__(self, f, on_read: Callable[[int], None], cancel_check: Optional[Callable[[], bool]]):
+        self.f = f
+        self.on_read = on_read
+        self.cancel_check = cancel_check
+
+    def read(self, size: int = -1) -> bytes:
+        if self.cancel_check and self.cancel_check():
+            raise ArchiveCancelled()
+        data = self.f.read(size)
+        self.on_read(len(data))
+        return data
+
+
+class ArchiveBackend(ABC):
+    """Формат архива."""
+
+    name = ''
+    extension = ''
+    description = ''
+    supports_volumes = False
+    supports_update = False
+
+    def __init__(self, compression_level: int = 6, workers: Optional[int] = None):
+        """Инициализация.
+
+        Args:
+            compression_level: Уровень сжатия 0-9 (0 - быстрее, 9 - плотнее)
+            workers: Потоков сжатия (None - по числу ядер)
+        """
+        self.compression_level = max(0, min(9, compression_level))
+        self.workers = max(1, workers or default_workers())
+
+    @classmethod
+    def is_available(cls) -> bool:
+        """Доступен ли формат (установлены ли нужные пакеты)."""
+        return True
+
+    @abstractmethod
+    def archive(
+        self,
+        entries: Iterable[ArchiveEntry],
+        output_path: str,
+        result_callback: Optional[Callable[[ArchiveEntry, Optional[str]], None]] = None,
+        cancel_check: Optional[Callable[[], bool]] = None,
+        volume_size: Optional[int] = None,
+        bytes_callback: Optional[Callable[[int], None]] = None
+    ) -> bool:
+        """Создание архива (параметры как у ParallelZipArchiver.archive).
+
+        Returns:
+            False, если операция была отменена
+
+        Raises:
+            OSError: Ошибка записи архива
+            ValueError: Формат не поддерживает разбиение на тома
+        """
+
+    def update(
+        self,
+        archive_path: str,
+        entries: Iterable[ArchiveEntry],
+        result_callback: Optional[Callable[[ArchiveEntry, Optional[str]], None]] = None,
+        cancel_check: Optional[Callable[[], bool]] = None,
+        bytes_callback: Optional[Callable[[int], None]] = None
+    ) -> bool:
+        """Обновление существующего архива (параметры как у ZipUpdater.update).
+
+        Raises:
+            ValueError: Формат не поддерживает обновление
+        """
+        raise ValueError(f"Формат {self.description} не поддерживает обновление архива")
+
+
+class ZipBackend(ArchiveBackend):
+    """ZIP (DEFLATE), совместим с любыми программами."""
+
+    name = 'zip'
+    extension = '.zip'
+    description = 'ZIP'
+    supports_volumes = True
+    supports_update = True
+
+    def archive(self, entries, output_path, result_callback=None, cancel_check=None,
+                volume_size=None, bytes_callback=None) -> bool:
+        archiver = ParallelZipArchiver(self.compression_level, self.workers)
+        return archiver.archive(entries, output_path, result_callback, cancel_check, volume_size, bytes_callback)
+
+    def update(self, archive_path, entries, result_callback=None, cancel_check=None, bytes_callback=None) -> bool:
+        updater = ZipUpdater(ParallelZipArchiver(self.compression_level, self.workers))
+        return updater.update(archive_path, entries, result_callback, cancel_check, bytes_callback)
+
+
+class TarBackend(ArchiveBackend):
+    """tar с блочным сжатием в пуле потоков."""
+
+    block_size = ARCHIVE_BLOCK_SIZE
+
+    @abstractmethod
+    def compress_block(self, block: bytes) -> bytes:
+        """Сжатие блока в самостоятельный член/поток/кадр формата."""
+
+    def archive(self, entries, output_path, result_callback=None, cancel_check=None,
+                volume_size=None, bytes_callback=None) -> bool:
+        if volume_size:
+            raise ValueError(f"Формат {self.description} не поддерживает разбиение на тома")
+        output_dir = os.path.dirname(os.path.abspath(output_path))
+        fd, temp_path = tempfile.mkstemp(prefix='.archive_', suffix='.part', dir=output_dir)
+        completed = False
+        try:
+            with os.fdopen(fd, 'wb') as output:
+                writer = ParallelBlockWriter(output, self.compress_block, self.workers, self.block_size)
+                try:
+                    completed = self._write_tar(writer, entries, result_callback, cancel_check, bytes_callback)
+                    if completed:
+                        writer.finish()
+                finally:
+                    if not completed:
+                        writer.abort()
+            if completed:
+                replace_archive(temp_path, output_path)
+            return completed
+        finally:
+            if not completed:
+                try:
+                    os.remove(temp_path)
+                except OSError:
+                    pass
+
+    def _write_tar(
+        self,
+        writer: ParallelBlockWriter,
+        entries: Iterable[ArchiveEntry],
+        result_callback: Optional[Callable[[ArchiveEntry, Optional[str]], None]],
+        cancel_check: Optional[Callable[[], bool]],
+        bytes_callback: Optional[Callable[[int], None]]
+    ) -> bool:
+        """Запись потока tar в блочный компрессор."""
+        bytes_done = 0
+
+        def on_read(size: int):
+            nonlocal bytes_done
+            bytes_done += size
+            if bytes_callback:
+                bytes_callback(bytes_done)
+
+        tar = tarfile.open(fileobj=writer, mode='w|', format=tarfile.PAX_FORMAT)
+        try:
+            for entry in entries:
+                if cancel_check and cancel_check():
+                    return False
+                try:
+                    info = tar.gettarinfo(entry.source, entry.arcname.replace(os.sep, '/'))
+                    f = open(entry.source, 'rb')
+                except OSError as e:
+                    logger.warning(f"Не удалось добавить {entry.source}: {e}")
+                    if result_callback:
+                        result_callback(entry, str(e))
+                    continue
+                with f:
+                    try:
+                        tar.addfile(info, _ProgressReader(f, on_read, cancel_check))
+                    except ArchiveCancelled:
+                        return False
+                    except OSError as e:
+                        # Заголовок записи уже в архиве - продолжить нельзя
+                        raise ArchiveWriteError(f"Ошибка записи {entry.source}: {e}") from e
+                if result_callback:
+                    result_callback(entry, None)
+            tar.close()
+            return True
+        finally:
+            if not tar.closed:
+                # Отмена или ошибка: конец потока tar уже не записывается
+                writer.abort()
+                tar.close()
+
+
+class TarGzBackend(TarBackend):
+    """tar.gz: быстрое сжатие, распаковывается везде."""
+
+    name = 'tar.gz'
+    extension = '.tar.gz'
+    description = 'tar.gz'
+
+    def compress_block(self, block: bytes) -> bytes:
+        compressor = zlib.compressobj(self.compression_level, zlib.DEFLATED, 31)
+        return compressor.compress(block) + compressor.flush()
+
+
+class TarXzBackend(TarBackend):
+    """tar.xz: наилучшее сжатие, медленнее остальных."""
+
+    name = 'tar.xz'
+    extension = '.tar.xz'
+    description = 'tar.xz'
+
+    def compress_block(self, block: bytes) -> bytes:
+        # Словарь больше блока не нужен, а память компрессора растет с его размером
+        dict_size = max(4096, min(_XZ_DICT_SIZES[self.compression_level], len(block)))
+        filters = [{'id': lzma.FILTER_LZMA2, 'preset': self.compression_level, 'dict_size': dict_size}]
+        return lzma.compress(block, format=lzma.FORMAT_XZ, filters=filters)
+
+
+class TarZstdBackend(TarBackend):
+    """tar.zst: высокая скорость при сжатии на уровне gzip и лучше."""
+
+    name = 'tar.zst'
+    extension = '.tar.zst'
+    description = 'tar.zst'
+
+    @classmethod
+    def is_available(cls) -> bool:
+        return zstandard is not None
+
+    @property
+    def zstd_level(self) -> int:
+        """Уровень zstd (1-19) для уровня 0-9."""
+        return max(1, round(self.compression_level * 19 / 9))
+
+    def compress_block(self, block: bytes) -> bytes:
+        return zstandard.ZstdCompressor(level=self.zstd_level).compress(block)
+
+
+BACKENDS: Dict[str, Type[ArchiveBackend]] = {
+    backend.name: backend for backend in (ZipBackend, TarGzBackend, TarXzBackend, TarZstdBackend)
+}
+
+
+def available_backends() -> List[str]:
+    """Имена доступных форматов."""
+    return [name for name, backend in BACKENDS.items() if backend.is_available()]
+
+
+def create_backend(name: str, compression_level: int = 6, workers: Optional[int] = None) -> ArchiveBackend:
+    """Создание формата по имени.
+
+    Args:
+        name: Имя формата (см. BACKENDS)
+        compression_level: Уровень сжатия 0-9
+        workers: Потоков сжатия
+
+    Returns:
+        Формат архива
+
+    Raises:
+        ValueError: Неизвестный или недоступный формат
+    """
+    backend = BACKENDS.get(name)
+    if backend is None:
+        raise ValueError(f"Неизвестный формат архива: {name}")
+    if not backend.is_available():
+        raise ValueError(f"Формат {name} недоступен (не установлены нужные пакеты)")
+    return backend(compression_level, workers)
+
+
+def resolve_preset(preset: str) -> Tuple[str, int]:
+    """Формат и уровень для пресета скорость/сжатие.
+
+    Пресет перечисляет варианты по убыванию предпочтения; выбирается
+    первый доступный.
+
+    Args:
+        preset: Название пресета из ARCHIVE_PRESETS
+
+    Returns:
+        Tuple[имя формата, уровень сжатия]
+
+    Raises:
+        ValueError: Неизвестный пресет или нет доступных вариантов
+    """
+    for name, level in ARCHIVE_PRESETS.get(preset, []):
+        if name in BACKENDS and BACKENDS[name].is_available():
+            return name, level
+    raise ValueError(f"Пресет недоступен: {preset}")
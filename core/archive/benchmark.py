@@ -0,0 +1,144 @@
+"""Сравнение форматов архивов на выборке файлов пользователя.
+
+Из списка файлов выбирается ограниченная выборка (равномерно по всему
+дереву, а не только первые файлы), которая архивируется каждым
+вариантом (формат, уровень) во временную папку. Для каждого варианта
+сообщается время, скорость и коэффициент сжатия.
+"""
+
+import logging
+import os
+import random
+import tempfile
+import time
+from dataclasses import dataclass
+from typing import Callable, Iterable, List, Optional, Tuple
+
+from .backends import BACKENDS, create_backend
+from .scanner import ArchiveEntry, iter_entries
+
+logger = logging.getLogger(__name__)
+
+try:
+    from config.constants import ARCHIVE_BENCHMARK_FILES, ARCHIVE_BENCHMARK_SIZE
+except ImportError:
+    ARCHIVE_BENCHMARK_FILES = 30
+    ARCHIVE_BENCHMARK_SIZE = 32 * 1024 * 1024
+
+# Варианты по умолчанию: быстрый и плотный уровень каждого формата
+DEFAULT_CANDIDATES = [(name, level) for name in BACKENDS for level in (1, 6, 9)]
+
+
+@dataclass
+class BenchmarkResult:
+    """Результат архивации выборки одним вариантом."""
+    backend: str
+    level: int
+    input_size: int
+    output_size: int = 0
+    seconds: float = 0.0
+    error: Optional[str] = None
+
+    @property
+    def ratio(self) -> float:
+        """Доля размера архива от исходного (меньше - лучше)."""
+        return self.output_size / self.input_size if self.input_size else 1.0
+
+    @property
+    def speed(self) -> float:
+        """Скорость архивации, байт в секунду."""
+        return self.input_size / self.seconds if self.seconds > 0 else 0.0
+
+
+def sample_entries(
+    paths: Iterable[str],
+    max_files: int = ARCHIVE_BENCHMARK_FILES,
+    max_bytes: int = ARCHIVE_BENCHMARK_SIZE,
+    seed: int = 0
+) -> List[ArchiveEntry]:
+    """Выборка файлов для сравнения.
+
+    Файлы выбираются резервуарной выборкой по всему дереву, затем
+    выборка ограничивается по объему. Файлы больше max_bytes не
+    выбираются.
+
+    Args:
+        paths: Пути к файлам и папкам
+        max_files: Максимальное количество файлов
+        max_bytes: Максимальный суммарный размер
+        seed: Начальное значение генератора (выборка воспроизводима)
+
+    Returns:
+        Записи выборки в порядке обхода
+    """
+    rng = random.Random(seed)
+    reservoir: List[Tuple[int, ArchiveEntry]] = []
+    seen = 0
+    for entry in iter_entries(paths):
+        if entry.size is None or entry.size > max_bytes:
+            continue
+        if len(reservoir) < max_files:
+            reservoir.append((seen, entry))
+        else:
+            index = rng.randrange(seen + 1)
+            if index < max_files:
+                reservoir[index] = (seen, entry)
+        seen += 1
+
+    sample: List[ArchiveEntry] = []
+    total = 0
+    for _, entry in sorted(reservoir, key=lambda item: item[0]):
+        if total + entry.size > max_bytes:
+            continue
+        sample.append(entry)
+        total += entry.size
+    return sample
+
+
+def run_benchmark(
+    entries: List[ArchiveEntry],
+    candidates: Iterable[Tuple[str, int]] = DEFAULT_CANDIDATES,
+    result_callback: Optional[Callable[[BenchmarkResult], None]] = None,
+    cancel_check: Optional[Callable[[], bool]] = None,
+    workers: Optional[int] = None
+) -> List[BenchmarkResult]:
+    """Архивация выборки каждым вариантом.
+
+    Недоступные форматы пропускаются.
+
+    Args:
+        entries: Выборка файлов
+        candidates: Варианты (имя формата, уровень 0-9)
+        result_callback: Функция, вызываемая после каждого варианта
+        cancel_check: Функция, возвращающая True при отмене
+        workers: Потоков сжатия
+
+    Returns:
+        Результаты в порядке вариантов
+    """
+    input_size = sum(entry.size or 0 for entry in entries)
+    results: List[BenchmarkResult] = []
+    with tempfile.TemporaryDirectory(prefix='archive_benchmark_') as temp_dir:
+        for name, level in candidates:
+            if cancel_check and cancel_check():
+                break
+            result = BenchmarkResult(name, level, input_size)
+            try:
+                backend = create_backend(name, level, workers)
+            except ValueError:
+                continue
+            output_path = os.path.join(temp_dir, f"sample_{name}_{level}{backend.extension}")
+            started = time.perf_counter()
+            try:
+                if not backend.archive(entries, output_path, cancel_check=cancel_check):
+                    break
+                result.seconds = time.perf_counter() - started
+                result.output_size = os.path.getsize(output_path)
+                os.remove(output_path)
+            except (OSError, RuntimeError) as e:
+                logger.warning(f"Ошибка сравнения формата {name}: {e}")
+                result.error = str(e)
+            results.append(result)
+            if result_callback:
+                result_callback(result)
+    return results
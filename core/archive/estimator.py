@@ -0,0 +1,125 @@
+"""Оценка размера файлов после сжатия.
+
+Для уже сжатых форматов размер после сжатия принимается равным
+исходному. Для остальных ограниченная выборка (начало и середина файла)
+сжимается компрессором выбранного формата архива на выбранном уровне,
+и коэффициент сжатия выборки переносится на весь файл. Результаты
+кэшируются по (путь, размер, время изменения, уровень, формат),
+поэтому повторное обновление списка не читает файлы заново.
+"""
+
+import logging
+import os
+import threading
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+from .backends import TarBackend, create_backend
+from .policy import CompressionPolicy
+from .zip_writer import ZIP_STORED
+
+logger = logging.getLogger(__name__)
+
+# Размер одного блока выборки; читается не больше двух блоков на файл
+ESTIMATE_BLOCK_SIZE = 128 * 1024
+
+# Максимальное количество записей кэша оценок
+MAX_ESTIMATE_CACHE_ENTRIES = 20000
+
+
+@dataclass
+class SizeEstimate:
+    """Оценка размера элемента списка."""
+    path: str
+    exists: bool
+    is_file: bool
+    size: int = 0
+    estimated_size: int = 0
+
+
+class CompressedSizeEstimator:
+    """Оценка размера после сжатия по выборке с кэшированием."""
+
+    def __init__(self, block_size: int = ESTIMATE_BLOCK_SIZE, max_entries: int = MAX_ESTIMATE_CACHE_ENTRIES):
+        """Инициализация.
+
+        Args:
+            block_size: Размер блока выборки
+            max_entries: Максимальное количество записей кэша
+        """
+        self.block_size = block_size
+        self.max_entries = max_entries
+        self._cache: 'OrderedDict[Tuple[str, int, int, int, str], int]' = OrderedDict()
+        self._backends: Dict[Tuple[str, int], TarBackend] = {}
+        self._lock = threading.Lock()
+
+    def estimate(self, path: str, compression_level: int, backend: str = 'zip') -> SizeEstimate:
+        """Оценка размера элемента.
+
+        Args:
+            path: Путь к файлу или папке
+            compression_level: Уровень сжатия
+            backend: Формат архива (см. backends.BACKENDS)
+
+        Returns:
+            Оценка (для папок и отсутствующих путей размер не оценивается)
+
+        Raises:
+            ValueError: Неизвестный или недоступный формат
+        """
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return SizeEstimate(path, exists=False, is_file=False)
+        if not os.path.isfile(path):
+            return SizeEstimate(path, exists=True, is_file=False)
+
+        key = (path, stat.st_size, stat.st_mtime_ns, compression_level, backend)
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                return SizeEstimate(path, True, True, stat.st_size, cached)
+
+        estimated = self._estimate_file(path, stat.st_size, compression_level, backend)
+        with self._lock:
+            self._cache[key] = estimated
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+        return SizeEstimate(path, True, True, stat.st_size, estimated)
+
+    def _estimate_file(self, path: str, size: int, compression_level: int, backend: str = 'zip') -> int:
+        """Оценка размера файла по выборке."""
+        policy = CompressionPolicy(compression_level)
+        if size == 0 or policy.method_for_extension(path) == ZIP_STORED:
+            return size
+        try:
+            with open(path, 'rb') as f:
+                sample = f.read(self.block_size)
+                if size > 2 * self.block_size:
+                    # Начало файла часто отличается от основного содержимого (заголовки)
+                    f.seek(size // 2)
+                    sample += f.read(self.block_size)
+        except OSError as e:
+            logger.debug(f"Не удалось прочитать выборку {path}: {e}")
+            return size
+        if not sample:
+            return size
+        if policy.choose(path, sample) == ZIP_STORED:
+            return size
+        compressed = len(self._compress_sample(sample, compression_level, backend))
+        return min(size, int(size * compressed / len(sample)))
+
+    def _compress_sample(self, sample: bytes, compression_level: int, backend: str) -> bytes:
+        """Сжатие выборки компрессором формата архива."""
+        if backend == 'zip':
+            return zlib.compress(sample, compression_level)
+        key = (backend, compression_level)
+        with self._lock:
+            tar_backend = self._backends.get(key)
+            if tar_backend is None:
+                tar_backend = create_backend(backend, compression_level)
+                self._backends[key] = tar_backend
+        return tar_backend.compress_block(sample)
@@ -0,0 +1,431 @@
+"""Параллельное создание ZIP архива.
+
+Записи сжимаются одновременно в нескольких потоках (zlib и crc32
+освобождают GIL), результат каждой записи хранится в памяти или, для
+больших файлов, во временном файле. Единственный поток записи добавляет
+готовые записи в архив в исходном порядке. Уже сжатые данные
+сохраняются без сжатия (см. policy). Количество одновременно
+подготовленных записей ограничено, поэтому память не растет с размером
+архива.
+
+Файлы больше порога переноса тоже сжимаются в рабочих потоках (во
+временный файл), а поток записи только копирует их в архив. Сразу в
+архив пишутся лишь большие файлы без сжатия: копировать их во временный
+файл незачем (размеры записываются в дескриптор после данных). Архив
+может быть разбит на тома фиксированного размера.
+"""
+
+import logging
+import os
+import tempfile
+import threading
+import zlib
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from stat import S_IMODE
+from typing import Callable, Deque, Iterable, List, Optional, Tuple
+
+from .policy import CompressionPolicy
+from .scanner import ArchiveEntry, iter_entries
+from .zip_writer import ZIP_DEFLATED, CompressedEntry, SplitArchiveOutput, ZipWriter
+
+logger = logging.getLogger(__name__)
+
+try:
+    from config.constants import ARCHIVE_SPILL_THRESHOLD, ARCHIVE_WORKERS
+except ImportError:
+    ARCHIVE_SPILL_THRESHOLD = 16 * 1024 * 1024
+    ARCHIVE_WORKERS = None
+
+# Размер блока чтения исходных файлов
+READ_CHUNK_SIZE = 1024 * 1024
+
+# Интервал проверки отмены при ожидании сжатия записи, секунды
+CANCEL_POLL_INTERVAL = 0.1
+
+
+class ArchiveWriteError(RuntimeError):
+    """Ошибка, после которой архив не может быть завершен."""
+
+
+class _CompressionAborted(Exception):
+    """Сжатие записи прервано: архивация отменена или завершилась ошибкой."""
+
+
+def collect_entries(paths: Iterable[str]) -> Tuple[List[ArchiveEntry], List[Tuple[str, str]]]:
+    """Список записей архива для файлов и папок.
+
+    Файл добавляется под своим именем, содержимое папки - с путями
+    относительно родителя папки.
+
+    Args:
+        paths: Пути к файлам и папкам
+
+    Returns:
+        Tuple[записи, список (путь, ошибка) для пропущенных элементов]
+    """
+    errors: List[Tuple[str, str]] = []
+    entries = list(iter_entries(paths, lambda path, error: errors.append((path, error))))
+    return entries, errors
+
+
+def replace_archive(temp_path: str, output_path: str) -> None:
+    """Переименование готового временного файла в архив.
+
+    mkstemp создает файл с правами 0600, поэтому перед переименованием
+    файлу возвращаются права заменяемого архива или, для нового архива,
+    права по умолчанию с учетом umask.
+
+    Raises:
+        OSError: Ошибка переименования
+    """
+    try:
+        mode = S_IMODE(os.stat(output_path).st_mode)
+    except OSError:
+        umask = os.umask(0)
+        os.umask(umask)
+        mode = 0o666 & ~umask
+    os.chmod(temp_path, mode)
+    os.replace(temp_path, output_path)
+
+
+def default_workers() -> int:
+    """Количество потоков сжатия по умолчанию."""
+    return ARCHIVE_WORKERS or max(1, os.cpu_count() or 1)
+
+
+class ParallelZipArchiver:
+    """Создание ZIP архива с параллельным сжатием записей."""
+
+    def __init__(
+        self,
+        compression_level: int = 6,
+        workers: Optional[int] = None,
+        spill_threshold: int = ARCHIVE_SPILL_THRESHOLD,
+        policy: Optional[CompressionPolicy] = None
+    ):
+        """Инициализация.
+
+        Args:
+            compression_level: Уровень сжатия DEFLATE (0 - без сжатия)
+            workers: Потоков сжатия (None - по числу ядер)
+            spill_threshold: Объем сжатых данных записи, после которого
+                             они переносятся из памяти во временный файл;
+                             файлы большего размера без сжатия пишутся
+                             сразу в архив
+            policy: Выбор метода для записи (по умолчанию - уже сжатые
+                    форматы и несжимаемые данные сохраняются без сжатия)
+        """
+        self.compression_level = compression_level
+        self.policy = policy or CompressionPolicy(compression_level)
+        self.workers = max(1, workers or default_workers())
+        self.spill_threshold = spill_threshold
+        self.temp_dir: Optional[str] = None
+        self._abort = threading.Event()
+
+    def prepare_entry(self, entry: ArchiveEntry) -> CompressedEntry:
+        """Подготовка записи: копия из обновляемого архива или сжатие
+        (выполняется в рабочем потоке).
+
+        Raises:
+            OSError: Ошибка чтения файла
+        """
+        reused = self._reuse_existing(entry)
+        return reused if reused is not None else self.compress_entry(entry)
+
+    def prepare_large_entry(self, entry: ArchiveEntry) -> Optional[CompressedEntry]:
+        """Подготовка записи большого файла (выполняется в рабочем потоке).
+
+        Returns:
+            Подготовленная запись или None, если файл сохраняется без
+            сжатия и пишется потоком записи сразу в архив
+
+        Raises:
+            OSError: Ошибка чтения файла
+        """
+        reused = self._reuse_existing(entry)
+        if reused is not None:
+            return reused
+        with open(entry.source, 'rb') as f:
+            first_chunk = f.read(READ_CHUNK_SIZE)
+        method = self.policy.choose(entry.source, first_chunk)
+        if method != ZIP_DEFLATED:
+            return None
+        return self.compress_entry(entry, method)
+
+    def compress_entry(self, entry: ArchiveEntry, method: Optional[int] = None) -> CompressedEntry:
+        """Сжатие одной записи (выполняется в рабочем потоке).
+
+        Args:
+            entry: Запись
+            method: Метод сжатия (None - выбор по первому блоку файла)
+
+        Raises:
+            OSError: Ошибка чтения файла
+        """
+        stat = os.stat(entry.source)
+        output = tempfile.SpooledTemporaryFile(max_size=self.spill_threshold, dir=self.temp_dir)
+        compressor = None
+        if method == ZIP_DEFLATED:
+            compressor = zlib.compressobj(self.compression_level, zlib.DEFLATED, -15)
+        crc = 0
+        file_size = 0
+        compressed_size = 0
+        try:
+            with open(entry.source, 'rb') as f:
+                while True:
+                    chunk = f.read(READ_CHUNK_SIZE)
+                    if method is None:
+                        # Метод выбирается по первому блоку, без дополнительного чтения
+                        method = self.policy.choose(entry.source, chunk)
+                        if method == ZIP_DEFLATED:
+                            compressor = zlib.compressobj(self.compression_level, zlib.DEFLATED, -15)
+                    if not chunk:
+                        break
+                    if self._abort.is_set():
+                        raise _CompressionAborted()
+                    file_size += len(chunk)
+                    crc = zlib.crc32(chunk, crc)
+                    data = compressor.compress(chunk) if compressor else chunk
+                    output.write(data)
+                    compressed_size += len(data)
+            if compressor:
+                data = compressor.flush()
+                output.write(data)
+                compressed_size += len(data)
+        except BaseException:
+            output.close()
+            raise
+        entry.method = method
+        return CompressedEntry(
+            arcname=entry.arcname,
+            method=method,
+            crc=crc,
+            compressed_size=compressed_size,
+            file_size=file_size,
+            mtime=stat.st_mtime,
+            mode=stat.st_mode,
+            data=output,
+        )
+
+    def archive(
+        self,
+        entries: Iterable[ArchiveEntry],
+        output_path: str,
+        result_callback: Optional[Callable[[ArchiveEntry, Optional[str]], None]] = None,
+        cancel_check: Optional[Callable[[], bool]] = None,
+        volume_size: Optional[int] = None,
+        bytes_callback: Optional[Callable[[int], None]] = None,
+        finalize: Optional[Callable[[], None]] = None
+    ) -> bool:
+        """Создание архива.
+
+        Архив пишется во временный файл и переименовывается в output_path
+        только после успешного завершения. Тома разбитого архива пишутся
+        под своими именами и удаляются при отмене или ошибке.
+
+        Args:
+            entries: Записи в порядке добавления (могут перечисляться
+                     во время архивации, например EntryProducer)
+            output_path: Путь к архиву (последний том для разбитого архива)
+            result_callback: Функция (запись, ошибка или None), вызывается
+                             в потоке, вызвавшем archive, в порядке записей
+            cancel_check: Функция, возвращающая True при отмене
+            volume_size: Размер тома в байтах (None - один файл)
+            bytes_callback: Функция (обработано байт исходных данных)
+            finalize: Функция, вызываемая после записи архива до его
+                      переименования (например, закрытие обновляемого архива)
+
+        Returns:
+            False, если операция была отменена
+
+        Raises:
+            OSError: Ошибка записи архива
+        """
+        output_dir = os.path.dirname(os.path.abspath(output_path))
+        self.temp_dir = output_dir
+        if volume_size:
+            writer = ZipWriter(SplitArchiveOutput(output_path, volume_size))
+            completed = False
+            try:
+                completed = self._write_entries(writer, entries, result_callback, cancel_check, bytes_callback)
+                if completed:
+                    writer.close()
+                    if finalize:
+                        finalize()
+                return completed
+            finally:
+                if not completed:
+                    writer.abort()
+
+        fd, temp_path = tempfile.mkstemp(prefix='.archive_', suffix='.part', dir=output_dir)
+        completed = False
+        try:
+            with os.fdopen(fd, 'wb') as output:
+                writer = ZipWriter(output)
+                try:
+                    completed = self._write_entries(
+                        writer, entries, result_callback, cancel_check, bytes_callback
+                    )
+                    if completed:
+                        writer.close()
+                finally:
+                    if not completed:
+                        writer.abort()
+            if completed:
+                if finalize:
+                    finalize()
+                replace_archive(temp_path, output_path)
+            return completed
+        finally:
+            if not completed:
+                try:
+                    os.remove(temp_path)
+                except OSError:
+                    pass
+
+    def _write_entries(
+        self,
+        writer: ZipWriter,
+        entries: Iterable[ArchiveEntry],
+        result_callback: Optional[Callable[[ArchiveEntry, Optional[str]], None]],
+        cancel_check: Optional[Callable[[], bool]],
+        bytes_callback: Optional[Callable[[int], None]] = None
+    ) -> bool:
+        """Сжатие в пуле потоков и запись в исходном порядке."""
+        # Не больше двух подготовленных записей на поток - память ограничена
+        window = self.workers * 2
+        pending: Deque[Tuple[ArchiveEntry, Future]] = deque()
+        entries = iter(entries)
+        bytes_done = 0
+        self._abort.clear()
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            try:
+                exhausted = False
+                while pending or not exhausted:
+                    while not exhausted and len(pending) < window:
+                        entry = next(entries, None)
+                        if entry is None:
+                            exhausted = True
+                            break
+                        if entry.size is not None and entry.size > self.spill_threshold:
+                            pending.append((entry, executor.submit(self.prepare_large_entry, entry)))
+                        else:
+                            pending.append((entry, executor.submit(self.prepare_entry, entry)))
+                    if not pending:
+                        break
+
+                    entry, future = pending[0]
+                    # Сжатие большого файла может идти долго - отмена проверяется во время ожидания
+                    while True:
+                        if cancel_check and cancel_check():
+                            return False
+                        if future.done():
+                            break
+                        wait([future], timeout=CANCEL_POLL_INTERVAL)
+                    pending.popleft()
+                    try:
+                        compressed = future.result()
+                        streamed = compressed is None
+                        if streamed:
+                            # Большой файл без сжатия пишется сразу в архив
+                            compressed = self._stream_entry(
+                                writer, entry, cancel_check,
+                                bytes_callback and (lambda size: bytes_callback(bytes_done + size))
+                            )
+                            if compressed is None:
+                                return False
+                    except OSError as e:
+                        # Ошибка чтения исходного файла - запись пропускается
+                        logger.warning(f"Не удалось сжать {entry.source}: {e}")
+                        if result_callback:
+                            result_callback(entry, str(e))
+                        continue
+                    if not streamed:
+                        self._write_prepared(writer, entry, compressed)
+                    bytes_done += compressed.file_size
+                    if bytes_callback:
+                        bytes_callback(bytes_done)
+                    if result_callback:
+                        result_callback(entry, None)
+                return True
+            finally:
+                # Отмена или ошибка записи: прерываем сжатие и освобождаем подготовленные записи
+                self._abort.set()
+                pending_futures = [future for _, future in pending]
+                for future in pending_futures:
+                    future.cancel()
+                for future in pending_futures:
+                    if not future.cancelled():
+                        try:
+                            compressed = future.result()
+                        except (OSError, _CompressionAborted):
+                            continue
+                        if compressed is not None:
+                            compressed.close()
+
+    @staticmethod
+    def _reuse_existing(entry: ArchiveEntry) -> Optional[CompressedEntry]:
+        """Копия записи обновляемого архива, если файл не изменился.
+
+        Raises:
+            OSError: Ошибка чтения файла
+        """
+        if entry.existing is None:
+            return None
+        entry.method = entry.existing.method
+        if entry.reused:
+            # Запись архива без соответствующего файла сохраняется как есть
+            return entry.existing.reuse()
+        stat = os.stat(entry.source)
+        if not entry.existing.unchanged(entry.source, stat):
+            entry.method = None
+            return None
+        entry.reused = True
+        return entry.existing.reuse(stat)
+
+    @staticmethod
+    def _write_prepared(writer: ZipWriter, entry: ArchiveEntry, compressed: CompressedEntry) -> None:
+        """Запись подготовленной записи в архив.
+
+        Raises:
+            ArchiveWriteError: Ошибка записи архива
+        """
+        try:
+            writer.write_entry(compressed)
+        except OSError as e:
+            compressed.close()
+            raise ArchiveWriteError(f"Ошибка записи {entry.source}: {e}") from e
+
+    def _stream_entry(
+        self,
+        writer: ZipWriter,
+        entry: ArchiveEntry,
+        cancel_check: Optional[Callable[[], bool]],
+        progress_callback: Optional[Callable[[int], None]]
+    ) -> Optional[CompressedEntry]:
+        """Запись большого файла сразу в архив (выполняется в потоке записи).
+
+        Ошибка открытия файла пропускает запись; ошибка чтения после
+        начала записи прерывает создание архива.
+
+        Returns:
+            Записанная запись или None при отмене
+
+        Raises:
+            OSError: Ошибка чтения или записи
+        """
+        stat = os.stat(entry.source)
+        with open(entry.source, 'rb') as f:
+            first_chunk = f.read(READ_CHUNK_SIZE)
+            method = self.policy.choose(entry.source, first_chunk)
+            entry.method = method
+            try:
+                return writer.write_stream(
+                    entry.arcname, f, method, self.compression_level, stat.st_mtime, stat.st_mode,
+                    first_chunk=first_chunk, progress_callback=progress_callback, cancel_check=cancel_check,
+                )
+            except OSError as e:
+                # Заголовок записи уже в архиве - продолжить нельзя
+                raise ArchiveWriteError(f"Ошибка записи {entry.source}: {e}") from e
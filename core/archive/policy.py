@@ -0,0 +1,82 @@
+"""Выбор метода сжатия для записи архива.
+
+Уже сжатые форматы (JPEG, MP4, ZIP, DOCX и т.п.) сохраняются без
+сжатия: DEFLATE почти не уменьшает их, но тратит большую часть
+времени процессора. Для остальных файлов энтропия оценивается пробным
+быстрым сжатием первого блока: если блок почти не сжимается, запись
+сохраняется без сжатия.
+"""
+
+import os
+import zlib
+
+from .zip_writer import ZIP_DEFLATED, ZIP_STORED
+
+# Размер пробного блока (берется из уже прочитанного начала файла)
+SAMPLE_SIZE = 64 * 1024
+
+# Пробный блок считается несжимаемым, если сжатие дает меньше 3% выигрыша
+STORE_RATIO_THRESHOLD = 0.97
+
+# Файлы меньше этого размера не проверяются (выигрыш от проверки незаметен)
+MIN_SAMPLE_SIZE = 512
+
+# Форматы, данные которых уже сжаты
+INCOMPRESSIBLE_EXTENSIONS = frozenset({
+    # Изображения
+    '.jpg', '.jpeg', '.png', '.gif', '.webp', '.heic', '.heif', '.avif', '.jxl',
+    # Видео
+    '.mp4', '.m4v', '.mkv', '.mov', '.avi', '.wmv', '.webm', '.flv', '.3gp',
+    # Аудио
+    '.mp3', '.aac', '.m4a', '.ogg', '.opus', '.flac', '.wma',
+    # Архивы
+    '.zip', '.7z', '.rar', '.gz', '.tgz', '.bz2', '.xz', '.txz', '.zst', '.lz4', '.cab',
+    # Документы в ZIP контейнере
+    '.docx', '.xlsx', '.pptx', '.odt', '.ods', '.odp', '.epub', '.jar', '.apk',
+})
+
+
+class CompressionPolicy:
+    """Политика выбора метода сжатия по расширению и пробному блоку."""
+
+    def __init__(self, compression_level: int = 6, sample_size: int = SAMPLE_SIZE,
+                 threshold: float = STORE_RATIO_THRESHOLD):
+        """Инициализация.
+
+        Args:
+            compression_level: Уровень сжатия (0 - все записи без сжатия)
+            sample_size: Размер пробного блока
+            threshold: Доля исходного размера, начиная с которой блок несжимаем
+        """
+        self.compression_level = compression_level
+        self.sample_size = sample_size
+        self.threshold = threshold
+
+    def method_for_extension(self, file_path: str) -> int:
+        """Метод по расширению (ZIP_DEFLATED - решение требует проверки данных)."""
+        if self.compression_level <= 0:
+            return ZIP_STORED
+        if os.path.splitext(file_path)[1].lower() in INCOMPRESSIBLE_EXTENSIONS:
+            return ZIP_STORED
+        return ZIP_DEFLATED
+
+    def choose(self, file_path: str, head: bytes) -> int:
+        """Метод сжатия записи.
+
+        Args:
+            file_path: Путь к файлу
+            head: Начало файла (используется не больше sample_size байт)
+
+        Returns:
+            ZIP_STORED или ZIP_DEFLATED
+        """
+        if self.method_for_extension(file_path) == ZIP_STORED:
+            return ZIP_STORED
+        sample = head[:self.sample_size]
+        if len(sample) < MIN_SAMPLE_SIZE:
+            return ZIP_DEFLATED
+        # Быстрое сжатие на уровне 1 - оценка энтропии блока
+        compressed = zlib.compress(sample, 1)
+        if len(compressed) >= len(sample) * self.threshold:
+            return ZIP_STORED
+        return ZIP_DEFLATED
@@ -0,0 +1,163 @@
+"""Перечисление файлов для архивации.
+
+Обход выполняется через os.scandir (тип элемента известен без
+отдельного stat). EntryProducer перечисляет файлы в отдельном потоке и
+передает их через ограниченную очередь, поэтому архивация начинается
+сразу, а память не зависит от размера дерева.
+"""
+
+import logging
+import os
+import queue
+import stat
+import threading
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Callable, Iterable, Iterator, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from .update import ExistingEntry
+
+logger = logging.getLogger(__name__)
+
+# Максимальное количество записей в очереди между обходом и архивацией
+MAX_QUEUED_ENTRIES = 10000
+
+# Признак завершения обхода в очереди
+_DONE = object()
+
+
+@dataclass
+class ArchiveEntry:
+    """Файл, добавляемый в архив."""
+    source: str
+    arcname: str
+    group: str  # Исходный элемент списка (файл или папка), к которому относится запись
+    method: Optional[int] = None  # Выбранный метод сжатия (после сжатия)
+    size: Optional[int] = None  # Размер файла при обходе (None - неизвестен)
+    existing: Optional['ExistingEntry'] = None  # Запись обновляемого архива с тем же именем
+    reused: bool = False  # Сжатые данные скопированы из обновляемого архива
+
+
+def iter_entries(
+    paths: Iterable[str],
+    error_callback: Optional[Callable[[str, str], None]] = None
+) -> Iterator[ArchiveEntry]:
+    """Перечисление записей архива для файлов и папок.
+
+    Файл добавляется под своим именем, содержимое папки - с путями
+    относительно родителя папки. Символические ссылки на папки не
+    обходятся.
+
+    Args:
+        paths: Пути к файлам и папкам
+        error_callback: Функция (путь, ошибка) для пропущенных элементов
+
+    Yields:
+        Записи в порядке обхода
+    """
+    for path in paths:
+        try:
+            info = os.stat(path)
+        except OSError:
+            if error_callback:
+                error_callback(path, "Файл не найден")
+            continue
+        if stat.S_ISREG(info.st_mode):
+            yield ArchiveEntry(path, os.path.basename(path), path, size=info.st_size)
+        elif stat.S_ISDIR(info.st_mode):
+            base = os.path.dirname(path)
+            yield from _walk(path, base, path)
+        elif error_callback:
+            error_callback(path, "Неизвестный тип")
+
+
+def _walk(top: str, base: str, group: str) -> Iterator[ArchiveEntry]:
+    """Обход папки: файлы папки, затем вложенные папки."""
+    stack = [top]
+    while stack:
+        directory = stack.pop()
+        subdirs: List[str] = []
+        try:
+            with os.scandir(directory) as it:
+                items = sorted(it, key=lambda item: item.name)
+        except OSError as e:
+            logger.warning(f"Не удалось прочитать папку {directory}: {e}")
+            continue
+        for item in items:
+            try:
+                if item.is_dir(follow_symlinks=False):
+                    subdirs.append(item.path)
+                elif item.is_file():
+                    yield ArchiveEntry(item.path, os.path.relpath(item.path, base), group, size=item.stat().st_size)
+            except OSError as e:
+                logger.warning(f"Не удалось получить сведения о {item.path}: {e}")
+        stack.extend(reversed(subdirs))
+
+
+class EntryProducer:
+    """Перечисление записей в отдельном потоке через ограниченную очередь."""
+
+    def __init__(self, paths: Iterable[str], max_queued: int = MAX_QUEUED_ENTRIES):
+        """Инициализация.
+
+        Args:
+            paths: Пути к файлам и папкам
+            max_queued: Максимальное количество записей в очереди
+        """
+        self.paths = list(paths)
+        self.errors: List[Tuple[str, str]] = []
+        self.scanned_files = 0
+        self.scanned_bytes = 0
+        self.finished = False
+        self._queue: 'queue.Queue' = queue.Queue(maxsize=max_queued)
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._error: Optional[BaseException] = None
+
+    def __iter__(self) -> Iterator[ArchiveEntry]:
+        """Запуск обхода и получение записей по мере перечисления."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='archive-scan', daemon=True)
+            self._thread.start()
+        while True:
+            item = self._queue.get()
+            if item is _DONE:
+                if self._error is not None:
+                    raise self._error
+                return
+            yield item
+
+    def stop(self) -> None:
+        """Остановка обхода (очередь освобождается, поток завершается)."""
+        self._stopped.set()
+        while True:
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                break
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self) -> None:
+        """Обход в потоке-производителе."""
+        try:
+            for entry in iter_entries(self.paths, lambda path, error: self.errors.append((path, error))):
+                self.scanned_files += 1
+                self.scanned_bytes += entry.size or 0
+                if not self._put(entry):
+                    return
+        except BaseException as e:
+            self._error = e
+        finally:
+            self.finished = True
+            self._put(_DONE)
+
+    def _put(self, item: object) -> bool:
+        """Помещение в очередь с проверкой остановки."""
+        while not self._stopped.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
@@ -0,0 +1,417 @@
+"""Обновление существующего ZIP архива.
+
+Центральный каталог существующего архива читается один раз. Файл,
+совпадающий с записью архива по размеру и времени изменения (или, если
+время отличается, по CRC), не сжимается заново: его сжатые данные
+копируются из старого архива байт в байт. Сжимаются только новые и
+измененные файлы. Новый архив пишется во временный файл и заменяет
+старый после успешного завершения.
+
+Имена записей без флага UTF-8 берутся из поля Info-ZIP Unicode Path
+(0x7075), если оно есть; иначе запись сопоставляется с файлом по байтам
+имени в одной из распространенных кодировок (UTF-8 у Info-ZIP в Linux,
+cp866 у Проводника Windows, cp437 по спецификации). У скопированных
+записей имя и это поле сохраняются в исходном виде.
+"""
+
+import logging
+import os
+import struct
+import time
+import zlib
+from dataclasses import dataclass
+from typing import BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from .parallel import ParallelZipArchiver
+from .scanner import ArchiveEntry
+from .zip_writer import CompressedEntry, dos_date_time
+
+logger = logging.getLogger(__name__)
+
+_LOCAL_HEADER = struct.Struct('<IHHHHHIIIHH')
+_CENTRAL_HEADER = struct.Struct('<IHHHHHHIIIHHHHHII')
+_END_RECORD = struct.Struct('<IHHHHIIH')
+_ZIP64_END_RECORD = struct.Struct('<IQHHIIQQQQ')
+_ZIP64_LOCATOR = struct.Struct('<IIQI')
+
+_CENTRAL_HEADER_SIGNATURE = 0x02014B50
+_END_SIGNATURE = b'PK\x05\x06'
+_ZIP64_LOCATOR_SIGNATURE = 0x07064B50
+_ZIP64_END_SIGNATURE = 0x06064B50
+_ZIP64_EXTRA_ID = 0x0001
+_UNICODE_PATH_EXTRA_ID = 0x7075
+_MAX_32 = 0xFFFFFFFF
+_MAX_16 = 0xFFFF
+
+_FLAG_ENCRYPTED = 0x01
+_FLAG_UTF8 = 0x800
+
+# Кодировки имен без флага UTF-8 (в порядке проверки при сопоставлении)
+_LEGACY_NAME_ENCODINGS = ('utf-8', 'cp866', 'cp437')
+
+# Запись конца каталога и максимальная длина комментария архива
+_MAX_END_SEARCH = _END_RECORD.size + 0xFFFF
+
+# Размер блока чтения при вычислении CRC
+_CRC_CHUNK_SIZE = 1024 * 1024
+
+
+class _ArchiveSlice:
+    """Сжатые данные записи внутри открытого архива."""
+
+    def __init__(self, fp: BinaryIO, header_offset: int, size: int):
+        self.fp = fp
+        self.header_offset = header_offset
+        self.size = size
+        self._start: Optional[int] = None
+        self._position = 0
+
+    def seek(self, position: int) -> None:
+        self._position = position
+
+    def read(self, size: int = -1) -> bytes:
+        if self._start is None:
+            # Длина имени и дополнительного поля локального заголовка
+            # могут отличаться от центрального каталога
+            self.fp.seek(self.header_offset)
+            header = self.fp.read(_LOCAL_HEADER.size)
+            if len(header) < _LOCAL_HEADER.size or header[:4] != b'PK\x03\x04':
+                raise OSError("Поврежден локальный заголовок записи архива")
+            name_length, extra_length = _LOCAL_HEADER.unpack(header)[9:11]
+            self._start = self.header_offset + _LOCAL_HEADER.size + name_length + extra_length
+        remaining = self.size - self._position
+        if size < 0 or size > remaining:
+            size = remaining
+        if size <= 0:
+            return b''
+        self.fp.seek(self._start + self._position)
+        data = self.fp.read(size)
+        if len(data) < size:
+            raise OSError("Неожиданный конец архива")
+        self._position += len(data)
+        return data
+
+    def close(self) -> None:
+        """Архив закрывается вместе с ZipSource."""
+
+
+@dataclass
+class ExistingEntry:
+    """Запись существующего архива."""
+    arcname: str
+    method: int
+    crc: int
+    compressed_size: int
+    file_size: int
+    dos_time: int
+    dos_date: int
+    mode: int
+    header_offset: int
+    fp: BinaryIO
+    raw_name: bytes = b''  # Имя в том виде, как оно записано в архиве
+    name_flags: int = 0  # Флаг UTF-8 записи
+    name_extra: bytes = b''  # Поле Unicode Path (0x7075) целиком
+    legacy_name: bool = False  # Имя не ASCII, без UTF-8 и без поля Unicode Path
+
+    @property
+    def key(self) -> Union[str, bytes]:
+        """Ключ для сопоставления с файлом: имя или байты имени в неизвестной кодировке."""
+        return self.raw_name if self.legacy_name else self.arcname
+
+    @property
+    def mtime(self) -> float:
+        """Время изменения из полей MS-DOS."""
+        try:
+            return time.mktime((
+                (self.dos_date >> 9) + 1980, (self.dos_date >> 5) & 0x0F, self.dos_date & 0x1F,
+                self.dos_time >> 11, (self.dos_time >> 5) & 0x3F, (self.dos_time & 0x1F) * 2,
+                0, 0, -1,
+            ))
+        except (OverflowError, ValueError):
+            return 0.0
+
+    def unchanged(self, path: str, stat: os.stat_result) -> bool:
+        """Совпадает ли файл с записью.
+
+        Размер сравнивается всегда; при совпадении времени изменения
+        (с точностью MS-DOS) файл не читается, иначе сравнивается CRC.
+
+        Raises:
+            OSError: Ошибка чтения файла
+        """
+        if stat.st_size != self.file_size:
+            return False
+        if dos_date_time(stat.st_mtime) == (self.dos_time, self.dos_date):
+            return True
+        crc = 0
+        with open(path, 'rb') as f:
+            while True:
+                chunk = f.read(_CRC_CHUNK_SIZE)
+                if not chunk:
+                    break
+                crc = zlib.crc32(chunk, crc)
+        return crc == self.crc
+
+    def reuse(self, stat: Optional[os.stat_result] = None) -> CompressedEntry:
+        """Запись для копирования сжатых данных без повторного сжатия.
+
+        Args:
+            stat: Сведения о файле (время и права берутся из файла),
+                  None - сохраняются значения из архива
+        """
+        return CompressedEntry(
+            arcname=self.arcname,
+            method=self.method,
+            crc=self.crc,
+            compressed_size=self.compressed_size,
+            file_size=self.file_size,
+            mtime=stat.st_mtime if stat else self.mtime,
+            mode=stat.st_mode if stat else self.mode,
+            data=_ArchiveSlice(self.fp, self.header_offset, self.compressed_size),
+            raw_name=self.raw_name or None,
+            name_flags=self.name_flags,
+            name_extra=self.name_extra,
+        )
+
+
+class ZipSource:
+    """Открытый существующий архив и его центральный каталог."""
+
+    def __init__(self, path: str):
+        """Открытие архива и чтение центрального каталога.
+
+        Args:
+            path: Путь к архиву
+
+        Raises:
+            OSError: Ошибка чтения
+            ValueError: Архив поврежден или не поддерживается
+                        (разбит на тома, содержит зашифрованные записи)
+        """
+        self.path = path
+        self.fp = open(path, 'rb')
+        try:
+            self.entries: List[ExistingEntry] = self._read_central_directory()
+        except BaseException:
+            self.fp.close()
+            raise
+
+    def close(self) -> None:
+        """Закрытие архива."""
+        self.fp.close()
+
+    def _read_central_directory(self) -> List[ExistingEntry]:
+        """Разбор записи конца каталога и заголовков центрального каталога."""
+        fp = self.fp
+        fp.seek(0, os.SEEK_END)
+        file_size = fp.tell()
+        search_size = min(file_size, _MAX_END_SEARCH)
+        fp.seek(file_size - search_size)
+        tail = fp.read(search_size)
+        end_position = tail.rfind(_END_SIGNATURE)
+        if end_position < 0 or end_position + _END_RECORD.size > len(tail):
+            raise ValueError("Не найдена запись конца центрального каталога")
+        (_, disk, central_disk, _, count, central_size,
+         central_offset, _) = _END_RECORD.unpack(tail[end_position:end_position + _END_RECORD.size])
+
+        if count == _MAX_16 or central_size == _MAX_32 or central_offset == _MAX_32 or disk == _MAX_16:
+            locator_position = end_position - _ZIP64_LOCATOR.size
+            if locator_position < 0:
+                raise ValueError("Не найден указатель ZIP64")
+            signature, _, zip64_offset, _ = _ZIP64_LOCATOR.unpack(
+                tail[locator_position:locator_position + _ZIP64_LOCATOR.size]
+            )
+            if signature != _ZIP64_LOCATOR_SIGNATURE:
+                raise ValueError("Не найден указатель ZIP64")
+            fp.seek(zip64_offset)
+            record = fp.read(_ZIP64_END_RECORD.size)
+            if len(record) < _ZIP64_END_RECORD.size:
+                raise ValueError("Повреждена запись конца каталога ZIP64")
+            (signature, _, _, _, disk, central_disk, _, count,
+             central_size, central_offset) = _ZIP64_END_RECORD.unpack(record)
+            if signature != _ZIP64_END_SIGNATURE:
+                raise ValueError("Повреждена запись конца каталога ZIP64")
+        if disk != 0 or central_disk != 0:
+            raise ValueError("Обновление архивов, разбитых на тома, не поддерживается")
+
+        fp.seek(central_offset)
+        directory = fp.read(central_size)
+        if len(directory) < central_size:
+            raise ValueError("Поврежден центральный каталог")
+        entries: List[ExistingEntry] = []
+        position = 0
+        for _ in range(count):
+            header = directory[position:position + _CENTRAL_HEADER.size]
+            if len(header) < _CENTRAL_HEADER.size:
+                raise ValueError("Поврежден центральный каталог")
+            (signature, _, _, flags, method, dos_time, dos_date, crc, compressed_size, file_size,
+             name_length, extra_length, comment_length, _, _, external_attr,
+             header_offset) = _CENTRAL_HEADER.unpack(header)
+            if signature != _CENTRAL_HEADER_SIGNATURE:
+                raise ValueError("Поврежден центральный каталог")
+            if flags & _FLAG_ENCRYPTED:
+                raise ValueError("Обновление архивов с зашифрованными записями не поддерживается")
+            position += _CENTRAL_HEADER.size
+            raw_name = directory[position:position + name_length]
+            extra = directory[position + name_length:position + name_length + extra_length]
+            position += name_length + extra_length + comment_length
+
+            fields = self._extra_fields(extra)
+            # ZIP64: 64-битные значения идут только для полей, равных 0xFFFFFFFF
+            zip64_data = fields.get(_ZIP64_EXTRA_ID, b'')
+            zip64_values = list(struct.unpack(f'<{len(zip64_data) // 8}Q', zip64_data[:len(zip64_data) // 8 * 8]))
+            needed = (file_size == _MAX_32) + (compressed_size == _MAX_32) + (header_offset == _MAX_32)
+            if len(zip64_values) < needed:
+                raise ValueError("Повреждено расширенное поле ZIP64 записи")
+            if file_size == _MAX_32:
+                file_size = zip64_values.pop(0)
+            if compressed_size == _MAX_32:
+                compressed_size = zip64_values.pop(0)
+            if header_offset == _MAX_32:
+                header_offset = zip64_values.pop(0)
+
+            unicode_data = fields.get(_UNICODE_PATH_EXTRA_ID)
+            name, legacy = self._decode_name(raw_name, flags, unicode_data)
+            entries.append(ExistingEntry(
+                arcname=name,
+                method=method,
+                crc=crc,
+                compressed_size=compressed_size,
+                file_size=file_size,
+                dos_time=dos_time,
+                dos_date=dos_date,
+                mode=(external_attr >> 16) or 0o100644,
+                header_offset=header_offset,
+                fp=fp,
+                raw_name=raw_name,
+                name_flags=flags & _FLAG_UTF8,
+                name_extra=(
+                    struct.pack('<HH', _UNICODE_PATH_EXTRA_ID, len(unicode_data)) + unicode_data
+                    if unicode_data is not None else b''
+                ),
+                legacy_name=legacy,
+            ))
+        return entries
+
+    @staticmethod
+    def _extra_fields(extra: bytes) -> Dict[int, bytes]:
+        """Дополнительные поля записи: идентификатор -> данные."""
+        fields: Dict[int, bytes] = {}
+        position = 0
+        while position + 4 <= len(extra):
+            field_id, size = struct.unpack('<HH', extra[position:position + 4])
+            fields.setdefault(field_id, extra[position + 4:position + 4 + size])
+            position += 4 + size
+        return fields
+
+    @staticmethod
+    def _decode_name(raw_name: bytes, flags: int, unicode_path: Optional[bytes]) -> Tuple[str, bool]:
+        """Имя записи.
+
+        Returns:
+            Tuple[имя, кодировка имени неизвестна]
+        """
+        if flags & _FLAG_UTF8:
+            return raw_name.decode('utf-8', 'replace'), False
+        # Поле Unicode Path действительно, пока CRC совпадает с именем в заголовке
+        if unicode_path is not None and len(unicode_path) > 5 and unicode_path[0] == 1:
+            if struct.unpack('<I', unicode_path[1:5])[0] == zlib.crc32(raw_name):
+                try:
+                    return unicode_path[5:].decode('utf-8'), False
+                except UnicodeDecodeError:
+                    pass
+        if raw_name.isascii():
+            return raw_name.decode('ascii'), False
+        try:
+            return raw_name.decode('utf-8'), True
+        except UnicodeDecodeError:
+            return raw_name.decode('cp437'), True
+
+
+class ZipUpdater:
+    """Обновление ZIP архива с копированием неизмененных записей."""
+
+    def __init__(self, archiver: Optional[ParallelZipArchiver] = None):
+        """Инициализация.
+
+        Args:
+            archiver: Архиватор для новых и измененных файлов
+        """
+        self.archiver = archiver or ParallelZipArchiver()
+        self.removed_count = 0
+
+    def update(
+        self,
+        archive_path: str,
+        entries: Iterable[ArchiveEntry],
+        result_callback: Optional[Callable[[ArchiveEntry, Optional[str]], None]] = None,
+        cancel_check: Optional[Callable[[], bool]] = None,
+        bytes_callback: Optional[Callable[[int], None]] = None,
+        remove_missing: bool = False
+    ) -> bool:
+        """Обновление архива.
+
+        Записи архива, которым не соответствует ни один файл, сохраняются
+        (как zip -u) или удаляются при remove_missing. Сохраненные записи
+        добавляются в конец архива и передаются в result_callback с
+        group, равным archive_path.
+
+        Args:
+            archive_path: Путь к существующему архиву
+            entries: Файлы архива (как для ParallelZipArchiver.archive)
+            result_callback: Функция (запись, ошибка или None);
+                             у скопированных записей entry.reused = True
+            cancel_check: Функция, возвращающая True при отмене
+            bytes_callback: Функция (обработано байт исходных данных)
+            remove_missing: Удалять записи файлов, которых больше нет
+
+        Returns:
+            False, если операция была отменена
+
+        Raises:
+            OSError: Ошибка чтения или записи
+            ValueError: Архив поврежден или не поддерживается
+        """
+        source = ZipSource(archive_path)
+        try:
+            existing: Dict[Union[str, bytes], ExistingEntry] = {entry.key: entry for entry in source.entries}
+            return self.archiver.archive(
+                self._merge(entries, existing, archive_path, remove_missing),
+                archive_path, result_callback, cancel_check,
+                bytes_callback=bytes_callback, finalize=source.close,
+            )
+        finally:
+            source.close()
+
+    def _merge(
+        self,
+        entries: Iterable[ArchiveEntry],
+        existing: Dict[Union[str, bytes], ExistingEntry],
+        archive_path: str,
+        remove_missing: bool
+    ) -> Iterator[ArchiveEntry]:
+        """Сопоставление файлов с записями архива по имени."""
+        self.removed_count = 0
+        for entry in entries:
+            entry.existing = self._pop_existing(existing, entry.arcname.replace(os.sep, '/'))
+            yield entry
+        if remove_missing:
+            self.removed_count = len(existing)
+            return
+        for old in existing.values():
+            yield ArchiveEntry(archive_path, old.arcname, archive_path, existing=old, reused=True)
+
+    @staticmethod
+    def _pop_existing(existing: Dict[Union[str, bytes], ExistingEntry], name: str) -> Optional[ExistingEntry]:
+        """Запись архива для имени файла (с учетом имен в неизвестной кодировке)."""
+        found = existing.pop(name, None)
+        if found is not None or name.isascii():
+            return found
+        for encoding in _LEGACY_NAME_ENCODINGS:
+            try:
+                found = existing.pop(name.encode(encoding), None)
+            except UnicodeEncodeError:
+                continue
+            if found is not None:
+                return found
+        return None
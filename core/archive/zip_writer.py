@@ -0,0 +1,488 @@
+"""Запись ZIP архива.
+
+zipfile не умеет добавлять уже сжатые данные и разбивать архив на
+тома, поэтому заголовки формируются здесь по спецификации PKWARE
+APPNOTE: локальные заголовки, центральный каталог и запись конца
+каталога. Записи добавляются двумя способами:
+
+- заранее сжатые (размеры и CRC известны до записи данных);
+- потоковые: данные сжимаются во время записи, размеры и CRC
+  записываются после данных в дескриптор ZIP64.
+
+При превышении ограничений формата (4 ГБ, 65535 записей) добавляются
+поля и записи ZIP64. Заголовки центрального каталога накапливаются во
+временном файле, поэтому память не зависит от количества записей.
+Архив может писаться в один файл или в тома фиксированного размера
+(name.z01, name.z02, ..., name.zip).
+"""
+
+import os
+import struct
+import sys
+import tempfile
+import time
+import zlib
+from dataclasses import dataclass, field
+from typing import BinaryIO, Callable, List, Optional, Tuple, Union
+
+# Методы сжатия
+ZIP_STORED = 0
+ZIP_DEFLATED = 8
+
+# Сигнатуры записей
+_LOCAL_HEADER_SIGNATURE = 0x04034B50
+_CENTRAL_HEADER_SIGNATURE = 0x02014B50
+_END_SIGNATURE = 0x06054B50
+_ZIP64_END_SIGNATURE = 0x06064B50
+_ZIP64_LOCATOR_SIGNATURE = 0x07064B50
+_DATA_DESCRIPTOR_SIGNATURE = 0x08074B50
+_SPLIT_SIGNATURE = 0x08074B50
+# Архив, подготовленный к разбиению, уместился в один том
+_SINGLE_SEGMENT_SIGNATURE = 0x30304B50
+
+_LOCAL_HEADER = struct.Struct('<IHHHHHIIIHH')
+_CENTRAL_HEADER = struct.Struct('<IHHHHHHIIIHHHHHII')
+_END_RECORD = struct.Struct('<IHHHHIIH')
+_ZIP64_END_RECORD = struct.Struct('<IQHHIIQQQQ')
+_ZIP64_LOCATOR = struct.Struct('<IIQI')
+_ZIP64_DATA_DESCRIPTOR = struct.Struct('<IIQQ')
+
+_ZIP64_EXTRA_ID = 0x0001
+_MAX_32 = 0xFFFFFFFF
+_MAX_16 = 0xFFFF
+
+# Версии формата: 2.0 - DEFLATE, 4.5 - ZIP64
+_VERSION_DEFAULT = 20
+_VERSION_ZIP64 = 45
+
+# Флаги: размеры в дескрипторе после данных; имя в UTF-8
+_FLAG_DATA_DESCRIPTOR = 0x08
+_FLAG_UTF8 = 0x800
+
+# Система, создавшая архив (для трактовки внешних атрибутов)
+_CREATE_SYSTEM = 0 if sys.platform == 'win32' else 3
+
+# Минимальный размер тома (заголовок записи должен помещаться в том целиком)
+MIN_VOLUME_SIZE = 64 * 1024
+
+# Размер блока копирования данных
+_COPY_CHUNK_SIZE = 1024 * 1024
+
+
+def dos_date_time(timestamp: float) -> Tuple[int, int]:
+    """Дата и время в формате MS-DOS.
+
+    Args:
+        timestamp: Время в секундах от эпохи
+
+    Returns:
+        Tuple[время, дата]
+    """
+    t = time.localtime(timestamp)
+    if t.tm_year < 1980:
+        return 0, (1 << 5) | 1  # 1980-01-01 00:00
+    if t.tm_year > 2107:
+        return (23 << 11) | (59 << 5) | 29, (127 << 9) | (12 << 5) | 31
+    dos_time = (t.tm_hour << 11) | (t.tm_min << 5) | (t.tm_sec // 2)
+    dos_date = ((t.tm_year - 1980) << 9) | (t.tm_mon << 5) | t.tm_mday
+    return dos_time, dos_date
+
+
+def volume_paths(output_path: str, count: int) -> List[str]:
+    """Имена томов разбитого архива: name.z01, ..., name.zip.
+
+    Args:
+        output_path: Путь к архиву (последний том)
+        count: Количество томов
+
+    Returns:
+        Пути томов по порядку
+    """
+    base = os.path.splitext(output_path)[0]
+    return [f"{base}.z{index + 1:02d}" for index in range(count - 1)] + [output_path]
+
+
+@dataclass
+class CompressedEntry:
+    """Запись архива с уже сжатыми данными."""
+    arcname: str
+    method: int
+    crc: int
+    compressed_size: int
+    file_size: int
+    mtime: float
+    mode: int = 0o100644
+    data: Optional[BinaryIO] = None  # Сжатые данные (поток закрывается после записи)
+    # Имя в исходном виде для записей, скопированных из другого архива
+    # (None - имя кодируется из arcname)
+    raw_name: Optional[bytes] = None
+    name_flags: int = 0  # Флаг UTF-8 для raw_name
+    name_extra: bytes = b''  # Дополнительные поля имени (Unicode Path)
+    disk: int = field(default=0, init=False)  # Том локального заголовка
+    offset: int = field(default=0, init=False)  # Смещение локального заголовка в томе
+
+    def close(self) -> None:
+        """Освобождение временных данных."""
+        if self.data is not None:
+            self.data.close()
+            self.data = None
+
+
+class ArchiveOutput:
+    """Вывод архива в один поток."""
+
+    def __init__(self, fileobj: BinaryIO):
+        """Инициализация.
+
+        Args:
+            fileobj: Поток для записи (позиция - начало архива)
+        """
+        self.fp = fileobj
+        self.disk = 0
+        self.offset = 0
+        self.bytes_written = 0
+
+    def write(self, data: bytes) -> None:
+        """Запись данных."""
+        self.fp.write(data)
+        self.offset += len(data)
+        self.bytes_written += len(data)
+
+    def ensure_room(self, size: int) -> None:
+        """Гарантия, что запись размера size поместится в текущий том."""
+
+    @property
+    def disk_count(self) -> int:
+        """Количество томов."""
+        return self.disk + 1
+
+    def finish(self) -> None:
+        """Завершение записи."""
+        self.fp.flush()
+
+    def abort(self) -> None:
+        """Прерывание записи."""
+
+
+class SplitArchiveOutput(ArchiveOutput):
+    """Вывод архива в тома фиксированного размера."""
+
+    def __init__(self, output_path: str, volume_size: int):
+        """Инициализация.
+
+        Args:
+            output_path: Путь к архиву (имя последнего тома)
+            volume_size: Максимальный размер тома в байтах
+        """
+        if volume_size < MIN_VOLUME_SIZE:
+            raise ValueError(f"Размер тома меньше {MIN_VOLUME_SIZE} байт")
+        self.output_path = output_path
+        self.volume_size = volume_size
+        self.paths: List[str] = []
+        super().__init__(self._open_volume(0))
+        # Первый том начинается с сигнатуры разбитого архива
+        self.write(struct.pack('<I', _SPLIT_SIGNATURE))
+
+    def _open_volume(self, index: int) -> BinaryIO:
+        """Открытие тома (до завершения тома называются name.zNN)."""
+        path = volume_paths(self.output_path, index + 2)[index]
+        self.paths.append(path)
+        return open(path, 'wb')
+
+    def _next_volume(self) -> None:
+        """Переход к следующему тому."""
+        self.fp.close()
+        self.disk += 1
+        self.offset = 0
+        self.fp = self._open_volume(self.disk)
+
+    def write(self, data: bytes) -> None:
+        """Запись данных с переходом между томами."""
+        view = memoryview(data)
+        while view:
+            room = self.volume_size - self.offset
+            if room <= 0:
+                self._next_volume()
+                continue
+            part = view[:room]
+            self.fp.write(part)
+            self.offset += len(part)
+            self.bytes_written += len(part)
+            view = view[len(part):]
+
+    def ensure_room(self, size: int) -> None:
+        """Заголовки не разрываются между томами."""
+        if self.offset and self.offset + size > self.volume_size:
+            self._next_volume()
+
+    def finish(self) -> None:
+        """Закрытие последнего тома и переименование в name.zip."""
+        if self.disk == 0:
+            # Архив уместился в один том - отмечаем его как обычный
+            self.fp.seek(0)
+            self.fp.write(struct.pack('<I', _SINGLE_SEGMENT_SIGNATURE))
+        self.fp.close()
+        os.replace(self.paths[-1], self.output_path)
+        self.paths[-1] = self.output_path
+
+    def abort(self) -> None:
+        """Удаление записанных томов."""
+        try:
+            self.fp.close()
+        except OSError:
+            pass
+        for path in self.paths:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+class ZipWriter:
+    """Последовательная запись записей и центрального каталога ZIP."""
+
+    def __init__(self, output: Union[ArchiveOutput, BinaryIO]):
+        """Инициализация.
+
+        Args:
+            output: Вывод архива или поток для записи в один файл
+        """
+        self.output = output if isinstance(output, ArchiveOutput) else ArchiveOutput(output)
+        self.count = 0
+        self.closed = False
+        # Заголовки центрального каталога: (том, смещение в томе) известны при записи
+        self._central = tempfile.SpooledTemporaryFile(max_size=1024 * 1024)
+        self._central_records: List[int] = []  # Размеры заголовков (для разбиения по томам)
+
+    @property
+    def position(self) -> int:
+        """Объем записанных данных."""
+        return self.output.bytes_written
+
+    def write_entry(self, entry: CompressedEntry) -> None:
+        """Добавление заранее сжатой записи (поток entry.data закрывается).
+
+        Args:
+            entry: Сжатая запись
+        """
+        zip64 = entry.file_size >= _MAX_32 or entry.compressed_size >= _MAX_32
+        extra = b''
+        if zip64:
+            extra = struct.pack('<HHQQ', _ZIP64_EXTRA_ID, 16, entry.file_size, entry.compressed_size)
+        self._write_local_header(
+            entry, 0, entry.crc,
+            _MAX_32 if zip64 else entry.compressed_size,
+            _MAX_32 if zip64 else entry.file_size,
+            extra, zip64,
+        )
+        if entry.data is not None:
+            entry.data.seek(0)
+            while True:
+                chunk = entry.data.read(_COPY_CHUNK_SIZE)
+                if not chunk:
+                    break
+                self.output.write(chunk)
+            entry.close()
+        self._add_central_header(entry)
+
+    def write_stream(
+        self,
+        arcname: str,
+        source: BinaryIO,
+        method: int,
+        compression_level: int,
+        mtime: float,
+        mode: int = 0o100644,
+        first_chunk: bytes = b'',
+        progress_callback: Optional[Callable[[int], None]] = None,
+        cancel_check: Optional[Callable[[], bool]] = None
+    ) -> Optional[CompressedEntry]:
+        """Потоковая запись: данные сжимаются во время записи в архив.
+
+        Размеры и CRC записываются после данных в дескриптор ZIP64,
+        поэтому файл читается один раз и не копируется во временный файл.
+
+        Args:
+            arcname: Имя в архиве
+            source: Поток исходных данных (читается с текущей позиции)
+            method: ZIP_STORED или ZIP_DEFLATED
+            compression_level: Уровень сжатия
+            mtime: Время изменения
+            mode: Права доступа
+            first_chunk: Уже прочитанное начало данных
+            progress_callback: Функция (прочитано байт исходных данных)
+            cancel_check: Функция, возвращающая True при отмене
+
+        Returns:
+            Запись или None при отмене (архив после отмены не завершается)
+        """
+        entry = CompressedEntry(arcname, method, 0, 0, 0, mtime, mode)
+        # Размеры неизвестны: нули в заголовке, поле ZIP64 резервирует 64-битные размеры
+        extra = struct.pack('<HHQQ', _ZIP64_EXTRA_ID, 16, 0, 0)
+        self._write_local_header(entry, _FLAG_DATA_DESCRIPTOR, 0, 0, 0, extra, True)
+
+        compressor = zlib.compressobj(compression_level, zlib.DEFLATED, -15) if method == ZIP_DEFLATED else None
+        crc = 0
+        file_size = 0
+        compressed_size = 0
+        chunk = first_chunk or source.read(_COPY_CHUNK_SIZE)
+        while chunk:
+            if cancel_check and cancel_check():
+                return None
+            file_size += len(chunk)
+            crc = zlib.crc32(chunk, crc)
+            data = compressor.compress(chunk) if compressor else chunk
+            if data:
+                self.output.write(data)
+                compressed_size += len(data)
+            if progress_callback:
+                progress_callback(file_size)
+            chunk = source.read(_COPY_CHUNK_SIZE)
+        if compressor:
+            data = compressor.flush()
+            self.output.write(data)
+            compressed_size += len(data)
+
+        entry.crc = crc
+        entry.file_size = file_size
+        entry.compressed_size = compressed_size
+        self.output.ensure_room(_ZIP64_DATA_DESCRIPTOR.size)
+        self.output.write(_ZIP64_DATA_DESCRIPTOR.pack(
+            _DATA_DESCRIPTOR_SIGNATURE, crc, compressed_size, file_size
+        ))
+        self._add_central_header(entry, _FLAG_DATA_DESCRIPTOR)
+        return entry
+
+    def close(self) -> None:
+        """Запись центрального каталога и конца архива."""
+        if self.closed:
+            return
+        self.closed = True
+        output = self.output
+
+        central_disk = central_offset = None
+        record_disks: List[int] = []
+        central_size = 0
+        self._central.seek(0)
+        for record_size in self._central_records:
+            output.ensure_room(record_size)
+            if central_disk is None:
+                central_disk, central_offset = output.disk, output.offset
+            record_disks.append(output.disk)
+            output.write(self._central.read(record_size))
+            central_size += record_size
+        self._central.close()
+        if central_disk is None:
+            central_disk, central_offset = output.disk, output.offset
+        count = self.count
+
+        output.ensure_room(_ZIP64_END_RECORD.size + _ZIP64_LOCATOR.size + _END_RECORD.size)
+        entries_on_last_disk = record_disks.count(output.disk)
+        disks = output.disk_count
+        if (count >= _MAX_16 or central_offset >= _MAX_32 or central_size >= _MAX_32
+                or disks > _MAX_16):
+            zip64_end_disk, zip64_end_offset = output.disk, output.offset
+            output.write(_ZIP64_END_RECORD.pack(
+                _ZIP64_END_SIGNATURE, _ZIP64_END_RECORD.size - 12,
+                (_CREATE_SYSTEM << 8) | _VERSION_ZIP64, _VERSION_ZIP64,
+                output.disk, central_disk, entries_on_last_disk, count, central_size, central_offset,
+            ))
+            output.write(_ZIP64_LOCATOR.pack(_ZIP64_LOCATOR_SIGNATURE, zip64_end_disk, zip64_end_offset, disks))
+        output.write(_END_RECORD.pack(
+            _END_SIGNATURE,
+            min(output.disk, _MAX_16), min(central_disk, _MAX_16),
+            min(entries_on_last_disk, _MAX_16), min(count, _MAX_16),
+            min(central_size, _MAX_32), min(central_offset, _MAX_32), 0,
+        ))
+        output.finish()
+
+    def abort(self) -> None:
+        """Прерывание записи без каталога."""
+        self.closed = True
+        self._central.close()
+        self.output.abort()
+
+    def _write_local_header(
+        self,
+        entry: CompressedEntry,
+        flags: int,
+        crc: int,
+        compressed_size: int,
+        file_size: int,
+        extra: bytes,
+        zip64: bool
+    ) -> None:
+        """Запись локального заголовка (заголовок не разрывается между томами)."""
+        name, flags = self._encode_name(entry, flags)
+        extra += entry.name_extra
+        dos_time, dos_date = dos_date_time(entry.mtime)
+        header = _LOCAL_HEADER.pack(
+            _LOCAL_HEADER_SIGNATURE,
+            _VERSION_ZIP64 if zip64 else _VERSION_DEFAULT,
+            flags,
+            entry.method,
+            dos_time,
+            dos_date,
+            crc,
+            compressed_size,
+            file_size,
+            len(name),
+            len(extra),
+        ) + name + extra
+        self.output.ensure_room(len(header))
+        entry.disk = self.output.disk
+        entry.offset = self.output.offset
+        self.output.write(header)
+
+    def _add_central_header(self, entry: CompressedEntry, flags: int = 0) -> None:
+        """Формирование заголовка центрального каталога для записи."""
+        name, flags = self._encode_name(entry, flags)
+        zip64_fields = []
+        file_size, compressed_size, offset, disk = entry.file_size, entry.compressed_size, entry.offset, entry.disk
+        if file_size >= _MAX_32:
+            zip64_fields.append(file_size)
+            file_size = _MAX_32
+        if compressed_size >= _MAX_32:
+            zip64_fields.append(compressed_size)
+            compressed_size = _MAX_32
+        if offset >= _MAX_32:
+            zip64_fields.append(offset)
+            offset = _MAX_32
+        extra = b''
+        if zip64_fields:
+            extra = struct.pack(f'<HH{len(zip64_fields)}Q', _ZIP64_EXTRA_ID, 8 * len(zip64_fields), *zip64_fields)
+        extra += entry.name_extra
+        version = _VERSION_ZIP64 if zip64_fields or flags & _FLAG_DATA_DESCRIPTOR else _VERSION_DEFAULT
+        dos_time, dos_date = dos_date_time(entry.mtime)
+
+        record = _CENTRAL_HEADER.pack(
+            _CENTRAL_HEADER_SIGNATURE,
+            (_CREATE_SYSTEM << 8) | version,
+            version,
+            flags,
+            entry.method,
+            dos_time,
+            dos_date,
+            entry.crc,
+            compressed_size,
+            file_size,
+            len(name),
+            len(extra),
+            0,  # длина комментария
+            min(disk, _MAX_16),
+            0,  # внутренние атрибуты
+            (entry.mode & 0xFFFF) << 16,
+            offset,
+        ) + name + extra
+        self._central.write(record)
+        self._central_records.append(len(record))
+        self.count += 1
+
+    @staticmethod
+    def _encode_name(entry: CompressedEntry, flags: int) -> Tuple[bytes, int]:
+        """Байты имени записи и флаги с учетом кодировки имени."""
+        if entry.raw_name is not None:
+            return entry.raw_name, flags | entry.name_flags
+        if not entry.arcname.isascii():
+            flags |= _FLAG_UTF8
+        return entry.arcname.replace(os.sep, '/').encode('utf-8'), flags
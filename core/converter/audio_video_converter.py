@@ -129,6 +129,44 @@ def check_ffmpeg_installed() -> bool:
         return False
 
 
+def get_ffmpeg_version() -> Optional[str]:
+    """Получение версии ffmpeg (локальной или системной).
+
+    Выполняет один запуск `ffmpeg -version` и разбирает первую строку вывода.
+
+    Returns:
+        Строка версии (например '6.1.1') или None если ffmpeg недоступен
+    """
+    candidates = []
+    local_ffmpeg = get_ffmpeg_path()
+    if local_ffmpeg:
+        candidates.append(local_ffmpeg)
+    candidates.append('ffmpeg')
+
+    for executable in candidates:
+        try:
+            result = subprocess.run(
+                [executable, '-version'],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                timeout=5
+            )
+        except (FileNotFoundError, subprocess.TimeoutExpired):
+            continue
+        except (OSError, ValueError, subprocess.SubprocessError) as e:
+            logger.debug(f"Ошибка получения версии ffmpeg ({executable}): {e}")
+            continue
+        if result.returncode != 0:
+            continue
+        first_line = result.stdout.decode('utf-8', errors='replace').splitlines()
+        # Формат: "ffmpeg version 6.1.1 Copyright (c) ..."
+        parts = first_line[0].split() if first_line else []
+        if len(parts) >= 3 and parts[1] == 'version':
+            return parts[2]
+        return 'unknown'
+    return None
+
+
 def convert_audio_video(
     file_path: str,
     output_path: str,
@@ -0,0 +1,198 @@
+"""Реестр бэкендов конвертации с отложенной загрузкой.
+
+Библиотеки конвертации (Pillow, PyMuPDF, pdf2docx, docx2pdf, python-docx,
+COM-модули) импортируются только при первом обращении к ним, а не при
+создании FileConverter. Время импорта каждого бэкенда сохраняется
+для диагностики.
+"""
+
+import logging
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+_NOT_LOADED = object()
+
+
+def _load_pillow() -> Any:
+    from PIL import Image
+    return Image
+
+
+def _load_pymupdf() -> Any:
+    import fitz  # PyMuPDF
+    return fitz
+
+
+def _load_pdf2docx() -> Any:
+    from pdf2docx import Converter
+    return Converter
+
+
+def _load_docx2pdf() -> Any:
+    from docx2pdf import convert as docx2pdf_convert
+    return docx2pdf_convert
+
+
+def _load_python_docx() -> Any:
+    import docx
+    return docx
+
+
+def _load_win32com() -> Any:
+    import win32com.client
+    return win32com.client
+
+
+def _load_comtypes() -> Any:
+    import comtypes.client
+    return comtypes.client
+
+
+def _load_pythoncom() -> Any:
+    import pythoncom
+    return pythoncom
+
+
+# Загрузчики по умолчанию: имя бэкенда -> (функция загрузки, только для Windows)
+DEFAULT_LOADERS: Dict[str, tuple] = {
+    'pillow': (_load_pillow, False),
+    'pymupdf': (_load_pymupdf, False),
+    'pdf2docx': (_load_pdf2docx, False),
+    'docx2pdf': (_load_docx2pdf, False),
+    'python-docx': (_load_python_docx, False),
+    'win32com': (_load_win32com, True),
+    'comtypes': (_load_comtypes, True),
+    'pythoncom': (_load_pythoncom, True),
+}
+
+
+class BackendRegistry:
+    """Реестр бэкендов с отложенным импортом.
+
+    Каждый бэкенд загружается не более одного раза; результат
+    (модуль, класс или функция) или его отсутствие (None) кешируется.
+    """
+
+    def __init__(self, loaders: Optional[Dict[str, tuple]] = None):
+        """Инициализация реестра.
+
+        Args:
+            loaders: Словарь имя -> (функция загрузки, только для Windows).
+                     По умолчанию DEFAULT_LOADERS.
+        """
+        self._loaders: Dict[str, tuple] = dict(DEFAULT_LOADERS if loaders is None else loaders)
+        self._loaded: Dict[str, Any] = {}
+        self._errors: Dict[str, str] = {}
+        self.import_times: Dict[str, float] = {}
+        self._failure_callbacks: List[Callable[[str, str], None]] = []
+        self._lock = threading.Lock()
+
+    def register(self, name: str, loader: Callable[[], Any], windows_only: bool = False) -> None:
+        """Регистрация (или замена) загрузчика бэкенда.
+
+        Args:
+            name: Имя бэкенда
+            loader: Функция без аргументов, возвращающая объект бэкенда
+            windows_only: Загружать только на Windows
+        """
+        with self._lock:
+            self._loaders[name] = (loader, windows_only)
+            self._loaded.pop(name, None)
+            self._errors.pop(name, None)
+
+    def on_failure(self, callback: Callable[[str, str], None]) -> None:
+        """Подписка на ошибки загрузки бэкендов.
+
+        Args:
+            callback: Функция (имя бэкенда, сообщение об ошибке)
+        """
+        self._failure_callbacks.append(callback)
+
+    def get(self, name: str) -> Optional[Any]:
+        """Получение бэкенда (импорт при первом обращении).
+
+        Args:
+            name: Имя бэкенда
+
+        Returns:
+            Объект бэкенда или None если он недоступен
+        """
+        value = self._loaded.get(name, _NOT_LOADED)
+        if value is not _NOT_LOADED:
+            return value
+
+        with self._lock:
+            value = self._loaded.get(name, _NOT_LOADED)
+            if value is not _NOT_LOADED:
+                return value
+            value, error = self._load(name)
+            self._loaded[name] = value
+
+        if error is not None:
+            for callback in self._failure_callbacks:
+                try:
+                    callback(name, error)
+                except Exception as e:
+                    logger.debug(f"Ошибка обработчика загрузки бэкенда {name}: {e}")
+        return value
+
+    def is_loaded(self, name: str) -> bool:
+        """Был ли бэкенд уже загружен (или признан недоступным)."""
+        return name in self._loaded
+
+    def loaded_names(self) -> List[str]:
+        """Список бэкендов, к которым уже обращались."""
+        return list(self._loaded)
+
+    def dump(self) -> Dict[str, Any]:
+        """Снимок состояния для диагностики.
+
+        Returns:
+            Словарь имя -> {loaded, available, import_time, error}
+        """
+        result = {}
+        for name in self._loaders:
+            loaded = name in self._loaded
+            result[name] = {
+                'loaded': loaded,
+                'available': loaded and self._loaded[name] is not None,
+                'import_time': round(self.import_times[name], 4) if name in self.import_times else None,
+                'error': self._errors.get(name),
+            }
+        return result
+
+    def _load(self, name: str) -> tuple:
+        """Импорт бэкенда с замером времени.
+
+        Returns:
+            Кортеж (объект бэкенда или None, сообщение об ошибке или None)
+        """
+        if name not in self._loaders:
+            return None, f"Неизвестный бэкенд: {name}"
+
+        loader, windows_only = self._loaders[name]
+        if windows_only and sys.platform != 'win32':
+            return None, None
+
+        start = time.perf_counter()
+        error = None
+        try:
+            value = loader()
+        except ImportError as e:
+            value, error = None, str(e)
+        except (OSError, RuntimeError, AttributeError) as e:
+            # Сломанная установка или отсутствующие системные библиотеки
+            value, error = None, str(e)
+        elapsed = time.perf_counter() - start
+        self.import_times[name] = elapsed
+
+        if error is not None:
+            self._errors[name] = error
+            logger.debug(f"Бэкенд {name} недоступен ({elapsed:.3f} с): {error}")
+        else:
+            logger.debug(f"Бэкенд {name} загружен за {elapsed:.3f} с")
+        return value, error
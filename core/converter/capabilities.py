@@ -0,0 +1,387 @@
+"""Реестр возможностей конвертера.
+
+Проверяет доступность бэкендов конвертации (Pillow, PyMuPDF, pdf2docx,
+Microsoft Word, ffmpeg, LibreOffice и др.) один раз и строит таблицу
+поддерживаемых пар форматов. После проверки вопрос "можно ли конвертировать
+.X в .Y" решается поиском в словаре без обращения к файловой системе
+и без запуска внешних процессов.
+"""
+
+import importlib.util
+import json
+import logging
+import sys
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Python-бэкенды: имя -> (имя модуля для импорта, имя дистрибутива для версии)
+PYTHON_BACKENDS: Dict[str, Tuple[str, str]] = {
+    'pillow': ('PIL', 'Pillow'),
+    'pymupdf': ('fitz', 'PyMuPDF'),
+    'pdf2docx': ('pdf2docx', 'pdf2docx'),
+    'docx2pdf': ('docx2pdf', 'docx2pdf'),
+    'python-docx': ('docx', 'python-docx'),
+}
+
+# COM-бэкенды доступны только на Windows
+COM_BACKENDS: Dict[str, Tuple[str, str]] = {
+    'win32com': ('win32com', 'pywin32'),
+    'comtypes': ('comtypes', 'comtypes'),
+}
+
+# Целевые форматы ODT, для которых есть fallback без Office
+ODT_FALLBACK_TARGETS = frozenset({'.txt', '.html', '.htm', '.docx'})
+ODT_WORD_TARGETS = frozenset({'.pdf', '.doc', '.rtf', '.docx', '.txt', '.html', '.htm'})
+
+
+@dataclass
+class BackendInfo:
+    """Информация о бэкенде конвертации."""
+    name: str
+    available: bool
+    version: Optional[str] = None
+    detail: Optional[str] = None
+
+
+def _probe_python_backend(name: str, module_name: str, dist_name: str) -> BackendInfo:
+    """Проверка наличия Python-пакета без его импорта.
+
+    Args:
+        name: Имя бэкенда
+        module_name: Имя модуля для импорта
+        dist_name: Имя дистрибутива (для определения версии)
+
+    Returns:
+        Информация о бэкенде
+    """
+    try:
+        spec = importlib.util.find_spec(module_name)
+    except (ImportError, ValueError) as e:
+        return BackendInfo(name, False, detail=str(e))
+    if spec is None:
+        return BackendInfo(name, False, detail=f"Модуль {module_name} не найден")
+
+    version = None
+    try:
+        from importlib.metadata import PackageNotFoundError, version as dist_version
+        try:
+            version = dist_version(dist_name)
+        except PackageNotFoundError:
+            pass
+    except ImportError:
+        pass
+    return BackendInfo(name, True, version=version)
+
+
+class ConverterCapabilities:
+    """Реестр возможностей конвертера.
+
+    Хранит сведения о доступных бэкендах, их версиях и таблицу
+    поддерживаемых пар (исходный формат -> целевые форматы).
+    Проверка выполняется один раз (синхронно при первом обращении
+    или в фоне через refresh_async) и может периодически повторяться
+    в фоновом потоке.
+    """
+
+    def __init__(self, format_validator: Any, check_word_installed: Optional[Callable[[], Tuple[bool, str]]] = None):
+        """Инициализация реестра.
+
+        Args:
+            format_validator: Объект с таблицами поддерживаемых форматов (FormatValidator)
+            check_word_installed: Функция проверки установки Word
+        """
+        self.formats = format_validator
+        self.check_word_installed = check_word_installed
+        self.backends: Dict[str, BackendInfo] = {}
+        self.pairs: Dict[str, FrozenSet[str]] = {}
+        self.probed_at: Optional[float] = None
+        self.probe_duration: float = 0.0
+        self._lock = threading.RLock()
+        self._refresh_thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+
+    @property
+    def is_probed(self) -> bool:
+        """Выполнена ли проверка бэкендов."""
+        return self.probed_at is not None
+
+    def probe(self) -> None:
+        """Проверка всех бэкендов и перестроение таблицы пар форматов.
+
+        Новые данные подменяют старые целиком, поэтому параллельные
+        поиски в таблице всегда видят согласованное состояние.
+        """
+        with self._lock:
+            start = time.perf_counter()
+            backends = self._probe_backends()
+            pairs = self._build_pairs(backends)
+            self.backends = backends
+            self.pairs = pairs
+            self.probe_duration = time.perf_counter() - start
+            self.probed_at = time.time()
+        logger.info(
+            f"Возможности конвертера проверены за {self.probe_duration:.3f} с: "
+            f"{', '.join(name for name, info in backends.items() if info.available) or 'нет бэкендов'}"
+        )
+
+    def ensure_probed(self) -> None:
+        """Выполнение проверки, если она еще не выполнялась."""
+        if self.is_probed:
+            return
+        with self._lock:
+            if not self.is_probed:
+                self.probe()
+
+    def refresh_async(self) -> threading.Thread:
+        """Однократная проверка бэкендов в фоновом потоке.
+
+        Returns:
+            Запущенный поток
+        """
+        thread = threading.Thread(target=self._safe_probe, name="ConverterCapabilitiesProbe", daemon=True)
+        thread.start()
+        return thread
+
+    def start_background_refresh(self, interval: float) -> None:
+        """Запуск периодической фоновой перепроверки бэкендов.
+
+        Args:
+            interval: Интервал между проверками (секунды)
+        """
+        if self._refresh_thread is not None and self._refresh_thread.is_alive():
+            return
+        self._stop_event.clear()
+
+        def _loop():
+            self._safe_probe()
+            while not self._stop_event.wait(interval):
+                self._safe_probe()
+
+        self._refresh_thread = threading.Thread(target=_loop, name="ConverterCapabilitiesRefresh", daemon=True)
+        self._refresh_thread.start()
+
+    def stop_background_refresh(self) -> None:
+        """Остановка периодической перепроверки."""
+        self._stop_event.set()
+        if self._refresh_thread is not None:
+            self._refresh_thread.join(timeout=5)
+            self._refresh_thread = None
+
+    def mark_unavailable(self, backend_name: str, detail: Optional[str] = None) -> None:
+        """Пометка бэкенда как недоступного и перестроение таблицы пар.
+
+        Используется, когда пакет найден при проверке, но не смог
+        импортироваться при фактическом использовании.
+
+        Args:
+            backend_name: Имя бэкенда
+            detail: Причина недоступности
+        """
+        with self._lock:
+            if backend_name not in self.backends:
+                return
+            backends = dict(self.backends)
+            backends[backend_name] = BackendInfo(backend_name, False, backends[backend_name].version, detail)
+            self.pairs = self._build_pairs(backends)
+            self.backends = backends
+        logger.warning(f"Бэкенд конвертера {backend_name} недоступен: {detail}")
+
+    def supports(self, source_ext: str, target_ext: str) -> bool:
+        """Проверка поддержки пары форматов.
+
+        Args:
+            source_ext: Исходное расширение (с точкой)
+            target_ext: Целевое расширение (с точкой)
+
+        Returns:
+            True если конвертация поддерживается
+        """
+        self.ensure_probed()
+        return target_ext.lower() in self.pairs.get(source_ext.lower(), ())
+
+    def targets_for(self, source_ext: str) -> List[str]:
+        """Получение отсортированного списка целевых форматов.
+
+        Args:
+            source_ext: Исходное расширение (с точкой)
+
+        Returns:
+            Список целевых расширений
+        """
+        self.ensure_probed()
+        return sorted(self.pairs.get(source_ext.lower(), ()))
+
+    def is_available(self, backend_name: str) -> bool:
+        """Проверка доступности бэкенда по имени."""
+        self.ensure_probed()
+        info = self.backends.get(backend_name)
+        return bool(info and info.available)
+
+    def dump(self) -> Dict[str, Any]:
+        """Снимок реестра для диагностики.
+
+        Returns:
+            Словарь с бэкендами, версиями и парами форматов
+        """
+        return {
+            'platform': sys.platform,
+            'probed_at': self.probed_at,
+            'probe_duration': round(self.probe_duration, 4),
+            'backends': {name: asdict(info) for name, info in self.backends.items()},
+            'pairs': {source: sorted(targets) for source, targets in sorted(self.pairs.items())},
+        }
+
+    def dump_json(self, file_path: Optional[str] = None) -> str:
+        """Сериализация снимка реестра в JSON.
+
+        Args:
+            file_path: Путь для сохранения (если None, только возвращает строку)
+
+        Returns:
+            JSON строка
+        """
+        data = json.dumps(self.dump(), ensure_ascii=False, indent=2)
+        if file_path:
+            with open(file_path, 'w', encoding='utf-8') as f:
+                f.write(data)
+        return data
+
+    def _safe_probe(self) -> None:
+        """Проверка бэкендов с перехватом ошибок (для фоновых потоков)."""
+        try:
+            self.probe()
+        except Exception as e:
+            logger.warning(f"Ошибка при проверке возможностей конвертера: {e}", exc_info=True)
+
+    def _probe_backends(self) -> Dict[str, BackendInfo]:
+        """Проверка всех бэкендов.
+
+        Returns:
+            Словарь имя -> информация о бэкенде
+        """
+        backends: Dict[str, BackendInfo] = {}
+        for name, (module_name, dist_name) in PYTHON_BACKENDS.items():
+            backends[name] = _probe_python_backend(name, module_name, dist_name)
+
+        if sys.platform == 'win32':
+            for name, (module_name, dist_name) in COM_BACKENDS.items():
+                backends[name] = _probe_python_backend(name, module_name, dist_name)
+        else:
+            for name in COM_BACKENDS:
+                backends[name] = BackendInfo(name, False, detail="Доступно только на Windows")
+
+        backends['word'] = self._probe_word(backends)
+        backends['ffmpeg'] = self._probe_ffmpeg()
+        backends['libreoffice'] = self._probe_libreoffice()
+        return backends
+
+    def _probe_word(self, backends: Dict[str, BackendInfo]) -> BackendInfo:
+        """Проверка Microsoft Word (только при наличии COM-клиента)."""
+        has_com = backends['win32com'].available or backends['comtypes'].available
+        if not has_com or self.check_word_installed is None:
+            return BackendInfo('word', False, detail="COM клиент недоступен")
+        try:
+            installed, message = self.check_word_installed()
+        except (OSError, RuntimeError, AttributeError) as e:
+            return BackendInfo('word', False, detail=str(e))
+        return BackendInfo('word', bool(installed), detail=message)
+
+    def _probe_ffmpeg(self) -> BackendInfo:
+        """Проверка ffmpeg (один запуск процесса)."""
+        try:
+            from core.converter.audio_video_converter import get_ffmpeg_path, get_ffmpeg_version
+        except ImportError as e:
+            return BackendInfo('ffmpeg', False, detail=str(e))
+        version = get_ffmpeg_version()
+        if version is None:
+            return BackendInfo('ffmpeg', False, detail="ffmpeg не найден")
+        return BackendInfo('ffmpeg', True, version=version, detail=get_ffmpeg_path() or 'PATH')
+
+    def _probe_libreoffice(self) -> BackendInfo:
+        """Проверка LibreOffice (поиск soffice без запуска)."""
+        try:
+            from core.converter.libreoffice_converter import _find_libreoffice_path
+        except ImportError as e:
+            return BackendInfo('libreoffice', False, detail=str(e))
+        soffice_path = _find_libreoffice_path()
+        return BackendInfo('libreoffice', soffice_path is not None, detail=soffice_path)
+
+    def _build_pairs(self, backends: Dict[str, BackendInfo]) -> Dict[str, FrozenSet[str]]:
+        """Построение таблицы поддерживаемых пар форматов.
+
+        Правила повторяют прежнюю логику FormatValidator.can_convert,
+        но вычисляются один раз по результатам проверки бэкендов.
+
+        Args:
+            backends: Результаты проверки бэкендов
+
+        Returns:
+            Словарь исходное расширение -> множество целевых расширений
+        """
+        def has(name: str) -> bool:
+            info = backends.get(name)
+            return bool(info and info.available)
+
+        f = self.formats
+        word_ok = has('word')
+        pairs: Dict[str, set] = {}
+
+        def add(source: str, target: str) -> None:
+            if source != target:
+                pairs.setdefault(source, set()).add(target)
+
+        # Изображения (через Pillow, в PDF через PyMuPDF)
+        for source in f.supported_image_formats:
+            if has('pillow'):
+                for target in f.supported_image_formats:
+                    add(source, target)
+                if has('pymupdf'):
+                    add(source, '.pdf')
+
+        # Документы Word
+        for source in f.supported_document_formats:
+            if source in f.supported_image_formats:
+                # Изображения уже обработаны выше
+                continue
+            if source == '.pdf' and has('pymupdf') and has('pillow'):
+                # PDF в изображения (растеризация через PyMuPDF)
+                for target in f.supported_image_formats:
+                    add(source, target)
+            if source == '.odt':
+                targets = ODT_WORD_TARGETS if word_ok else ODT_FALLBACK_TARGETS
+                for target in targets:
+                    add(source, target)
+                continue
+            for target in f.supported_document_target_formats:
+                if source == '.docx' and target == '.pdf':
+                    supported = word_ok or has('docx2pdf')
+                elif source == '.doc' and target == '.pdf':
+                    supported = word_ok
+                elif source == '.pdf' and target == '.docx':
+                    supported = has('pdf2docx')
+                elif source in ('.docx', '.doc') and target in ('.odt', '.odp'):
+                    supported = target == '.odt' and word_ok
+                else:
+                    supported = has('python-docx')
+                if supported:
+                    add(source, target)
+
+        # Презентации (LibreOffice или PowerPoint COM, проверяются при конвертации)
+        for source in f.supported_presentation_formats:
+            for target in f.supported_presentation_target_formats:
+                add(source, target)
+
+        # Аудио и видео (через ffmpeg)
+        if has('ffmpeg'):
+            for source in f.supported_audio_formats:
+                for target in f.supported_audio_target_formats:
+                    add(source, target)
+            for source in f.supported_video_formats:
+                for target in f.supported_video_target_formats:
+                    add(source, target)
+
+        return {source: frozenset(targets) for source, targets in pairs.items()}
@@ -0,0 +1,315 @@
+"""Пул долгоживущих COM сессий Word/PowerPoint.
+
+Запуск Word.Application или PowerPoint.Application занимает секунды,
+поэтому при пакетной конвертации один экземпляр приложения переиспользуется
+в пределах рабочего потока (COM объекты привязаны к апартаменту потока).
+Экземпляр пересоздается после заданного количества документов, после
+ошибки конвертации или если приложение перестало отвечать.
+
+Все обращения к COM выполняются через ComAppFactory, поэтому логику пула
+можно проверить на любой платформе с подставной фабрикой.
+"""
+
+import logging
+import sys
+import threading
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+try:
+    from config.constants import COM_SESSION_MAX_DOCUMENTS
+except ImportError:
+    COM_SESSION_MAX_DOCUMENTS = 50
+
+WORD_PROG_ID = 'Word.Application'
+POWERPOINT_PROG_ID = 'PowerPoint.Application'
+
+
+class ComAppFactory(ABC):
+    """Интерфейс создания и закрытия COM приложений.
+
+    Реализация по умолчанию работает через pywin32/comtypes. Тесты
+    подставляют собственную реализацию с теми же методами.
+    """
+
+    def initialize_thread(self) -> None:
+        """Инициализация COM в текущем потоке."""
+
+    def uninitialize_thread(self) -> None:
+        """Освобождение COM в текущем потоке."""
+
+    @abstractmethod
+    def create(self, prog_id: str) -> Any:
+        """Создание экземпляра приложения.
+
+        Args:
+            prog_id: ProgID приложения (Word.Application, PowerPoint.Application)
+
+        Returns:
+            Объект приложения
+
+        Raises:
+            RuntimeError: Если приложение недоступно
+        """
+
+    def is_alive(self, app: Any) -> bool:
+        """Проверка, что приложение еще отвечает."""
+        return app is not None
+
+    def quit(self, app: Any) -> None:
+        """Закрытие приложения."""
+
+
+class Win32ComAppFactory(ComAppFactory):
+    """Фабрика COM приложений через pywin32 или comtypes."""
+
+    def __init__(self):
+        self._pythoncom = None
+        try:
+            import pythoncom
+            self._pythoncom = pythoncom
+        except ImportError:
+            pass
+
+    def initialize_thread(self) -> None:
+        if self._pythoncom is None:
+            return
+        try:
+            # COINIT_APARTMENTTHREADED = 2
+            self._pythoncom.CoInitializeEx(2)
+        except (AttributeError, ValueError):
+            self._pythoncom.CoInitialize()
+        except (OSError, RuntimeError) as e:
+            # Повторная инициализация в том же потоке - не ошибка
+            logger.debug(f"COM уже инициализирован в потоке: {e}")
+
+    def uninitialize_thread(self) -> None:
+        if self._pythoncom is None:
+            return
+        try:
+            self._pythoncom.CoUninitialize()
+        except (OSError, RuntimeError, AttributeError) as e:
+            logger.debug(f"Ошибка при освобождении COM: {e}")
+
+    def create(self, prog_id: str) -> Any:
+        if sys.platform != 'win32':
+            raise RuntimeError("COM доступен только на Windows")
+
+        if prog_id == WORD_PROG_ID:
+            # Проверка установки Word и несколько способов создания объекта
+            from core.converter.com_utils import create_word_application
+            try:
+                import win32com.client as com_client
+            except ImportError:
+                import comtypes.client as com_client
+            app, error_msg = create_word_application(com_client)
+            if app is None:
+                raise RuntimeError(error_msg or "Не удалось создать Word приложение")
+        else:
+            try:
+                import win32com.client
+                app = win32com.client.DispatchEx(prog_id)
+            except ImportError:
+                from comtypes.client import CreateObject
+                app = CreateObject(prog_id)
+
+        try:
+            app.Visible = False
+            app.DisplayAlerts = 0
+        except (AttributeError, OSError, RuntimeError, TypeError) as e:
+            # Некоторые версии PowerPoint не позволяют скрыть окно
+            logger.debug(f"Не удалось настроить {prog_id}: {e}")
+        return app
+
+    def is_alive(self, app: Any) -> bool:
+        try:
+            # Любое обращение к свойству упавшего приложения вызывает ошибку RPC
+            _ = app.Name
+            return True
+        except (AttributeError, OSError, RuntimeError, TypeError):
+            return False
+        except BaseException as e:
+            if isinstance(e, (KeyboardInterrupt, SystemExit)):
+                raise
+            return False
+
+    def quit(self, app: Any) -> None:
+        # Закрываем документы, оставшиеся открытыми после ошибок
+        try:
+            if hasattr(app, 'Documents'):
+                for doc in list(app.Documents):
+                    doc.Close(SaveChanges=False)
+            elif hasattr(app, 'Presentations'):
+                for presentation in list(app.Presentations):
+                    presentation.Close()
+        except (AttributeError, OSError, RuntimeError, TypeError):
+            pass
+        try:
+            app.Quit()
+        except (AttributeError, OSError, RuntimeError, TypeError) as e:
+            logger.warning(f"Ошибка при закрытии COM приложения: {e}")
+        except BaseException as e:
+            if isinstance(e, (KeyboardInterrupt, SystemExit)):
+                raise
+            logger.warning(f"Критическая ошибка при закрытии COM приложения: {e}")
+
+
+class ComSession:
+    """Экземпляр приложения, закрепленный за потоком."""
+
+    def __init__(self, app: Any, thread_id: int):
+        self.app = app
+        self.thread_id = thread_id
+        self.documents = 0
+        self.failed = False
+
+    def mark_failed(self) -> None:
+        """Пометить сессию как сломанную (будет пересоздана)."""
+        self.failed = True
+
+
+class ComSessionPool:
+    """Пул COM сессий: одно приложение на рабочий поток."""
+
+    def __init__(
+        self,
+        prog_id: str,
+        factory: Optional[ComAppFactory] = None,
+        max_documents: int = COM_SESSION_MAX_DOCUMENTS
+    ):
+        """Инициализация пула.
+
+        Args:
+            prog_id: ProgID приложения
+            factory: Фабрика COM приложений (по умолчанию Win32ComAppFactory)
+            max_documents: Количество документов, после которого
+                           приложение пересоздается (защита от утечек Office)
+        """
+        self.prog_id = prog_id
+        self.factory = factory or Win32ComAppFactory()
+        self.max_documents = max(1, max_documents)
+        self._local = threading.local()
+        self._sessions: Dict[int, ComSession] = {}
+        self._lock = threading.Lock()
+        self.created = 0
+        self.recycled = 0
+
+    @contextmanager
+    def session(self) -> Iterator[ComSession]:
+        """Получение сессии текущего потока.
+
+        Сессия пересоздается, если исчерпан лимит документов, предыдущая
+        конвертация завершилась ошибкой или приложение не отвечает.
+        Исключение внутри блока помечает сессию как сломанную.
+
+        Yields:
+            ComSession с готовым приложением
+
+        Raises:
+            RuntimeError: Если приложение не удалось создать
+        """
+        session = self._get_session()
+        try:
+            yield session
+        except BaseException:
+            session.mark_failed()
+            raise
+        finally:
+            session.documents += 1
+            if session.failed or session.documents >= self.max_documents:
+                self._close_session(session, recycled=True)
+
+    def release_thread(self) -> None:
+        """Закрытие сессии текущего потока (вызывается в конце пакета)."""
+        session = getattr(self._local, 'session', None)
+        if session is not None:
+            self._close_session(session)
+        if getattr(self._local, 'com_initialized', False):
+            self.factory.uninitialize_thread()
+            self._local.com_initialized = False
+
+    def shutdown(self) -> None:
+        """Закрытие сессии текущего потока и сброс учета остальных.
+
+        COM объект можно закрыть только из потока, в апартаменте которого
+        он создан, поэтому сессии других потоков здесь не закрываются:
+        каждый рабочий поток освобождает свою сессию сам (release_thread).
+        """
+        self.release_thread()
+        with self._lock:
+            abandoned = len(self._sessions)
+            self._sessions.clear()
+        if abandoned:
+            logger.warning(f"{self.prog_id}: {abandoned} сессий не освобождено своими потоками")
+
+    def stats(self) -> Dict[str, int]:
+        """Статистика пула."""
+        with self._lock:
+            active = len(self._sessions)
+        return {'active': active, 'created': self.created, 'recycled': self.recycled}
+
+    def _get_session(self) -> ComSession:
+        """Текущая сессия потока или новая."""
+        session = getattr(self._local, 'session', None)
+        if session is not None and not self.factory.is_alive(session.app):
+            logger.info(f"{self.prog_id} не отвечает, пересоздаем")
+            self._close_session(session, recycled=True)
+            session = None
+        if session is not None:
+            return session
+
+        if not getattr(self._local, 'com_initialized', False):
+            self.factory.initialize_thread()
+            self._local.com_initialized = True
+        app = self.factory.create(self.prog_id)
+        thread_id = threading.get_ident()
+        session = ComSession(app, thread_id)
+        self._local.session = session
+        with self._lock:
+            self._sessions[thread_id] = session
+            self.created += 1
+        logger.debug(f"Создана COM сессия {self.prog_id} для потока {thread_id}")
+        return session
+
+    def _close_session(self, session: ComSession, recycled: bool = False) -> None:
+        """Закрытие приложения сессии."""
+        with self._lock:
+            if self._sessions.get(session.thread_id) is session:
+                del self._sessions[session.thread_id]
+            if recycled:
+                self.recycled += 1
+        if getattr(self._local, 'session', None) is session:
+            self._local.session = None
+        self.factory.quit(session.app)
+
+
+_pools: Dict[str, ComSessionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_com_session_pool(prog_id: str) -> ComSessionPool:
+    """Общий пул для приложения (создается при первом обращении).
+
+    Args:
+        prog_id: ProgID приложения
+
+    Returns:
+        ComSessionPool
+    """
+    with _pools_lock:
+        pool = _pools.get(prog_id)
+        if pool is None:
+            pool = ComSessionPool(prog_id)
+            _pools[prog_id] = pool
+        return pool
+
+
+def release_com_sessions() -> None:
+    """Закрытие COM сессий текущего потока во всех пулах."""
+    with _pools_lock:
+        pools = list(_pools.values())
+    for pool in pools:
+        pool.release_thread()
@@ -2,7 +2,8 @@
 
 Содержит функции для работы с Microsoft Word через COM интерфейс:
 - Создание и закрытие Word приложений
-- Конвертация документов через Word
+- Конвертация документов через Word (экземпляр Word берется из пула
+  сессий com_session_pool и переиспользуется в пределах потока)
 - Проверка наличия Word в системе
 """
 
@@ -25,6 +26,23 @@ else:
 logger = logging.getLogger(__name__)
 
 
+def describe_save_error(error_msg: str) -> str:
+    """Текст ошибки сохранения для пользователя.
+
+    Общие COM-исключения (короткие или начинающиеся с 'Open.') заменяются
+    нейтральным сообщением.
+
+    Args:
+        error_msg: Текст исключения
+
+    Returns:
+        str: Сообщение для пользователя
+    """
+    if error_msg and len(error_msg) > 10 and not error_msg.startswith('Open.'):
+        return error_msg
+    return 'Ошибка сохранения'
+
+
 def cleanup_word_application(word_app: Optional[Any]) -> None:
     """Безопасное закрытие Word приложения.
     
@@ -252,7 +270,10 @@ def create_word_application(com_client: Any) -> Tuple[Optional[Any], Optional[st
                 return word, None
             except (OSError, RuntimeError, AttributeError, TypeError) as e3:
                 error_msg3 = str(e3)
-                logger.error(f"Все способы создания Word.Application не удались. Ошибки: {error_msg1}, {error_msg2}, {error_msg3}")
+                logger.error(
+                    f"Все способы создания Word.Application не удались. "
+                    f"Ошибки: {error_msg1}, {error_msg2}, {error_msg3}"
+                )
                 
                 # Освобождаем COM если Word не был создан
                 if com_initialized and pythoncom_module:
@@ -271,12 +292,22 @@ def create_word_application(com_client: Any) -> Tuple[Optional[Any], Optional[st
                         logger.debug(f"Критическая ошибка при освобождении COM: {uninit_error}")
                 
                 # Формируем понятное сообщение об ошибке
-                if any(keyword in error_msg1.lower() for keyword in ['invalid class string', 'clsid', 'class not registered', 'progid']):
-                    return None, "Microsoft Word не установлен или не зарегистрирован в системе. Установите Microsoft Office с Word."
+                registry_keywords = ['invalid class string', 'clsid', 'class not registered', 'progid']
+                if any(keyword in error_msg1.lower() for keyword in registry_keywords):
+                    return None, (
+                        "Microsoft Word не установлен или не зарегистрирован в системе. "
+                        "Установите Microsoft Office с Word."
+                    )
                 elif "access is denied" in error_msg1.lower() or "permission" in error_msg1.lower():
-                    return None, "Нет доступа к Microsoft Word. Запустите программу от имени администратора или закройте все окна Word."
+                    return None, (
+                        "Нет доступа к Microsoft Word. Запустите программу от имени администратора "
+                        "или закройте все окна Word."
+                    )
                 elif "rpc" in error_msg1.lower() or "com" in error_msg1.lower():
-                    return None, "Ошибка COM при подключении к Word. Попробуйте перезапустить Word или перезагрузить компьютер."
+                    return None, (
+                        "Ошибка COM при подключении к Word. Попробуйте перезапустить Word "
+                        "или перезагрузить компьютер."
+                    )
                 else:
                     return None, f"Не удалось создать объект Word.Application: {error_msg1}"
 
@@ -395,21 +426,21 @@ def convert_docx_with_word(
                         return False, f"Критическая ошибка при повторной попытке сохранения: {retry_msg}"
                     return False, "Ошибка при сохранении PDF"
             else:
-                return False, f"Ошибка при сохранении PDF: {error_msg if error_msg and len(error_msg) > 10 and not error_msg.startswith('Open.') else 'Ошибка сохранения'}"
+                return False, f"Ошибка при сохранении PDF: {describe_save_error(error_msg)}"
         except (ValueError, TypeError, AttributeError) as save_error:
             # Ошибки данных/типов при сохранении PDF
             error_msg = str(save_error)
             # Логируем только реальные ошибки
             if error_msg and len(error_msg) > 10 and not error_msg.startswith('Open.'):
                 logger.error(f"Ошибка данных при сохранении PDF: {error_msg}")
-            return False, f"Ошибка данных при сохранении PDF: {error_msg if error_msg and len(error_msg) > 10 and not error_msg.startswith('Open.') else 'Ошибка сохранения'}"
+            return False, f"Ошибка данных при сохранении PDF: {describe_save_error(error_msg)}"
         except (MemoryError, RecursionError) as save_error:
             # Ошибки памяти/рекурсии при сохранении PDF
             error_msg = str(save_error)
             # Логируем только реальные ошибки
             if error_msg and len(error_msg) > 10 and not error_msg.startswith('Open.'):
                 logger.error(f"Ошибка памяти/рекурсии при сохранении PDF: {error_msg}")
-            return False, f"Ошибка памяти/рекурсии при сохранении PDF: {error_msg if error_msg and len(error_msg) > 10 and not error_msg.startswith('Open.') else 'Ошибка сохранения'}"
+            return False, f"Ошибка памяти/рекурсии при сохранении PDF: {describe_save_error(error_msg)}"
         # Финальный catch для неожиданных исключений (критично для стабильности COM)
         except BaseException as save_error:
             if isinstance(save_error, (KeyboardInterrupt, SystemExit)):
@@ -419,7 +450,7 @@ def convert_docx_with_word(
             # Логируем только реальные ошибки
             if error_msg and len(error_msg) > 10 and not error_msg.startswith('Open.'):
                 logger.error(f"Критическая ошибка при сохранении PDF: {error_msg}")
-            return False, f"Ошибка при сохранении PDF: {error_msg if error_msg and len(error_msg) > 10 and not error_msg.startswith('Open.') else 'Ошибка сохранения'}"
+            return False, f"Ошибка при сохранении PDF: {describe_save_error(error_msg)}"
         
         return True, None
         
@@ -449,184 +480,186 @@ def convert_docx_with_word(
         cleanup_word_document(doc)
 
 
-def convert_docx_with_word_com(
+def _save_word_document_as(
+    word_app: Any,
     file_path: str,
     output_path: str,
     file_format: int
+) -> Tuple[bool, str, Optional[str]]:
+    """Открытие документа в готовом Word приложении и сохранение в формате.
+    
+    Args:
+        word_app: Объект Word.Application
+        file_path: Путь к исходному файлу
+        output_path: Путь для сохранения результата
+        file_format: Формат для сохранения (17 = PDF, 16 = DOCX, и т.д.)
+        
+    Returns:
+        Tuple[успех, сообщение, путь к выходному файлу]
+    """
+    # Настраиваем Word
+    word_app.Visible = False
+    word_app.DisplayAlerts = 0  # Отключаем предупреждения
+    
+    # Открываем документ
+    doc_path = os.path.abspath(file_path)
+    logger.debug(f"Открываем документ Word: {doc_path}")
+    
+    doc = None
+    try:
+        if not hasattr(word_app, 'Documents'):
+            return False, "Word приложение не поддерживает Documents", None
+        
+        doc = word_app.Documents.Open(
+            FileName=doc_path,
+            ReadOnly=True,
+            ConfirmConversions=False,
+            AddToRecentFiles=False
+        )
+        logger.debug("Документ открыт успешно")
+    except (OSError, RuntimeError, AttributeError, TypeError) as open_error:
+        error_msg = str(open_error)
+        logger.error(f"Ошибка при открытии документа: {error_msg}")
+        return False, f"Не удалось открыть документ: {error_msg}", None
+    except (ValueError, TypeError, AttributeError) as open_error:
+        error_msg = str(open_error)
+        logger.error(f"Ошибка данных при открытии документа: {error_msg}")
+        return False, f"Ошибка данных при открытии документа: {error_msg}", None
+    except (MemoryError, RecursionError) as open_error:
+        error_msg = str(open_error)
+        logger.error(f"Ошибка памяти/рекурсии при открытии документа: {error_msg}")
+        return False, f"Ошибка памяти/рекурсии при открытии документа: {error_msg}", None
+    # Финальный catch для неожиданных исключений (критично для стабильности COM)
+    except BaseException as open_error:
+        if isinstance(open_error, (KeyboardInterrupt, SystemExit)):
+            raise
+        error_msg = str(open_error)
+        logger.error(f"Критическая ошибка при открытии документа: {error_msg}")
+        return False, f"Ошибка при открытии документа: {error_msg}", None
+    
+    # Сохраняем в нужном формате
+    output_file_path = os.path.abspath(output_path)
+    logger.debug(f"Сохраняем документ: {output_file_path}, формат: {file_format}")
+    
+    try:
+        # Проверяем директорию для выходного файла
+        output_dir = os.path.dirname(output_file_path)
+        if output_dir and not os.path.exists(output_dir):
+            os.makedirs(output_dir, exist_ok=True)
+        
+        doc.SaveAs(FileName=output_file_path, FileFormat=file_format)
+        logger.debug(f"Документ сохранен в формате {file_format}")
+        
+        # Проверяем, что файл создан
+        if os.path.exists(output_file_path):
+            return True, f"Документ успешно конвертирован в формат {file_format}", output_file_path
+        else:
+            return False, "Файл не был создан", None
+    except (OSError, RuntimeError, AttributeError, PermissionError) as save_error:
+        error_msg = str(save_error)
+        # Логируем только реальные ошибки (не общие COM-исключения)
+        if error_msg and len(error_msg) > 10 and not error_msg.startswith('Open.'):
+            logger.error(f"Ошибка при сохранении документа: {error_msg}")
+        # Пробуем удалить существующий файл и повторить
+        if os.path.exists(output_file_path):
+            try:
+                os.remove(output_file_path)
+                doc.SaveAs(FileName=output_file_path, FileFormat=file_format)
+                if os.path.exists(output_file_path):
+                    return True, f"Документ успешно конвертирован в формат {file_format}", output_file_path
+            except (ValueError, TypeError, AttributeError) as retry_error:
+                retry_msg = str(retry_error)
+                if retry_msg and len(retry_msg) > 10 and not retry_msg.startswith('Open.'):
+                    return False, f"Ошибка данных при сохранении документа: {retry_msg}", None
+                return False, "Ошибка данных при сохранении документа", None
+            except (MemoryError, RecursionError) as retry_error:
+                retry_msg = str(retry_error)
+                if retry_msg and len(retry_msg) > 10 and not retry_msg.startswith('Open.'):
+                    return False, f"Ошибка памяти/рекурсии при сохранении документа: {retry_msg}", None
+                return False, "Ошибка памяти/рекурсии при сохранении документа", None
+            # Финальный catch для неожиданных исключений (критично для стабильности COM)
+            except BaseException as retry_error:
+                if isinstance(retry_error, (KeyboardInterrupt, SystemExit)):
+                    raise
+                retry_msg = str(retry_error)
+                if retry_msg and len(retry_msg) > 10 and not retry_msg.startswith('Open.'):
+                    return False, f"Критическая ошибка при сохранении документа: {retry_msg}", None
+                return False, "Не удалось сохранить документ", None
+        return False, f"Ошибка при сохранении документа: {describe_save_error(error_msg)}", None
+    except (ValueError, TypeError, AttributeError) as save_error:
+        error_msg = str(save_error)
+        # Логируем только реальные ошибки
+        if error_msg and len(error_msg) > 10 and not error_msg.startswith('Open.'):
+            logger.error(f"Ошибка данных при сохранении документа: {error_msg}")
+        return False, f"Ошибка данных при сохранении документа: {describe_save_error(error_msg)}", None
+    except (MemoryError, RecursionError) as save_error:
+        error_msg = str(save_error)
+        # Логируем только реальные ошибки
+        if error_msg and len(error_msg) > 10 and not error_msg.startswith('Open.'):
+            logger.error(f"Ошибка памяти/рекурсии при сохранении документа: {error_msg}")
+        return False, f"Ошибка памяти/рекурсии при сохранении документа: {describe_save_error(error_msg)}", None
+    # Финальный catch для неожиданных исключений (критично для стабильности COM)
+    except BaseException as save_error:
+        if isinstance(save_error, (KeyboardInterrupt, SystemExit)):
+            raise
+        error_msg = str(save_error)
+        # Логируем только реальные ошибки
+        if error_msg and len(error_msg) > 10 and not error_msg.startswith('Open.'):
+            logger.error(f"Критическая ошибка при сохранении документа: {error_msg}")
+        return False, f"Ошибка при сохранении документа: {describe_save_error(error_msg)}", None
+    finally:
+        # Закрываем документ
+        if doc:
+            cleanup_word_document(doc)
+            doc = None
+
+
+def convert_docx_with_word_com(
+    file_path: str,
+    output_path: str,
+    file_format: int,
+    session_pool: Optional[Any] = None
 ) -> Tuple[bool, str, Optional[str]]:
     """Конвертация DOCX/DOC в другой формат через Word COM.
     
-    Обертка над convert_docx_with_word, которая создает Word приложение
-    и управляет его жизненным циклом.
+    Word.Application берется из пула COM сессий: в пределах рабочего потока
+    один экземпляр Word обслуживает весь пакет и пересоздается после
+    ошибки или заданного количества документов.
     
     Args:
         file_path: Путь к исходному DOCX или DOC файлу
         output_path: Путь для сохранения результата
         file_format: Формат для сохранения (17 = PDF, 16 = DOCX, и т.д.)
+        session_pool: Пул COM сессий (по умолчанию общий пул Word)
         
     Returns:
         Tuple[успех, сообщение, путь к выходному файлу]
     """
-    import sys
+    from core.converter.com_session_pool import WORD_PROG_ID, get_com_session_pool
     
-    # Определяем COM клиент
-    com_client = None
-    com_client_type = None
-    
-    if sys.platform == 'win32':
+    if session_pool is None:
+        if sys.platform != 'win32':
+            return False, "COM библиотеки не доступны на этой платформе", None
         try:
-            import win32com.client
-            com_client = win32com.client
-            com_client_type = "win32com"
+            import win32com.client  # noqa: F401
         except ImportError:
             try:
-                import comtypes.client
-                com_client = comtypes.client
-                com_client_type = "comtypes"
+                import comtypes.client  # noqa: F401
             except ImportError:
                 return False, "COM библиотеки не доступны. Установите pywin32 или comtypes", None
-    
-    if not com_client:
-        return False, "COM библиотеки не доступны на этой платформе", None
-    
-    word_app = None
-    pythoncom_module = None
-    com_initialized = False
+        session_pool = get_com_session_pool(WORD_PROG_ID)
     
     try:
-        # Создаем Word приложение
-        word_app, error_msg = create_word_application(com_client)
-        if not word_app:
-            return False, error_msg or "Не удалось создать Word приложение", None
-        
-        # Инициализируем COM
-        try:
-            import pythoncom
-            pythoncom_module = pythoncom
-            com_initialized = True
-        except ImportError:
-            pass
-        
-        # Настраиваем Word
-        word_app.Visible = False
-        word_app.DisplayAlerts = 0  # Отключаем предупреждения
-        
-        # Открываем документ
-        doc_path = os.path.abspath(file_path)
-        logger.debug(f"Открываем документ Word: {doc_path}")
-        
-        doc = None
-        try:
-            if not hasattr(word_app, 'Documents'):
-                return False, "Word приложение не поддерживает Documents", None
-            
-            doc = word_app.Documents.Open(
-                FileName=doc_path,
-                ReadOnly=True,
-                ConfirmConversions=False,
-                AddToRecentFiles=False
-            )
-            logger.debug("Документ открыт успешно")
-        except (OSError, RuntimeError, AttributeError, TypeError) as open_error:
-            error_msg = str(open_error)
-            logger.error(f"Ошибка при открытии документа: {error_msg}")
-            return False, f"Не удалось открыть документ: {error_msg}", None
-        except (ValueError, TypeError, AttributeError) as open_error:
-            error_msg = str(open_error)
-            logger.error(f"Ошибка данных при открытии документа: {error_msg}")
-            return False, f"Ошибка данных при открытии документа: {error_msg}", None
-        except (MemoryError, RecursionError) as open_error:
-            error_msg = str(open_error)
-            logger.error(f"Ошибка памяти/рекурсии при открытии документа: {error_msg}")
-            return False, f"Ошибка памяти/рекурсии при открытии документа: {error_msg}", None
-        # Финальный catch для неожиданных исключений (критично для стабильности COM)
-        except BaseException as open_error:
-            if isinstance(open_error, (KeyboardInterrupt, SystemExit)):
-                raise
-            error_msg = str(open_error)
-            logger.error(f"Критическая ошибка при открытии документа: {error_msg}")
-            return False, f"Ошибка при открытии документа: {error_msg}", None
-        
-        # Сохраняем в нужном формате
-        output_file_path = os.path.abspath(output_path)
-        logger.debug(f"Сохраняем документ: {output_file_path}, формат: {file_format}")
-        
-        try:
-            # Проверяем директорию для выходного файла
-            output_dir = os.path.dirname(output_file_path)
-            if output_dir and not os.path.exists(output_dir):
-                os.makedirs(output_dir, exist_ok=True)
-            
-            doc.SaveAs(FileName=output_file_path, FileFormat=file_format)
-            logger.debug(f"Документ сохранен в формате {file_format}")
-            
-            # Проверяем, что файл создан
-            if os.path.exists(output_file_path):
-                return True, f"Документ успешно конвертирован в формат {file_format}", output_file_path
-            else:
-                return False, "Файл не был создан", None
-        except (OSError, RuntimeError, AttributeError, PermissionError) as save_error:
-            error_msg = str(save_error)
-            # Логируем только реальные ошибки (не общие COM-исключения)
-            if error_msg and len(error_msg) > 10 and not error_msg.startswith('Open.'):
-                logger.error(f"Ошибка при сохранении документа: {error_msg}")
-            # Пробуем удалить существующий файл и повторить
-            if os.path.exists(output_file_path):
-                try:
-                    os.remove(output_file_path)
-                    doc.SaveAs(FileName=output_file_path, FileFormat=file_format)
-                    if os.path.exists(output_file_path):
-                        return True, f"Документ успешно конвертирован в формат {file_format}", output_file_path
-                except (ValueError, TypeError, AttributeError) as retry_error:
-                    retry_msg = str(retry_error)
-                    if retry_msg and len(retry_msg) > 10 and not retry_msg.startswith('Open.'):
-                        return False, f"Ошибка данных при сохранении документа: {retry_msg}", None
-                    return False, "Ошибка данных при сохранении документа", None
-                except (MemoryError, RecursionError) as retry_error:
-                    retry_msg = str(retry_error)
-                    if retry_msg and len(retry_msg) > 10 and not retry_msg.startswith('Open.'):
-                        return False, f"Ошибка памяти/рекурсии при сохранении документа: {retry_msg}", None
-                    return False, "Ошибка памяти/рекурсии при сохранении документа", None
-                # Финальный catch для неожиданных исключений (критично для стабильности COM)
-                except BaseException as retry_error:
-                    if isinstance(retry_error, (KeyboardInterrupt, SystemExit)):
-                        raise
-                    retry_msg = str(retry_error)
-                    if retry_msg and len(retry_msg) > 10 and not retry_msg.startswith('Open.'):
-                        return False, f"Критическая ошибка при сохранении документа: {retry_msg}", None
-                    return False, "Не удалось сохранить документ", None
-            return False, f"Ошибка при сохранении документа: {error_msg if error_msg and len(error_msg) > 10 and not error_msg.startswith('Open.') else 'Ошибка сохранения'}", None
-        except (ValueError, TypeError, AttributeError) as save_error:
-            error_msg = str(save_error)
-            # Логируем только реальные ошибки
-            if error_msg and len(error_msg) > 10 and not error_msg.startswith('Open.'):
-                logger.error(f"Ошибка данных при сохранении документа: {error_msg}")
-            return False, f"Ошибка данных при сохранении документа: {error_msg if error_msg and len(error_msg) > 10 and not error_msg.startswith('Open.') else 'Ошибка сохранения'}", None
-        except (MemoryError, RecursionError) as save_error:
-            error_msg = str(save_error)
-            # Логируем только реальные ошибки
-            if error_msg and len(error_msg) > 10 and not error_msg.startswith('Open.'):
-                logger.error(f"Ошибка памяти/рекурсии при сохранении документа: {error_msg}")
-            return False, f"Ошибка памяти/рекурсии при сохранении документа: {error_msg if error_msg and len(error_msg) > 10 and not error_msg.startswith('Open.') else 'Ошибка сохранения'}", None
-        # Финальный catch для неожиданных исключений (критично для стабильности COM)
-        except BaseException as save_error:
-            if isinstance(save_error, (KeyboardInterrupt, SystemExit)):
-                raise
-            error_msg = str(save_error)
-            # Логируем только реальные ошибки
-            if error_msg and len(error_msg) > 10 and not error_msg.startswith('Open.'):
-                logger.error(f"Критическая ошибка при сохранении документа: {error_msg}")
-            return False, f"Ошибка при сохранении документа: {error_msg if error_msg and len(error_msg) > 10 and not error_msg.startswith('Open.') else 'Ошибка сохранения'}", None
-        finally:
-            # Закрываем документ
-            if doc:
-                cleanup_word_document(doc)
-                doc = None
-    
+        with session_pool.session() as session:
+            result = _save_word_document_as(session.app, file_path, output_path, file_format)
+            if not result[0]:
+                # После ошибки Word может остаться в неопределенном состоянии
+                session.mark_failed()
+            return result
     except (OSError, RuntimeError, AttributeError, TypeError) as e:
         error_msg = str(e)
         logger.error(f"Ошибка выполнения при конвертации через Word COM: {error_msg}", exc_info=True)
-        return False, f"Ошибка выполнения при конвертации: {error_msg}", None
+        return False, error_msg or "Не удалось создать Word приложение", None
     except (ValueError, KeyError, IndexError) as e:
         error_msg = str(e)
         logger.error(f"Ошибка данных при конвертации через Word COM: {error_msg}", exc_info=True)
@@ -642,22 +675,3 @@ def convert_docx_with_word_com(
         error_msg = str(e)
         logger.error(f"Критическая ошибка при конвертации через Word COM: {error_msg}", exc_info=True)
         return False, f"Ошибка конвертации: {error_msg}", None
-    finally:
-        # Закрываем Word приложение
-        if word_app:
-            try:
-                # Закрываем все открытые документы
-                if hasattr(word_app, 'Documents'):
-                    for doc in list(word_app.Documents):
-                        if doc:
-                            cleanup_word_document(doc)
-            except (AttributeError, OSError, RuntimeError):
-                pass
-            cleanup_word_application(word_app)
-        
-        # Освобождаем COM
-        if com_initialized and pythoncom_module:
-            try:
-                pythoncom_module.CoUninitialize()
-            except (OSError, RuntimeError, AttributeError):
-                pass
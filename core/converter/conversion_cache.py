@@ -0,0 +1,260 @@
+"""Кеш результатов конвертации.
+
+Запоминает успешные конвертации по ключу (отпечаток исходного файла,
+целевой формат, качество, бэкенд). Повторный запуск пакета пропускает
+файлы, выходной файл которых уже существует и не изменился с момента
+конвертации. В режиме отпечатка по содержимому одинаковые исходные
+файлы по разным путям получают готовый результат жесткой ссылкой
+или копией без повторной конвертации.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+try:
+    from config.constants import MAX_CONVERSION_CACHE_ENTRIES
+except ImportError:
+    MAX_CONVERSION_CACHE_ENTRIES = 10000
+
+# Режимы отпечатка исходного файла
+FINGERPRINT_STAT = 'stat'  # Путь + размер + время изменения (без чтения файла)
+FINGERPRINT_CONTENT = 'content'  # SHA-256 содержимого (находит дубликаты)
+
+# Режимы материализации результата для дубликатов
+LINK_HARDLINK = 'hardlink'
+LINK_COPY = 'copy'
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def _stat_signature(path: str) -> Optional[Tuple[int, int]]:
+    """Размер и время изменения файла (нс) или None."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_size, st.st_mtime_ns
+
+
+class ConversionCache:
+    """Кеш результатов конвертации с сохранением в JSON."""
+
+    def __init__(
+        self,
+        cache_file: Optional[str] = None,
+        fingerprint_mode: str = FINGERPRINT_STAT,
+        link_mode: Optional[str] = LINK_HARDLINK,
+        max_entries: int = MAX_CONVERSION_CACHE_ENTRIES
+    ):
+        """Инициализация кеша.
+
+        Args:
+            cache_file: Путь к JSON файлу кеша (None - только в памяти)
+            fingerprint_mode: FINGERPRINT_STAT или FINGERPRINT_CONTENT
+            link_mode: Как получать результат для дубликатов:
+                       LINK_HARDLINK, LINK_COPY или None (не использовать)
+            max_entries: Максимальное количество записей
+        """
+        self.cache_file = cache_file
+        self.fingerprint_mode = fingerprint_mode
+        self.link_mode = link_mode
+        self.max_entries = max_entries
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self.hits = 0
+        self.misses = 0
+        self._hashes: Dict[Tuple[str, int, int], str] = {}
+        self._dirty = False
+        self._lock = threading.Lock()
+        if cache_file:
+            self.load()
+
+    def load(self) -> None:
+        """Загрузка кеша из файла."""
+        if not self.cache_file or not os.path.exists(self.cache_file):
+            return
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if isinstance(data, dict) and isinstance(data.get('entries'), dict):
+                self.entries = data['entries']
+        except (OSError, json.JSONDecodeError, ValueError, TypeError) as e:
+            logger.warning(f"Не удалось загрузить кеш конвертации: {e}")
+
+    def save(self) -> bool:
+        """Сохранение кеша в файл (если были изменения).
+
+        Returns:
+            True если успешно или нечего сохранять
+        """
+        if not self.cache_file or not self._dirty:
+            return True
+        with self._lock:
+            data = {'version': 1, 'entries': dict(self.entries)}
+            self._dirty = False
+        temp_file = self.cache_file + '.tmp'
+        try:
+            with open(temp_file, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(temp_file, self.cache_file)
+            return True
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning(f"Не удалось сохранить кеш конвертации: {e}")
+            return False
+
+    def clear(self) -> None:
+        """Очистка кеша."""
+        with self._lock:
+            self.entries.clear()
+            self._hashes.clear()
+            self._dirty = True
+
+    def fingerprint(self, file_path: str) -> Optional[str]:
+        """Отпечаток исходного файла.
+
+        Args:
+            file_path: Путь к исходному файлу
+
+        Returns:
+            Строка отпечатка или None если файл недоступен
+        """
+        signature = _stat_signature(file_path)
+        if signature is None:
+            return None
+        size, mtime_ns = signature
+        if self.fingerprint_mode != FINGERPRINT_CONTENT:
+            return f"stat:{os.path.normcase(os.path.abspath(file_path))}:{size}:{mtime_ns}"
+
+        # Хеш пересчитывается только если файл изменился
+        hash_key = (os.path.normcase(os.path.abspath(file_path)), size, mtime_ns)
+        digest = self._hashes.get(hash_key)
+        if digest is None:
+            hasher = hashlib.sha256()
+            try:
+                with open(file_path, 'rb') as f:
+                    for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+                        hasher.update(chunk)
+            except OSError:
+                return None
+            digest = hasher.hexdigest()
+            self._hashes[hash_key] = digest
+        return f"sha256:{digest}:{size}"
+
+    @staticmethod
+    def make_key(fingerprint: str, target_ext: str, quality: int, backend: str) -> str:
+        """Ключ записи кеша."""
+        return f"{fingerprint}|{target_ext.lower()}|{quality}|{backend}"
+
+    def lookup(self, file_path: str, target_ext: str, quality: int, backend: str,
+               output_path: str) -> Optional[str]:
+        """Поиск готового результата конвертации.
+
+        Если результат уже лежит по output_path и не изменился, возвращается
+        output_path. Если результат есть для такого же содержимого по другому
+        пути, он переносится в output_path жесткой ссылкой или копией.
+
+        Args:
+            file_path: Путь к исходному файлу
+            target_ext: Целевой формат (с точкой)
+            quality: Качество
+            backend: Сигнатура бэкенда/параметров конвертации
+            output_path: Ожидаемый путь результата
+
+        Returns:
+            Путь к готовому результату или None
+        """
+        fingerprint = self.fingerprint(file_path)
+        if fingerprint is None:
+            return None
+        key = self.make_key(fingerprint, target_ext, quality, backend)
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        outputs = entry.get('outputs', {})
+        output_key = os.path.normcase(os.path.abspath(output_path))
+        if output_key in outputs and self._output_valid(output_key, outputs[output_key]):
+            self.hits += 1
+            return output_path
+
+        # Дубликат исходного файла: результат уже есть по другому пути
+        if self.link_mode is None or os.path.exists(output_path):
+            self.misses += 1
+            return None
+        for cached_output, signature in list(outputs.items()):
+            if self._output_valid(cached_output, signature) and self._materialize(cached_output, output_path):
+                self._add_output(key, output_path)
+                self.hits += 1
+                return output_path
+        self.misses += 1
+        return None
+
+    def store(self, file_path: str, target_ext: str, quality: int, backend: str, output_path: str) -> None:
+        """Запись успешной конвертации.
+
+        Args:
+            file_path: Путь к исходному файлу
+            target_ext: Целевой формат (с точкой)
+            quality: Качество
+            backend: Сигнатура бэкенда/параметров конвертации
+            output_path: Путь к результату (кешируются только файлы)
+        """
+        if not output_path or not os.path.isfile(output_path):
+            return
+        fingerprint = self.fingerprint(file_path)
+        if fingerprint is None:
+            return
+        key = self.make_key(fingerprint, target_ext, quality, backend)
+        self._add_output(key, output_path, source=file_path)
+
+    def stats(self) -> Dict[str, int]:
+        """Статистика использования кеша."""
+        return {'entries': len(self.entries), 'hits': self.hits, 'misses': self.misses}
+
+    def _add_output(self, key: str, output_path: str, source: Optional[str] = None) -> None:
+        """Добавление результата к записи кеша (запись становится самой новой)."""
+        signature = _stat_signature(output_path)
+        if signature is None:
+            return
+        output_key = os.path.normcase(os.path.abspath(output_path))
+        with self._lock:
+            entry = self.entries.pop(key, None) or {'source': source, 'outputs': {}}
+            entry['outputs'][output_key] = list(signature)
+            entry['created'] = time.time()
+            self.entries[key] = entry
+            # Удаляем самые старые записи (словарь сохраняет порядок вставки)
+            while len(self.entries) > self.max_entries:
+                self.entries.pop(next(iter(self.entries)))
+            self._dirty = True
+
+    @staticmethod
+    def _output_valid(output_path: str, signature) -> bool:
+        """Проверка, что результат существует и не изменялся."""
+        return _stat_signature(output_path) == tuple(signature)
+
+    def _materialize(self, cached_output: str, output_path: str) -> bool:
+        """Создание результата для дубликата (жесткая ссылка или копия)."""
+        try:
+            output_dir = os.path.dirname(output_path)
+            if output_dir:
+                os.makedirs(output_dir, exist_ok=True)
+            if self.link_mode == LINK_HARDLINK:
+                try:
+                    os.link(cached_output, output_path)
+                    return True
+                except OSError:
+                    # Другой том или ФС без жестких ссылок - копируем
+                    pass
+            shutil.copy2(cached_output, output_path)
+            return True
+        except OSError as e:
+            logger.debug(f"Не удалось использовать кешированный результат {cached_output}: {e}")
+            return False
@@ -13,6 +13,8 @@ import os
 import sys
 from typing import Optional, Tuple
 
+from core.converter.com_utils import describe_save_error
+
 logger = logging.getLogger(__name__)
 
 # Импорт функции проверки существования с поддержкой Unicode
@@ -74,7 +76,10 @@ def convert_docx_to_pdf(
         tried_methods = []
         
         # Метод 1: Пробуем через Word COM (Windows) - приоритетный метод
-        logger.info(f"Проверка доступности Word COM: platform={sys.platform}, win32com={win32com is not None}, comtypes={comtypes is not None}")
+        logger.info(
+            f"Проверка доступности Word COM: platform={sys.platform}, "
+            f"win32com={win32com is not None}, comtypes={comtypes is not None}"
+        )
         if sys.platform == 'win32' and (win32com or comtypes):
             logger.info(f"Пробуем конвертировать через Word COM: {file_path} -> {output_path}")
             try:
@@ -89,12 +94,6 @@ def convert_docx_to_pdf(
             except (OSError, RuntimeError, AttributeError, TypeError) as e:
                 logger.warning(f"Ошибка выполнения при конвертации через Word COM: {e}", exc_info=True)
                 tried_methods.append(f"Word COM (ошибка: {str(e)[:100]})")
-        else:
-            if sys.platform != 'win32':
-                logger.info("Word COM недоступен: не Windows платформа")
-            elif not win32com and not comtypes:
-                logger.warning("Word COM недоступен: не установлены win32com или comtypes. Установите: pip install pywin32 или pip install comtypes")
-                tried_methods.append("Word COM (недоступен - не установлены библиотеки)")
             except (ValueError, KeyError, IndexError) as e:
                 logger.warning(f"Ошибка данных при конвертации через Word COM: {e}")
                 tried_methods.append(f"Word COM (ошибка: {str(e)[:100]})")
@@ -107,6 +106,15 @@ def convert_docx_to_pdf(
                     raise
                 logger.warning(f"Критическая ошибка конвертации через Word COM: {e}", exc_info=True)
                 tried_methods.append(f"Word COM (ошибка: {str(e)[:100]})")
+        else:
+            if sys.platform != 'win32':
+                logger.info("Word COM недоступен: не Windows платформа")
+            elif not win32com and not comtypes:
+                logger.warning(
+                    "Word COM недоступен: не установлены win32com или comtypes. "
+                    "Установите: pip install pywin32 или pip install comtypes"
+                )
+                tried_methods.append("Word COM (недоступен - не установлены библиотеки)")
         
         # Метод 2: Пробуем использовать docx2pdf (только если COM методы недоступны)
         if use_docx2pdf and docx2pdf_convert is not None and not win32com and not comtypes and source_ext == '.docx':
@@ -187,9 +195,15 @@ def convert_docx_to_pdf(
         # Если все методы не сработали
         if not tried_methods:
             if sys.platform == 'win32':
-                return False, "Не удалось конвертировать файл. Убедитесь, что Microsoft Word или LibreOffice установлены и доступны.", None
+                return False, (
+                    "Не удалось конвертировать файл. "
+                    "Убедитесь, что Microsoft Word или LibreOffice установлены и доступны."
+                ), None
             else:
-                return False, "Конвертация DOC/DOCX в PDF доступна только на Windows с установленным Microsoft Word или при установленной библиотеке docx2pdf или LibreOffice.", None
+                return False, (
+                    "Конвертация DOC/DOCX в PDF доступна только на Windows с установленным Microsoft Word "
+                    "или при установленной библиотеке docx2pdf или LibreOffice."
+                ), None
         
         methods_str = ", ".join(tried_methods)
         return False, f"Не удалось конвертировать файл. Попробованы методы: {methods_str}", None
@@ -227,9 +241,11 @@ def convert_pdf_to_docx(
         output_path: Путь для сохранения DOCX
         win32com: Модуль win32com (или None)
         comtypes: Модуль comtypes (или None)
-        check_word_installed: Функция проверки установки Word
+        check_word_installed: Функция проверки установки Word (проверка
+                              выполняется пулом при создании сессии)
         cleanup_word_document: Функция очистки документа Word
-        cleanup_word_application: Функция очистки приложения Word
+        cleanup_word_application: Функция очистки приложения Word (Word
+                                  закрывается пулом сессий)
         
     Returns:
         Tuple[успех, сообщение, путь к выходному файлу]
@@ -237,166 +253,19 @@ def convert_pdf_to_docx(
     if not sys.platform == 'win32':
         return False, "Конвертация через Word доступна только на Windows", None
     
-    word = None
-    doc = None
-    com_initialized = False
-    pythoncom_module = None
+    if not win32com and not comtypes:
+        return False, "Microsoft Word недоступен через COM", None
+    
+    from core.converter.com_session_pool import WORD_PROG_ID, get_com_session_pool
     
     try:
-        # Проверяем доступность COM
-        if win32com:
-            try:
-                import win32com.client
-                import pythoncom
-                pythoncom_module = pythoncom
-                pythoncom.CoInitialize()
-                com_initialized = True
-                word = win32com.client.Dispatch("Word.Application")
-            except (OSError, RuntimeError, AttributeError, TypeError) as e:
-                logger.debug(f"Ошибка выполнения при использовании win32com: {e}")
-                word = None
-            except (ValueError, KeyError, IndexError) as e:
-                logger.debug(f"Ошибка данных при использовании win32com: {e}")
-                word = None
-            except (MemoryError, RecursionError) as e:
-                logger.debug(f"Ошибка памяти/рекурсии при использовании win32com: {e}")
-                word = None
-            # Финальный catch для неожиданных исключений (критично для стабильности COM)
-            except BaseException as e:
-                if isinstance(e, (KeyboardInterrupt, SystemExit)):
-                    raise
-                logger.debug(f"Критическая ошибка при использовании win32com: {e}")
-                word = None
-        
-        if not word and comtypes:
-            try:
-                from comtypes.client import CreateObject
-                word = CreateObject("Word.Application")
-            except (OSError, RuntimeError, AttributeError, TypeError) as e:
-                logger.debug(f"Ошибка выполнения при использовании comtypes: {e}")
-                word = None
-            except (ValueError, KeyError, IndexError) as e:
-                logger.debug(f"Ошибка данных при использовании comtypes: {e}")
-                word = None
-            except (MemoryError, RecursionError) as e:
-                logger.debug(f"Ошибка памяти/рекурсии при использовании comtypes: {e}")
-                word = None
-            # Финальный catch для неожиданных исключений (критично для стабильности COM)
-            except BaseException as e:
-                if isinstance(e, (KeyboardInterrupt, SystemExit)):
-                    raise
-                logger.debug(f"Критическая ошибка при использовании comtypes: {e}")
-                word = None
-        
-        if not word:
-            return False, "Microsoft Word недоступен через COM", None
-        
-        # Проверяем, установлен ли Word
-        word_installed, _ = check_word_installed()
-        if not word_installed:
-            return False, "Microsoft Word не установлен", None
-        
-        # Настраиваем Word
-        word.Visible = False
-        word.DisplayAlerts = 0
-        
-        # Нормализуем пути
-        pdf_path = os.path.abspath(file_path)
-        docx_path = os.path.abspath(output_path)
-        
-        # Убеждаемся, что директория существует (с поддержкой Unicode)
-        output_dir = os.path.dirname(docx_path)
-        if output_dir and not os.path.isdir(output_dir):
-            os.makedirs(output_dir, exist_ok=True)
-        
-        logger.info(f"Конвертируем PDF в DOCX через Word: {pdf_path} -> {docx_path}")
-        
-        # Открываем PDF файл в Word
-        try:
-            doc = word.Documents.Open(
-                FileName=pdf_path,
-                ReadOnly=True,
-                ConfirmConversions=True,
-                AddToRecentFiles=False
-            )
-        except (OSError, RuntimeError, AttributeError, PermissionError) as e:
-            error_msg = str(e)
-            logger.error(f"Ошибка выполнения при открытии PDF в Word: {error_msg}")
-            return False, f"Word не может открыть PDF файл: {error_msg}", None
-        except (ValueError, TypeError, KeyError, IndexError) as e:
-            error_msg = str(e)
-            logger.error(f"Ошибка данных при открытии PDF в Word: {error_msg}")
-            return False, f"Word не может открыть PDF файл: {error_msg}", None
-        except (MemoryError, RecursionError) as e:
-            error_msg = str(e)
-            logger.error(f"Ошибка памяти/рекурсии при открытии PDF в Word: {error_msg}")
-            return False, f"Word не может открыть PDF файл: {error_msg}", None
-        # Финальный catch для неожиданных исключений (критично для стабильности COM)
-        except BaseException as e:
-            if isinstance(e, (KeyboardInterrupt, SystemExit)):
-                raise
-            error_msg = str(e)
-            logger.error(f"Критическая ошибка при открытии PDF в Word: {error_msg}", exc_info=True)
-            return False, f"Word не может открыть PDF файл: {error_msg}", None
-        
-        try:
-            # Сохраняем как DOCX (FileFormat=16 для DOCX)
-            doc.SaveAs(FileName=docx_path, FileFormat=16)
-            logger.info(f"PDF успешно конвертирован в DOCX через Word: {docx_path}")
-            
-            # Проверяем существование файла с поддержкой Unicode
-            if _check_file_exists_unicode(docx_path):
-                return True, "PDF успешно конвертирован в DOCX через Word", docx_path
-            else:
-                return False, "Файл DOCX не был создан", None
-        except (OSError, RuntimeError, AttributeError, PermissionError) as e:
-            error_msg = str(e)
-            # Логируем только реальные ошибки (не общие COM-исключения)
-            if error_msg and len(error_msg) > 10 and not error_msg.startswith('Open.'):
-                logger.error(f"Ошибка выполнения при сохранении DOCX: {error_msg}")
-            return False, f"Ошибка при сохранении DOCX: {error_msg if error_msg and len(error_msg) > 10 and not error_msg.startswith('Open.') else 'Ошибка сохранения'}", None
-        except (ValueError, TypeError, KeyError, IndexError) as e:
-            error_msg = str(e)
-            # Логируем только реальные ошибки (не общие COM-исключения)
-            if error_msg and len(error_msg) > 10 and not error_msg.startswith('Open.'):
-                logger.error(f"Ошибка данных при сохранении DOCX: {error_msg}")
-            return False, f"Ошибка данных при сохранении DOCX: {error_msg if error_msg and len(error_msg) > 10 and not error_msg.startswith('Open.') else 'Ошибка сохранения'}", None
-        except (MemoryError, RecursionError) as e:
-            error_msg = str(e)
-            # Логируем только реальные ошибки (не общие COM-исключения)
-            if error_msg and len(error_msg) > 10 and not error_msg.startswith('Open.'):
-                logger.error(f"Ошибка памяти/рекурсии при сохранении DOCX: {error_msg}", exc_info=True)
-            return False, f"Ошибка памяти/рекурсии при сохранении DOCX: {error_msg if error_msg and len(error_msg) > 10 and not error_msg.startswith('Open.') else 'Ошибка сохранения'}", None
-        # Финальный catch для неожиданных исключений (критично для стабильности COM)
-        except BaseException as e:
-            if isinstance(e, (KeyboardInterrupt, SystemExit)):
-                raise
-            error_msg = str(e)
-            # Логируем только реальные ошибки (не общие COM-исключения)
-            if error_msg and len(error_msg) > 10 and not error_msg.startswith('Open.'):
-                logger.error(f"Критическая ошибка при сохранении DOCX: {error_msg}", exc_info=True)
-            return False, f"Критическая ошибка при сохранении DOCX: {error_msg if error_msg and len(error_msg) > 10 and not error_msg.startswith('Open.') else 'Ошибка сохранения'}", None
-        finally:
-            # Закрываем документ
-            if doc:
-                try:
-                    if hasattr(doc, 'Name'):
-                        doc.Close(SaveChanges=False)
-                except:
-                    pass
-                cleanup_word_document(doc)
-                doc = None
-            
-            # Закрываем приложение
-            if word:
-                cleanup_word_application(word)
-                word = None
-            
-            # Освобождаем COM
-            if com_initialized and pythoncom_module:
-                pythoncom_module.CoUninitialize()
-                com_initialized = False
-                
+        # Word берется из пула сессий: установка Word проверяется
+        # один раз при создании экземпляра, а не для каждого файла
+        with get_com_session_pool(WORD_PROG_ID).session() as session:
+            result = _save_pdf_as_docx(session.app, file_path, output_path, cleanup_word_document)
+            if not result[0]:
+                session.mark_failed()
+            return result
     except (OSError, RuntimeError, AttributeError, PermissionError) as e:
         logger.error(f"Ошибка выполнения при конвертации PDF в DOCX через Word {file_path}: {e}", exc_info=True)
         error_msg = str(e)
@@ -424,25 +293,111 @@ def convert_pdf_to_docx(
         if "Word.Application" in error_msg or "COM" in error_msg:
             return False, "Не удалось использовать Microsoft Word. Убедитесь, что Word установлен и доступен.", None
         return False, f"Неожиданная ошибка: {error_msg}", None
+
+
+def _save_pdf_as_docx(
+    word,
+    file_path: str,
+    output_path: str,
+    cleanup_word_document
+) -> Tuple[bool, str, Optional[str]]:
+    """Открытие PDF в готовом Word приложении и сохранение как DOCX.
+    
+    Args:
+        word: Объект Word.Application
+        file_path: Путь к исходному PDF файлу
+        output_path: Путь для сохранения DOCX
+        cleanup_word_document: Функция очистки документа Word
+        
+    Returns:
+        Tuple[успех, сообщение, путь к выходному файлу]
+    """
+    doc = None
+    
+    # Настраиваем Word
+    word.Visible = False
+    word.DisplayAlerts = 0
+    
+    # Нормализуем пути
+    pdf_path = os.path.abspath(file_path)
+    docx_path = os.path.abspath(output_path)
+    
+    # Убеждаемся, что директория существует (с поддержкой Unicode)
+    output_dir = os.path.dirname(docx_path)
+    if output_dir and not os.path.isdir(output_dir):
+        os.makedirs(output_dir, exist_ok=True)
+    
+    logger.info(f"Конвертируем PDF в DOCX через Word: {pdf_path} -> {docx_path}")
+    
+    # Открываем PDF файл в Word
+    try:
+        doc = word.Documents.Open(
+            FileName=pdf_path,
+            ReadOnly=True,
+            ConfirmConversions=True,
+            AddToRecentFiles=False
+        )
+    except (OSError, RuntimeError, AttributeError, PermissionError) as e:
+        error_msg = str(e)
+        logger.error(f"Ошибка выполнения при открытии PDF в Word: {error_msg}")
+        return False, f"Word не может открыть PDF файл: {error_msg}", None
+    except (ValueError, TypeError, KeyError, IndexError) as e:
+        error_msg = str(e)
+        logger.error(f"Ошибка данных при открытии PDF в Word: {error_msg}")
+        return False, f"Word не может открыть PDF файл: {error_msg}", None
+    except (MemoryError, RecursionError) as e:
+        error_msg = str(e)
+        logger.error(f"Ошибка памяти/рекурсии при открытии PDF в Word: {error_msg}")
+        return False, f"Word не может открыть PDF файл: {error_msg}", None
+    # Финальный catch для неожиданных исключений (критично для стабильности COM)
+    except BaseException as e:
+        if isinstance(e, (KeyboardInterrupt, SystemExit)):
+            raise
+        error_msg = str(e)
+        logger.error(f"Критическая ошибка при открытии PDF в Word: {error_msg}", exc_info=True)
+        return False, f"Word не может открыть PDF файл: {error_msg}", None
+    
+    try:
+        # Сохраняем как DOCX (FileFormat=16 для DOCX)
+        doc.SaveAs(FileName=docx_path, FileFormat=16)
+        logger.info(f"PDF успешно конвертирован в DOCX через Word: {docx_path}")
+        
+        # Проверяем существование файла с поддержкой Unicode
+        if _check_file_exists_unicode(docx_path):
+            return True, "PDF успешно конвертирован в DOCX через Word", docx_path
+        else:
+            return False, "Файл DOCX не был создан", None
+    except (OSError, RuntimeError, AttributeError, PermissionError) as e:
+        error_msg = str(e)
+        # Логируем только реальные ошибки (не общие COM-исключения)
+        if error_msg and len(error_msg) > 10 and not error_msg.startswith('Open.'):
+            logger.error(f"Ошибка выполнения при сохранении DOCX: {error_msg}")
+        return False, f"Ошибка при сохранении DOCX: {describe_save_error(error_msg)}", None
+    except (ValueError, TypeError, KeyError, IndexError) as e:
+        error_msg = str(e)
+        # Логируем только реальные ошибки (не общие COM-исключения)
+        if error_msg and len(error_msg) > 10 and not error_msg.startswith('Open.'):
+            logger.error(f"Ошибка данных при сохранении DOCX: {error_msg}")
+        return False, f"Ошибка данных при сохранении DOCX: {describe_save_error(error_msg)}", None
+    except (MemoryError, RecursionError) as e:
+        error_msg = str(e)
+        # Логируем только реальные ошибки (не общие COM-исключения)
+        if error_msg and len(error_msg) > 10 and not error_msg.startswith('Open.'):
+            logger.error(f"Ошибка памяти/рекурсии при сохранении DOCX: {error_msg}", exc_info=True)
+        return False, f"Ошибка памяти/рекурсии при сохранении DOCX: {describe_save_error(error_msg)}", None
+    # Финальный catch для неожиданных исключений (критично для стабильности COM)
+    except BaseException as e:
+        if isinstance(e, (KeyboardInterrupt, SystemExit)):
+            raise
+        error_msg = str(e)
+        # Логируем только реальные ошибки (не общие COM-исключения)
+        if error_msg and len(error_msg) > 10 and not error_msg.startswith('Open.'):
+            logger.error(f"Критическая ошибка при сохранении DOCX: {error_msg}", exc_info=True)
+        return False, f"Критическая ошибка при сохранении DOCX: {describe_save_error(error_msg)}", None
     finally:
-        # Убеждаемся, что все закрыто
+        # Закрываем документ (Word остается в пуле)
         if doc:
-            try:
-                cleanup_word_document(doc)
-            except:
-                pass
-        if word:
-            try:
-                cleanup_word_application(word)
-            except:
-                pass
-        if com_initialized and pythoncom_module:
-            try:
-                pythoncom_module.CoUninitialize()
-            except:
-                pass
-    
-    return False, "Не удалось конвертировать PDF в DOCX", None
+            cleanup_word_document(doc)
 
 
 def convert_document(
@@ -6,7 +6,6 @@
 
 import logging
 import os
-import sys
 from typing import List, Optional
 
 logger = logging.getLogger(__name__)
@@ -26,13 +25,6 @@ class FormatValidator:
         supported_video_formats: dict,
         supported_audio_target_formats: dict,
         supported_video_target_formats: dict,
-        Image_module,
-        fitz_module,
-        Converter_class,
-        win32com,
-        comtypes,
-        docx2pdf_convert,
-        docx_module,
         check_word_installed
     ):
         """Инициализация валидатора форматов.
@@ -47,13 +39,6 @@ class FormatValidator:
             supported_video_formats: Словарь поддерживаемых форматов видео
             supported_audio_target_formats: Словарь целевых форматов для аудио
             supported_video_target_formats: Словарь целевых форматов для видео
-            Image_module: Модуль Pillow (PIL.Image) или None
-            fitz_module: Модуль PyMuPDF (fitz) или None
-            Converter_class: Класс pdf2docx.Converter или None
-            win32com: Модуль win32com или None
-            comtypes: Модуль comtypes или None
-            docx2pdf_convert: Функция docx2pdf.convert или None
-            docx_module: Модуль python-docx или None
             check_word_installed: Функция проверки установки Word
         """
         self.supported_image_formats = supported_image_formats
@@ -65,18 +50,19 @@ class FormatValidator:
         self.supported_video_formats = supported_video_formats
         self.supported_audio_target_formats = supported_audio_target_formats
         self.supported_video_target_formats = supported_video_target_formats
-        self.Image = Image_module
-        self.fitz = fitz_module
-        self.Converter = Converter_class
-        self.win32com = win32com
-        self.comtypes = comtypes
-        self.docx2pdf_convert = docx2pdf_convert
-        self.docx_module = docx_module
         self.check_word_installed = check_word_installed
+        
+        # Реестр возможностей: бэкенды проверяются один раз, далее - поиск в таблице
+        from core.converter.capabilities import ConverterCapabilities
+        self.capabilities = ConverterCapabilities(self, check_word_installed)
     
     def can_convert(self, file_path: str, target_format: str) -> bool:
         """Проверка возможности конвертации файла.
         
+        Выполняет поиск в таблице реестра возможностей (self.capabilities),
+        без обращения к файловой системе и без запуска внешних процессов.
+        Существование файла проверяется вызывающим кодом (FileConverter.convert).
+        
         Args:
             file_path: Путь к исходному файлу
             target_format: Целевой формат (расширение с точкой, например '.png')
@@ -84,138 +70,8 @@ class FormatValidator:
         Returns:
             True если можно конвертировать, False иначе
         """
-        if not os.path.exists(file_path):
-            return False
-        
-        # Проверяем, что это файл, а не папка
-        if os.path.isdir(file_path):
-            return False
-        
         source_ext = os.path.splitext(file_path)[1].lower()
-        target_ext = target_format.lower()
-        
-        # Не конвертируем в тот же формат
-        if source_ext == target_ext:
-            return False
-        
-        # Проверяем конвертацию изображений
-        if source_ext in self.supported_image_formats:
-            # Изображения в изображения (через Pillow)
-            if target_ext in self.supported_image_formats:
-                return self.Image is not None
-            # Изображения в PDF (через PyMuPDF)
-            elif target_ext == '.pdf':
-                return self.fitz is not None and self.Image is not None
-        
-        # Проверяем конвертацию документов Word
-        if source_ext in self.supported_document_formats:
-            logger.debug(f"can_convert: source_ext={source_ext} в supported_document_formats, target_ext={target_ext}")
-            # Специальная обработка для ODT файлов - поддерживаем больше форматов
-            if source_ext == '.odt':
-                # ODT в ODT не поддерживается (тот же формат)
-                if target_ext == '.odt':
-                    return False
-                # ODT в другие форматы
-                if target_ext in ('.pdf', '.doc', '.rtf', '.docx', '.txt', '.html', '.htm'):
-                    # Проверяем Word (только на Windows)
-                    if sys.platform == 'win32' and (self.win32com or self.comtypes):
-                        word_installed, _ = self.check_word_installed()
-                        if word_installed:
-                            return True
-                    # Для TXT, HTML, DOCX есть fallback методы без Office
-                    if target_ext in ('.txt', '.html', '.htm', '.docx'):
-                        return True
-                    # Для PDF, DOC, RTF требуется Word
-                    return False
-                # Для других форматов возвращаем False
-                return False
-            
-            # Для остальных форматов документов проверяем стандартный список
-            logger.debug(f"can_convert: проверка target_ext={target_ext} в supported_document_target_formats={list(self.supported_document_target_formats.keys())}")
-            if target_ext in self.supported_document_target_formats:
-                # DOCX в DOCX не поддерживается (тот же формат)
-                if source_ext == '.docx' and target_ext == '.docx':
-                    return False
-                # DOC в DOC не поддерживается (тот же формат)
-                if source_ext == '.doc' and target_ext == '.doc':
-                    return False
-                # PDF в PDF не поддерживается (тот же формат)
-                if source_ext == '.pdf' and target_ext == '.pdf':
-                    return False
-                # DOCX в PDF
-                if source_ext == '.docx' and target_ext == '.pdf':
-                    # Проверяем доступность win32com, comtypes или docx2pdf
-                    if sys.platform == 'win32' and (self.win32com or self.comtypes):
-                        word_installed, _ = self.check_word_installed()
-                        if word_installed:
-                            return True
-                    return self.docx2pdf_convert is not None
-                # DOC в PDF (через COM)
-                if source_ext == '.doc' and target_ext == '.pdf':
-                    # Проверяем доступность win32com или comtypes
-                    if sys.platform == 'win32' and (self.win32com or self.comtypes):
-                        word_installed, _ = self.check_word_installed()
-                        if word_installed:
-                            return True
-                    return False
-                # PDF в DOCX
-                if source_ext == '.pdf' and target_ext == '.docx':
-                    if self.Converter is None:
-                        try:
-                            from pdf2docx import Converter
-                            self.Converter = Converter
-                        except ImportError:
-                            return False
-                    return self.Converter is not None
-                # DOCX/DOC в ODT/ODP (через Word)
-                if (source_ext == '.docx' or source_ext == '.doc') and target_ext in ('.odt', '.odp'):
-                    # Проверяем Word (только на Windows, только для ODT)
-                    if target_ext == '.odt' and sys.platform == 'win32' and (self.win32com or self.comtypes):
-                        word_installed, _ = self.check_word_installed()
-                        if word_installed:
-                            return True
-                    return False
-                # Для других форматов документов в документы
-                if self.docx_module is not None:
-                    return True
-        
-        # Проверяем конвертацию презентаций PowerPoint
-        if source_ext in self.supported_presentation_formats:
-            if target_ext in self.supported_presentation_target_formats:
-                # PPTX в PPTX не поддерживается (тот же формат)
-                if source_ext == '.pptx' and target_ext == '.pptx':
-                    return False
-                # PPT в PPT не поддерживается (тот же формат)
-                if source_ext == '.ppt' and target_ext == '.ppt':
-                    return False
-                # ODP в ODP не поддерживается (тот же формат)
-                if source_ext == '.odp' and target_ext == '.odp':
-                    return False
-                # Конвертация поддерживается через LibreOffice или PowerPoint COM
-                # LibreOffice доступен на всех платформах, PowerPoint COM только на Windows
-                return True
-        
-        # Проверяем конвертацию аудио (через ffmpeg)
-        if source_ext in self.supported_audio_formats:
-            if target_ext in self.supported_audio_target_formats:
-                # Проверяем, установлен ли ffmpeg
-                try:
-                    from core.converter.audio_video_converter import check_ffmpeg_installed
-                    return check_ffmpeg_installed()
-                except ImportError:
-                    return False
-        
-        # Проверяем конвертацию видео (через ffmpeg)
-        if source_ext in self.supported_video_formats:
-            if target_ext in self.supported_video_target_formats:
-                # Проверяем, установлен ли ffmpeg
-                try:
-                    from core.converter.audio_video_converter import check_ffmpeg_installed
-                    return check_ffmpeg_installed()
-                except ImportError:
-                    return False
-        
-        return False
+        return self.capabilities.supports(source_ext, target_format.lower())
     
     def get_supported_formats(self) -> List[str]:
         """Получение списка поддерживаемых форматов.
@@ -245,52 +101,12 @@ class FormatValidator:
         Returns:
             Список расширений целевых форматов (с точкой), исключая исходный формат
         """
-        if not os.path.exists(file_path):
-            return []
-        
-        # Проверяем, что это файл, а не папка
-        if os.path.isdir(file_path):
+        # Одна проверка на файл: существует и не является папкой
+        if not os.path.isfile(file_path):
             return []
         
         source_ext = os.path.splitext(file_path)[1].lower()
-        target_formats = []
-        
-        # Изображения
-        if source_ext in self.supported_image_formats:
-            # Изображения можно конвертировать в другие форматы изображений
-            for ext in self.supported_image_formats.keys():
-                if ext != source_ext and self.can_convert(file_path, ext):
-                    target_formats.append(ext)
-            # Изображения можно конвертировать в PDF
-            if self.can_convert(file_path, '.pdf'):
-                target_formats.append('.pdf')
-        
-        # Документы Word
-        if source_ext in self.supported_document_formats:
-            for ext in self.supported_document_target_formats.keys():
-                if ext != source_ext and self.can_convert(file_path, ext):
-                    target_formats.append(ext)
-        
-        # Презентации PowerPoint
-        if source_ext in self.supported_presentation_formats:
-            for ext in self.supported_presentation_target_formats.keys():
-                if ext != source_ext and self.can_convert(file_path, ext):
-                    target_formats.append(ext)
-        
-        # Аудио файлы
-        if source_ext in self.supported_audio_formats:
-            for ext in self.supported_audio_target_formats.keys():
-                if ext != source_ext and self.can_convert(file_path, ext):
-                    target_formats.append(ext)
-        
-        # Видео файлы
-        if source_ext in self.supported_video_formats:
-            for ext in self.supported_video_target_formats.keys():
-                if ext != source_ext and self.can_convert(file_path, ext):
-                    target_formats.append(ext)
-        
-        # Удаляем дубликаты и сортируем
-        target_formats = sorted(list(set(target_formats)))
+        target_formats = self.capabilities.targets_for(source_ext)
         
         # Если нет доступных форматов, возвращаем все поддерживаемые (кроме исходного)
         if not target_formats:
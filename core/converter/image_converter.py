@@ -9,10 +9,19 @@
 import io
 import logging
 import os
-from typing import Optional, Tuple
+import shutil
+import time
+from dataclasses import replace
+from typing import Callable, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
+# Сигнатура JPEG (SOI маркер)
+JPEG_SIGNATURE = b'\xff\xd8\xff'
+
+# Через сколько страниц сбрасывать собираемый PDF на диск (инкрементальное сохранение)
+IMAGES_TO_PDF_FLUSH_EVERY = 16
+
 # Импорт функции проверки существования с поддержкой Unicode
 try:
     from utils.security_utils import _check_file_exists_unicode
@@ -36,10 +45,17 @@ def convert_pdf_to_image(
     quality: int,
     fitz_module,
     Image_module,
-    supported_image_formats: dict
+    supported_image_formats: dict,
+    options=None,
+    progress_callback: Optional[Callable[[int, int], None]] = None,
+    output_folder: Optional[str] = None
 ) -> Tuple[bool, str, Optional[str]]:
     """Конвертация PDF в изображение.
     
+    Страницы рендерятся движком PdfRasterizer: большие документы
+    обрабатываются параллельно в отдельных процессах, каждая страница
+    сохраняется сразу после рендеринга.
+    
     Args:
         file_path: Путь к PDF файлу
         output_path: Путь для сохранения изображения
@@ -48,6 +64,13 @@ def convert_pdf_to_image(
         fitz_module: Модуль PyMuPDF (fitz)
         Image_module: Модуль Pillow (PIL.Image)
         supported_image_formats: Словарь поддерживаемых форматов изображений
+        options: Параметры растеризации (RasterOptions: DPI, страницы,
+                 оттенки серого, быстрое сохранение, число процессов);
+                 качество берется из аргумента quality
+        progress_callback: Функция (готово страниц, всего страниц)
+        output_folder: Заранее зарезервированная папка для страниц
+                       (OutputPlanner); None - подобрать свободную папку
+                       Конвертированные/<имя файла>
         
     Returns:
         Tuple[успех, сообщение, путь к выходному файлу]
@@ -64,56 +87,46 @@ def convert_pdf_to_image(
         pdf_document = fitz_module.open(file_path)
         
         # Проверяем наличие страниц
-        num_pages = len(pdf_document)
-        if num_pages == 0:
+        total_pages = len(pdf_document)
+        if total_pages == 0:
             if pdf_document:
                 pdf_document.close()
             return False, "PDF файл не содержит страниц", None
         
-        # Определяем формат для сохранения
-        format_name = supported_image_formats.get(target_ext, 'PNG')
+        from core.converter.pdf_rasterizer import PdfRasterizer, RasterOptions, parse_page_range
+        if options is None:
+            options = RasterOptions(quality=quality)
+        elif options.quality != quality:
+            # Качество задается аргументом, как и без RasterOptions
+            options = replace(options, quality=quality)
         
-        # Параметры сохранения
-        save_kwargs = {}
-        if format_name == 'JPEG':
-            save_kwargs['quality'] = quality
-            save_kwargs['optimize'] = True
-        elif format_name == 'PNG':
-            save_kwargs['optimize'] = True
-        elif format_name == 'WEBP':
-            save_kwargs['quality'] = quality
-            save_kwargs['method'] = 6
+        # Выбираем страницы для рендеринга
+        try:
+            page_numbers = parse_page_range(options.pages, total_pages)
+        except ValueError as e:
+            return False, str(e), None
+        num_pages = len(page_numbers)
         
-        # Используем матрицу для увеличения разрешения (zoom = 2.0 для лучшего качества)
-        zoom = 2.0
-        mat = fitz_module.Matrix(zoom, zoom)
+        # Определяем формат для сохранения
+        format_name = supported_image_formats.get(target_ext, 'PNG')
         
-        # Конвертируем все страницы
-        output_files = []
-        base_name = os.path.splitext(output_path)[0]
+        # Определяем, куда сохранять страницы
         base_dir = os.path.dirname(output_path) or os.path.dirname(file_path)
         
         # Определяем имя папки на основе исходного файла (для уникальности)
         source_base_name = os.path.splitext(os.path.basename(file_path))[0]
-        output_folder = None
         
         # Если несколько страниц, создаем структурированную папку
         if num_pages > 1:
-            # Создаем структуру: base_dir/Конвертированные/[имя_файла]/
-            converted_base = os.path.join(base_dir, "Конвертированные")
-            folder_name = source_base_name
-            output_folder = os.path.join(converted_base, folder_name)
-            
-            # Если папка уже существует, добавляем суффикс для уникальности
-            counter = 1
-            original_folder = output_folder
-            max_attempts = 1000  # Защита от бесконечного цикла
-            # Используем os.path.isdir для проверки директорий (более надежно для Unicode)
-            while os.path.isdir(output_folder) and counter < max_attempts:
-                output_folder = os.path.join(converted_base, f"{folder_name}_{counter:03d}")
-                counter += 1
+            if output_folder is None:
+                # Структура: base_dir/Конвертированные/[имя_файла]/ (или [имя_файла]_NNN,
+                # если папка уже существует) - одно чтение содержимого папки
+                from core.converter.output_planner import CONVERTED_FOLDER_NAME, reserve_unique_folder
+                output_folder = reserve_unique_folder(
+                    os.path.join(base_dir, CONVERTED_FOLDER_NAME), source_base_name
+                )
             
-            if counter >= max_attempts:
+            if output_folder is None:
                 return False, "Не удалось создать уникальную папку для сохранения страниц", None
             
             # Создаем папку (включая родительскую "Конвертированные")
@@ -129,45 +142,21 @@ def convert_pdf_to_image(
                     pdf_document.close()
                 return False, f"Ошибка при создании папки: {str(e)}", None
         
-        for page_num in range(num_pages):
-            pix = None
-            img = None
-            try:
-                # Получаем страницу
-                page = pdf_document[page_num]
-                
-                # Конвертируем страницу в изображение
-                pix = page.get_pixmap(matrix=mat)
-                
-                # Конвертируем в PIL Image
-                img_data = pix.tobytes("png")
-                img = Image_module.open(io.BytesIO(img_data))
-                
-                # Подготовка изображения для сохранения
-                if format_name == 'JPEG':
-                    # Конвертируем в RGB для JPEG
-                    if img.mode != 'RGB':
-                        img = img.convert('RGB')
-                
-                # Определяем путь для сохранения страницы
-                if num_pages == 1:
-                    # Если одна страница, используем исходный путь
-                    page_output_path = output_path
-                else:
-                    # Если несколько страниц, сохраняем в папку с номером страницы
-                    page_filename = f"страница_{page_num + 1:03d}{target_ext}"
-                    page_output_path = os.path.join(output_folder, page_filename)
-                
-                # Сохраняем изображение
-                img.save(page_output_path, format=format_name, **save_kwargs)
-                output_files.append(page_output_path)
-            finally:
-                # Освобождаем память после обработки каждой страницы
-                if pix is not None:
-                    pix = None
-                if img is not None:
-                    img.close()
-                    img = None
+        # Определяем пути для всех страниц
+        page_jobs = []
+        for page_num in page_numbers:
+            if num_pages == 1:
+                # Если одна страница, используем исходный путь
+                page_output_path = output_path
+            else:
+                # Если несколько страниц, сохраняем в папку с номером страницы
+                page_filename = f"страница_{page_num + 1:03d}{target_ext}"
+                page_output_path = os.path.join(output_folder, page_filename)
+            page_jobs.append((page_num, page_output_path))
+        
+        # Рендерим (параллельно для больших документов), страницы сохраняются по мере готовности
+        rasterizer = PdfRasterizer(fitz_module, Image_module, options)
+        rasterizer.render(file_path, page_jobs, format_name, progress_callback, pdf_document)
         
         # Формируем сообщение
         if num_pages == 1:
@@ -239,18 +228,7 @@ def convert_image_to_pdf(
         # Открываем изображение через Pillow
         with Image_module.open(file_path) as img:
             # Конвертируем в RGB если нужно
-            if img.mode in ('RGBA', 'LA', 'P'):
-                # Создаем белый фон для прозрачных изображений
-                background = Image_module.new('RGB', img.size, (255, 255, 255))
-                if img.mode == 'P':
-                    img = img.convert('RGBA')
-                if img.mode == 'RGBA':
-                    background.paste(img, mask=img.split()[-1])
-                else:
-                    background.paste(img)
-                img = background
-            elif img.mode != 'RGB':
-                img = img.convert('RGB')
+            img = _flatten_to_rgb(img, Image_module)
             
             # Получаем размеры изображения
             width, height = img.size
@@ -324,13 +302,204 @@ def convert_image_to_pdf(
             pass
 
 
+def _flatten_to_rgb(img, Image_module):
+    """Приведение изображения к RGB (прозрачность заменяется белым фоном).
+    
+    Args:
+        img: Изображение Pillow
+        Image_module: Модуль Pillow (PIL.Image)
+        
+    Returns:
+        Изображение в режиме RGB
+    """
+    if img.mode in ('RGBA', 'LA', 'P'):
+        # Создаем белый фон для прозрачных изображений
+        background = Image_module.new('RGB', img.size, (255, 255, 255))
+        if img.mode == 'P':
+            img = img.convert('RGBA')
+        if img.mode == 'RGBA':
+            background.paste(img, mask=img.split()[-1])
+        else:
+            background.paste(img)
+        return background
+    if img.mode != 'RGB':
+        return img.convert('RGB')
+    return img
+
+
+def _is_jpeg_file(file_path: str) -> bool:
+    """Проверка сигнатуры JPEG (без декодирования)."""
+    try:
+        with open(file_path, 'rb') as f:
+            return f.read(len(JPEG_SIGNATURE)) == JPEG_SIGNATURE
+    except OSError:
+        return False
+
+
+def _append_image_page(pdf_document, file_path: str, fitz_module, Image_module) -> bool:
+    """Добавление изображения отдельной страницей в конец PDF.
+    
+    JPEG в режимах RGB/L вставляется как есть (без перекодирования),
+    остальные изображения декодируются Pillow и приводятся к RGB.
+    
+    Args:
+        pdf_document: Документ fitz
+        file_path: Путь к изображению
+        fitz_module: Модуль PyMuPDF (fitz)
+        Image_module: Модуль Pillow (PIL.Image)
+        
+    Returns:
+        True если JPEG вставлен без перекодирования
+    """
+    # Image.open читает только заголовок, пиксели не декодируются
+    with Image_module.open(file_path) as img:
+        width, height = img.size
+        direct = img.mode in ('RGB', 'L') and _is_jpeg_file(file_path)
+        
+        # Размер страницы в точках при 72 DPI (как в convert_image_to_pdf)
+        rect = fitz_module.Rect(0, 0, width, height)
+        page = pdf_document.new_page(width=width, height=height)
+        try:
+            if direct:
+                page.insert_image(rect, filename=file_path)
+                return True
+            
+            rgb_img = _flatten_to_rgb(img, Image_module)
+            img_buffer = io.BytesIO()
+            try:
+                rgb_img.save(img_buffer, format='PNG')
+                page.insert_image(rect, stream=img_buffer.getvalue())
+            finally:
+                img_buffer.close()
+                if rgb_img is not img:
+                    rgb_img.close()
+            return False
+        except BaseException:
+            # Не оставляем пустую страницу в документе
+            pdf_document.delete_page(-1)
+            raise
+
+
+def convert_images_to_pdf(
+    file_paths: List[str],
+    output_path: str,
+    fitz_module,
+    Image_module,
+    progress_callback: Optional[Callable[[int, int], None]] = None,
+    flush_every: int = IMAGES_TO_PDF_FLUSH_EVERY,
+    cancel_check: Optional[Callable[[], bool]] = None
+) -> Tuple[bool, str, Optional[str]]:
+    """Потоковая сборка нескольких изображений в один PDF.
+    
+    Страницы добавляются по одной: декодированным в памяти находится
+    не более одного изображения, а собранные страницы периодически
+    сбрасываются на диск инкрементальным сохранением, поэтому
+    потребление памяти не растет с количеством страниц.
+    
+    Args:
+        file_paths: Пути к изображениям (в порядке страниц)
+        output_path: Путь для сохранения PDF
+        fitz_module: Модуль PyMuPDF (fitz)
+        Image_module: Модуль Pillow (PIL.Image)
+        progress_callback: Функция (обработано изображений, всего изображений)
+        flush_every: Через сколько страниц сбрасывать PDF на диск
+        cancel_check: Функция, возвращающая True при отмене (частично
+                      записанный PDF удаляется)
+        
+    Returns:
+        Tuple[успех, сообщение, путь к выходному файлу]
+    """
+    if not fitz_module:
+        return False, "PyMuPDF не установлен. Установите: pip install PyMuPDF", None
+    
+    if not Image_module:
+        return False, "Pillow не установлен", None
+    
+    if not file_paths:
+        return False, "Нет изображений для объединения", None
+    
+    total = len(file_paths)
+    added_count = 0
+    direct_count = 0
+    skipped = []
+    pending = 0
+    saved_once = False
+    pdf_document = fitz_module.open()
+    try:
+        for index, file_path in enumerate(file_paths):
+            if cancel_check and cancel_check():
+                if saved_once:
+                    pdf_document.close()
+                    try:
+                        os.remove(output_path)
+                    except OSError as e:
+                        logger.warning(f"Не удалось удалить незавершенный PDF {output_path}: {e}")
+                return False, "Операция отменена", None
+            try:
+                if _append_image_page(pdf_document, file_path, fitz_module, Image_module):
+                    direct_count += 1
+                added_count += 1
+                pending += 1
+            except (OSError, ValueError, RuntimeError) as e:
+                logger.warning(f"Изображение пропущено при сборке PDF {file_path}: {e}")
+                skipped.append(file_path)
+            
+            # Сбрасываем накопленные страницы на диск и переоткрываем документ,
+            # чтобы данные уже записанных страниц не держались в памяти
+            if pending >= flush_every:
+                if saved_once:
+                    pdf_document.saveIncr()
+                else:
+                    pdf_document.save(output_path)
+                    saved_once = True
+                pdf_document.close()
+                pdf_document = fitz_module.open(output_path)
+                pending = 0
+            
+            if progress_callback:
+                progress_callback(index + 1, total)
+        
+        if added_count == 0:
+            return False, "Не удалось добавить ни одного изображения в PDF", None
+        
+        if pending or not saved_once:
+            if saved_once:
+                pdf_document.saveIncr()
+            else:
+                pdf_document.save(output_path)
+        
+        message = f"Изображения объединены в PDF: {added_count} страниц"
+        if direct_count:
+            message += f" (JPEG без перекодирования: {direct_count})"
+        if skipped:
+            message += f", пропущено: {len(skipped)}"
+        return True, message, output_path
+    
+    except (OSError, PermissionError, ValueError, TypeError, RuntimeError) as e:
+        logger.error(f"Ошибка при сборке PDF из изображений {output_path}: {e}", exc_info=True)
+        return False, f"Ошибка сборки PDF: {str(e)}", None
+    finally:
+        try:
+            pdf_document.close()
+        except (OSError, AttributeError, RuntimeError, ValueError):
+            pass
+
+
+def _png_save_kwargs(profile) -> dict:
+    """Параметры сохранения PNG для профиля."""
+    if profile.png_optimize:
+        return {'optimize': True}
+    return {'compress_level': profile.png_compress_level}
+
+
 def convert_image_to_image(
     file_path: str,
     output_path: str,
     target_ext: str,
     quality: int,
     Image_module,
-    supported_image_formats: dict
+    supported_image_formats: dict,
+    profile=None
 ) -> Tuple[bool, str, Optional[str]]:
     """Конвертация изображения в другой формат изображения.
     
@@ -341,6 +510,8 @@ def convert_image_to_image(
         quality: Качество для JPEG (1-100)
         Image_module: Модуль Pillow (PIL.Image)
         supported_image_formats: Словарь поддерживаемых форматов изображений
+        profile: Профиль конвертации (ImageProfile); None - профиль 'quality'.
+                 Время конвертации учитывается в статистике профиля.
         
     Returns:
         Tuple[успех, сообщение, путь к выходному файлу]
@@ -348,9 +519,54 @@ def convert_image_to_image(
     if not Image_module:
         return False, "Pillow не установлен", None
     
+    from core.converter.image_profiles import get_image_profile
+    if profile is None:
+        profile = get_image_profile()
+    
+    start = time.perf_counter()
     try:
-        # Открываем изображение
+        return _convert_image_to_image(
+            file_path, output_path, target_ext, quality,
+            Image_module, supported_image_formats, profile
+        )
+    finally:
+        profile.record(time.perf_counter() - start)
+
+
+def _convert_image_to_image(
+    file_path: str,
+    output_path: str,
+    target_ext: str,
+    quality: int,
+    Image_module,
+    supported_image_formats: dict,
+    profile
+) -> Tuple[bool, str, Optional[str]]:
+    """Конвертация изображения по профилю (см. convert_image_to_image)."""
+    from core.converter.image_profiles import REWRAP_MIN_QUALITY
+    
+    try:
+        # Открываем изображение (читается только заголовок)
         with Image_module.open(file_path) as img:
+            format_name = supported_image_formats.get(target_ext, 'PNG')
+            
+            max_size = profile.max_size
+            needs_resize = max_size is not None and (img.width > max_size[0] or img.height > max_size[1])
+            
+            # Тот же кодек и без уменьшения: копируем файл без декодирования
+            if (profile.allow_rewrap and not needs_resize and img.format == format_name
+                    and quality >= REWRAP_MIN_QUALITY):
+                if os.path.normcase(os.path.abspath(file_path)) != os.path.normcase(os.path.abspath(output_path)):
+                    shutil.copyfile(file_path, output_path)
+                return True, "Файл сохранен без перекодирования (тот же кодек)", output_path
+            
+            if needs_resize:
+                # Draft-режим: JPEG декодируется сразу в уменьшенном масштабе (DCT scaling)
+                if profile.use_draft and img.format == 'JPEG':
+                    img.draft(img.mode if img.mode in ('RGB', 'L') else None, max_size)
+                # reducing_gap: быстрое целочисленное уменьшение перед ресемплингом
+                img.thumbnail(max_size, reducing_gap=profile.reducing_gap)
+            
             # Конвертируем в RGB для форматов, которые не поддерживают прозрачность
             if target_ext in ('.jpg', '.jpeg', '.bmp') and img.mode in ('RGBA', 'LA', 'P'):
                 # Создаем белый фон
@@ -368,7 +584,6 @@ def convert_image_to_image(
             
             # Параметры сохранения
             save_kwargs = {}
-            format_name = supported_image_formats.get(target_ext, 'PNG')
             
             # Обработка специальных форматов
             if format_name == 'JPEG2000':
@@ -388,14 +603,14 @@ def convert_image_to_image(
             
             if format_name == 'JPEG':
                 save_kwargs['quality'] = quality
-                save_kwargs['optimize'] = True
+                save_kwargs['optimize'] = profile.jpeg_optimize
                 if img.mode != 'RGB':
                     img = img.convert('RGB')
             elif format_name == 'PNG':
-                save_kwargs['optimize'] = True
+                save_kwargs.update(_png_save_kwargs(profile))
             elif format_name == 'WEBP':
                 save_kwargs['quality'] = quality
-                save_kwargs['method'] = 6
+                save_kwargs['method'] = profile.webp_method
             elif format_name == 'GIF':
                 # Для GIF можно использовать optimize для уменьшения размера (low quality)
                 if quality < 50:  # Low quality
@@ -436,7 +651,7 @@ def convert_image_to_image(
                 if format_name not in ('PNG', 'JPEG'):
                     format_name = 'PNG'
                     output_path = os.path.splitext(output_path)[0] + '.png'
-                    img.save(output_path, format='PNG', optimize=True)
+                    img.save(output_path, format='PNG', **_png_save_kwargs(profile))
                     logger.warning(f"Формат {target_ext} не поддерживается, сохранено как PNG")
                 else:
                     raise
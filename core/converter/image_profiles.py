@@ -0,0 +1,100 @@
+"""Профили конвертации изображений.
+
+Профиль задает компромисс между скоростью и степенью сжатия:
+уровни усилий кодировщиков, опциональное уменьшение размера
+(с draft-режимом JPEG и reduce при загрузке) и разрешение
+копировать файл без перекодирования, если кодек не меняется.
+Каждый профиль накапливает измеренное время конвертаций.
+"""
+
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Tuple
+
+# Минимальное качество, при котором JPEG/WEBP того же кодека копируется
+# без перекодирования (при меньшем качестве пользователь явно хочет пережать)
+REWRAP_MIN_QUALITY = 90
+
+
+@dataclass
+class ImageProfile:
+    """Профиль конвертации изображений."""
+    name: str
+    jpeg_optimize: bool = True
+    png_optimize: bool = True
+    png_compress_level: int = 6
+    webp_method: int = 6
+    max_size: Optional[Tuple[int, int]] = None  # Уменьшение до (ширина, высота)
+    use_draft: bool = True  # Draft-режим JPEG при уменьшении
+    reducing_gap: Optional[float] = 2.0  # Reduce при загрузке перед ресемплингом
+    allow_rewrap: bool = True  # Копирование без перекодирования для того же кодека
+    files: int = field(default=0, compare=False)
+    total_time: float = field(default=0.0, compare=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def record(self, elapsed: float) -> None:
+        """Учет времени одной конвертации.
+
+        Args:
+            elapsed: Время конвертации (секунды)
+        """
+        with self._lock:
+            self.files += 1
+            self.total_time += elapsed
+
+    @property
+    def average_time(self) -> float:
+        """Среднее время конвертации одного файла (секунды)."""
+        return self.total_time / self.files if self.files else 0.0
+
+    def reset_stats(self) -> None:
+        """Сброс накопленной статистики."""
+        with self._lock:
+            self.files = 0
+            self.total_time = 0.0
+
+
+# Встроенные профили
+IMAGE_PROFILES: Dict[str, ImageProfile] = {
+    # Максимальное сжатие (прежнее поведение: всегда перекодирование)
+    'quality': ImageProfile('quality', allow_rewrap=False),
+    # Быстрее при почти том же размере
+    'balanced': ImageProfile('balanced', jpeg_optimize=True, png_optimize=False,
+                             png_compress_level=6, webp_method=4),
+    # Пакетная конвертация для веба
+    'fast': ImageProfile('fast', jpeg_optimize=False, png_optimize=False,
+                         png_compress_level=1, webp_method=1),
+    # Миниатюры
+    'thumbnail': ImageProfile('thumbnail', jpeg_optimize=False, png_optimize=False,
+                              png_compress_level=1, webp_method=0, max_size=(256, 256)),
+}
+
+DEFAULT_IMAGE_PROFILE = 'quality'
+
+
+def get_image_profile(name: Optional[str] = None) -> ImageProfile:
+    """Получение профиля по имени.
+
+    Args:
+        name: Имя профиля (None - профиль по умолчанию)
+
+    Returns:
+        Профиль (неизвестное имя - профиль по умолчанию)
+    """
+    return IMAGE_PROFILES.get(name or DEFAULT_IMAGE_PROFILE, IMAGE_PROFILES[DEFAULT_IMAGE_PROFILE])
+
+
+def get_profiles_report() -> Dict[str, Dict[str, float]]:
+    """Отчет об измеренном времени по профилям.
+
+    Returns:
+        Словарь имя профиля -> {files, total_time, average_time}
+    """
+    return {
+        name: {
+            'files': profile.files,
+            'total_time': round(profile.total_time, 4),
+            'average_time': round(profile.average_time, 4),
+        }
+        for name, profile in IMAGE_PROFILES.items()
+    }
@@ -2,18 +2,105 @@
 
 Содержит функции для конвертации ODT файлов:
 - Конвертация через Microsoft Word
-- Конвертация без LibreOffice (fallback методы)
+- Конвертация без LibreOffice (fallback методы с потоковым разбором content.xml)
 """
 
+import html
 import logging
 import os
 import sys
 import zipfile
 import xml.etree.ElementTree as ET
-from typing import Optional, Tuple
+from typing import IO, Iterator, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
+# Пространство имен text: в content.xml
+ODT_TEXT_NS = '{urn:oasis:names:tc:opendocument:xmlns:text:1.0}'
+ODT_PARAGRAPH_TAGS = (ODT_TEXT_NS + 'p', ODT_TEXT_NS + 'h')
+ODT_SPACE_TAG = ODT_TEXT_NS + 's'
+ODT_TAB_TAG = ODT_TEXT_NS + 'tab'
+ODT_LINE_BREAK_TAG = ODT_TEXT_NS + 'line-break'
+
+
+def _odt_paragraph_text(elem: ET.Element) -> str:
+    """Текст параграфа с учетом пробелов, табуляций и переносов строк ODF."""
+    parts = [elem.text or '']
+    for child in elem:
+        if child.tag == ODT_SPACE_TAG:
+            parts.append(' ' * int(child.get(ODT_TEXT_NS + 'c', '1')))
+        elif child.tag == ODT_TAB_TAG:
+            parts.append('\t')
+        elif child.tag == ODT_LINE_BREAK_TAG:
+            parts.append('\n')
+        else:
+            parts.append(_odt_paragraph_text(child))
+        parts.append(child.tail or '')
+    return ''.join(parts)
+
+
+def iter_odt_paragraphs(content_stream: IO[bytes]) -> Iterator[str]:
+    """Потоковое чтение параграфов и заголовков из content.xml.
+    
+    XML разбирается через iterparse: каждый обработанный элемент вне
+    открытого параграфа очищается и удаляется из родителя, поэтому
+    память не растет с размером документа. Вложенные параграфы
+    (сноски, ячейки таблиц, врезки) возвращаются отдельно.
+    
+    Args:
+        content_stream: Бинарный поток content.xml
+        
+    Yields:
+        Текст очередного параграфа
+    """
+    stack = []
+    paragraph_depth = 0
+    for event, elem in ET.iterparse(content_stream, events=('start', 'end')):
+        if event == 'start':
+            stack.append(elem)
+            if elem.tag in ODT_PARAGRAPH_TAGS:
+                paragraph_depth += 1
+            continue
+        
+        stack.pop()
+        if elem.tag in ODT_PARAGRAPH_TAGS:
+            paragraph_depth -= 1
+            yield _odt_paragraph_text(elem)
+        
+        # Внутри параграфа элементы нужны до его закрытия
+        if paragraph_depth == 0 or elem.tag in ODT_PARAGRAPH_TAGS:
+            elem.clear()
+            if stack:
+                stack[-1].remove(elem)
+
+
+def _write_odt_text(odt_zip: zipfile.ZipFile, output_path: str) -> bool:
+    """Потоковая запись текста ODT в TXT.
+    
+    Returns:
+        True если записан непустой текст
+    """
+    has_text = False
+    with odt_zip.open('content.xml') as content, open(output_path, 'w', encoding='utf-8') as f:
+        for paragraph in iter_odt_paragraphs(content):
+            if paragraph.strip():
+                has_text = True
+            f.write(paragraph)
+            f.write('\n')
+    if not has_text:
+        os.remove(output_path)
+    return has_text
+
+
+def _write_odt_html(odt_zip: zipfile.ZipFile, output_path: str) -> None:
+    """Потоковая запись параграфов ODT в HTML."""
+    with odt_zip.open('content.xml') as content, open(output_path, 'w', encoding='utf-8') as f:
+        f.write('<html><head><meta charset="utf-8"></head><body>\n')
+        for paragraph in iter_odt_paragraphs(content):
+            if paragraph:
+                f.write(f'<p>{html.escape(paragraph)}</p>\n')
+        f.write('</body></html>')
+
 
 def convert_odt_with_word(
     file_path: str,
@@ -239,21 +326,7 @@ def convert_odt_without_libreoffice(
             try:
                 with zipfile.ZipFile(file_path, 'r') as odt_zip:
                     if 'content.xml' in odt_zip.namelist():
-                        content_xml = odt_zip.read('content.xml').decode('utf-8')
-                        # Парсим XML и извлекаем текст
-                        root = ET.fromstring(content_xml)
-                        # Находим все текстовые узлы
-                        text_content = []
-                        for elem in root.iter():
-                            if elem.text:
-                                text_content.append(elem.text)
-                            if elem.tail:
-                                text_content.append(elem.tail)
-                        
-                        text = '\n'.join(text_content).strip()
-                        if text:
-                            with open(output_path, 'w', encoding='utf-8') as f:
-                                f.write(text)
+                        if _write_odt_text(odt_zip, output_path):
                             return True, "Текст успешно извлечен из ODT файла", output_path
             except (OSError, PermissionError, ValueError, TypeError, KeyError) as e:
                 logger.debug(f"Ошибка выполнения при извлечении текста из ODT: {e}")
@@ -276,27 +349,7 @@ def convert_odt_without_libreoffice(
             try:
                 with zipfile.ZipFile(file_path, 'r') as odt_zip:
                     if 'content.xml' in odt_zip.namelist():
-                        content_xml = odt_zip.read('content.xml').decode('utf-8')
-                        root = ET.fromstring(content_xml)
-                        
-                        # Конвертация в HTML
-                        html_content = ['<html><head><meta charset="utf-8"></head><body>']
-                        
-                        # Извлекаем параграфы
-                        for para in root.findall('.//{urn:oasis:names:tc:opendocument:xmlns:text:1.0}p'):
-                            text_parts = []
-                            for elem in para.iter():
-                                if elem.text:
-                                    text_parts.append(elem.text)
-                                if elem.tail:
-                                    text_parts.append(elem.tail)
-                            if text_parts:
-                                html_content.append(f'<p>{"".join(text_parts)}</p>')
-                        
-                        html_content.append('</body></html>')
-                        
-                        with open(output_path, 'w', encoding='utf-8') as f:
-                            f.write('\n'.join(html_content))
+                        _write_odt_html(odt_zip, output_path)
                         return True, "ODT файл конвертирован в HTML", output_path
             except (OSError, PermissionError, ValueError, TypeError, KeyError) as e:
                 logger.debug(f"Ошибка выполнения при конвертации ODT в HTML: {e}")
@@ -320,22 +373,14 @@ def convert_odt_without_libreoffice(
                 # Сначала извлекаем текст
                 with zipfile.ZipFile(file_path, 'r') as odt_zip:
                     if 'content.xml' in odt_zip.namelist():
-                        content_xml = odt_zip.read('content.xml').decode('utf-8')
-                        root = ET.fromstring(content_xml)
-                        
                         # Создаем новый DOCX документ
                         doc = docx_module.Document()
                         
-                        # Извлекаем параграфы
-                        for para in root.findall('.//{urn:oasis:names:tc:opendocument:xmlns:text:1.0}p'):
-                            text_parts = []
-                            for elem in para.iter():
-                                if elem.text:
-                                    text_parts.append(elem.text)
-                                if elem.tail:
-                                    text_parts.append(elem.tail)
-                            if text_parts:
-                                doc.add_paragraph(''.join(text_parts))
+                        # Параграфы читаются потоково, без дерева content.xml
+                        with odt_zip.open('content.xml') as content:
+                            for paragraph in iter_odt_paragraphs(content):
+                                if paragraph:
+                                    doc.add_paragraph(paragraph)
                         
                         doc.save(output_path)
                         return True, "ODT файл конвертирован в DOCX (базовая конвертация)", output_path
@@ -0,0 +1,165 @@
+"""Планирование выходных путей конвертации.
+
+Все выходные пути пакета вычисляются заранее: для каждой целевой папки
+выполняется одно чтение содержимого, коллизии разрешаются в памяти
+детерминированно (в порядке файлов пакета) и занятые имена резервируются.
+Два исходных файла с одинаковым результатом больше не перезаписывают
+друг друга, а результат не может затереть другой исходный файл пакета.
+"""
+
+import logging
+import os
+import threading
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+try:
+    from config.constants import MAX_OUTPUT_NAME_ATTEMPTS
+except ImportError:
+    MAX_OUTPUT_NAME_ATTEMPTS = 1000
+
+# Папка для многостраничных результатов (страницы PDF)
+CONVERTED_FOLDER_NAME = "Конвертированные"
+
+
+def _dir_key(directory: str) -> str:
+    """Нормализованный ключ папки."""
+    return os.path.normcase(os.path.abspath(directory or '.'))
+
+
+class OutputPlanner:
+    """Резервирование уникальных выходных путей для пакета конвертации."""
+
+    def __init__(self, overwrite_existing: bool = True, max_attempts: int = MAX_OUTPUT_NAME_ATTEMPTS):
+        """Инициализация планировщика.
+
+        Args:
+            overwrite_existing: Разрешать перезапись существующих файлов, не
+                                входящих в пакет (повторный запуск обновляет
+                                прежние результаты). Папки не перезаписываются никогда.
+            max_attempts: Максимальный номер суффикса _NNN
+        """
+        self.overwrite_existing = overwrite_existing
+        self.max_attempts = max_attempts
+        self._listings: Dict[str, Set[str]] = {}
+        self._reserved: Dict[str, Set[str]] = {}
+        self._folders: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def plan(self, jobs: Sequence[Tuple[str, Optional[str]]]) -> List[Optional[str]]:
+        """Планирование выходных файлов пакета.
+
+        Args:
+            jobs: Список (путь к исходному файлу, целевое расширение или None)
+
+        Returns:
+            Список выходных путей в том же порядке (None - результат
+            не требуется или имя не удалось подобрать)
+        """
+        with self._lock:
+            # Исходные файлы пакета не должны быть перезаписаны результатами
+            for source, _ in jobs:
+                self._reserved_in(os.path.dirname(source)).add(os.path.normcase(os.path.basename(source)))
+
+            outputs = []
+            for source, target_ext in jobs:
+                if not target_ext or os.path.splitext(source)[1].lower() == target_ext.lower():
+                    outputs.append(None)
+                    continue
+                directory = os.path.dirname(source)
+                stem = os.path.splitext(os.path.basename(source))[0]
+                outputs.append(self._reserve_name(directory, stem, target_ext, self.overwrite_existing))
+            return outputs
+
+    def reserve_file(self, path: str) -> Optional[str]:
+        """Резервирование отдельного выходного файла.
+
+        Args:
+            path: Желаемый путь
+
+        Returns:
+            Свободный путь (с суффиксом _NNN при коллизии) или None
+        """
+        stem, ext = os.path.splitext(os.path.basename(path))
+        with self._lock:
+            return self._reserve_name(os.path.dirname(path), stem, ext, self.overwrite_existing)
+
+    def reserve_folder(self, parent: str, name: str) -> Optional[str]:
+        """Резервирование новой папки (существующие папки не используются).
+
+        Args:
+            parent: Родительская папка
+            name: Желаемое имя
+
+        Returns:
+            Путь к свободной папке или None
+        """
+        with self._lock:
+            return self._reserve_name(parent, name, '', False)
+
+    def plan_converted_folder(self, source: str) -> Optional[str]:
+        """Резервирование папки Конвертированные/<имя> для многостраничного результата.
+
+        Args:
+            source: Путь к исходному файлу
+
+        Returns:
+            Путь к папке или None
+        """
+        parent = os.path.join(os.path.dirname(source), CONVERTED_FOLDER_NAME)
+        stem = os.path.splitext(os.path.basename(source))[0]
+        folder = self.reserve_folder(parent, stem)
+        if folder:
+            with self._lock:
+                self._folders[os.path.normcase(os.path.abspath(source))] = folder
+        return folder
+
+    def folder_for(self, source: str) -> Optional[str]:
+        """Заранее зарезервированная папка для исходного файла."""
+        with self._lock:
+            return self._folders.get(os.path.normcase(os.path.abspath(source)))
+
+    def _listing(self, directory: str) -> Set[str]:
+        """Содержимое папки (читается один раз)."""
+        key = _dir_key(directory)
+        names = self._listings.get(key)
+        if names is None:
+            try:
+                names = {os.path.normcase(name) for name in os.listdir(directory or '.')}
+            except OSError:
+                # Папка еще не создана - все имена свободны
+                names = set()
+            self._listings[key] = names
+        return names
+
+    def _reserved_in(self, directory: str) -> Set[str]:
+        """Имена, зарезервированные в папке этим планировщиком."""
+        return self._reserved.setdefault(_dir_key(directory), set())
+
+    def _reserve_name(self, directory: str, stem: str, ext: str, allow_existing: bool) -> Optional[str]:
+        """Подбор свободного имени stem, stem_001, stem_002... в папке."""
+        reserved = self._reserved_in(directory)
+        existing = set() if allow_existing else self._listing(directory)
+        for counter in range(self.max_attempts):
+            name = f"{stem}{ext}" if counter == 0 else f"{stem}_{counter:03d}{ext}"
+            key = os.path.normcase(name)
+            if key not in reserved and key not in existing:
+                reserved.add(key)
+                return os.path.join(directory, name)
+        logger.warning(f"Не удалось подобрать свободное имя для {stem}{ext} в {directory}")
+        return None
+
+
+def reserve_unique_folder(parent: str, name: str) -> Optional[str]:
+    """Свободная папка parent/name или parent/name_NNN (одно чтение parent).
+
+    Args:
+        parent: Родительская папка
+        name: Желаемое имя
+
+    Returns:
+        Путь к свободной папке или None
+    """
+    return OutputPlanner().reserve_folder(parent, name)
+
@@ -0,0 +1,338 @@
+"""Конвертация PDF в DOCX через pdf2docx в изолированных процессах.
+
+pdf2docx медленный и расходует много памяти на больших PDF, поэтому
+документ делится на диапазоны страниц, каждый диапазон конвертируется
+в отдельном процессе (несколько процессов параллельно), после чего
+части объединяются в один DOCX. Родительский процесс следит за объемом
+резидентной памяти каждого процесса и завершает его при превышении
+лимита. Падение процесса приводит к ошибке конвертации файла,
+а не к завершению приложения.
+"""
+
+import copy
+import logging
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Интервал опроса процессов (секунды)
+POLL_INTERVAL = 0.2
+
+# Пространство имен связей OOXML (r:embed, r:id, r:link)
+_REL_NS = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
+_REL_ATTRS = tuple(f'{{{_REL_NS}}}{name}' for name in ('embed', 'id', 'link'))
+
+
+@dataclass
+class Pdf2DocxOptions:
+    """Параметры изолированной конвертации PDF в DOCX."""
+    chunk_pages: int = 50  # Страниц на один процесс
+    workers: Optional[int] = None  # Параллельных процессов (None - до 2 по числу ядер)
+    max_rss_mb: Optional[int] = 2048  # Лимит резидентной памяти процесса (None - без лимита)
+    chunk_timeout: Optional[float] = None  # Лимит времени на диапазон (секунды)
+
+
+def get_process_rss(pid: int) -> Optional[int]:
+    """Резидентная память процесса в байтах.
+
+    Использует psutil, если установлен, иначе /proc (Linux)
+    или GetProcessMemoryInfo (Windows).
+
+    Args:
+        pid: Идентификатор процесса
+
+    Returns:
+        Объем памяти или None, если определить не удалось
+    """
+    try:
+        import psutil
+        return psutil.Process(pid).memory_info().rss
+    except ImportError:
+        pass
+    except Exception:
+        return None
+
+    if sys.platform.startswith('linux'):
+        try:
+            with open(f'/proc/{pid}/statm', 'r') as f:
+                return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+        except (OSError, ValueError, IndexError):
+            return None
+
+    if sys.platform == 'win32':
+        try:
+            import ctypes
+            from ctypes import wintypes
+
+            class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+                _fields_ = [
+                    ('cb', wintypes.DWORD),
+                    ('PageFaultCount', wintypes.DWORD),
+                    ('PeakWorkingSetSize', ctypes.c_size_t),
+                    ('WorkingSetSize', ctypes.c_size_t),
+                    ('QuotaPeakPagedPoolUsage', ctypes.c_size_t),
+                    ('QuotaPagedPoolUsage', ctypes.c_size_t),
+                    ('QuotaPeakNonPagedPoolUsage', ctypes.c_size_t),
+                    ('QuotaNonPagedPoolUsage', ctypes.c_size_t),
+                    ('PagefileUsage', ctypes.c_size_t),
+                    ('PeakPagefileUsage', ctypes.c_size_t),
+                ]
+
+            # PROCESS_QUERY_LIMITED_INFORMATION | PROCESS_VM_READ
+            handle = ctypes.windll.kernel32.OpenProcess(0x1000 | 0x0010, False, pid)
+            if not handle:
+                return None
+            try:
+                counters = PROCESS_MEMORY_COUNTERS()
+                counters.cb = ctypes.sizeof(counters)
+                if ctypes.windll.psapi.GetProcessMemoryInfo(handle, ctypes.byref(counters), counters.cb):
+                    return counters.WorkingSetSize
+            finally:
+                ctypes.windll.kernel32.CloseHandle(handle)
+        except (AttributeError, OSError, ValueError):
+            return None
+    return None
+
+
+def plan_page_chunks(page_count: int, chunk_pages: int) -> List[Tuple[int, int]]:
+    """Разбиение страниц на диапазоны.
+
+    Args:
+        page_count: Количество страниц (0 или меньше - неизвестно)
+        chunk_pages: Страниц в диапазоне
+
+    Returns:
+        Список (начало, конец) с нумерацией с 0, конец не включается;
+        (0, None) - весь документ одним диапазоном
+    """
+    if page_count <= 0 or page_count <= chunk_pages:
+        return [(0, None)]
+    chunk_pages = max(1, chunk_pages)
+    return [(start, min(start + chunk_pages, page_count)) for start in range(0, page_count, chunk_pages)]
+
+
+def _convert_chunk_worker(file_path: str, output_path: str, start: int, end: Optional[int], conn) -> None:
+    """Конвертация диапазона страниц в дочернем процессе (точка входа процесса)."""
+    try:
+        from pdf2docx import Converter
+        converter = Converter(file_path)
+        try:
+            converter.convert(output_path, start=start, end=end)
+        finally:
+            converter.close()
+        conn.send((True, None))
+    except BaseException as e:
+        conn.send((False, f"{type(e).__name__}: {e}"))
+    finally:
+        conn.close()
+
+
+def merge_docx_parts(part_paths: List[str], output_path: str, docx_module: Any) -> None:
+    """Объединение частичных DOCX в один документ.
+
+    Содержимое частей добавляется в конец первой части; связанные
+    изображения и гиперссылки переносятся вместе со связями.
+
+    Args:
+        part_paths: Пути к частям в порядке страниц
+        output_path: Путь к итоговому файлу
+        docx_module: Модуль python-docx
+    """
+    master = docx_module.Document(part_paths[0])
+    master_body = master.element.body
+    master_part = master.part
+    # Свойства раздела должны оставаться последним элементом тела документа
+    sect_pr = master_body.sectPr
+
+    for part_path in part_paths[1:]:
+        part_doc = docx_module.Document(part_path)
+        part_rels = part_doc.part.rels
+        for element in part_doc.element.body.iterchildren():
+            if element.tag.endswith('}sectPr'):
+                continue
+            element = copy.deepcopy(element)
+            for node in element.iter():
+                for attr in _REL_ATTRS:
+                    old_rid = node.get(attr)
+                    if not old_rid or old_rid not in part_rels:
+                        continue
+                    rel = part_rels[old_rid]
+                    if rel.is_external:
+                        new_rid = master_part.relate_to(rel.target_ref, rel.reltype, is_external=True)
+                    else:
+                        new_rid = master_part.relate_to(rel.target_part, rel.reltype)
+                    node.set(attr, new_rid)
+            if sect_pr is not None:
+                sect_pr.addprevious(element)
+            else:
+                master_body.append(element)
+
+    master.save(output_path)
+
+
+class Pdf2DocxRunner:
+    """Запуск pdf2docx по диапазонам страниц в отдельных процессах."""
+
+    def __init__(
+        self,
+        options: Optional[Pdf2DocxOptions] = None,
+        docx_module: Any = None,
+        worker: Callable = _convert_chunk_worker
+    ):
+        """Инициализация.
+
+        Args:
+            options: Параметры конвертации
+            docx_module: Модуль python-docx (нужен для объединения частей;
+                         без него документ конвертируется одним процессом)
+            worker: Функция процесса (file_path, output_path, start, end, conn)
+        """
+        self.options = options or Pdf2DocxOptions()
+        self.docx_module = docx_module
+        self.worker = worker
+
+    def get_worker_count(self, chunk_count: int) -> int:
+        """Количество одновременно работающих процессов."""
+        if self.options.workers is not None:
+            workers = max(1, self.options.workers)
+        else:
+            # pdf2docx расходует много памяти - по умолчанию не больше двух процессов
+            workers = min(2, os.cpu_count() or 1)
+        return min(workers, chunk_count)
+
+    def convert(
+        self,
+        file_path: str,
+        output_path: str,
+        page_count: int = 0,
+        progress_callback: Optional[Callable[[int, int], None]] = None
+    ) -> Tuple[bool, str, Optional[str]]:
+        """Конвертация PDF в DOCX.
+
+        Args:
+            file_path: Путь к PDF
+            output_path: Путь к итоговому DOCX
+            page_count: Количество страниц (0 - неизвестно, без разбиения)
+            progress_callback: Функция (готово диапазонов, всего диапазонов)
+
+        Returns:
+            Tuple[успех, сообщение, путь к выходному файлу]
+        """
+        chunks = plan_page_chunks(page_count, self.options.chunk_pages)
+        if len(chunks) > 1 and self.docx_module is None:
+            logger.info("python-docx недоступен, PDF конвертируется одним процессом без разбиения")
+            chunks = [(0, None)]
+
+        output_dir = os.path.dirname(os.path.abspath(output_path))
+        os.makedirs(output_dir, exist_ok=True)
+        temp_dir = tempfile.mkdtemp(prefix='.pdf2docx_', dir=output_dir)
+        try:
+            part_paths = [os.path.join(temp_dir, f'part_{index:04d}.docx') for index in range(len(chunks))]
+            error = self._run_chunks(file_path, chunks, part_paths, progress_callback)
+            if error:
+                return False, error, None
+
+            if len(part_paths) == 1:
+                os.replace(part_paths[0], output_path)
+            else:
+                merge_docx_parts(part_paths, output_path, self.docx_module)
+            return True, "PDF успешно конвертирован в DOCX", output_path
+        except (OSError, ValueError, KeyError, AttributeError) as e:
+            logger.error(f"Ошибка при сборке DOCX из частей {file_path}: {e}", exc_info=True)
+            return False, f"Ошибка сборки DOCX: {e}", None
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+    def _run_chunks(
+        self,
+        file_path: str,
+        chunks: List[Tuple[int, Optional[int]]],
+        part_paths: List[str],
+        progress_callback: Optional[Callable[[int, int], None]]
+    ) -> Optional[str]:
+        """Выполнение диапазонов в процессах с контролем памяти.
+
+        Returns:
+            Сообщение об ошибке или None при успехе
+        """
+        # spawn: безопасно при наличии потоков Qt и одинаково на всех платформах
+        context = multiprocessing.get_context('spawn')
+        workers = self.get_worker_count(len(chunks))
+        max_rss = self.options.max_rss_mb * 1024 * 1024 if self.options.max_rss_mb else None
+        pending = list(range(len(chunks)))
+        running = []  # (индекс, процесс, канал, время запуска)
+        done = 0
+
+        try:
+            while pending or running:
+                while pending and len(running) < workers:
+                    index = pending.pop(0)
+                    start, end = chunks[index]
+                    receiver, sender = context.Pipe(duplex=False)
+                    process = context.Process(
+                        target=self.worker,
+                        args=(file_path, part_paths[index], start, end, sender),
+                        daemon=True
+                    )
+                    process.start()
+                    sender.close()
+                    running.append((index, process, receiver, time.monotonic()))
+
+                time.sleep(POLL_INTERVAL)
+
+                for item in list(running):
+                    index, process, receiver, started = item
+                    pages = self._describe_chunk(chunks[index])
+                    if process.is_alive():
+                        rss = get_process_rss(process.pid) if max_rss else None
+                        if rss is not None and rss > max_rss:
+                            return (f"Превышен лимит памяти {self.options.max_rss_mb} МБ "
+                                    f"при конвертации {pages}")
+                        timeout = self.options.chunk_timeout
+                        if timeout is not None and time.monotonic() - started > timeout:
+                            return f"Превышено время конвертации {pages}"
+                        continue
+
+                    process.join()
+                    running.remove(item)
+                    try:
+                        result = receiver.recv() if receiver.poll() else None
+                    except EOFError:
+                        # Процесс завершился, не отправив результат
+                        result = None
+                    receiver.close()
+                    if result is None:
+                        return f"Процесс конвертации {pages} завершился аварийно (код {process.exitcode})"
+                    success, error = result
+                    if not success:
+                        return f"Ошибка конвертации {pages}: {error}"
+                    if not os.path.exists(part_paths[index]):
+                        return f"Файл DOCX для {pages} не был создан"
+                    done += 1
+                    if progress_callback:
+                        progress_callback(done, len(chunks))
+            return None
+        except (OSError, EOFError, RuntimeError) as e:
+            logger.error(f"Ошибка запуска процесса pdf2docx: {e}", exc_info=True)
+            return f"Не удалось запустить процесс конвертации: {e}"
+        finally:
+            for _, process, receiver, _ in running:
+                if process.is_alive():
+                    process.terminate()
+                process.join(5)
+                receiver.close()
+
+    @staticmethod
+    def _describe_chunk(chunk: Tuple[int, Optional[int]]) -> str:
+        """Описание диапазона для сообщений."""
+        start, end = chunk
+        if end is None:
+            return "документа"
+        return f"страниц {start + 1}-{end}"
@@ -0,0 +1,319 @@
+"""Растеризация PDF в изображения.
+
+Рендерит страницы PDF через PyMuPDF с настраиваемым DPI, выбором
+диапазона страниц и опциональным режимом оттенков серого. Большие
+документы обрабатываются параллельно в отдельных процессах: каждый
+процесс открывает собственный документ fitz и сохраняет страницы
+своего диапазона сразу по мере готовности.
+"""
+
+import logging
+import math
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Базовое разрешение PDF (точек на дюйм)
+PDF_BASE_DPI = 72
+
+# Минимальное число страниц для запуска параллельных процессов
+# (для коротких документов накладные расходы на процессы больше выигрыша)
+PARALLEL_MIN_PAGES = 8
+
+# Число чанков на один процесс (для равномерной загрузки)
+CHUNKS_PER_WORKER = 4
+
+
+@dataclass
+class RasterOptions:
+    """Параметры растеризации PDF."""
+    dpi: int = 144  # Соответствует прежнему масштабу 2.0
+    grayscale: bool = False
+    fast_save: bool = False  # Без optimize для PNG, быстрый режим WEBP
+    pages: Optional[str] = None  # Диапазон страниц, например "1-3,7" (нумерация с 1)
+    workers: Optional[int] = None  # None - по числу ядер, 1 - в текущем процессе
+    quality: int = 95  # При конвертации заменяется аргументом quality
+
+
+def parse_page_range(spec: Optional[str], num_pages: int) -> List[int]:
+    """Разбор диапазона страниц.
+
+    Args:
+        spec: Строка вида "1-3,7,10-" (нумерация с 1) или None для всех страниц
+        num_pages: Количество страниц в документе
+
+    Returns:
+        Отсортированный список номеров страниц (с 0)
+
+    Raises:
+        ValueError: Если диапазон некорректен или не содержит страниц
+    """
+    if not spec or not spec.strip():
+        return list(range(num_pages))
+
+    pages = set()
+    for part in spec.split(','):
+        part = part.strip()
+        if not part:
+            continue
+        if '-' in part:
+            start_str, end_str = part.split('-', 1)
+            start = int(start_str) if start_str.strip() else 1
+            end = int(end_str) if end_str.strip() else num_pages
+        else:
+            start = end = int(part)
+        if start < 1 or end < start:
+            raise ValueError(f"Некорректный диапазон страниц: {part}")
+        pages.update(range(start - 1, min(end, num_pages)))
+
+    if not pages:
+        raise ValueError(f"Диапазон страниц не содержит страниц документа: {spec}")
+    return sorted(pages)
+
+
+def build_save_kwargs(format_name: str, quality: int, fast_save: bool) -> Dict[str, Any]:
+    """Параметры сохранения изображения для Pillow.
+
+    Args:
+        format_name: Формат Pillow ('PNG', 'JPEG', 'WEBP', ...)
+        quality: Качество (1-100)
+        fast_save: Быстрое сохранение без максимального сжатия
+
+    Returns:
+        Словарь параметров для Image.save
+    """
+    save_kwargs: Dict[str, Any] = {}
+    if format_name == 'JPEG':
+        save_kwargs['quality'] = quality
+        save_kwargs['optimize'] = not fast_save
+    elif format_name == 'PNG':
+        if fast_save:
+            save_kwargs['compress_level'] = 1
+        else:
+            save_kwargs['optimize'] = True
+    elif format_name == 'WEBP':
+        save_kwargs['quality'] = quality
+        save_kwargs['method'] = 2 if fast_save else 6
+    return save_kwargs
+
+
+def split_into_chunks(items: List[Any], workers: int) -> List[List[Any]]:
+    """Разбиение списка на непрерывные чанки для процессов.
+
+    Args:
+        items: Элементы (страницы)
+        workers: Количество процессов
+
+    Returns:
+        Список чанков
+    """
+    if not items:
+        return []
+    chunk_count = max(1, min(len(items), workers * CHUNKS_PER_WORKER))
+    chunk_size = math.ceil(len(items) / chunk_count)
+    return [items[i:i + chunk_size] for i in range(0, len(items), chunk_size)]
+
+
+def render_page(
+    fitz_module,
+    Image_module,
+    pdf_document,
+    page_num: int,
+    output_path: str,
+    format_name: str,
+    options: RasterOptions
+) -> None:
+    """Рендеринг одной страницы и сохранение на диск.
+
+    Пиксели передаются в Pillow напрямую (без промежуточного PNG),
+    а PNG в быстром режиме сохраняется средствами PyMuPDF.
+
+    Args:
+        fitz_module: Модуль PyMuPDF
+        Image_module: Модуль Pillow (PIL.Image)
+        pdf_document: Открытый документ fitz
+        page_num: Номер страницы (с 0)
+        output_path: Путь для сохранения
+        format_name: Формат Pillow
+        options: Параметры растеризации
+    """
+    zoom = options.dpi / PDF_BASE_DPI
+    colorspace = fitz_module.csGRAY if options.grayscale else fitz_module.csRGB
+    page = pdf_document[page_num]
+    pix = page.get_pixmap(matrix=fitz_module.Matrix(zoom, zoom), colorspace=colorspace, alpha=False)
+    try:
+        if format_name == 'PNG' and options.fast_save:
+            pix.save(output_path)
+            return
+        mode = 'L' if pix.n == 1 else 'RGB'
+        img = Image_module.frombytes(mode, (pix.width, pix.height), pix.samples)
+        try:
+            img.save(output_path, format=format_name,
+                     **build_save_kwargs(format_name, options.quality, options.fast_save))
+        finally:
+            img.close()
+    finally:
+        pix = None
+
+
+def _render_pages_worker(
+    file_path: str,
+    page_jobs: List[Tuple[int, str]],
+    format_name: str,
+    options_dict: Dict[str, Any]
+) -> List[Tuple[int, str]]:
+    """Рендеринг диапазона страниц в отдельном процессе.
+
+    Каждый процесс открывает собственный экземпляр документа.
+
+    Args:
+        file_path: Путь к PDF
+        page_jobs: Список (номер страницы, путь для сохранения)
+        format_name: Формат Pillow
+        options_dict: Параметры растеризации (RasterOptions в виде словаря)
+
+    Returns:
+        Список (номер страницы, путь) сохраненных страниц
+    """
+    import fitz  # PyMuPDF
+    from PIL import Image
+
+    options = RasterOptions(**options_dict)
+    done = []
+    pdf_document = fitz.open(file_path)
+    try:
+        for page_num, output_path in page_jobs:
+            render_page(fitz, Image, pdf_document, page_num, output_path, format_name, options)
+            done.append((page_num, output_path))
+    finally:
+        pdf_document.close()
+    return done
+
+
+class PdfRasterizer:
+    """Движок растеризации PDF с параллельной обработкой страниц."""
+
+    def __init__(self, fitz_module, Image_module, options: Optional[RasterOptions] = None):
+        """Инициализация движка.
+
+        Args:
+            fitz_module: Модуль PyMuPDF (fitz)
+            Image_module: Модуль Pillow (PIL.Image)
+            options: Параметры растеризации
+        """
+        self.fitz = fitz_module
+        self.Image = Image_module
+        self.options = options or RasterOptions()
+
+    def get_worker_count(self, page_count: int) -> int:
+        """Определение количества процессов для документа.
+
+        Args:
+            page_count: Количество страниц для рендеринга
+
+        Returns:
+            Количество процессов (1 - рендеринг в текущем процессе)
+        """
+        if self.options.workers is not None:
+            workers = max(1, self.options.workers)
+        else:
+            workers = os.cpu_count() or 1
+        if page_count < PARALLEL_MIN_PAGES:
+            return 1
+        return min(workers, page_count)
+
+    def render(
+        self,
+        file_path: str,
+        page_jobs: List[Tuple[int, str]],
+        format_name: str,
+        progress_callback: Optional[Callable[[int, int], None]] = None,
+        pdf_document=None
+    ) -> List[str]:
+        """Рендеринг страниц с сохранением по мере готовности.
+
+        Args:
+            file_path: Путь к PDF
+            page_jobs: Список (номер страницы, путь для сохранения)
+            format_name: Формат Pillow
+            progress_callback: Функция (готово страниц, всего страниц)
+            pdf_document: Уже открытый документ (для рендеринга в текущем процессе)
+
+        Returns:
+            Список путей сохраненных страниц в порядке номеров страниц
+        """
+        total = len(page_jobs)
+        done: Dict[int, str] = {}
+
+        workers = self.get_worker_count(total)
+        if workers > 1:
+            remaining = self._render_parallel(file_path, page_jobs, format_name, workers, done, progress_callback)
+        else:
+            remaining = page_jobs
+
+        if remaining:
+            self._render_sequential(file_path, remaining, format_name, done, total, progress_callback, pdf_document)
+
+        return [done[page_num] for page_num, _ in page_jobs]
+
+    def _render_parallel(
+        self,
+        file_path: str,
+        page_jobs: List[Tuple[int, str]],
+        format_name: str,
+        workers: int,
+        done: Dict[int, str],
+        progress_callback: Optional[Callable[[int, int], None]]
+    ) -> List[Tuple[int, str]]:
+        """Рендеринг чанков страниц в пуле процессов.
+
+        Returns:
+            Задания, которые не удалось выполнить в пуле (для последовательного рендеринга)
+        """
+        total = len(page_jobs)
+        options_dict = asdict(self.options)
+        # spawn: безопасно при наличии потоков Qt и одинаково на всех платформах
+        context = multiprocessing.get_context('spawn')
+        try:
+            with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+                futures = [
+                    executor.submit(_render_pages_worker, file_path, chunk, format_name, options_dict)
+                    for chunk in split_into_chunks(page_jobs, workers)
+                ]
+                for future in as_completed(futures):
+                    for page_num, output_path in future.result():
+                        done[page_num] = output_path
+                    if progress_callback:
+                        progress_callback(len(done), total)
+        except (BrokenProcessPool, OSError, ImportError) as e:
+            logger.warning(f"Параллельная растеризация недоступна, продолжаем в текущем процессе: {e}")
+        return [job for job in page_jobs if job[0] not in done]
+
+    def _render_sequential(
+        self,
+        file_path: str,
+        page_jobs: List[Tuple[int, str]],
+        format_name: str,
+        done: Dict[int, str],
+        total: int,
+        progress_callback: Optional[Callable[[int, int], None]],
+        pdf_document=None
+    ) -> None:
+        """Рендеринг страниц в текущем процессе."""
+        own_document = pdf_document is None
+        if own_document:
+            pdf_document = self.fitz.open(file_path)
+        try:
+            for page_num, output_path in page_jobs:
+                render_page(self.fitz, self.Image, pdf_document, page_num, output_path, format_name, self.options)
+                done[page_num] = output_path
+                if progress_callback:
+                    progress_callback(len(done), total)
+        finally:
+            if own_document:
+                pdf_document.close()
@@ -72,150 +72,18 @@ def convert_pptx_with_powerpoint_com(
     if not sys.platform == 'win32':
         return False, "Конвертация через PowerPoint доступна только на Windows", None
     
-    powerpoint = None
-    presentation = None
-    pythoncom_module = None
-    com_initialized = False
+    if not win32com and not comtypes:
+        return False, "Microsoft PowerPoint недоступен через COM", None
+    
+    from core.converter.com_session_pool import POWERPOINT_PROG_ID, get_com_session_pool
     
     try:
-        # Проверяем доступность COM
-        if win32com:
-            try:
-                import win32com.client
-                import pythoncom
-                pythoncom_module = pythoncom
-                pythoncom.CoInitialize()
-                com_initialized = True
-                powerpoint = win32com.client.Dispatch("PowerPoint.Application")
-            except (OSError, RuntimeError, AttributeError, TypeError) as e:
-                logger.debug(f"Ошибка выполнения при использовании win32com для PowerPoint: {e}")
-                powerpoint = None
-            except (ValueError, KeyError, IndexError) as e:
-                logger.debug(f"Ошибка данных при использовании win32com для PowerPoint: {e}")
-                powerpoint = None
-            except (MemoryError, RecursionError) as e:
-                logger.debug(f"Ошибка памяти/рекурсии при использовании win32com для PowerPoint: {e}")
-                powerpoint = None
-            except BaseException as e:
-                if isinstance(e, (KeyboardInterrupt, SystemExit)):
-                    raise
-                logger.debug(f"Критическая ошибка при использовании win32com для PowerPoint: {e}")
-                powerpoint = None
-        
-        if not powerpoint and comtypes:
-            try:
-                from comtypes.client import CreateObject
-                powerpoint = CreateObject("PowerPoint.Application")
-            except (OSError, RuntimeError, AttributeError, TypeError) as e:
-                logger.debug(f"Ошибка выполнения при использовании comtypes для PowerPoint: {e}")
-                powerpoint = None
-            except (ValueError, KeyError, IndexError) as e:
-                logger.debug(f"Ошибка данных при использовании comtypes для PowerPoint: {e}")
-                powerpoint = None
-            except (MemoryError, RecursionError) as e:
-                logger.debug(f"Ошибка памяти/рекурсии при использовании comtypes для PowerPoint: {e}")
-                powerpoint = None
-            except BaseException as e:
-                if isinstance(e, (KeyboardInterrupt, SystemExit)):
-                    raise
-                logger.debug(f"Критическая ошибка при использовании comtypes для PowerPoint: {e}")
-                powerpoint = None
-        
-        if not powerpoint:
-            return False, "Microsoft PowerPoint недоступен через COM", None
-        
-        # Настраиваем PowerPoint
-        powerpoint.Visible = False
-        powerpoint.DisplayAlerts = 0  # ppAlertsNone
-        
-        # Нормализуем пути
-        ppt_path = os.path.abspath(file_path)
-        output_file_path = os.path.abspath(output_path)
-        
-        # Убеждаемся, что директория существует
-        output_dir = os.path.dirname(output_file_path)
-        if output_dir and not os.path.isdir(output_dir):
-            os.makedirs(output_dir, exist_ok=True)
-        
-        logger.info(f"Конвертируем презентацию через PowerPoint: {ppt_path} -> {output_file_path}")
-        
-        # Открываем презентацию
-        try:
-            presentation = powerpoint.Presentations.Open(
-                FileName=ppt_path,
-                ReadOnly=True,
-                WithWindow=False
-            )
-        except (OSError, RuntimeError, AttributeError, PermissionError) as e:
-            error_msg = str(e)
-            logger.error(f"Ошибка выполнения при открытии презентации в PowerPoint: {error_msg}")
-            return False, f"PowerPoint не может открыть файл: {error_msg}", None
-        except (ValueError, TypeError, KeyError, IndexError) as e:
-            error_msg = str(e)
-            logger.error(f"Ошибка данных при открытии презентации в PowerPoint: {error_msg}")
-            return False, f"PowerPoint не может открыть файл: {error_msg}", None
-        except (MemoryError, RecursionError) as e:
-            error_msg = str(e)
-            logger.error(f"Ошибка памяти/рекурсии при открытии презентации в PowerPoint: {error_msg}")
-            return False, f"PowerPoint не может открыть файл: {error_msg}", None
-        except BaseException as e:
-            if isinstance(e, (KeyboardInterrupt, SystemExit)):
-                raise
-            error_msg = str(e)
-            logger.error(f"Критическая ошибка при открытии презентации в PowerPoint: {error_msg}", exc_info=True)
-            return False, f"PowerPoint не может открыть файл: {error_msg}", None
-        
-        try:
-            # Сохраняем в нужном формате
-            # Форматы: 32 = PDF, 24 = PPTX, 1 = PPT, 35 = ODP
-            presentation.SaveAs(FileName=output_file_path, FileFormat=file_format)
-            logger.info(f"Презентация успешно конвертирована через PowerPoint: {output_file_path}")
-            
-            # Проверяем существование файла с поддержкой Unicode
-            if _check_file_exists_unicode(output_file_path):
-                return True, "Презентация успешно конвертирована через PowerPoint", output_file_path
-            else:
-                return False, "Файл не был создан", None
-        except (OSError, RuntimeError, AttributeError, PermissionError) as e:
-            error_msg = str(e)
-            logger.error(f"Ошибка выполнения при сохранении презентации: {error_msg}")
-            return False, f"Ошибка при сохранении: {error_msg}", None
-        except (ValueError, TypeError, KeyError, IndexError) as e:
-            error_msg = str(e)
-            logger.error(f"Ошибка данных при сохранении презентации: {error_msg}")
-            return False, f"Ошибка данных при сохранении: {error_msg}", None
-        except (MemoryError, RecursionError) as e:
-            error_msg = str(e)
-            logger.error(f"Ошибка памяти/рекурсии при сохранении презентации: {error_msg}", exc_info=True)
-            return False, f"Ошибка памяти/рекурсии при сохранении: {error_msg}", None
-        except BaseException as e:
-            if isinstance(e, (KeyboardInterrupt, SystemExit)):
-                raise
-            error_msg = str(e)
-            logger.error(f"Критическая ошибка при сохранении презентации: {error_msg}", exc_info=True)
-            return False, f"Критическая ошибка при сохранении: {error_msg}", None
-        finally:
-            # Закрываем презентацию
-            if presentation:
-                try:
-                    presentation.Close()
-                except:
-                    pass
-                presentation = None
-            
-            # Закрываем приложение
-            if powerpoint:
-                try:
-                    powerpoint.Quit()
-                except:
-                    pass
-                powerpoint = None
-            
-            # Освобождаем COM
-            if com_initialized and pythoncom_module:
-                pythoncom_module.CoUninitialize()
-                com_initialized = False
-                
+        # PowerPoint берется из пула сессий и не закрывается после каждого файла
+        with get_com_session_pool(POWERPOINT_PROG_ID).session() as session:
+            result = _save_presentation_as(session.app, file_path, output_path, file_format)
+            if not result[0]:
+                session.mark_failed()
+            return result
     except (OSError, RuntimeError, AttributeError, PermissionError) as e:
         logger.error(f"Ошибка выполнения при конвертации презентации через PowerPoint {file_path}: {e}", exc_info=True)
         error_msg = str(e)
@@ -242,25 +110,104 @@ def convert_pptx_with_powerpoint_com(
         if "PowerPoint.Application" in error_msg or "COM" in error_msg:
             return False, "Не удалось использовать Microsoft PowerPoint. Убедитесь, что PowerPoint установлен и доступен.", None
         return False, f"Неожиданная ошибка: {error_msg}", None
+
+
+def _save_presentation_as(
+    powerpoint,
+    file_path: str,
+    output_path: str,
+    file_format: int
+) -> Tuple[bool, str, Optional[str]]:
+    """Открытие презентации в готовом PowerPoint и сохранение в формате.
+    
+    Args:
+        powerpoint: Объект PowerPoint.Application
+        file_path: Путь к исходному PPTX или PPT файлу
+        output_path: Путь для сохранения результата
+        file_format: Формат для сохранения (32 = PDF, 24 = PPTX, и т.д.)
+        
+    Returns:
+        Tuple[успех, сообщение, путь к выходному файлу]
+    """
+    presentation = None
+    
+    # Настраиваем PowerPoint
+    powerpoint.Visible = False
+    powerpoint.DisplayAlerts = 0  # ppAlertsNone
+    
+    # Нормализуем пути
+    ppt_path = os.path.abspath(file_path)
+    output_file_path = os.path.abspath(output_path)
+    
+    # Убеждаемся, что директория существует
+    output_dir = os.path.dirname(output_file_path)
+    if output_dir and not os.path.isdir(output_dir):
+        os.makedirs(output_dir, exist_ok=True)
+    
+    logger.info(f"Конвертируем презентацию через PowerPoint: {ppt_path} -> {output_file_path}")
+    
+    # Открываем презентацию
+    try:
+        presentation = powerpoint.Presentations.Open(
+            FileName=ppt_path,
+            ReadOnly=True,
+            WithWindow=False
+        )
+    except (OSError, RuntimeError, AttributeError, PermissionError) as e:
+        error_msg = str(e)
+        logger.error(f"Ошибка выполнения при открытии презентации в PowerPoint: {error_msg}")
+        return False, f"PowerPoint не может открыть файл: {error_msg}", None
+    except (ValueError, TypeError, KeyError, IndexError) as e:
+        error_msg = str(e)
+        logger.error(f"Ошибка данных при открытии презентации в PowerPoint: {error_msg}")
+        return False, f"PowerPoint не может открыть файл: {error_msg}", None
+    except (MemoryError, RecursionError) as e:
+        error_msg = str(e)
+        logger.error(f"Ошибка памяти/рекурсии при открытии презентации в PowerPoint: {error_msg}")
+        return False, f"PowerPoint не может открыть файл: {error_msg}", None
+    except BaseException as e:
+        if isinstance(e, (KeyboardInterrupt, SystemExit)):
+            raise
+        error_msg = str(e)
+        logger.error(f"Критическая ошибка при открытии презентации в PowerPoint: {error_msg}", exc_info=True)
+        return False, f"PowerPoint не может открыть файл: {error_msg}", None
+    
+    try:
+        # Сохраняем в нужном формате
+        # Форматы: 32 = PDF, 24 = PPTX, 1 = PPT, 35 = ODP
+        presentation.SaveAs(FileName=output_file_path, FileFormat=file_format)
+        logger.info(f"Презентация успешно конвертирована через PowerPoint: {output_file_path}")
+        
+        # Проверяем существование файла с поддержкой Unicode
+        if _check_file_exists_unicode(output_file_path):
+            return True, "Презентация успешно конвертирована через PowerPoint", output_file_path
+        else:
+            return False, "Файл не был создан", None
+    except (OSError, RuntimeError, AttributeError, PermissionError) as e:
+        error_msg = str(e)
+        logger.error(f"Ошибка выполнения при сохранении презентации: {error_msg}")
+        return False, f"Ошибка при сохранении: {error_msg}", None
+    except (ValueError, TypeError, KeyError, IndexError) as e:
+        error_msg = str(e)
+        logger.error(f"Ошибка данных при сохранении презентации: {error_msg}")
+        return False, f"Ошибка данных при сохранении: {error_msg}", None
+    except (MemoryError, RecursionError) as e:
+        error_msg = str(e)
+        logger.error(f"Ошибка памяти/рекурсии при сохранении презентации: {error_msg}", exc_info=True)
+        return False, f"Ошибка памяти/рекурсии при сохранении: {error_msg}", None
+    except BaseException as e:
+        if isinstance(e, (KeyboardInterrupt, SystemExit)):
+            raise
+        error_msg = str(e)
+        logger.error(f"Критическая ошибка при сохранении презентации: {error_msg}", exc_info=True)
+        return False, f"Критическая ошибка при сохранении: {error_msg}", None
     finally:
-        # Убеждаемся, что все закрыто
+        # Закрываем презентацию (PowerPoint остается в пуле)
         if presentation:
             try:
                 presentation.Close()
-            except:
-                pass
-        if powerpoint:
-            try:
-                powerpoint.Quit()
-            except:
+            except (AttributeError, OSError, RuntimeError, TypeError):
                 pass
-        if com_initialized and pythoncom_module:
-            try:
-                pythoncom_module.CoUninitialize()
-            except:
-                pass
-    
-    return False, "Не удалось конвертировать презентацию", None
 
 
 def convert_presentation(
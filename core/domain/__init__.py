@@ -1,12 +1,18 @@
 """Доменные модели приложения."""
 
 from .file_info import FileInfo, FileStatus
+from .file_batch import FileBatch, FileRecord
+from .file_delta import FileDelta, FileSnapshot
 from .application_state import ApplicationState
 from .re_file_result import ReFileResult, ReFiledFile
 
 __all__ = [
     'FileInfo',
     'FileStatus',
+    'FileBatch',
+    'FileRecord',
+    'FileDelta',
+    'FileSnapshot',
     'ApplicationState',
     'ReFileResult',
     'ReFiledFile',
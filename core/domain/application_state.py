@@ -3,15 +3,24 @@
 from dataclasses import dataclass, field
 from typing import List, Optional, Dict, Any
 from pathlib import Path
+from .file_batch import FileBatch
+from .file_delta import FileDelta, FileSnapshot
 from .file_info import FileInfo
 
+try:
+    from config.constants import UNDO_MEMORY_BUDGET
+except ImportError:
+    UNDO_MEMORY_BUDGET = 16 * 1024 * 1024
+
 
 @dataclass
 class ApplicationState:
     """Состояние приложения."""
-    files: List[FileInfo] = field(default_factory=list)
-    undo_stack: List[List[FileInfo]] = field(default_factory=list)
-    redo_stack: List[List[FileInfo]] = field(default_factory=list)
+    # Файлы хранятся по столбцам (FileBatch); элементы - представления FileInfo
+    files: FileBatch = field(default_factory=FileBatch)
+    # Изменения для отмены/повтора (только изменившиеся файлы, см. file_delta)
+    undo_stack: List[FileDelta] = field(default_factory=list)
+    redo_stack: List[FileDelta] = field(default_factory=list)
     cancel_flag: bool = False
     
     # Данные для вкладок
@@ -28,6 +37,11 @@ class ApplicationState:
             True если файл добавлен, False если уже существует
         """
         # Проверяем, нет ли уже такого файла
+        if isinstance(self.files, FileBatch):
+            if self.files.find_path(file.path) >= 0:
+                return False
+            self.files.append(file)
+            return True
         for existing_file in self.files:
             if existing_file.path == file.path:
                 return False
@@ -63,74 +77,120 @@ class ApplicationState:
             FileInfo или None
         """
         target_path = Path(path)
+        if isinstance(self.files, FileBatch):
+            index = self.files.find_path(target_path)
+            return self.files[index] if index >= 0 else None
         for file in self.files:
             if file.path == target_path:
                 return file
         return None
     
-    def push_undo(self, files: List[FileInfo]) -> None:
-        """Добавление состояния в стек отмены.
+    def snapshot_files(self, files: Optional[List[FileInfo]] = None) -> FileSnapshot:
+        """Снимок изменяемых полей файлов перед изменением.
         
         Args:
-            files: Список файлов для сохранения
+            files: Список файлов (по умолчанию - self.files)
+            
+        Returns:
+            Снимок для push_undo
         """
-        # Создаем копию состояния
-        files_copy = [FileInfo(
-            path=f.path,
-            old_name=f.old_name,
-            new_name=f.new_name,
-            extension=f.extension,
-            status=f.status,
-            metadata=f.metadata.copy() if f.metadata else {},
-            error_message=f.error_message,
-            full_path=f.full_path
-        ) for f in files]
+        return FileSnapshot(self.files if files is None else files)
+    
+    def push_undo(self, before: FileSnapshot, files: Optional[List[FileInfo]] = None) -> bool:
+        """Добавление изменения в стек отмены.
         
-        self.undo_stack.append(files_copy)
-        # Ограничиваем размер стека
-        if len(self.undo_stack) > 50:
-            self.undo_stack.pop(0)
+        Сохраняются только файлы, изменившиеся после снимка.
+        
+        Args:
+            before: Снимок до изменения (snapshot_files)
+            files: Список файлов после изменения (по умолчанию - self.files)
+            
+        Returns:
+            True если изменение добавлено, False если ничего не изменилось
+        """
+        delta = FileDelta.between(before, self.files if files is None else files)
+        if not delta:
+            return False
+        self._push(self.undo_stack, delta)
         # Очищаем стек повтора при новом действии
         self.redo_stack.clear()
+        return True
     
-    def pop_undo(self) -> Optional[List[FileInfo]]:
-        """Извлечение состояния из стека отмены.
+    def pop_undo(self) -> Optional[FileDelta]:
+        """Извлечение изменения из стека отмены.
         
         Returns:
-            Список файлов или None
+            Изменение или None
         """
         if not self.undo_stack:
             return None
         return self.undo_stack.pop()
     
-    def push_redo(self, files: List[FileInfo]) -> None:
-        """Добавление состояния в стек повтора.
+    def push_redo(self, delta: FileDelta) -> None:
+        """Добавление изменения в стек повтора.
         
         Args:
-            files: Список файлов для сохранения
+            delta: Отмененное изменение
         """
-        files_copy = [FileInfo(
-            path=f.path,
-            old_name=f.old_name,
-            new_name=f.new_name,
-            extension=f.extension,
-            status=f.status,
-            metadata=f.metadata.copy() if f.metadata else {},
-            error_message=f.error_message,
-            full_path=f.full_path
-        ) for f in files]
-        
-        self.redo_stack.append(files_copy)
-        if len(self.redo_stack) > 50:
-            self.redo_stack.pop(0)
+        self._push(self.redo_stack, delta)
     
-    def pop_redo(self) -> Optional[List[FileInfo]]:
-        """Извлечение состояния из стека повтора.
+    def pop_redo(self) -> Optional[FileDelta]:
+        """Извлечение изменения из стека повтора.
         
         Returns:
-            Список файлов или None
+            Изменение или None
         """
         if not self.redo_stack:
             return None
         return self.redo_stack.pop()
-
+    
+    def undo(self, files: Optional[List[FileInfo]] = None) -> bool:
+        """Отмена последнего изменения.
+        
+        Args:
+            files: Список файлов (по умолчанию - self.files)
+            
+        Returns:
+            True если изменение отменено, False если стек пуст
+        """
+        delta = self.pop_undo()
+        if delta is None:
+            return False
+        delta.revert(self.files if files is None else files)
+        self._push(self.redo_stack, delta)
+        return True
+    
+    def redo(self, files: Optional[List[FileInfo]] = None) -> bool:
+        """Повтор последнего отмененного изменения.
+        
+        Args:
+            files: Список файлов (по умолчанию - self.files)
+            
+        Returns:
+            True если изменение повторено, False если стек пуст
+        """
+        delta = self.pop_redo()
+        if delta is None:
+            return False
+        delta.apply(self.files if files is None else files)
+        self._push(self.undo_stack, delta)
+        return True
+    
+    def undo_memory(self) -> int:
+        """Оценка памяти стеков отмены и повтора (байты)."""
+        return sum(delta.nbytes for delta in self.undo_stack) + sum(delta.nbytes for delta in self.redo_stack)
+    
+    def _push(self, stack: List[FileDelta], delta: FileDelta) -> None:
+        """Добавление в стек с вытеснением старых записей по объему памяти.
+        
+        Бюджет UNDO_MEMORY_BUDGET действует на каждый стек отдельно;
+        последняя запись сохраняется, даже если превышает бюджет.
+        """
+        stack.append(delta)
+        total = sum(entry.nbytes for entry in stack)
+        evicted = 0
+        while total > UNDO_MEMORY_BUDGET and evicted < len(stack) - 1:
+            total -= stack[evicted].nbytes
+            evicted += 1
+        if evicted:
+            del stack[:evicted]
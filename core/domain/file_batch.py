@@ -0,0 +1,531 @@
+"""Столбцовое хранилище списка файлов для больших сессий.
+
+FileBatch хранит файлы не объектами, а параллельными столбцами:
+- индексы папок в массиве (сами папки - в общей таблице строк);
+- исходные и новые имена, расширения (интернированные строки);
+- коды статусов и размеры в массивах array.
+
+Редкие поля (сообщения об ошибках, метаданные, full_path, отличный от
+пути) хранятся в словарях по индексу. Операции над одним атрибутом всех
+файлов (предпросмотр, проверка конфликтов, статистика, отображение
+списка) читают столбцы без создания объектов.
+
+Для совместимости FileBatch ведет себя как список FileInfo: элементы
+возвращаются как представления FileRecord, создаваемые по требованию;
+изменения через представление записываются в столбцы. Представление
+ссылается на позицию в списке и становится недействительным после
+удаления или вставки элементов перед ним.
+"""
+
+import os
+import sys
+from array import array
+from collections import Counter
+from collections.abc import MutableSequence
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from .file_info import FileInfo, FileStatus, _split_name
+
+# Коды статусов в столбце statuses
+_STATUSES = tuple(FileStatus)
+_STATUS_CODES = {status: code for code, status in enumerate(_STATUSES)}
+
+# Размер неизвестен
+UNKNOWN_SIZE = -1
+
+
+def _status_code(status) -> int:
+    """Код статуса (строковый статус приводится к FileStatus)."""
+    code = _STATUS_CODES.get(status)
+    if code is None:
+        code = _STATUS_CODES[FileStatus.from_string(str(status))]
+    return code
+
+
+class FileRecord(FileInfo):
+    """Представление файла из FileBatch с интерфейсом FileInfo.
+
+    Атрибуты читаются из столбцов хранилища и записываются в них.
+    """
+
+    __slots__ = ('_batch', '_index')
+
+    def __init__(self, batch: 'FileBatch', index: int) -> None:
+        """Инициализация.
+
+        Args:
+            batch: Хранилище
+            index: Позиция файла
+        """
+        self._batch = batch
+        self._index = index
+
+    @property
+    def old_name(self) -> str:
+        return self._batch.old_names[self._index]
+
+    @old_name.setter
+    def old_name(self, value: str) -> None:
+        self._batch._set_old(self._index, value, self._batch.old_extensions[self._index])
+
+    @property
+    def new_name(self) -> str:
+        return self._batch.new_names[self._index]
+
+    @new_name.setter
+    def new_name(self, value: str) -> None:
+        self._batch.new_names[self._index] = value
+
+    @property
+    def extension(self) -> str:
+        return self._batch.extensions[self._index]
+
+    @extension.setter
+    def extension(self, value: str) -> None:
+        self._batch.extensions[self._index] = sys.intern(value) if value else value
+
+    @property
+    def _old_extension(self) -> str:
+        return self._batch.old_extensions[self._index]
+
+    @_old_extension.setter
+    def _old_extension(self, value: str) -> None:
+        self._batch._set_old(self._index, self._batch.old_names[self._index], value)
+
+    @property
+    def status(self) -> FileStatus:
+        return _STATUSES[self._batch.statuses[self._index]]
+
+    @status.setter
+    def status(self, value) -> None:
+        self._batch.statuses[self._index] = _status_code(value)
+
+    @property
+    def error_message(self) -> Optional[str]:
+        return self._batch._errors.get(self._index)
+
+    @error_message.setter
+    def error_message(self, value: Optional[str]) -> None:
+        self._batch._set_sparse(self._batch._errors, self._index, value)
+
+    @property
+    def path(self) -> Path:
+        return Path(self._batch.path_str(self._index))
+
+    @path.setter
+    def path(self, value: Union[Path, str]) -> None:
+        self._batch._set_path(self._index, value)
+
+    @property
+    def full_path(self) -> Optional[str]:
+        return self._batch.full_path(self._index)
+
+    @full_path.setter
+    def full_path(self, value: Optional[str]) -> None:
+        self._batch._set_full_path(self._index, value)
+
+    @property
+    def _metadata(self) -> Optional[Dict]:
+        return self._batch._metadata.get(self._index)
+
+    @property
+    def metadata(self) -> Dict:
+        metadata = self._batch._metadata.get(self._index)
+        if metadata is None:
+            metadata = self._batch._metadata[self._index] = {}
+        return metadata
+
+    @metadata.setter
+    def metadata(self, value: Optional[Dict]) -> None:
+        self._batch._set_sparse(self._batch._metadata, self._index, value)
+
+    def _joined_path(self) -> str:
+        return self._batch.path_str(self._index)
+
+
+class FileBatch(MutableSequence):
+    """Список файлов в виде параллельных столбцов."""
+
+    # Как у списка: изменяемый, не хешируется
+    __hash__ = None
+
+    def __init__(self, files: Iterable[FileInfo] = ()) -> None:
+        """Инициализация.
+
+        Args:
+            files: Начальные файлы
+        """
+        self._init_columns()
+        self.extend(files)
+
+    def _init_columns(self) -> None:
+        # Таблица папок: строка хранится один раз для всех файлов папки
+        self._dirs: List[str] = []
+        self._dir_ids: Dict[str, int] = {}
+        self.dir_index = array('i')
+        self.old_names: List[str] = []
+        self.new_names: List[str] = []
+        self.extensions: List[str] = []
+        self.old_extensions: List[str] = []
+        self.statuses = array('b')
+        self.sizes = array('q')
+        # Редкие поля по индексу
+        self._names: Dict[int, str] = {}  # Имя в пути, если не old_name + old_extension
+        self._full_paths: Dict[int, Optional[str]] = {}  # full_path, если отличается от пути
+        self._errors: Dict[int, str] = {}
+        self._metadata: Dict[int, Dict] = {}
+
+    # ------------------------------------------------------------------
+    # Добавление
+    # ------------------------------------------------------------------
+
+    def add_path(self, file_path: str, metadata: Optional[Dict] = None,
+                 size: int = UNKNOWN_SIZE) -> int:
+        """Добавление файла по пути без создания FileInfo.
+
+        Args:
+            file_path: Путь к файлу
+            metadata: Метаданные
+            size: Размер файла (байты)
+
+        Returns:
+            Индекс добавленного файла
+        """
+        file_path = os.fspath(file_path)
+        old_name, extension = _split_name(file_path)
+        directory, name = os.path.split(file_path)
+        return self._append(directory, name, file_path, old_name, old_name, extension,
+                            extension, _STATUS_CODES[FileStatus.READY], None, metadata, size)
+
+    def append(self, file: FileInfo) -> None:
+        """Добавление файла (данные копируются в столбцы)."""
+        self._append(*self._row(file))
+
+    def _row(self, file: FileInfo) -> Tuple:
+        """Данные файла для столбцов."""
+        if not isinstance(file, FileInfo):
+            raise TypeError(f"FileBatch хранит только FileInfo, получен {type(file).__name__}")
+        if isinstance(file, FileRecord):
+            directory, name = os.path.split(file._batch.path_str(file._index))
+        else:
+            directory, name = file._directory, file._name
+        metadata = file._metadata
+        size = metadata.get('size', UNKNOWN_SIZE) if metadata else UNKNOWN_SIZE
+        if not isinstance(size, int):
+            size = UNKNOWN_SIZE
+        return (directory, name, file.full_path, file.old_name, file.new_name, file.extension,
+                file._old_extension, _status_code(file.status), file.error_message, metadata, size)
+
+    def _append(self, directory: str, name: str, full_path: Optional[str], old_name: str,
+                new_name: str, extension: str, old_extension: str, status: int,
+                error_message: Optional[str], metadata: Optional[Dict], size: int) -> int:
+        index = len(self.old_names)
+        self.dir_index.append(self._dir_id(directory))
+        self.old_names.append(old_name)
+        self.new_names.append(new_name)
+        self.extensions.append(sys.intern(extension) if extension else extension)
+        self.old_extensions.append(sys.intern(old_extension) if old_extension else old_extension)
+        self.statuses.append(status)
+        self.sizes.append(size)
+        self._store_row_sparse(index, name, full_path, error_message, metadata)
+        return index
+
+    def _store_row_sparse(self, index: int, name: str, full_path: Optional[str],
+                          error_message: Optional[str], metadata: Optional[Dict]) -> None:
+        if name != self._derived_name(index):
+            self._names[index] = name
+        if full_path != self.path_str(index):
+            self._full_paths[index] = full_path
+        if error_message is not None:
+            self._errors[index] = error_message
+        if metadata is not None:
+            self._metadata[index] = metadata
+
+    def _dir_id(self, directory: str) -> int:
+        dir_id = self._dir_ids.get(directory)
+        if dir_id is None:
+            dir_id = self._dir_ids[directory] = len(self._dirs)
+            self._dirs.append(sys.intern(directory))
+        return dir_id
+
+    # ------------------------------------------------------------------
+    # Интерфейс списка
+    # ------------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self.old_names)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [FileRecord(self, i) for i in range(*index.indices(len(self)))]
+        return FileRecord(self, self._normalize_index(index))
+
+    def __iter__(self) -> Iterator[FileRecord]:
+        for index in range(len(self)):
+            yield FileRecord(self, index)
+
+    def __setitem__(self, index: int, file: FileInfo) -> None:
+        if isinstance(index, slice):
+            raise TypeError("FileBatch не поддерживает присваивание срезу")
+        index = self._normalize_index(index)
+        directory, name, full_path, old_name, new_name, extension, old_extension, \
+            status, error_message, metadata, size = self._row(file)
+        self.dir_index[index] = self._dir_id(directory)
+        self.old_names[index] = old_name
+        self.new_names[index] = new_name
+        self.extensions[index] = sys.intern(extension) if extension else extension
+        self.old_extensions[index] = sys.intern(old_extension) if old_extension else old_extension
+        self.statuses[index] = status
+        self.sizes[index] = size
+        for sparse in (self._names, self._full_paths, self._errors, self._metadata):
+            sparse.pop(index, None)
+        self._store_row_sparse(index, name, full_path, error_message, metadata)
+
+    def __delitem__(self, index) -> None:
+        if isinstance(index, slice):
+            removed = set(range(*index.indices(len(self))))
+        else:
+            removed = {self._normalize_index(index)}
+        keep = [i for i in range(len(self)) if i not in removed]
+        self._reorder(keep)
+
+    def insert(self, index: int, file: FileInfo) -> None:
+        """Вставка файла (в конец - O(1), в середину - O(n))."""
+        count = len(self)
+        if index < 0:
+            index = max(count + index, 0)
+        self.append(file)
+        if index < count:
+            self._reorder(list(range(index)) + [count] + list(range(index, count)))
+
+    def clear(self) -> None:
+        """Очистка списка."""
+        self._init_columns()
+
+    def index(self, value: Any, start: int = 0, stop: Optional[int] = None) -> int:
+        """Позиция файла (поиск по пути без создания представлений)."""
+        stop = len(self) if stop is None else stop
+        if isinstance(value, FileRecord) and value._batch is self and start <= value._index < stop:
+            return value._index
+        if isinstance(value, FileInfo):
+            target = value.path
+            for i in self._iter_name_matches(target.name, start, stop):
+                if Path(self.path_str(i)) == target and self[i] == value:
+                    return i
+        raise ValueError(f"{value!r} нет в списке")
+
+    def __contains__(self, value: Any) -> bool:
+        try:
+            self.index(value)
+        except ValueError:
+            return False
+        return True
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, (list, tuple, FileBatch)):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+    def __repr__(self) -> str:
+        return f"FileBatch({len(self)} файлов)"
+
+    def _normalize_index(self, index: int) -> int:
+        count = len(self)
+        if index < 0:
+            index += count
+        if not 0 <= index < count:
+            raise IndexError("индекс FileBatch вне диапазона")
+        return index
+
+    def _reorder(self, order: List[int]) -> None:
+        """Перестановка/удаление строк: новая строка i - старая строка order[i]."""
+        self.dir_index = array('i', (self.dir_index[i] for i in order))
+        self.old_names = [self.old_names[i] for i in order]
+        self.new_names = [self.new_names[i] for i in order]
+        self.extensions = [self.extensions[i] for i in order]
+        self.old_extensions = [self.old_extensions[i] for i in order]
+        self.statuses = array('b', (self.statuses[i] for i in order))
+        self.sizes = array('q', (self.sizes[i] for i in order))
+        for attr in ('_names', '_full_paths', '_errors', '_metadata'):
+            sparse = getattr(self, attr)
+            if sparse:
+                setattr(self, attr, {new: sparse[old] for new, old in enumerate(order) if old in sparse})
+
+    # ------------------------------------------------------------------
+    # Доступ к столбцам
+    # ------------------------------------------------------------------
+
+    def name(self, index: int) -> str:
+        """Имя файла в пути (с расширением)."""
+        name = self._names.get(index)
+        if name is None:
+            name = self._derived_name(index)
+        return name
+
+    def _derived_name(self, index: int) -> Optional[str]:
+        """Имя в пути по умолчанию: old_name + old_extension."""
+        old_name = self.old_names[index]
+        old_extension = self.old_extensions[index]
+        if old_name is None or old_extension is None:
+            return None
+        return old_name + old_extension
+
+    def path_str(self, index: int) -> str:
+        """Путь к файлу в виде строки."""
+        directory = self._dirs[self.dir_index[index]]
+        name = self.name(index)
+        return os.path.join(directory, name) if directory else name
+
+    def full_path(self, index: int) -> Optional[str]:
+        """full_path файла (как FileInfo.full_path)."""
+        if index in self._full_paths:
+            return self._full_paths[index]
+        return self.path_str(index)
+
+    def iter_rows(self) -> Iterator[Tuple[str, str, str, Optional[str]]]:
+        """Строки для отображения: (старое имя, новое имя, расширение, full_path)."""
+        full_paths = self._full_paths
+        for index in range(len(self)):
+            full_path = full_paths[index] if index in full_paths else self.path_str(index)
+            yield self.old_names[index], self.new_names[index], self.extensions[index], full_path
+
+    def status(self, index: int) -> FileStatus:
+        """Статус файла."""
+        return _STATUSES[self.statuses[index]]
+
+    def set_names(self, index: int, new_name: str, extension: str) -> None:
+        """Установка нового имени и расширения."""
+        self.new_names[index] = new_name
+        self.extensions[index] = sys.intern(extension) if extension else extension
+
+    def set_status(self, index: int, status: FileStatus, error_message: Optional[str] = None) -> None:
+        """Установка статуса и сообщения об ошибке."""
+        self.statuses[index] = _status_code(status)
+        self._set_sparse(self._errors, index, error_message)
+
+    def errors(self) -> Dict[int, str]:
+        """Сообщения об ошибках по индексам файлов (только файлы с ошибками)."""
+        return dict(self._errors)
+
+    def find_path(self, path: Union[Path, str]) -> int:
+        """Индекс файла с таким путем (сравнение как у Path) или -1."""
+        target = Path(path)
+        for index in self._iter_name_matches(target.name, 0, len(self)):
+            if Path(self.path_str(index)) == target:
+                return index
+        return -1
+
+    def find_full_path(self, full_path: str) -> int:
+        """Индекс файла с таким full_path (сравнение строк) или -1."""
+        for index, value in self._full_paths.items():
+            if value == full_path:
+                return index
+        directory, name = os.path.split(full_path)
+        dir_id = self._dir_ids.get(directory)
+        if dir_id is None:
+            return -1
+        dir_index = self.dir_index
+        for index in self._iter_name_matches(name, 0, len(self)):
+            if dir_index[index] == dir_id and index not in self._full_paths and self.path_str(index) == full_path:
+                return index
+        return -1
+
+    def _iter_name_matches(self, name: str, start: int, stop: int) -> Iterator[int]:
+        """Индексы файлов с таким именем в пути (без сборки строк имен)."""
+        names = self._names
+        old_names = self.old_names
+        old_extensions = self.old_extensions
+        length = len(name)
+        for index in range(start, stop):
+            if index in names:
+                if names[index] == name:
+                    yield index
+                continue
+            old_name = old_names[index]
+            old_extension = old_extensions[index]
+            if old_name is None or old_extension is None:
+                continue
+            if (len(old_name) + len(old_extension) == length
+                    and name.startswith(old_name) and name.endswith(old_extension)):
+                yield index
+
+    def find_conflicts(self) -> Dict[str, List[int]]:
+        """Группы файлов, получающих одинаковое новое имя.
+
+        Returns:
+            Новое имя с расширением -> индексы файлов (только группы из 2+ файлов)
+        """
+        first: Dict[str, int] = {}
+        conflicts: Dict[str, List[int]] = {}
+        for index, full_name in enumerate(map(str.__add__, self.new_names, self.extensions)):
+            previous = first.setdefault(full_name, index)
+            if previous != index:
+                group = conflicts.get(full_name)
+                if group is None:
+                    conflicts[full_name] = [previous, index]
+                else:
+                    group.append(index)
+        return conflicts
+
+    def mark_conflicts(self) -> int:
+        """Пометка конфликтующих файлов ошибкой.
+
+        Returns:
+            Количество помеченных файлов
+        """
+        marked = 0
+        for full_name, indices in self.find_conflicts().items():
+            conflict_msg = f"Конфликт: {len(indices)} файла с именем '{full_name}'"
+            for index in indices:
+                self.set_status(index, FileStatus.ERROR, conflict_msg)
+            marked += len(indices)
+        return marked
+
+    def extension_counts(self) -> Counter:
+        """Количество файлов по расширениям (в нижнем регистре)."""
+        counts: Counter = Counter()
+        for extension, count in Counter(self.extensions).items():
+            counts[extension.lower()] += count
+        return counts
+
+    def total_size(self) -> int:
+        """Суммарный размер файлов с известным размером (байты)."""
+        return sum(size for size in self.sizes if size > 0)
+
+    # ------------------------------------------------------------------
+    # Запись через представления
+    # ------------------------------------------------------------------
+
+    def _set_sparse(self, sparse: Dict, index: int, value) -> None:
+        if value is None:
+            sparse.pop(index, None)
+        else:
+            sparse[index] = value
+
+    def _set_old(self, index: int, old_name: str, old_extension: str) -> None:
+        # Имя в пути не зависит от old_name: сохраняем его до изменения
+        name = self.name(index)
+        self.old_names[index] = old_name
+        self.old_extensions[index] = sys.intern(old_extension) if old_extension else old_extension
+        self._set_name(index, name)
+
+    def _set_name(self, index: int, name: str) -> None:
+        if name == self._derived_name(index):
+            self._names.pop(index, None)
+        else:
+            self._names[index] = name
+
+    def _set_path(self, index: int, value: Union[Path, str]) -> None:
+        # full_path при смене пути не меняется (как у FileInfo)
+        full_path = self.full_path(index)
+        directory, name = os.path.split(str(value) if isinstance(value, Path) else os.fspath(value))
+        self.dir_index[index] = self._dir_id(directory)
+        self._set_name(index, name)
+        self._set_full_path(index, full_path)
+
+    def _set_full_path(self, index: int, value: Optional[str]) -> None:
+        if value == self.path_str(index):
+            self._full_paths.pop(index, None)
+        else:
+            self._full_paths[index] = value
@@ -0,0 +1,150 @@
+"""Компактные изменения списка файлов для отмены/повтора.
+
+Вместо копии всего списка FileInfo запись отмены хранит только файлы,
+у которых изменились new_name, extension или статус. Данные хранятся по
+столбцам: индексы и коды статусов - в массивах array, строки - в
+списках (строки не копируются, а разделяются с FileInfo). Применение и
+откат выполняются за O(числа изменений).
+
+Записи привязаны к позициям файлов в списке: между снимком и
+применением порядок файлов не должен меняться.
+"""
+
+import sys
+from array import array
+from typing import List, Optional, Sequence
+
+from .file_batch import _STATUSES, FileBatch, _status_code
+from .file_info import FileInfo
+
+# Оценка постоянных накладных расходов записи (объект, списки, массивы)
+_DELTA_OVERHEAD = 512
+
+
+class FileSnapshot:
+    """Снимок изменяемых полей списка файлов (без копирования объектов)."""
+
+    __slots__ = ('new_names', 'extensions', 'statuses', 'errors')
+
+    def __init__(self, files: Sequence[FileInfo]):
+        """Снимок.
+
+        Args:
+            files: Список файлов
+        """
+        if isinstance(files, FileBatch):
+            # Копия столбцов без создания представлений
+            self.new_names: List[str] = list(files.new_names)
+            self.extensions: List[str] = list(files.extensions)
+            self.statuses = array('b', files.statuses)
+            errors = files.errors()
+            self.errors: List[Optional[str]] = [errors.get(i) for i in range(len(files))] if errors else [None] * len(files)
+            return
+        self.new_names = [f.new_name for f in files]
+        self.extensions = [f.extension for f in files]
+        self.statuses = array('b', (_status_code(f.status) for f in files))
+        self.errors = [f.error_message for f in files]
+
+    def __len__(self) -> int:
+        return len(self.new_names)
+
+
+class FileDelta:
+    """Изменения полей файлов между двумя состояниями списка."""
+
+    __slots__ = (
+        'indices',
+        'old_names', 'new_names',
+        'old_extensions', 'new_extensions',
+        'old_statuses', 'new_statuses',
+        'old_errors', 'new_errors',
+        'nbytes',
+    )
+
+    def __init__(self):
+        self.indices = array('l')
+        self.old_names: List[str] = []
+        self.new_names: List[str] = []
+        self.old_extensions: List[str] = []
+        self.new_extensions: List[str] = []
+        self.old_statuses = array('b')
+        self.new_statuses = array('b')
+        self.old_errors: List[Optional[str]] = []
+        self.new_errors: List[Optional[str]] = []
+        # Оценка занимаемой памяти (байты)
+        self.nbytes = 0
+
+    @classmethod
+    def between(cls, before: FileSnapshot, files: Sequence[FileInfo]) -> 'FileDelta':
+        """Изменения от снимка до текущего состояния файлов.
+
+        Args:
+            before: Снимок до изменения
+            files: Список файлов после изменения
+
+        Returns:
+            Запись изменений (пустая, если ничего не изменилось)
+        """
+        delta = cls()
+        if isinstance(files, FileBatch):
+            # Сравнение столбцов без создания представлений
+            errors = files.errors()
+            rows = zip(files.new_names, files.extensions, files.statuses,
+                       (errors.get(i) for i in range(len(files))))
+        else:
+            rows = ((f.new_name, f.extension, _status_code(f.status), f.error_message) for f in files)
+        for index, (new_name, extension, status, error) in zip(range(len(before)), rows):
+            if (new_name == before.new_names[index]
+                    and extension == before.extensions[index]
+                    and status == before.statuses[index]
+                    and error == before.errors[index]):
+                continue
+            delta.indices.append(index)
+            delta.old_names.append(before.new_names[index])
+            delta.new_names.append(new_name)
+            delta.old_extensions.append(before.extensions[index])
+            delta.new_extensions.append(extension)
+            delta.old_statuses.append(before.statuses[index])
+            delta.new_statuses.append(status)
+            delta.old_errors.append(before.errors[index])
+            delta.new_errors.append(error)
+        delta.nbytes = delta._estimate_size()
+        return delta
+
+    def __len__(self) -> int:
+        return len(self.indices)
+
+    def apply(self, files: Sequence[FileInfo]) -> None:
+        """Повтор изменения (состояние после изменения)."""
+        self._set(files, self.new_names, self.new_extensions, self.new_statuses, self.new_errors)
+
+    def revert(self, files: Sequence[FileInfo]) -> None:
+        """Отмена изменения (состояние до изменения)."""
+        self._set(files, self.old_names, self.old_extensions, self.old_statuses, self.old_errors)
+
+    def _set(self, files: Sequence[FileInfo], names: List[str], extensions: List[str],
+             statuses: array, errors: List[Optional[str]]) -> None:
+        count = len(files)
+        for position, index in enumerate(self.indices):
+            if index >= count:
+                continue
+            if isinstance(files, FileBatch):
+                files.set_names(index, names[position], extensions[position])
+                files.set_status(index, _STATUSES[statuses[position]], errors[position])
+                continue
+            f = files[index]
+            f.new_name = names[position]
+            f.extension = extensions[position]
+            f.status = _STATUSES[statuses[position]]
+            f.error_message = errors[position]
+
+    def _estimate_size(self) -> int:
+        """Оценка памяти записи (строки учитываются, даже если разделяются с FileInfo)."""
+        size = _DELTA_OVERHEAD
+        for column in (self.indices, self.old_statuses, self.new_statuses):
+            size += column.itemsize * len(column)
+        for column in (self.old_names, self.new_names, self.old_extensions,
+                       self.new_extensions, self.old_errors, self.new_errors):
+            size += 8 * len(column)
+            size += sum(sys.getsizeof(value) for value in column if value is not None)
+        return size
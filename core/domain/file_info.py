@@ -1,8 +1,9 @@
 """Модель информации о файле."""
 
-from dataclasses import dataclass, field
+import os
+import sys
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple, Union
 from enum import Enum
 
 
@@ -25,33 +26,144 @@ class FileStatus(Enum):
         return cls.READY
 
 
-@dataclass
+def _split_name(file_path: str) -> Tuple[str, str]:
+    """Имя без расширения и расширение (как Path.stem и Path.suffix, без создания Path)."""
+    name = os.path.basename(file_path)
+    if not name or name in ('.', '..'):
+        path_obj = Path(file_path)
+        return path_obj.stem, path_obj.suffix
+    i = name.rfind('.')
+    if 0 < i < len(name) - 1:
+        # Расширения повторяются у множества файлов: храним одну строку
+        return name[:i], sys.intern(name[i:])
+    return name, ''
+
+
 class FileInfo:
-    """Модель информации о файле."""
-    path: Path
-    old_name: str
-    new_name: str
-    extension: str
-    status: FileStatus = FileStatus.READY
-    metadata: Optional[Dict] = field(default_factory=dict)
-    error_message: Optional[str] = None
-    
-    # Для обратной совместимости
-    full_path: Optional[str] = None
-    
-    def __post_init__(self):
-        """Инициализация после создания."""
-        if self.full_path is None:
-            self.full_path = str(self.path)
-        # Убеждаемся, что path - это Path объект
-        if isinstance(self.path, str):
-            self.path = Path(self.path)
-        # Сохраняем старое расширение для проверки изменений
-        if not hasattr(self, '_old_extension') or self._old_extension is None:
-            self._old_extension = self.extension
+    """Модель информации о файле.
+    
+    Компактное представление для больших списков: атрибуты хранятся в
+    __slots__, путь хранится как папка (интернированная строка, общая
+    для файлов одной папки) и имя, объект Path создается при первом
+    обращении к path. full_path хранится отдельно, только если
+    отличается от пути, а пустые метаданные создаются при первом
+    обращении к metadata.
+    """
+    
+    __slots__ = (
+        '_directory', '_name', '_path', '_full_path', '_metadata',
+        'old_name', 'new_name', 'extension', 'status', 'error_message',
+        '_old_extension',
+    )
+    
+    # Как у dataclass с eq=True: объекты изменяемые и не хешируются
+    __hash__ = None
+    
+    def __init__(
+        self,
+        path: Union[Path, str],
+        old_name: str,
+        new_name: str,
+        extension: str,
+        status: FileStatus = FileStatus.READY,
+        metadata: Optional[Dict] = None,
+        error_message: Optional[str] = None,
+        full_path: Optional[str] = None
+    ) -> None:
+        """Инициализация.
+        
+        Args:
+            path: Путь к файлу
+            old_name: Исходное имя (без расширения)
+            new_name: Новое имя (без расширения)
+            extension: Расширение
+            status: Статус
+            metadata: Метаданные
+            error_message: Сообщение об ошибке
+            full_path: Полный путь (для обратной совместимости, по умолчанию - str(path))
+        """
+        self._path = None
+        self._full_path = None
+        self._set_path(path)
+        # Для обратной совместимости
+        if full_path is None:
+            full_path = str(path)
+        self.full_path = full_path
+        self.old_name = old_name
+        self.new_name = new_name
+        self.extension = extension
+        self.status = status
+        self._metadata = metadata
+        self.error_message = error_message
         # Сохраняем старое расширение для проверки изменений
-        if self._old_extension is None:
-            self._old_extension = self.extension
+        self._old_extension = extension
+    
+    def _set_path(self, path: Union[Path, str]) -> None:
+        """Сохранение пути как (папка, имя)."""
+        if isinstance(path, Path):
+            self._path = path
+            path = str(path)
+        else:
+            self._path = None
+            path = os.fspath(path)
+        directory, self._name = os.path.split(path)
+        self._directory = sys.intern(directory)
+    
+    def _joined_path(self) -> str:
+        return os.path.join(self._directory, self._name) if self._directory else self._name
+    
+    @property
+    def path(self) -> Path:
+        """Путь к файлу (Path создается при первом обращении)."""
+        if self._path is None:
+            self._path = Path(self._joined_path())
+        return self._path
+    
+    @path.setter
+    def path(self, value: Union[Path, str]) -> None:
+        # full_path при смене пути не меняется (как у поля dataclass)
+        if self._full_path is None:
+            self._full_path = self._joined_path()
+        self._set_path(value)
+    
+    @property
+    def full_path(self) -> Optional[str]:
+        """Полный путь в виде строки (для обратной совместимости)."""
+        if self._full_path is None:
+            return self._joined_path()
+        return self._full_path
+    
+    @full_path.setter
+    def full_path(self, value: Optional[str]) -> None:
+        self._full_path = None if value == self._joined_path() else value
+    
+    @property
+    def metadata(self) -> Dict:
+        """Метаданные (пустой словарь создается при первом обращении)."""
+        if self._metadata is None:
+            self._metadata = {}
+        return self._metadata
+    
+    @metadata.setter
+    def metadata(self, value: Optional[Dict]) -> None:
+        self._metadata = value
+    
+    def _fields(self) -> Tuple:
+        return (self.path, self.old_name, self.new_name, self.extension, self.status,
+                self._metadata or {}, self.error_message, self.full_path)
+    
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, FileInfo):
+            return NotImplemented
+        return self._fields() == other._fields()
+    
+    def __repr__(self) -> str:
+        return (
+            f"{self.__class__.__qualname__}(path={self.path!r}, old_name={self.old_name!r}, "
+            f"new_name={self.new_name!r}, extension={self.extension!r}, status={self.status!r}, "
+            f"metadata={self._metadata or {}!r}, error_message={self.error_message!r}, "
+            f"full_path={self.full_path!r})"
+        )
     
     @classmethod
     def from_path(cls, file_path: str, metadata: Optional[Dict[str, Any]] = None) -> 'FileInfo':
@@ -64,17 +176,15 @@ class FileInfo:
         Returns:
             FileInfo объект
         """
-        path_obj = Path(file_path)
-        old_name = path_obj.stem
-        extension = path_obj.suffix
+        old_name, extension = _split_name(file_path)
         
         return cls(
-            path=path_obj,
+            path=file_path,
             old_name=old_name,
             new_name=old_name,
             extension=extension,
             status=FileStatus.READY,
-            metadata=metadata or {},
+            metadata=metadata,
             full_path=file_path
         )
     
@@ -97,10 +207,10 @@ class FileInfo:
             extension = data.get('extension', '')
             file_path = str(Path(dir_path) / f"{old_name}{extension}")
         
-        path_obj = Path(file_path)
-        old_name = data.get('old_name', path_obj.stem)
+        stem, suffix = _split_name(file_path)
+        old_name = data.get('old_name', stem)
         new_name = data.get('new_name', old_name)
-        extension = data.get('extension', path_obj.suffix)
+        extension = data.get('extension', suffix)
         status_str = data.get('status', 'Готов')
         
         # Извлекаем сообщение об ошибке из статуса
@@ -109,12 +219,12 @@ class FileInfo:
             error_message = status_str.replace('Ошибка:', '').strip()
         
         return cls(
-            path=path_obj,
+            path=file_path,
             old_name=old_name,
             new_name=new_name,
             extension=extension,
             status=FileStatus.from_string(status_str),
-            metadata=data.get('metadata', {}),
+            metadata=data.get('metadata'),
             error_message=error_message,
             full_path=file_path
         )
@@ -166,7 +276,7 @@ class FileInfo:
         """Проверка, изменилось ли имя."""
         # Проверяем изменение имени и расширения
         name_changed = self.old_name != self.new_name
-        ext_changed = self._old_extension != self.extension if hasattr(self, '_old_extension') and self._old_extension is not None else False
+        ext_changed = self._old_extension != self.extension if self._old_extension is not None else False
         return name_changed or ext_changed
     
     def is_ready(self) -> bool:
@@ -72,13 +72,24 @@ class FileConverter:
     """Класс для конвертации файлов."""
     
     def __init__(self) -> None:
-        """Инициализация конвертера файлов."""
-        # Импорт Pillow для работы с изображениями
-        try:
-            from PIL import Image
-            self.Image = Image
-        except ImportError:
-            self.Image = None
+        """Инициализация конвертера файлов.
+        
+        Библиотеки конвертации не импортируются здесь: каждая загружается
+        через реестр бэкендов при первом обращении (см. свойства ниже).
+        """
+        from core.converter.backends import BackendRegistry
+        self.backends = BackendRegistry()
+        
+        # Параметры растеризации PDF (RasterOptions); None - значения по умолчанию
+        self.pdf_raster_options = None
+        # Профиль конвертации изображений (ImageProfile); None - профиль 'quality'
+        self.image_profile = None
+        # Кеш результатов конвертации (ConversionCache); None - без кеша
+        self.conversion_cache = None
+        # Планировщик выходных путей текущего пакета (OutputPlanner); None - вне пакета
+        self.output_planner = None
+        # Параметры конвертации PDF в DOCX через pdf2docx (Pdf2DocxOptions); None - по умолчанию
+        self.pdf2docx_options = None
         
         # Поддерживаемые форматы изображений для конвертации
         # ВАЖНО: PDF не является изображением, это документ, поэтому он не включен здесь
@@ -91,64 +102,6 @@ class FileConverter:
             '.ico': 'ICO'
         }
         
-        # Импорт python-docx для работы с Word документами
-        try:
-            import docx
-            self.docx_module = docx
-        except ImportError:
-            self.docx_module = None
-        
-        # Импорт библиотек для конвертации документов
-        self.docx2pdf_convert = None
-        self.comtypes = None
-        self.win32com = None
-        self.pythoncom = None
-        self.use_docx2pdf = False
-        
-        # Импорт pdf2docx для конвертации PDF в DOCX
-        self.Converter = None
-        try:
-            from pdf2docx import Converter
-            self.Converter = Converter
-        except ImportError:
-            pass
-        
-        # Импорт COM библиотек (Windows)
-        if sys.platform == 'win32':
-            try:
-                import win32com.client
-                self.win32com = win32com.client
-            except ImportError:
-                pass
-            
-            try:
-                import comtypes.client
-                self.comtypes = comtypes.client
-            except ImportError:
-                pass
-            
-            try:
-                import pythoncom
-                self.pythoncom = pythoncom
-            except ImportError:
-                pass
-        
-        # Импорт docx2pdf как fallback метод
-        try:
-            from docx2pdf import convert as docx2pdf_convert
-            self.docx2pdf_convert = docx2pdf_convert
-            if not self.win32com and not self.comtypes:
-                self.use_docx2pdf = True
-        except ImportError:
-            pass
-        
-        # Импорт PyMuPDF для конвертации PDF
-        try:
-            import fitz  # PyMuPDF
-            self.fitz = fitz
-        except ImportError:
-            self.fitz = None
-        
         # Поддерживаемые форматы документов (Word, без изображений)
         self.supported_document_formats = {
             '.pdf': 'PDF',
@@ -221,15 +174,59 @@ class FileConverter:
             self.supported_video_formats,
             self.supported_audio_target_formats,
             self.supported_video_target_formats,
-            self.Image,
-            self.fitz,
-            self.Converter,
-            self.win32com,
-            self.comtypes,
-            self.docx2pdf_convert,
-            self.docx_module,
             check_word_installed
         )
+        # Реестр возможностей (бэкенды, версии, пары форматов)
+        self.capabilities = self.format_validator.capabilities
+        # Если пакет найден при проверке, но не импортировался - убираем его пары
+        self.backends.on_failure(self.capabilities.mark_unavailable)
+    
+    # Бэкенды конвертации (загружаются при первом обращении)
+    
+    @property
+    def Image(self) -> Optional[Any]:
+        """Модуль Pillow (PIL.Image) или None."""
+        return self.backends.get('pillow')
+    
+    @property
+    def fitz(self) -> Optional[Any]:
+        """Модуль PyMuPDF (fitz) или None."""
+        return self.backends.get('pymupdf')
+    
+    @property
+    def Converter(self) -> Optional[Any]:
+        """Класс pdf2docx.Converter или None."""
+        return self.backends.get('pdf2docx')
+    
+    @property
+    def docx2pdf_convert(self) -> Optional[Any]:
+        """Функция docx2pdf.convert или None."""
+        return self.backends.get('docx2pdf')
+    
+    @property
+    def docx_module(self) -> Optional[Any]:
+        """Модуль python-docx или None."""
+        return self.backends.get('python-docx')
+    
+    @property
+    def win32com(self) -> Optional[Any]:
+        """Модуль win32com.client или None (только Windows)."""
+        return self.backends.get('win32com')
+    
+    @property
+    def comtypes(self) -> Optional[Any]:
+        """Модуль comtypes.client или None (только Windows)."""
+        return self.backends.get('comtypes')
+    
+    @property
+    def pythoncom(self) -> Optional[Any]:
+        """Модуль pythoncom или None (только Windows)."""
+        return self.backends.get('pythoncom')
+    
+    @property
+    def use_docx2pdf(self) -> bool:
+        """Использовать docx2pdf как основной метод (нет COM библиотек)."""
+        return self.docx2pdf_convert is not None and not self.win32com and not self.comtypes
     
 
     
@@ -347,7 +344,7 @@ class FileConverter:
                     error_msg = f"Для конвертации изображений в PDF необходимо установить: {', '.join(missing_libs)}. Установите: pip install {' '.join(missing_libs)}"
             elif source_ext == '.pdf' and target_ext == '.docx':
                 # Специальное сообщение для PDF в DOCX
-                if not self.Converter:
+                if not self.capabilities.is_available('pdf2docx'):
                     error_msg = "Для конвертации PDF в DOCX необходимо установить библиотеку pdf2docx. Установите: python -m pip install pdf2docx"
                 else:
                     error_msg = "Конвертация PDF в DOCX не поддерживается. Проверьте, что библиотека pdf2docx установлена и доступна."
@@ -368,6 +365,95 @@ class FileConverter:
             if not output_path.lower().endswith(target_ext):
                 output_path = os.path.splitext(output_path)[0] + target_ext
         
+        # Кеш результатов: повторный запуск пакета пропускает готовые файлы
+        cache = self.conversion_cache
+        backend = None
+        if cache is not None:
+            backend = self._get_backend_signature(source_ext, target_ext)
+            cached_path = cache.lookup(file_path, target_ext, quality, backend, output_path)
+            if cached_path:
+                return True, "Результат взят из кеша конвертации", cached_path
+        
+        success, message, converted_path = self._convert_file(
+            file_path, source_ext, target_ext, output_path, quality
+        )
+        if success and cache is not None and converted_path:
+            cache.store(file_path, target_ext, quality, backend, converted_path)
+        return success, message, converted_path
+    
+    def _get_backend_signature(self, source_ext: str, target_ext: str) -> str:
+        """Сигнатура параметров, влияющих на результат конвертации (для кеша).
+        
+        Args:
+            source_ext: Исходное расширение
+            target_ext: Целевое расширение
+            
+        Returns:
+            Строка сигнатуры
+        """
+        if source_ext == '.pdf' and target_ext in self.supported_image_formats:
+            options = self.pdf_raster_options
+            return f"pdf-raster:{options!r}"
+        if source_ext in self.supported_image_formats:
+            profile = self.image_profile
+            return f"image:{profile.name if profile is not None else 'default'}"
+        categories = (
+            ('document', self.supported_document_formats),
+            ('presentation', self.supported_presentation_formats),
+            ('audio', self.supported_audio_formats),
+            ('video', self.supported_video_formats),
+        )
+        for category, formats in categories:
+            if source_ext in formats:
+                return category
+        return 'default'
+
+    def _convert_pdf_to_docx_isolated(self, file_path: str, output_path: str) -> Tuple[bool, str, Optional[str]]:
+        """Конвертация PDF в DOCX через pdf2docx в отдельных процессах.
+        
+        Большие документы делятся на диапазоны страниц; сбой или превышение
+        лимита памяти процессом возвращается как ошибка конвертации файла.
+        
+        Args:
+            file_path: Путь к PDF
+            output_path: Путь для сохранения DOCX
+            
+        Returns:
+            Кортеж (успех, сообщение, путь к выходному файлу)
+        """
+        from core.converter.pdf2docx_runner import Pdf2DocxRunner
+        
+        page_count = 0
+        if self.fitz:
+            try:
+                with self.fitz.open(file_path) as pdf_document:
+                    page_count = len(pdf_document)
+            except (OSError, RuntimeError, ValueError) as e:
+                logger.debug(f"Не удалось определить количество страниц {file_path}: {e}")
+        
+        runner = Pdf2DocxRunner(self.pdf2docx_options, self.docx_module)
+        return runner.convert(file_path, output_path, page_count)
+
+    def _get_planned_folder(self, file_path: str) -> Optional[str]:
+        """Папка для страниц, зарезервированная планировщиком пакета."""
+        if self.output_planner is None:
+            return None
+        return self.output_planner.folder_for(file_path)
+
+    def _convert_file(self, file_path: str, source_ext: str, target_ext: str,
+                      output_path: str, quality: int) -> Tuple[bool, str, Optional[str]]:
+        """Выбор бэкенда и выполнение конвертации (без проверок и кеша).
+        
+        Args:
+            file_path: Путь к исходному файлу
+            source_ext: Исходное расширение
+            target_ext: Целевое расширение
+            output_path: Путь для сохранения
+            quality: Качество для JPEG (1-100)
+            
+        Returns:
+            Кортеж (успех, сообщение, путь к выходному файлу)
+        """
         try:
             # Проверяем тип файла и конвертируем соответственно
             # Сначала проверяем, не является ли это конвертация изображения
@@ -398,7 +484,8 @@ class FileConverter:
                         from core.converter.image_converter import convert_image_to_image
                         return convert_image_to_image(
                             file_path, output_path, target_ext, quality,
-                            self.Image, self.supported_image_formats
+                            self.Image, self.supported_image_formats,
+                            self.image_profile
                         )
                     except ImportError:
                         return False, "Модуль конвертации изображений недоступен", None
@@ -423,42 +510,38 @@ class FileConverter:
                         )
                     except ImportError:
                         return False, "Модуль конвертации документов недоступен", None
+                elif source_ext == '.pdf' and target_ext in self.supported_image_formats:
+                    # PDF в изображения (растеризация страниц)
+                    try:
+                        from core.converter.image_converter import convert_pdf_to_image
+                        return convert_pdf_to_image(
+                            file_path, output_path, target_ext, quality,
+                            self.fitz, self.Image, self.supported_image_formats,
+                            self.pdf_raster_options,
+                            output_folder=self._get_planned_folder(file_path)
+                        )
+                    except ImportError:
+                        return False, "Модуль конвертации PDF недоступен", None
                 elif source_ext == '.pdf' and target_ext == '.docx':
+                    word_result = None
                     try:
                         from core.converter.document_converter import convert_pdf_to_docx
-                        return convert_pdf_to_docx(
+                        word_result = convert_pdf_to_docx(
                             file_path, output_path,
                             self.win32com, self.comtypes,
                             check_word_installed,
                             cleanup_word_document,
                             cleanup_word_application
                         )
+                        if word_result[0]:
+                            return word_result
                     except ImportError:
-                        # Fallback на pdf2docx
-                        if self.Converter:
-                            try:
-                                converter = self.Converter(file_path)
-                                converter.convert(output_path)
-                                converter.close()
-                                if os.path.exists(output_path):
-                                    return True, "PDF успешно конвертирован в DOCX", output_path
-                            except (OSError, PermissionError, ValueError, AttributeError) as e:
-                                return False, f"Ошибка конвертации: {str(e)}", None
-                            except (MemoryError, RecursionError) as e:
-
-                                # Ошибки памяти/рекурсии
-
-                                pass
-
-                            # Финальный catch для неожиданных исключений (критично для стабильности)
-
-                            except BaseException as e:
-
-                                if isinstance(e, (KeyboardInterrupt, SystemExit)):
-
-                                    raise
-                                return False, f"Неожиданная ошибка конвертации: {str(e)}", None
-                        return False, "Модуль конвертации PDF недоступен", None
+                        pass
+                    # Fallback на pdf2docx (в отдельных процессах с лимитом памяти;
+                    # сама библиотека в процесс интерфейса не импортируется)
+                    if self.capabilities.is_available('pdf2docx'):
+                        return self._convert_pdf_to_docx_isolated(file_path, output_path)
+                    return word_result or (False, "Модуль конвертации PDF недоступен", None)
                 # Конвертация DOCX/DOC в ODT/ODP (через Word или LibreOffice)
                 elif (source_ext == '.docx' or source_ext == '.doc') and target_ext in ('.odt', '.odp'):
                     try:
@@ -595,7 +678,9 @@ class FileConverter:
                     from core.converter.image_converter import convert_pdf_to_image
                     return convert_pdf_to_image(
                         file_path, output_path, target_ext, quality,
-                        self.fitz, self.Image, self.supported_image_formats
+                        self.fitz, self.Image, self.supported_image_formats,
+                        self.pdf_raster_options,
+                        output_folder=self._get_planned_folder(file_path)
                     )
                 except ImportError:
                     return False, "Модуль конвертации PDF недоступен", None
@@ -617,7 +702,8 @@ class FileConverter:
                         from core.converter.image_converter import convert_image_to_image
                         return convert_image_to_image(
                             file_path, output_path, target_ext, quality,
-                            self.Image, self.supported_image_formats
+                            self.Image, self.supported_image_formats,
+                            self.image_profile
                         )
                     except ImportError:
                         return False, "Модуль конвертации изображений недоступен", None
@@ -630,8 +716,8 @@ class FileConverter:
         except (MemoryError, RecursionError) as e:
 
             # Ошибки памяти/рекурсии
-
-            pass
+            logger.error(f"Ошибка памяти/рекурсии при конвертации файла {file_path}: {e}")
+            return False, f"Недостаточно памяти для конвертации: {str(e)}", None
 
         # Финальный catch для неожиданных исключений (критично для стабильности)
 
@@ -656,6 +742,31 @@ class FileConverter:
         success, message, output_path = self.convert(file_path, target_format)
         return output_path if success else None
     
+    def convert_images_to_pdf(self, file_paths: List[str], output_path: str,
+                              progress_callback=None, cancel_check=None) -> Tuple[bool, str, Optional[str]]:
+        """Объединение нескольких изображений в один PDF (потоковая сборка).
+        
+        Args:
+            file_paths: Пути к изображениям (в порядке страниц)
+            output_path: Путь для сохранения PDF
+            progress_callback: Функция (обработано изображений, всего изображений)
+            cancel_check: Функция, возвращающая True при отмене
+            
+        Returns:
+            Кортеж (успех, сообщение, путь к выходному файлу)
+        """
+        if not output_path.lower().endswith('.pdf'):
+            output_path = os.path.splitext(output_path)[0] + '.pdf'
+        try:
+            from core.converter.image_converter import convert_images_to_pdf
+        except ImportError:
+            return False, "Модуль конвертации изображений недоступен", None
+        return convert_images_to_pdf(
+            file_paths, output_path,
+            self.fitz, self.Image,
+            progress_callback, cancel_check=cancel_check
+        )
+    
     def convert_batch(self, file_paths: List[str], target_format: str, 
                      output_dir: Optional[str] = None, quality: int = 95) -> List[Tuple[str, bool, str, Optional[str]]]:
         """Конвертация нескольких файлов.
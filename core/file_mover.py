@@ -0,0 +1,249 @@
+"""Перемещение файлов, в том числе между устройствами.
+
+На одном устройстве файл перемещается через os.rename. Между
+устройствами данные копируются средствами ядра (os.copy_file_range,
+затем os.sendfile), а при их недоступности - блоками через буфер.
+Копия пишется во временный файл рядом с целевым, проверяется (размер
+и, по желанию, хеш) и только после этого переименовывается в целевой
+файл; исходный файл удаляется последним. Несколько перемещений
+выполняются одновременно, чтобы очередь диска не простаивала.
+"""
+
+import errno
+import hashlib
+import logging
+import os
+import shutil
+import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import Callable, Iterable, Iterator, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+try:
+    from config.constants import MOVE_CHUNK_SIZE, MOVE_WORKERS
+except ImportError:
+    MOVE_CHUNK_SIZE = 8 * 1024 * 1024
+    MOVE_WORKERS = 4
+
+# Прогресс копирования: (исходный файл, скопировано байт, всего байт)
+ProgressCallback = Callable[[str, int, int], None]
+
+# Ошибки, при которых системный способ копирования недоступен для этой пары файлов
+_UNSUPPORTED_ERRNOS = {errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EBADF, errno.ENOTSUP, errno.EOPNOTSUPP}
+
+
+class MoveCancelled(OSError):
+    """Перемещение отменено (исходный файл не изменен)."""
+
+
+@dataclass
+class MoveOptions:
+    """Параметры перемещения файлов."""
+    verify_hash: bool = False  # Сравнивать хеши исходного файла и копии перед удалением исходного
+    hash_algorithm: str = 'blake2b'
+    chunk_size: int = MOVE_CHUNK_SIZE
+    workers: int = MOVE_WORKERS
+    preserve_metadata: bool = True  # Копировать время изменения и права доступа
+
+
+class FileMover:
+    """Перемещение файлов с проверкой копии между устройствами."""
+
+    def __init__(self, options: Optional[MoveOptions] = None):
+        """Инициализация.
+
+        Args:
+            options: Параметры перемещения
+        """
+        self.options = options or MoveOptions()
+
+    def move(
+        self,
+        source: str,
+        destination: str,
+        progress_callback: Optional[ProgressCallback] = None,
+        cancel_check: Optional[Callable[[], bool]] = None
+    ) -> None:
+        """Перемещение одного файла.
+
+        Args:
+            source: Исходный файл
+            destination: Целевой путь
+            progress_callback: Прогресс копирования между устройствами
+            cancel_check: Функция, возвращающая True при отмене
+
+        Raises:
+            OSError: Ошибка перемещения (MoveCancelled при отмене)
+        """
+        try:
+            os.rename(source, destination)
+            return
+        except OSError as e:
+            if e.errno != errno.EXDEV:
+                raise
+        self.copy_verify_delete(source, destination, progress_callback, cancel_check)
+
+    def move_many(
+        self,
+        moves: Iterable[Tuple[str, str]],
+        progress_callback: Optional[ProgressCallback] = None,
+        cancel_check: Optional[Callable[[], bool]] = None
+    ) -> Iterator[Tuple[str, str, Optional[OSError]]]:
+        """Параллельное перемещение файлов.
+
+        Результаты выдаются в потоке вызывающего по мере готовности;
+        progress_callback вызывается из рабочих потоков.
+
+        Args:
+            moves: Пары (исходный файл, целевой путь)
+            progress_callback: Прогресс копирования между устройствами
+            cancel_check: Функция, возвращающая True при отмене
+
+        Yields:
+            Tuple[исходный файл, целевой путь, ошибка или None]
+        """
+        moves = list(moves)
+        if not moves:
+            return
+        workers = max(1, min(self.options.workers, len(moves)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(self.move, source, destination, progress_callback, cancel_check): (source, destination)
+                for source, destination in moves
+            }
+            try:
+                for future in as_completed(futures):
+                    source, destination = futures[future]
+                    try:
+                        future.result()
+                        yield source, destination, None
+                    except OSError as e:
+                        yield source, destination, e
+            finally:
+                # Досрочный выход (отмена): не начинаем оставшиеся перемещения
+                for future in futures:
+                    future.cancel()
+
+    def copy_verify_delete(
+        self,
+        source: str,
+        destination: str,
+        progress_callback: Optional[ProgressCallback] = None,
+        cancel_check: Optional[Callable[[], bool]] = None
+    ) -> None:
+        """Копирование с проверкой и удалением исходного файла.
+
+        Raises:
+            OSError: Ошибка копирования или проверки (исходный файл сохраняется)
+        """
+        directory, name = os.path.split(destination)
+        temp_path = os.path.join(directory, f".{name}.{os.getpid()}.part")
+        try:
+            source_size = self.copy_file(source, temp_path, progress_callback, cancel_check)
+            self._verify(source, temp_path, source_size)
+            if self.options.preserve_metadata:
+                shutil.copystat(source, temp_path)
+            os.replace(temp_path, destination)
+        except BaseException:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            raise
+        os.remove(source)
+
+    def copy_file(
+        self,
+        source: str,
+        destination: str,
+        progress_callback: Optional[ProgressCallback] = None,
+        cancel_check: Optional[Callable[[], bool]] = None
+    ) -> int:
+        """Копирование содержимого файла блоками.
+
+        Args:
+            source: Исходный файл
+            destination: Файл копии (перезаписывается)
+            progress_callback: Прогресс после каждого блока
+            cancel_check: Функция, возвращающая True при отмене
+
+        Returns:
+            Размер исходного файла
+
+        Raises:
+            OSError: Ошибка копирования
+        """
+        chunk_size = max(64 * 1024, self.options.chunk_size)
+        with open(source, 'rb') as src, open(destination, 'wb') as dst:
+            total = os.fstat(src.fileno()).st_size
+            copied = 0
+            copy_chunk = self._kernel_copy_chunk
+            while True:
+                if cancel_check and cancel_check():
+                    raise MoveCancelled(errno.ECANCELED, "Перемещение отменено", source)
+                written = 0
+                if copy_chunk is not None:
+                    try:
+                        written = copy_chunk(src.fileno(), dst.fileno(), copied, chunk_size)
+                    except OSError as e:
+                        if e.errno not in _UNSUPPORTED_ERRNOS or copied:
+                            raise
+                        # Системное копирование недоступно для этой пары файлов
+                        copy_chunk = None
+                if copy_chunk is None:
+                    written = self._buffered_copy_chunk(src, dst, copied, chunk_size)
+                if not written:
+                    break
+                copied += written
+                if progress_callback:
+                    progress_callback(source, copied, total)
+            dst.flush()
+            os.fsync(dst.fileno())
+        return total
+
+    @staticmethod
+    def _kernel_copy_chunk(src_fd: int, dst_fd: int, offset: int, count: int) -> int:
+        """Копирование блока средствами ядра без копирования в память процесса."""
+        if hasattr(os, 'copy_file_range'):
+            try:
+                return os.copy_file_range(src_fd, dst_fd, count, offset, offset)
+            except OSError as e:
+                if e.errno not in _UNSUPPORTED_ERRNOS:
+                    raise
+        if hasattr(os, 'sendfile') and sys.platform.startswith('linux'):
+            # sendfile пишет в текущую позицию целевого файла
+            os.lseek(dst_fd, offset, os.SEEK_SET)
+            return os.sendfile(dst_fd, src_fd, offset, count)
+        raise OSError(errno.ENOTSUP, "Системное копирование недоступно")
+
+    @staticmethod
+    def _buffered_copy_chunk(src, dst, offset: int, count: int) -> int:
+        """Копирование блока через буфер процесса."""
+        src.seek(offset)
+        dst.seek(offset)
+        data = src.read(count)
+        if data:
+            dst.write(data)
+        return len(data)
+
+    def _verify(self, source: str, copy_path: str, source_size: int) -> None:
+        """Проверка копии перед удалением исходного файла.
+
+        Raises:
+            OSError: Копия не совпадает с исходным файлом
+        """
+        copy_size = os.path.getsize(copy_path)
+        if copy_size != source_size or os.path.getsize(source) != source_size:
+            raise OSError(errno.EIO, f"Размер копии не совпадает ({copy_size} из {source_size} байт)", source)
+        if self.options.verify_hash and self.file_hash(source) != self.file_hash(copy_path):
+            raise OSError(errno.EIO, "Хеш копии не совпадает с исходным файлом", source)
+
+    def file_hash(self, path: str) -> str:
+        """Хеш содержимого файла."""
+        digest = hashlib.new(self.options.hash_algorithm)
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
@@ -2,13 +2,29 @@
 
 Обеспечивает сохранение и загрузку истории операций переименования
 для поддержки отмены/повтора действий.
+
+История хранится в журнале JSON Lines, в который только дописываются
+записи: сохранение операции пропорционально ее размеру, а не размеру
+всей истории. Файлы операции сохраняются полностью, частями по
+HISTORY_JOURNAL_CHUNK_SIZE. При загрузке читаются только заголовки
+операций; списки файлов читаются по запросу постранично. Когда в
+журнале накапливается больше операций, чем нужно хранить, журнал
+переписывается (сжатие).
+
+Формат строк журнала:
+    {"op": "begin", "id": N, "timestamp": ..., "type": ..., ...}
+    {"op": "files", "id": N, "files": [...]}
+    {"op": "end", "id": N}
+
+Операция без строки "end" (прерванная запись) при загрузке
+отбрасывается.
 """
 
 import json
 import logging
 import os
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional
 
 try:
     from config.constants import HISTORY_FILE, MAX_HISTORY_ITEMS
@@ -17,165 +33,318 @@ except ImportError:
     HISTORY_FILE = ".re_file_plus_history.json"
     MAX_HISTORY_ITEMS = 100
 
+try:
+    from config.constants import HISTORY_COMPACT_SLACK, HISTORY_JOURNAL_CHUNK_SIZE
+except ImportError:
+    HISTORY_JOURNAL_CHUNK_SIZE = 1000
+    HISTORY_COMPACT_SLACK = 50
+
 logger = logging.getLogger(__name__)
 
+# Начало строки со списком файлов: такие строки при загрузке не разбираются
+_FILES_PREFIX = b'{"op": "files"'
+
+# Поля заголовка операции (без списка файлов)
+_SUMMARY_FIELDS = ('id', 'timestamp', 'type', 'files_count', 'success_count', 'error_count')
+
+
+def _encode(record: Dict) -> bytes:
+    """Строка журнала."""
+    return json.dumps(record, ensure_ascii=False).encode('utf-8') + b'\n'
+
 
 class HistoryManager:
     """Класс для управления историей операций."""
-    
+
     def __init__(self, history_file: Optional[str] = None):
         """Инициализация менеджера истории.
-        
+
         Args:
-            history_file: Путь к файлу истории
+            history_file: Путь к файлу истории (журнал создается рядом
+                          с расширением .jsonl; история в формате .json
+                          переносится в журнал при первой загрузке)
         """
         if history_file is None:
             history_file = os.path.join(
                 os.path.expanduser("~"), HISTORY_FILE
             )
         self.history_file = history_file
+        self.journal_file = os.path.splitext(history_file)[0] + '.jsonl'
+        # Заголовки операций (без списков файлов), от старых к новым
         self.history: List[Dict] = []
+        # Смещения строк со списками файлов по id операции
+        self._chunks: Dict[int, List[int]] = {}
+        self._next_id = 1
+        # Операций в файле журнала (включая вытесненные из истории)
+        self._journal_operations = 0
         self.load_history()
-    
+
     def load_history(self) -> None:
-        """Загрузка истории из файла."""
+        """Загрузка заголовков операций из журнала."""
+        self.history = []
+        self._chunks = {}
+        self._journal_operations = 0
         try:
-            if os.path.exists(self.history_file):
-                with open(self.history_file, 'r', encoding='utf-8') as f:
-                    self.history = json.load(f)
-                if not isinstance(self.history, list):
-                    self.history = []
+            if os.path.exists(self.journal_file):
+                self._scan_journal()
+            elif self.history_file != self.journal_file and os.path.exists(self.history_file):
+                self._import_legacy()
         except (OSError, PermissionError, IOError, FileNotFoundError) as e:
             logger.error(f"Ошибка доступа при загрузке истории: {e}")
             self.history = []
+            self._chunks = {}
         except (json.JSONDecodeError, ValueError, TypeError) as e:
             logger.error(f"Ошибка данных при загрузке истории: {e}")
             self.history = []
-        except (MemoryError, RecursionError) as e:
+            self._chunks = {}
 
-            # Ошибки памяти/рекурсии
+    def _scan_journal(self) -> None:
+        """Чтение заголовков операций и смещений списков файлов.
 
-            pass
+        Хвост журнала после последней завершенной операции (прерванная
+        запись) отбрасывается.
+        """
+        valid_size = 0
+        pending: Optional[Dict] = None
+        pending_chunks: List[int] = []
+        with open(self.journal_file, 'rb') as f:
+            offset = 0
+            for line in f:
+                line_offset = offset
+                offset += len(line)
+                if not line.endswith(b'\n'):
+                    break
+                if line.startswith(_FILES_PREFIX):
+                    if pending is not None:
+                        pending_chunks.append(line_offset)
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    break
+                op = record.get('op')
+                if op == 'begin':
+                    pending = {field: record.get(field) for field in _SUMMARY_FIELDS}
+                    pending_chunks = []
+                elif op == 'end' and pending is not None and record.get('id') == pending['id']:
+                    self._add_summary(pending, pending_chunks)
+                    pending = None
+                    valid_size = offset
 
-        # Финальный catch для неожиданных исключений (критично для стабильности)
+        if valid_size < os.path.getsize(self.journal_file):
+            logger.warning(f"Отброшена незавершенная запись журнала истории {self.journal_file}")
+            os.truncate(self.journal_file, valid_size)
 
-        except BaseException as e:
+    def _import_legacy(self) -> None:
+        """Перенос истории из файла JSON в журнал."""
+        with open(self.history_file, 'r', encoding='utf-8') as f:
+            operations = json.load(f)
+        if not isinstance(operations, list):
+            return
+        for operation in operations[-MAX_HISTORY_ITEMS:]:
+            if isinstance(operation, dict):
+                self.add_operation(
+                    operation.get('type', ''),
+                    operation.get('files', []),
+                    operation.get('success_count', 0),
+                    operation.get('error_count', 0),
+                    timestamp=operation.get('timestamp'),
+                    files_count=operation.get('files_count'),
+                )
+        logger.info(f"История перенесена в журнал {self.journal_file}")
 
-            if isinstance(e, (KeyboardInterrupt, SystemExit)):
+    def _add_summary(self, summary: Dict, chunks: List[int]) -> None:
+        """Добавление заголовка операции с ограничением размера истории."""
+        self.history.append(summary)
+        self._chunks[summary['id']] = chunks
+        self._next_id = max(self._next_id, summary['id'] + 1)
+        self._journal_operations += 1
+        while len(self.history) > MAX_HISTORY_ITEMS:
+            removed = self.history.pop(0)
+            self._chunks.pop(removed['id'], None)
 
-                raise
-            logger.error(f"Неожиданная ошибка загрузки истории: {e}")
-            self.history = []
-    
     def save_history(self) -> bool:
-        """Сохранение истории в файл.
-        
+        """Сохранение истории: журнал переписывается только с хранимыми операциями.
+
+        Операции сохраняются в журнал при добавлении, поэтому вызывать
+        этот метод для сохранения не требуется.
+
         Returns:
             True если успешно, False в противном случае
         """
+        temp_file = self.journal_file + '.tmp'
         try:
-            with open(self.history_file, 'w', encoding='utf-8') as f:
-                json.dump(self.history, f, ensure_ascii=False, indent=2)
+            chunks: Dict[int, List[int]] = {}
+            with open(temp_file, 'wb') as output:
+                for summary in self.history:
+                    output.write(_encode({'op': 'begin', **summary}))
+                    chunks[summary['id']] = []
+                    for files in self._read_chunks(summary['id']):
+                        chunks[summary['id']].append(output.tell())
+                        output.write(_encode({'op': 'files', 'id': summary['id'], 'files': files}))
+                    output.write(_encode({'op': 'end', 'id': summary['id']}))
+                output.flush()
+                os.fsync(output.fileno())
+            os.replace(temp_file, self.journal_file)
+            self._chunks = chunks
+            self._journal_operations = len(self.history)
             return True
         except (OSError, PermissionError, IOError) as e:
             logger.error(f"Ошибка доступа при сохранении истории: {e}")
+            try:
+                os.remove(temp_file)
+            except OSError:
+                pass
             return False
-        except (ValueError, TypeError, json.JSONEncodeError) as e:
+        except (ValueError, TypeError) as e:
             logger.error(f"Ошибка данных при сохранении истории: {e}")
             return False
-        except (MemoryError, RecursionError) as e:
-
-            # Ошибки памяти/рекурсии
-
-            pass
 
-        # Финальный catch для неожиданных исключений (критично для стабильности)
-
-        except BaseException as e:
+    def add_operation(self, operation_type: str, files: List[Dict],
+                     success_count: int, error_count: int,
+                     timestamp: Optional[str] = None,
+                     files_count: Optional[int] = None) -> Optional[int]:
+        """Добавление операции в историю.
 
-            if isinstance(e, (KeyboardInterrupt, SystemExit)):
+        Операция дописывается в конец журнала; все файлы сохраняются.
 
-                raise
-            logger.error(f"Неожиданная ошибка сохранения истории: {e}")
-            return False
-    
-    def add_operation(self, operation_type: str, files: List[Dict], 
-                     success_count: int, error_count: int) -> None:
-        """Добавление операции в историю.
-        
         Args:
             operation_type: Тип операции (rename, undo, redo и т.д.)
             files: Список файлов
             success_count: Количество успешных операций
             error_count: Количество ошибок
+            timestamp: Время операции (по умолчанию - текущее)
+            files_count: Количество файлов (по умолчанию - len(files))
+
+        Returns:
+            id операции или None, если запись не удалась
         """
-        operation = {
-            'timestamp': datetime.now().isoformat(),
+        summary = {
+            'id': self._next_id,
+            'timestamp': timestamp or datetime.now().isoformat(),
             'type': operation_type,
-            'files_count': len(files),
+            'files_count': len(files) if files_count is None else files_count,
             'success_count': success_count,
             'error_count': error_count,
-            'files': files[:100]  # Ограничиваем количество файлов для экономии места
         }
-        
-        self.history.append(operation)
-        
-        # Ограничиваем размер истории
-        if len(self.history) > MAX_HISTORY_ITEMS:
-            self.history = self.history[-MAX_HISTORY_ITEMS:]
-        
-        self.save_history()
-    
+
+        chunks: List[int] = []
+        try:
+            with open(self.journal_file, 'ab') as f:
+                f.seek(0, os.SEEK_END)
+                offset = f.tell()
+                data = bytearray(_encode({'op': 'begin', **summary}))
+                for start in range(0, len(files), HISTORY_JOURNAL_CHUNK_SIZE):
+                    chunks.append(offset + len(data))
+                    data += _encode({
+                        'op': 'files',
+                        'id': summary['id'],
+                        'files': files[start:start + HISTORY_JOURNAL_CHUNK_SIZE],
+                    })
+                data += _encode({'op': 'end', 'id': summary['id']})
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+        except (OSError, PermissionError, IOError) as e:
+            logger.error(f"Ошибка доступа при сохранении истории: {e}")
+            return None
+        except (ValueError, TypeError) as e:
+            logger.error(f"Ошибка данных при сохранении истории: {e}")
+            return None
+
+        self._add_summary(summary, chunks)
+
+        # Периодическое сжатие журнала
+        if self._journal_operations > MAX_HISTORY_ITEMS + HISTORY_COMPACT_SLACK:
+            self.save_history()
+        return summary['id']
+
     def get_history(self, limit: Optional[int] = None) -> List[Dict]:
         """Получение истории операций.
-        
+
         Args:
             limit: Максимальное количество операций для возврата
-            
+
         Returns:
-            Список операций
+            Список заголовков операций (файлы - get_operation_files)
+        """
+        history = self.history[-limit:] if limit else self.history
+        return [dict(summary) for summary in history]
+
+    def get_operation_files(self, operation_id: int, offset: int = 0,
+                            limit: Optional[int] = None) -> List[Dict]:
+        """Страница списка файлов операции.
+
+        Читаются только строки журнала, содержащие запрошенную страницу.
+
+        Args:
+            operation_id: id операции
+            offset: Номер первого файла
+            limit: Количество файлов (None - до конца)
+
+        Returns:
+            Файлы операции (пустой список для неизвестной операции)
+        """
+        files: List[Dict] = []
+        first_chunk = offset // HISTORY_JOURNAL_CHUNK_SIZE
+        skip = offset % HISTORY_JOURNAL_CHUNK_SIZE
+        for chunk in self._read_chunks(operation_id, first_chunk):
+            files.extend(chunk[skip:])
+            skip = 0
+            if limit is not None and len(files) >= limit:
+                return files[:limit]
+        return files
+
+    def iter_operation_files(self, operation_id: int) -> Iterator[Dict]:
+        """Все файлы операции по частям (без загрузки списка целиком).
+
+        Args:
+            operation_id: id операции
         """
-        if limit:
-            return self.history[-limit:]
-        return self.history.copy()
-    
+        for chunk in self._read_chunks(operation_id):
+            yield from chunk
+
+    def _read_chunks(self, operation_id: int, first_chunk: int = 0) -> Iterator[List[Dict]]:
+        """Чтение списков файлов операции из журнала."""
+        offsets = self._chunks.get(operation_id, [])[first_chunk:]
+        if not offsets:
+            return
+        with open(self.journal_file, 'rb') as f:
+            for offset in offsets:
+                f.seek(offset)
+                yield json.loads(f.readline())['files']
+
     def clear_history(self) -> None:
         """Очистка истории."""
         self.history = []
-        self.save_history()
-    
+        self._chunks = {}
+        self._journal_operations = 0
+        try:
+            with open(self.journal_file, 'wb'):
+                pass
+        except OSError as e:
+            logger.error(f"Ошибка доступа при очистке истории: {e}")
+
     def export_history(self, file_path: str) -> bool:
         """Экспорт истории в файл.
-        
+
         Args:
             file_path: Путь к файлу для экспорта
-            
+
         Returns:
             True если успешно, False в противном случае
         """
         try:
             with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(self.history, f, ensure_ascii=False, indent=2)
+                operations = [
+                    {**summary, 'files': list(self.iter_operation_files(summary['id']))}
+                    for summary in self.history
+                ]
+                json.dump(operations, f, ensure_ascii=False, indent=2)
             return True
         except (OSError, PermissionError, IOError) as e:
             logger.error(f"Ошибка доступа при экспорте истории: {e}")
             return False
-        except (ValueError, TypeError, json.JSONEncodeError) as e:
+        except (ValueError, TypeError) as e:
             logger.error(f"Ошибка данных при экспорте истории: {e}")
             return False
-        except (MemoryError, RecursionError) as e:
-
-            # Ошибки памяти/рекурсии
-
-            pass
-
-        # Финальный catch для неожиданных исключений (критично для стабильности)
-
-        except BaseException as e:
-
-            if isinstance(e, (KeyboardInterrupt, SystemExit)):
-
-                raise
-            logger.error(f"Неожиданная ошибка экспорта истории: {e}")
-            return False
-
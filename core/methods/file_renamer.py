@@ -4,19 +4,142 @@ import logging
 import os
 import threading
 from pathlib import Path
-from typing import Any, Callable, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from core.rename_journal import start_journal
 
 logger = logging.getLogger(__name__)
 
 
+def _source_path(file_data: Any) -> Tuple[Optional[str], bool]:
+    """Исходный путь и признак папки для элемента списка переименования.
+
+    Args:
+        file_data: Элемент списка (объект FileInfo или словарь)
+
+    Returns:
+        Tuple[путь (с именем файла) или None, является ли папкой]
+    """
+    if hasattr(file_data, 'full_path'):
+        old_path = file_data.full_path or str(file_data.path)
+        # Если full_path не содержит имя файла, добавляем его
+        if old_path and hasattr(file_data, 'old_name') and file_data.old_name:
+            old_name_with_ext = file_data.old_name + (file_data.extension or '')
+            basename = os.path.basename(old_path)
+            # Проверяем, содержит ли путь имя файла
+            if not basename or basename != old_name_with_ext:
+                # Путь не содержит имя файла, добавляем его
+                old_path = os.path.join(old_path, old_name_with_ext)
+                logger.debug(f"Добавлено имя файла к пути: {old_path}")
+        is_folder = (
+            (file_data.metadata and file_data.metadata.get('is_folder', False))
+            if hasattr(file_data, 'metadata') else False
+        )
+    else:
+        old_path = file_data.get('full_path') or file_data.get('path')
+        # Если old_path не содержит имя файла, добавляем его
+        if old_path and file_data.get('old_name'):
+            old_name_with_ext = file_data.get('old_name', '') + file_data.get('extension', '')
+            basename = os.path.basename(old_path)
+            # Проверяем, содержит ли путь имя файла
+            if not basename or basename != old_name_with_ext:
+                # Путь не содержит имя файла, добавляем его
+                old_path = os.path.join(old_path, old_name_with_ext)
+                logger.debug(f"Добавлено имя файла к пути (dict): {old_path}")
+        is_folder = file_data.get('is_folder', False) or (
+            file_data.get('metadata', {}).get('is_folder', False)
+            if isinstance(file_data.get('metadata'), dict) else False
+        )
+    return old_path, bool(is_folder)
+
+
+def _target_name(file_data: Any, is_folder: bool) -> Tuple[str, str]:
+    """Новое имя и расширение (у папок расширение не добавляется)."""
+    if hasattr(file_data, 'new_name'):
+        return file_data.new_name, '' if is_folder else file_data.extension
+    return file_data.get('new_name', ''), '' if is_folder else file_data.get('extension', '')
+
+
+def _check_source(old_path: str, is_folder: bool) -> Optional[str]:
+    """Проверка исходного пути перед переименованием.
+
+    Args:
+        old_path: Нормализованный исходный путь
+        is_folder: Ожидается папка
+
+    Returns:
+        Сообщение об ошибке или None, если путь можно переименовать
+    """
+    item_type = "папка" if is_folder else "файл"
+    name = os.path.basename(old_path)
+    try:
+        # Используем кеш для оптимизации проверок существования
+        try:
+            from utils.file_cache import is_file_cached, is_dir_cached
+            file_exists = is_file_cached(old_path)
+            dir_exists = is_dir_cached(old_path) if not file_exists else False
+            path_exists = file_exists or dir_exists
+        except ImportError:
+            # Fallback если кеш недоступен
+            path_exists = os.path.exists(old_path)
+            file_exists = os.path.isfile(old_path) if path_exists else False
+            dir_exists = os.path.isdir(old_path) if path_exists else False
+
+        if not path_exists:
+            return f"Исходный {item_type} не найден: {name}"
+        if not (file_exists or dir_exists):
+            return f"Путь не является {item_type}: {name}"
+        if is_folder and not os.path.isdir(old_path):
+            return f"Путь указывает на файл, а не на папку: {name}"
+        if not is_folder and not os.path.isfile(old_path):
+            return f"Путь указывает на папку, а не на файл: {name}"
+    except (OSError, ValueError):
+        return f"Исходный {item_type} не найден: {name or 'неизвестный путь'}"
+    return None
+
+
+def _plan_renames(files_to_rename: List[Any]) -> List[Tuple[int, str, str]]:
+    """Запланированные переименования для журнала.
+
+    Элементы, которые цикл переименования отклонит (нет пути, путь не
+    прошел _check_source, пустое имя, имя не меняется), в план не входят:
+    при восстановлении после сбоя все пары плана считаются выполнимыми.
+
+    Returns:
+        Список (индекс, старый путь, новый путь)
+    """
+    pairs = []
+    for i, file_data in enumerate(files_to_rename):
+        try:
+            old_path, is_folder = _source_path(file_data)
+            new_name, extension = _target_name(file_data, is_folder)
+        except (AttributeError, TypeError) as e:
+            logger.debug(f"Элемент {i} не включен в журнал переименования: {e}")
+            continue
+        if not old_path or not new_name or not new_name.strip():
+            continue
+        old_path = os.path.normpath(old_path)
+        new_path = os.path.normpath(os.path.join(os.path.dirname(old_path), new_name + extension))
+        if old_path == new_path or _check_source(old_path, is_folder):
+            continue
+        pairs.append((i, old_path, new_path))
+    return pairs
+
+
 def re_file_files_thread(
     files_to_rename: List[Dict[str, Any]],
     callback: Callable[[int, int, List[Dict[str, Any]]], None],
     log_callback: Optional[Callable[[str], None]] = None,
     progress_callback: Optional[Callable[[int, int, str], None]] = None,
-    cancel_var: Optional[Any] = None
+    cancel_var: Optional[Any] = None,
+    journal_dir: Optional[str] = None
 ) -> None:
     """Переименование файлов в отдельном потоке.
+
+    Перед выполнением план пакета записывается в журнал переименования,
+    после каждого переименования в журнал добавляется отметка. Если
+    приложение завершится во время пакета, при следующем запуске пакет
+    можно продолжить или откатить (core.rename_journal).
     
     Args:
         files_to_rename: Список файлов для переименования
@@ -24,6 +147,7 @@ def re_file_files_thread(
         log_callback: Функция для логирования (принимает сообщение)
         progress_callback: Функция для обновления прогресса (принимает current, total, filename)
         callback: Функция обратного вызова при завершении (принимает success_count, error_count, renamed_files)
+        journal_dir: Папка журналов переименования (None - папка в директории данных)
     """
     if not files_to_rename:
         if callback:
@@ -59,6 +183,7 @@ def re_file_files_thread(
         error_count = 0
         renamed_files = []
         total = len(files_to_rename)
+        journal = start_journal(_plan_renames(files_to_rename), journal_dir)
         
         try:
             for i, file_data in enumerate(files_to_rename):
@@ -69,32 +194,7 @@ def re_file_files_thread(
                     break
                 try:
                     # Получаем old_path и is_folder
-                    if hasattr(file_data, 'full_path'):
-                        old_path = file_data.full_path or str(file_data.path)
-                        # Если full_path не содержит имя файла, добавляем его
-                        if old_path and hasattr(file_data, 'old_name') and file_data.old_name:
-                            old_name_with_ext = file_data.old_name + (file_data.extension or '')
-                            basename = os.path.basename(old_path)
-                            # Проверяем, содержит ли путь имя файла
-                            if not basename or basename != old_name_with_ext:
-                                # Путь не содержит имя файла, добавляем его
-                                old_path = os.path.join(old_path, old_name_with_ext)
-                                logger.debug(f"Добавлено имя файла к пути: {old_path}")
-                        is_folder = (file_data.metadata and file_data.metadata.get('is_folder', False)) if hasattr(file_data, 'metadata') else False
-                    else:
-                        old_path = file_data.get('full_path') or file_data.get('path')
-                        # Если old_path не содержит имя файла, добавляем его
-                        if old_path and file_data.get('old_name'):
-                            old_name_with_ext = file_data.get('old_name', '') + file_data.get('extension', '')
-                            basename = os.path.basename(old_path)
-                            # Проверяем, содержит ли путь имя файла
-                            if not basename or basename != old_name_with_ext:
-                                # Путь не содержит имя файла, добавляем его
-                                old_path = os.path.join(old_path, old_name_with_ext)
-                                logger.debug(f"Добавлено имя файла к пути (dict): {old_path}")
-                        is_folder = file_data.get('is_folder', False) or (
-                            file_data.get('metadata', {}).get('is_folder', False) if isinstance(file_data.get('metadata'), dict) else False
-                        )
+                    old_path, is_folder = _source_path(file_data)
                     
                     item_type = "папка" if is_folder else "файл"
                     
@@ -111,64 +211,8 @@ def re_file_files_thread(
                     
                     old_path = os.path.normpath(old_path)
                     
-                    try:
-                        # Используем кеш для оптимизации проверок существования
-                        try:
-                            from utils.file_cache import is_file_cached, is_dir_cached
-                            file_exists = is_file_cached(old_path)
-                            dir_exists = is_dir_cached(old_path) if not file_exists else False
-                            path_exists = file_exists or dir_exists
-                        except ImportError:
-                            # Fallback если кеш недоступен
-                            path_exists = os.path.exists(old_path)
-                            file_exists = os.path.isfile(old_path) if path_exists else False
-                            dir_exists = os.path.isdir(old_path) if path_exists else False
-                        
-                        if not path_exists:
-                            error_msg = f"Исходный {item_type} не найден: {os.path.basename(old_path)}"
-                            if log_callback:
-                                log_callback(f"Ошибка: {error_msg}")
-                            if hasattr(file_data, 'set_error'):
-                                file_data.set_error(error_msg)
-                            elif isinstance(file_data, dict):
-                                file_data['status'] = f"Ошибка: {error_msg}"
-                            error_count += 1
-                            continue
-                        
-                        if not (file_exists or dir_exists):
-                            error_msg = f"Путь не является {item_type}: {os.path.basename(old_path)}"
-                            if log_callback:
-                                log_callback(f"Ошибка: {error_msg}")
-                            if hasattr(file_data, 'set_error'):
-                                file_data.set_error(error_msg)
-                            elif isinstance(file_data, dict):
-                                file_data['status'] = f"Ошибка: {error_msg}"
-                            error_count += 1
-                            continue
-                        
-                        if is_folder and not os.path.isdir(old_path):
-                            error_msg = f"Путь указывает на файл, а не на папку: {os.path.basename(old_path)}"
-                            if log_callback:
-                                log_callback(f"Ошибка: {error_msg}")
-                            if hasattr(file_data, 'set_error'):
-                                file_data.set_error(error_msg)
-                            elif isinstance(file_data, dict):
-                                file_data['status'] = f"Ошибка: {error_msg}"
-                            error_count += 1
-                            continue
-                        
-                        if not is_folder and not os.path.isfile(old_path):
-                            error_msg = f"Путь указывает на папку, а не на файл: {os.path.basename(old_path)}"
-                            if log_callback:
-                                log_callback(f"Ошибка: {error_msg}")
-                            if hasattr(file_data, 'set_error'):
-                                file_data.set_error(error_msg)
-                            elif isinstance(file_data, dict):
-                                file_data['status'] = f"Ошибка: {error_msg}"
-                            error_count += 1
-                            continue
-                    except (OSError, ValueError) as e:
-                        error_msg = f"Исходный {item_type} не найден: {os.path.basename(old_path) if old_path else 'неизвестный путь'}"
+                    error_msg = _check_source(old_path, is_folder)
+                    if error_msg:
                         if log_callback:
                             log_callback(f"Ошибка: {error_msg}")
                         if hasattr(file_data, 'set_error'):
@@ -179,12 +223,7 @@ def re_file_files_thread(
                         continue
                     
                     # Получаем new_name и extension
-                    if hasattr(file_data, 'new_name'):
-                        new_name = file_data.new_name
-                        extension = '' if is_folder else file_data.extension
-                    else:
-                        new_name = file_data.get('new_name', '')
-                        extension = '' if is_folder else file_data.get('extension', '')
+                    new_name, extension = _target_name(file_data, is_folder)
                     
                     # Валидация нового имени
                     if not new_name or not new_name.strip():
@@ -214,6 +253,8 @@ def re_file_files_thread(
                     # Переименовываем файл/папку
                     try:
                         os.rename(old_path, new_path)
+                        if journal:
+                            journal.mark_done(i, old_path, new_path)
                         # Логируем успешное переименование
                         if logger.isEnabledFor(logging.INFO):
                             item_type = "папка" if is_folder else "файл"
@@ -322,6 +363,8 @@ def re_file_files_thread(
             if log_callback:
                 log_callback(f"Критическая ошибка: {e}")
         finally:
+            if journal:
+                journal.finish()
             if callback:
                 try:
                     callback(success_count, error_count, renamed_files)
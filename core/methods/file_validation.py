@@ -226,7 +226,12 @@ def check_conflicts(files_list: List[Dict[str, Any]]) -> None:
     
     Args:
         files_list: Список файлов с информацией о переименовании
+                    (словари или FileBatch - проверяется по столбцам)
     """
+    if hasattr(files_list, 'mark_conflicts'):
+        files_list.mark_conflicts()
+        return
+    
     # Используем defaultdict для группировки файлов по новому имени
     # Это позволяет избежать множественных проверок и улучшить производительность
     new_names_map: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
@@ -750,8 +750,12 @@ def check_conflicts(files_list: List[Dict[str, Any]]) -> None:
     Оптимизированная версия с использованием defaultdict для O(1) добавления.
     
     Args:
-        files_list: Список файлов для проверки
+        files_list: Список файлов для проверки (FileBatch проверяется по столбцам)
     """
+    if hasattr(files_list, 'mark_conflicts'):
+        files_list.mark_conflicts()
+        return
+    
     from collections import defaultdict
     
     # Создаем словарь для группировки файлов по новым именам
@@ -0,0 +1,335 @@
+"""Журнал упреждающей записи для пакетного переименования.
+
+Перед выполнением пакета в журнал записываются все запланированные пары
+(старый путь, новый путь), и журнал синхронизируется на диск один раз.
+По мере выполнения дописываются отметки о завершении; они
+синхронизируются группами (каждые RENAME_JOURNAL_SYNC_EVERY отметок или
+RENAME_JOURNAL_SYNC_INTERVAL секунд), поэтому стоимость журнала мала по
+сравнению с самими переименованиями. После завершения пакета журнал
+удаляется.
+
+Если приложение завершилось во время пакета, журнал остается. При
+следующем запуске пакет можно продолжить или откатить. Пары без
+отметки, переименованные после последней синхронизации, определяются по
+файловой системе (старого пути нет, новый есть).
+
+Формат журнала (JSON Lines):
+    {"op": "plan", "created": ..., "pairs": [[индекс, старый, новый], ...]}
+    {"op": "done", "i": индекс, "old": ..., "new": ...}
+"""
+
+import json
+import logging
+import os
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from infrastructure.system.paths import get_rename_journal_dir
+
+logger = logging.getLogger(__name__)
+
+try:
+    from config.constants import RENAME_JOURNAL_SYNC_EVERY, RENAME_JOURNAL_SYNC_INTERVAL
+except ImportError:
+    RENAME_JOURNAL_SYNC_EVERY = 256
+    RENAME_JOURNAL_SYNC_INTERVAL = 1.0
+
+# Расширение файлов журнала
+JOURNAL_EXTENSION = '.rjournal'
+
+# Состояния пары при восстановлении
+STATE_DONE = 'done'  # Переименована
+STATE_PENDING = 'pending'  # Не переименована, старый файл на месте
+STATE_MISSING = 'missing'  # Нет ни старого, ни нового файла
+STATE_CONFLICT = 'conflict'  # Существуют оба пути, без отметки
+
+
+def _same_file(first: str, second: str) -> bool:
+    """Оба пути указывают на один файл (смена только регистра имени
+    на файловой системе без учета регистра)."""
+    try:
+        return os.path.samefile(first, second)
+    except OSError:
+        return False
+
+
+def _name_listed(path: str) -> bool:
+    """Имя файла записано в каталоге именно в таком регистре."""
+    directory, name = os.path.split(path)
+    try:
+        return name in os.listdir(directory or '.')
+    except OSError:
+        return False
+
+
+def _encode(record: Dict) -> bytes:
+    """Строка журнала."""
+    return json.dumps(record, ensure_ascii=False).encode('utf-8') + b'\n'
+
+
+class RenameJournal:
+    """Журнал выполняемого пакета переименований."""
+
+    def __init__(self, journal_dir: str):
+        """Инициализация.
+
+        Args:
+            journal_dir: Папка журналов
+        """
+        self.journal_dir = journal_dir
+        self.path: Optional[str] = None
+        self._file = None
+        self._unsynced = 0
+        self._last_sync = 0.0
+
+    def begin(self, pairs: Iterable[Tuple[int, str, str]]) -> None:
+        """Запись плана пакета с синхронизацией на диск.
+
+        Args:
+            pairs: Запланированные переименования (индекс, старый путь, новый путь)
+
+        Raises:
+            OSError: Ошибка записи журнала
+        """
+        os.makedirs(self.journal_dir, exist_ok=True)
+        name = f"{datetime.now():%Y%m%d_%H%M%S}_{uuid.uuid4().hex[:8]}{JOURNAL_EXTENSION}"
+        self.path = os.path.join(self.journal_dir, name)
+        self._file = open(self.path, 'wb')
+        try:
+            self._file.write(_encode({
+                'op': 'plan',
+                'created': datetime.now().isoformat(),
+                'pairs': [[index, old, new] for index, old, new in pairs],
+            }))
+            self._sync()
+        except BaseException:
+            self._close()
+            self._remove()
+            raise
+
+    def mark_done(self, index: int, old_path: str, new_path: str) -> None:
+        """Отметка о выполненном переименовании (синхронизируется группами).
+
+        Ошибка записи отметки не прерывает пакет: при восстановлении
+        состояние пары определяется по файловой системе.
+
+        Args:
+            index: Индекс пары в плане
+            old_path: Старый путь
+            new_path: Новый путь
+        """
+        if self._file is None:
+            return
+        try:
+            self._file.write(_encode({'op': 'done', 'i': index, 'old': old_path, 'new': new_path}))
+            self._unsynced += 1
+            if (self._unsynced >= RENAME_JOURNAL_SYNC_EVERY
+                    or time.monotonic() - self._last_sync >= RENAME_JOURNAL_SYNC_INTERVAL):
+                self._sync()
+        except OSError as e:
+            logger.warning(f"Не удалось записать отметку в журнал переименования: {e}")
+
+    def finish(self) -> None:
+        """Завершение пакета: журнал больше не нужен и удаляется."""
+        self._close()
+        self._remove()
+
+    def _sync(self) -> None:
+        """Сброс буфера и синхронизация журнала на диск."""
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def _close(self) -> None:
+        if self._file is not None:
+            try:
+                self._file.close()
+            except OSError:
+                pass
+            self._file = None
+
+    def _remove(self) -> None:
+        if self.path:
+            try:
+                os.remove(self.path)
+            except OSError as e:
+                logger.warning(f"Не удалось удалить журнал переименования {self.path}: {e}")
+            self.path = None
+
+
+@dataclass
+class RenamePair:
+    """Пара прерванного пакета."""
+    index: int
+    old_path: str
+    new_path: str
+    marked: bool = False  # Есть отметка о выполнении
+
+
+@dataclass
+class InterruptedBatch:
+    """Пакет, не завершенный из-за сбоя."""
+    path: str
+    created: str
+    pairs: List[RenamePair] = field(default_factory=list)
+
+    @classmethod
+    def load(cls, path: str) -> 'InterruptedBatch':
+        """Чтение журнала.
+
+        Обрезанная последняя строка (сбой во время записи) пропускается.
+
+        Raises:
+            OSError: Ошибка чтения
+            ValueError: Журнал поврежден (нет плана)
+        """
+        with open(path, 'rb') as f:
+            lines = f.read().split(b'\n')
+        try:
+            plan = json.loads(lines[0])
+        except ValueError as e:
+            raise ValueError(f"Поврежден журнал переименования {path}") from e
+        if plan.get('op') != 'plan':
+            raise ValueError(f"Поврежден журнал переименования {path}")
+        batch = cls(path, plan.get('created', ''))
+        by_index: Dict[int, RenamePair] = {}
+        for index, old_path, new_path in plan['pairs']:
+            pair = RenamePair(index, old_path, new_path)
+            batch.pairs.append(pair)
+            by_index[index] = pair
+        for line in lines[1:]:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if record.get('op') == 'done' and record.get('i') in by_index:
+                pair = by_index[record['i']]
+                # Отметка содержит фактически использованные пути
+                pair.old_path = record.get('old', pair.old_path)
+                pair.new_path = record.get('new', pair.new_path)
+                pair.marked = True
+        return batch
+
+    def state(self, pair: RenamePair) -> str:
+        """Текущее состояние пары по отметкам и файловой системе."""
+        old_exists = os.path.lexists(pair.old_path)
+        new_exists = os.path.lexists(pair.new_path)
+        if old_exists and new_exists and _same_file(pair.old_path, pair.new_path):
+            # Смена регистра: выполнена ли она, видно только по имени в каталоге
+            new_exists = _name_listed(pair.new_path)
+            old_exists = not new_exists
+        if pair.marked:
+            return STATE_DONE if new_exists else STATE_MISSING
+        if new_exists and not old_exists:
+            return STATE_DONE
+        if old_exists and not new_exists:
+            return STATE_PENDING
+        if old_exists and new_exists:
+            return STATE_CONFLICT
+        return STATE_MISSING
+
+    def summary(self) -> Dict[str, int]:
+        """Количество пар по состояниям."""
+        counts: Dict[str, int] = {}
+        for pair in self.pairs:
+            state = self.state(pair)
+            counts[state] = counts.get(state, 0) + 1
+        return counts
+
+    def resume(self) -> Tuple[int, List[Tuple[RenamePair, str]]]:
+        """Выполнение оставшихся переименований и удаление журнала.
+
+        Returns:
+            Tuple[выполнено, список (пара, ошибка)]
+        """
+        done = 0
+        errors: List[Tuple[RenamePair, str]] = []
+        for pair in self.pairs:
+            if self.state(pair) != STATE_PENDING:
+                continue
+            try:
+                os.rename(pair.old_path, pair.new_path)
+                done += 1
+            except OSError as e:
+                errors.append((pair, str(e)))
+        self.discard()
+        return done, errors
+
+    def rollback(self) -> Tuple[int, List[Tuple[RenamePair, str]]]:
+        """Возврат выполненных переименований (в обратном порядке) и удаление журнала.
+
+        Returns:
+            Tuple[возвращено, список (пара, ошибка)]
+        """
+        restored = 0
+        errors: List[Tuple[RenamePair, str]] = []
+        for pair in reversed(self.pairs):
+            if self.state(pair) != STATE_DONE:
+                continue
+            if os.path.lexists(pair.old_path) and not _same_file(pair.old_path, pair.new_path):
+                errors.append((pair, f"Путь уже существует: {pair.old_path}"))
+                continue
+            try:
+                os.rename(pair.new_path, pair.old_path)
+                restored += 1
+            except OSError as e:
+                errors.append((pair, str(e)))
+        self.discard()
+        return restored, errors
+
+    def discard(self) -> None:
+        """Удаление журнала без изменения файлов."""
+        try:
+            os.remove(self.path)
+        except OSError as e:
+            logger.warning(f"Не удалось удалить журнал переименования {self.path}: {e}")
+
+
+def start_journal(pairs: Iterable[Tuple[int, str, str]],
+                  journal_dir: Optional[str] = None) -> Optional[RenameJournal]:
+    """Запись плана пакета в новый журнал.
+
+    Если журнал записать не удалось, пакет выполняется без него.
+
+    Args:
+        pairs: Запланированные переименования (индекс, старый путь, новый путь)
+        journal_dir: Папка журналов (None - папка в директории данных)
+
+    Returns:
+        Журнал или None
+    """
+    journal = RenameJournal(journal_dir or get_rename_journal_dir())
+    try:
+        journal.begin(pairs)
+    except OSError as e:
+        logger.error(f"Не удалось создать журнал переименования: {e}", exc_info=True)
+        return None
+    return journal
+
+
+def find_interrupted(journal_dir: Optional[str] = None) -> List[InterruptedBatch]:
+    """Пакеты, оставшиеся незавершенными после сбоя.
+
+    Args:
+        journal_dir: Папка журналов (None - папка в директории данных)
+
+    Returns:
+        Пакеты от старых к новым (поврежденные журналы пропускаются)
+    """
+    journal_dir = journal_dir or get_rename_journal_dir()
+    try:
+        names = sorted(name for name in os.listdir(journal_dir) if name.endswith(JOURNAL_EXTENSION))
+    except OSError:
+        return []
+    batches: List[InterruptedBatch] = []
+    for name in names:
+        path = os.path.join(journal_dir, name)
+        try:
+            batches.append(InterruptedBatch.load(path))
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.error(f"Не удалось прочитать журнал переименования {path}: {e}")
+    return batches
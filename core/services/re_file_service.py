@@ -9,6 +9,7 @@ from core.domain.re_file_result import ReFileResult, ReFiledFile
 from core.re_file_methods import ReFileMethod
 from core.re_file_methods import validate_filename
 from core.error_handling.errors import ErrorHandler, ErrorType, AppError
+from core.rename_journal import start_journal
 
 if TYPE_CHECKING:
     from core.metadata.extractor import MetadataExtractor
@@ -25,16 +26,19 @@ class ReFileService:
     def __init__(
         self,
         metadata_extractor: Optional['MetadataExtractor'] = None,
-        error_handler: Optional[ErrorHandler] = None
+        error_handler: Optional[ErrorHandler] = None,
+        journal_dir: Optional[str] = None
     ) -> None:
         """Инициализация сервиса.
         
         Args:
             metadata_extractor: Экстрактор метаданных (опционально)
             error_handler: Обработчик ошибок (опционально)
+            journal_dir: Папка журналов переименования (по умолчанию - в директории данных)
         """
         self.metadata_extractor = metadata_extractor
         self.error_handler = error_handler or ErrorHandler()
+        self.journal_dir = journal_dir
     
     def re_file_files(
         self,
@@ -178,152 +182,166 @@ class ReFileService:
             if logger.isEnabledFor(logging.INFO) and total_files > BATCH_SIZE:
                 logger.info(f"Обработка {total_files} файлов батчами по {BATCH_SIZE}")
             
-            processed_count = 0
-            for file in files:
-                # Пропускаем файлы с ошибками
-                if file.status != FileStatus.READY and file.status != FileStatus.PENDING:
-                    continue
+            # План пакета записывается в журнал до переименований
+            # (восстановление после сбоя - core.rename_journal)
+            journal = start_journal(
+                [(i, str(f.path), str(f.new_path)) for i, f in enumerate(files_to_process)],
+                self.journal_dir
+            )
+            
+            try:
+                processed_count = 0
+                for i, file in enumerate(files_to_process):
+                    # Пропускаем файлы с ошибками
+                    if file.status != FileStatus.READY and file.status != FileStatus.PENDING:
+                        continue
                 
-                if not file.is_renamed():
-                    continue
+                    if not file.is_renamed():
+                        continue
                 
-                try:
-                    new_path = file.new_path
-                    
-                    # Атомарная проверка и re-file операция
-                    # Используем try-except для обработки race condition
                     try:
-                        # Проверяем существование исходного файла
-                        if not file.path.exists():
+                        new_path = file.new_path
+                    
+                        # Атомарная проверка и re-file операция
+                        # Используем try-except для обработки race condition
+                        try:
+                            # Проверяем существование исходного файла
+                            if not file.path.exists():
+                                app_error = AppError(
+                                    ErrorType.FILE_NOT_FOUND,
+                                    f"Исходный файл не найден: {file.path}",
+                                    {'file_path': str(file.path)}
+                                )
+                                self.error_handler.handle_error(app_error)
+                                file.set_error(app_error.message)
+                                result.add_error(file, app_error.message)
+                                continue
+                        
+                            # Выполняем re-file операции (атомарная операция)
+                            # os.rename/path.rename атомарны и сами проверят существование
+                            # Это уменьшает вероятность race condition
+                            # Если файл уже существует, это вызовет FileExistsError
+                            try:
+                                # Выполняем атомарное переименование
+                                # path.rename() - атомарная операция на уровне ОС, которая либо
+                                # выполняется полностью, либо не выполняется вообще
+                                # Это предотвращает ситуации, когда файл частично переименован
+                                file.path.rename(new_path)
+                                if journal:
+                                    journal.mark_done(i, str(file.path), str(new_path))
+                                # Логируем успешное переименование для отладки и аудита
+                                if logger.isEnabledFor(logging.INFO):
+                                    logger.info(
+                                        f"Файл успешно переименован: {file.old_full_name} -> {file.new_full_name}",
+                                        extra={'action': 'FILE_RENAMED'}
+                                    )
+                            except FileExistsError:
+                                # Файл уже существует (возможна race condition)
+                                # Это может произойти, если другой процесс создал файл с таким же именем
+                                # между проверкой и переименованием
+                                app_error = AppError(
+                                    ErrorType.FILE_EXISTS,
+                                    f"Файл '{file.new_full_name}' уже существует",
+                                    {'new_path': str(new_path)}
+                                )
+                                self.error_handler.handle_error(app_error)
+                                file.set_error(app_error.message)
+                                result.add_error(file, app_error.message)
+                                continue
+                            # Обновляем путь файла на новый (после успешного переименования)
+                            file.path = new_path
+                            # Устанавливаем статус "готов" - файл успешно переименован
+                            file.set_ready()
+                        
+                            # Добавляем в результат успешных операций
+                            result.add_success(file, str(new_path))
+                            processed_count += 1
+                        
+                            # Логируем прогресс для больших батчей
+                            # Это помогает отслеживать прогресс при обработке тысяч файлов
+                            if logger.isEnabledFor(logging.DEBUG) and total_files > BATCH_SIZE:
+                                if processed_count % BATCH_SIZE == 0:
+                                    logger.debug(f"Обработано {processed_count}/{total_files} файлов")
+                        
+                        except FileExistsError as e:
+                            # Race condition: файл был создан между проверкой и re-file операцией
+                            # Это редкая ситуация, но возможная в многопоточной среде или
+                            # при параллельной работе нескольких процессов
                             app_error = AppError(
-                                ErrorType.FILE_NOT_FOUND,
-                                f"Исходный файл не найден: {file.path}",
-                                {'file_path': str(file.path)}
+                                ErrorType.RACE_CONDITION,
+                                f"Файл '{file.new_full_name}' уже существует (race condition)",
+                                {'old_path': str(file.path), 'new_path': str(new_path)},
+                                original_error=e
                             )
                             self.error_handler.handle_error(app_error)
                             file.set_error(app_error.message)
                             result.add_error(file, app_error.message)
-                            continue
-                        
-                        # Выполняем re-file операции (атомарная операция)
-                        # os.rename/path.rename атомарны и сами проверят существование
-                        # Это уменьшает вероятность race condition
-                        # Если файл уже существует, это вызовет FileExistsError
-                        try:
-                        # Выполняем атомарное переименование
-                        # path.rename() - атомарная операция на уровне ОС, которая либо
-                        # выполняется полностью, либо не выполняется вообще
-                        # Это предотвращает ситуации, когда файл частично переименован
-                        file.path.rename(new_path)
-                        # Логируем успешное переименование для отладки и аудита
-                        if logger.isEnabledFor(logging.INFO):
-                            logger.info(
-                                f"Файл успешно переименован: {file.old_full_name} -> {file.new_full_name}",
-                                extra={'action': 'FILE_RENAMED'}
-                            )
-                        except FileExistsError:
-                            # Файл уже существует (возможна race condition)
-                            # Это может произойти, если другой процесс создал файл с таким же именем
-                            # между проверкой и переименованием
+                        except (OSError, PermissionError) as e:
+                            # Другие ошибки файловой системы
+                            error_type = ErrorType.PERMISSION_DENIED if isinstance(e, PermissionError) else ErrorType.UNKNOWN_ERROR
                             app_error = AppError(
-                                ErrorType.FILE_EXISTS,
-                                f"Файл '{file.new_full_name}' уже существует",
-                                {'new_path': str(new_path)}
+                                error_type,
+                                f"Ошибка переименования: {str(e)}",
+                                {'old_path': str(file.path), 'new_path': str(new_path)},
+                                original_error=e
                             )
                             self.error_handler.handle_error(app_error)
                             file.set_error(app_error.message)
                             result.add_error(file, app_error.message)
-                            continue
-                        # Обновляем путь файла на новый (после успешного переименования)
-                        file.path = new_path
-                        # Устанавливаем статус "готов" - файл успешно переименован
-                        file.set_ready()
                         
-                        # Добавляем в результат успешных операций
-                        result.add_success(file, str(new_path))
-                        processed_count += 1
-                        
-                        # Логируем прогресс для больших батчей
-                        # Это помогает отслеживать прогресс при обработке тысяч файлов
-                        if logger.isEnabledFor(logging.DEBUG) and total_files > BATCH_SIZE:
-                            if processed_count % BATCH_SIZE == 0:
-                                logger.debug(f"Обработано {processed_count}/{total_files} файлов")
-                        
-                    except FileExistsError as e:
-                        # Race condition: файл был создан между проверкой и re-file операцией
-                        # Это редкая ситуация, но возможная в многопоточной среде или
-                        # при параллельной работе нескольких процессов
+                    except (ValueError, TypeError, AttributeError) as e:
                         app_error = AppError(
-                            ErrorType.RACE_CONDITION,
-                            f"Файл '{file.new_full_name}' уже существует (race condition)",
-                            {'old_path': str(file.path), 'new_path': str(new_path)},
+                            ErrorType.VALIDATION_ERROR,
+                            f"Ошибка валидации: {str(e)}",
+                            {'file_path': str(file.path)},
                             original_error=e
                         )
                         self.error_handler.handle_error(app_error)
                         file.set_error(app_error.message)
                         result.add_error(file, app_error.message)
-                    except (OSError, PermissionError) as e:
-                        # Другие ошибки файловой системы
-                        error_type = ErrorType.PERMISSION_DENIED if isinstance(e, PermissionError) else ErrorType.UNKNOWN_ERROR
+                    except (KeyboardInterrupt, SystemExit):
+                        # Не перехватываем системные исключения
+                        raise
+                    except (RuntimeError, AttributeError) as e:
+                        # Ошибки выполнения или доступа к атрибутам
+                        logger.error(f"Ошибка выполнения при переименовании файла: {e}", exc_info=True)
                         app_error = AppError(
-                            error_type,
-                            f"Ошибка переименования: {str(e)}",
+                            ErrorType.UNKNOWN_ERROR,
+                            f"Ошибка выполнения: {str(e)}",
                             {'old_path': str(file.path), 'new_path': str(new_path)},
                             original_error=e
                         )
                         self.error_handler.handle_error(app_error)
                         file.set_error(app_error.message)
                         result.add_error(file, app_error.message)
-                        
-                except (ValueError, TypeError, AttributeError) as e:
-                    app_error = AppError(
-                        ErrorType.VALIDATION_ERROR,
-                        f"Ошибка валидации: {str(e)}",
-                        {'file_path': str(file.path)},
-                        original_error=e
-                    )
-                    self.error_handler.handle_error(app_error)
-                    file.set_error(app_error.message)
-                    result.add_error(file, app_error.message)
-                except (KeyboardInterrupt, SystemExit):
-                    # Не перехватываем системные исключения
-                    raise
-                except (RuntimeError, AttributeError) as e:
-                    # Ошибки выполнения или доступа к атрибутам
-                    logger.error(f"Ошибка выполнения при переименовании файла: {e}", exc_info=True)
-                    app_error = AppError(
-                        ErrorType.UNKNOWN_ERROR,
-                        f"Ошибка выполнения: {str(e)}",
-                        {'old_path': str(file.path), 'new_path': str(new_path)},
-                        original_error=e
-                    )
-                    self.error_handler.handle_error(app_error)
-                    file.set_error(app_error.message)
-                    result.add_error(file, app_error.message)
-                except (ValueError, TypeError, KeyError, IndexError) as e:
-                    # Ошибки данных при обработке ошибки
-                    logger.error(f"Ошибка данных при обработке ошибки переименования: {e}", exc_info=True)
-                except (MemoryError, RecursionError) as e:
-                    # Ошибки памяти/рекурсии
-                    pass
-                # Финальный catch для неожиданных исключений (критично для стабильности)
+                    except (ValueError, TypeError, KeyError, IndexError) as e:
+                        # Ошибки данных при обработке ошибки
+                        logger.error(f"Ошибка данных при обработке ошибки переименования: {e}", exc_info=True)
+                    except (MemoryError, RecursionError) as e:
+                        # Ошибки памяти/рекурсии
+                        pass
+                    # Финальный catch для неожиданных исключений (критично для стабильности)
 
-                except BaseException as e:
+                    except BaseException as e:
 
-                    if isinstance(e, (KeyboardInterrupt, SystemExit)):
+                        if isinstance(e, (KeyboardInterrupt, SystemExit)):
 
-                        raise
-                    # Логируем неожиданные исключения
-                    logger.error(f"Неожиданная ошибка при переименовании файла: {e}", exc_info=True)
-                    app_error = AppError(
-                        ErrorType.UNKNOWN_ERROR,
-                        f"Неожиданная ошибка: {str(e)}",
-                        {'file_path': str(file.path)},
-                        original_error=e
-                    )
-                    self.error_handler.handle_error(app_error)
-                    file.set_error(app_error.message)
-                    result.add_error(file, app_error.message)
+                            raise
+                        # Логируем неожиданные исключения
+                        logger.error(f"Неожиданная ошибка при переименовании файла: {e}", exc_info=True)
+                        app_error = AppError(
+                            ErrorType.UNKNOWN_ERROR,
+                            f"Неожиданная ошибка: {str(e)}",
+                            {'file_path': str(file.path)},
+                            original_error=e
+                        )
+                        self.error_handler.handle_error(app_error)
+                        file.set_error(app_error.message)
+                        result.add_error(file, app_error.message)
+            finally:
+                # Журнал остается только при аварийном завершении процесса
+                if journal:
+                    journal.finish()
         else:
             # Только предпросмотр
             for file in files:
@@ -0,0 +1,17 @@
+"""Сортировка файлов по папкам."""
+
+from .engine import SorterEngine
+from .plan import PlanEntry, SorterPlan, SortMove, SortResult
+from .rules import FileRecord, RuleSet, SortRule, compile_rule
+
+__all__ = [
+    'SorterEngine',
+    'SorterPlan',
+    'PlanEntry',
+    'SortMove',
+    'SortResult',
+    'FileRecord',
+    'RuleSet',
+    'SortRule',
+    'compile_rule',
+]
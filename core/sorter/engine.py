@@ -0,0 +1,169 @@
+"""Движок сортировки файлов по папкам.
+
+Фильтры компилируются один раз в набор правил (см. rules), итоговые
+пути вычисляются планом (см. plan): каждая папка назначения читается
+и создается один раз, коллизии имен разрешаются в памяти. На одном
+устройстве файлы перемещаются через os.rename, между устройствами -
+через FileMover (копирование средствами ядра с проверкой) в нескольких
+потоках.
+"""
+
+import errno
+import logging
+import os
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from core.file_mover import MOVE_WORKERS, FileMover, MoveCancelled, MoveOptions, ProgressCallback
+
+from .plan import SorterPlan, SortMove, SortResult
+from .rules import RuleSet, read_exif
+
+logger = logging.getLogger(__name__)
+
+
+class SorterEngine:
+    """Пакетная сортировка файлов по папкам назначения."""
+
+    def __init__(
+        self,
+        target_folder: str,
+        filters: Sequence[Dict[str, Any]],
+        workers: int = MOVE_WORKERS,
+        exif_reader: Callable[[str], Dict[str, str]] = read_exif,
+        move_options: Optional[MoveOptions] = None
+    ):
+        """Инициализация движка.
+
+        Args:
+            target_folder: Папка, в которой создаются подпапки
+            filters: Список фильтров
+            workers: Потоков для перемещения между устройствами
+            exif_reader: Функция чтения EXIF для правил по дате съемки и камере
+            move_options: Параметры перемещения между устройствами
+                          (по умолчанию - проверка размера, workers потоков)
+        """
+        self.target_folder = target_folder
+        self.filters = list(filters)
+        self.rules = RuleSet(filters, exif_reader)
+        self.mover = FileMover(move_options or MoveOptions(workers=max(1, workers)))
+
+    def classify(self, file_path: str) -> str:
+        """Имя подпапки для файла.
+
+        Args:
+            file_path: Путь к файлу
+
+        Returns:
+            Относительный путь подпапки или пустая строка
+        """
+        return self.rules.classify(file_path)
+
+    def plan(self, files: Sequence[str]) -> Tuple[List[SortMove], List[SortResult]]:
+        """Планирование перемещений.
+
+        Args:
+            files: Список путей к файлам
+
+        Returns:
+            Tuple[список перемещений, список ошибок планирования]
+        """
+        plan = self.create_plan(files)
+        return plan.moves(), plan.errors()
+
+    def create_plan(self, files: Sequence[str] = ()) -> SorterPlan:
+        """План сортировки с правилами этого движка.
+
+        Args:
+            files: Список путей к файлам
+
+        Returns:
+            Построенный план
+        """
+        plan = SorterPlan(self.target_folder, self.filters, self.rules.exif_reader)
+        plan.build(files)
+        return plan
+
+    def execute(
+        self,
+        moves: Sequence[SortMove],
+        result_callback: Optional[Callable[[SortResult], None]] = None,
+        cancel_check: Optional[Callable[[], bool]] = None,
+        copy_progress_callback: Optional[ProgressCallback] = None
+    ) -> bool:
+        """Выполнение перемещений.
+
+        Сначала все файлы перемещаются через os.rename; файлы на другом
+        устройстве после этого параллельно копируются, проверяются и
+        удаляются (см. FileMover).
+
+        Args:
+            moves: Запланированные перемещения
+            result_callback: Функция, вызываемая для каждого результата
+                             (в потоке, вызвавшем execute)
+            cancel_check: Функция, возвращающая True при отмене
+            copy_progress_callback: Прогресс копирования между устройствами
+                                    (вызывается из рабочих потоков)
+
+        Returns:
+            False, если операция была отменена
+        """
+        def report(result: SortResult) -> None:
+            if result_callback:
+                result_callback(result)
+
+        # Каждая папка назначения создается один раз
+        failed_folders: Dict[str, OSError] = {}
+        for folder in {os.path.dirname(move.destination) for move in moves}:
+            try:
+                os.makedirs(folder, exist_ok=True)
+            except OSError as e:
+                logger.error(f"Не удалось создать папку {folder}: {e}")
+                failed_folders[folder] = e
+
+        cross_device: List[SortMove] = []
+        for move in moves:
+            if cancel_check and cancel_check():
+                return False
+            folder_error = failed_folders.get(os.path.dirname(move.destination))
+            if folder_error:
+                report(SortResult(move.source, False, f"Ошибка: {folder_error}"))
+                continue
+            try:
+                os.rename(move.source, move.destination)
+            except OSError as e:
+                if e.errno == errno.EXDEV:
+                    cross_device.append(move)
+                    continue
+                report(self._error_result(move, e))
+                continue
+            report(SortResult(move.source, True, f"Перемещен в {move.folder_name}", move.destination))
+
+        if not cross_device:
+            return True
+
+        by_source = {move.source: move for move in cross_device}
+        results = self.mover.move_many(
+            ((move.source, move.destination) for move in cross_device),
+            copy_progress_callback,
+            cancel_check
+        )
+        for source, _, error in results:
+            move = by_source[source]
+            if isinstance(error, MoveCancelled):
+                continue
+            if error is not None:
+                report(self._error_result(move, error))
+            else:
+                report(SortResult(move.source, True, f"Перемещен в {move.folder_name}", move.destination))
+            if cancel_check and cancel_check():
+                results.close()
+                return False
+        return not (cancel_check and cancel_check())
+
+    @staticmethod
+    def _error_result(move: SortMove, error: OSError) -> SortResult:
+        """Результат с ошибкой перемещения."""
+        if isinstance(error, FileNotFoundError) and not os.path.exists(move.source):
+            return SortResult(move.source, False, "Файл не найден")
+        logger.error(f"Ошибка при сортировке {move.source}: {error}")
+        return SortResult(move.source, False, f"Ошибка: {error}")
@@ -0,0 +1,295 @@
+"""План сортировки (пробный прогон).
+
+План вычисляется один раз: для каждого файла хранится подходящее
+правило, папка назначения и итоговое имя без коллизий. Предпросмотр
+отображает план, SorterWorker выполняет его. При изменении фильтров
+заново классифицируются только файлы, на которые изменение может
+повлиять, а имена пересчитываются только в затронутых папках.
+Записи FileRecord сохраняются, поэтому stat и EXIF не читаются повторно.
+"""
+
+import copy
+import logging
+import os
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Set
+
+from .rules import FileRecord, RuleSet, SortRule, compile_rule, read_exif
+
+logger = logging.getLogger(__name__)
+
+# Максимальный номер суффикса _N при подборе имени
+MAX_NAME_ATTEMPTS = 100000
+
+
+@dataclass
+class SortMove:
+    """Запланированное перемещение файла."""
+    source: str
+    destination: str
+    folder_name: str
+
+
+@dataclass
+class SortResult:
+    """Результат перемещения файла."""
+    source: str
+    success: bool
+    message: str
+    destination: Optional[str] = None
+
+
+@dataclass
+class PlanEntry:
+    """Строка плана сортировки."""
+    source: str
+    folder: str = ''  # Относительная папка ('' - фильтр не определен)
+    destination: Optional[str] = None  # Итоговый путь без коллизий
+    rule: Optional[SortRule] = None
+    error: Optional[str] = None
+
+
+def reserve_name(name: str, taken: Set[str]) -> Optional[str]:
+    """Подбор свободного имени name, name_1, name_2... и его резервирование.
+
+    Args:
+        name: Желаемое имя файла
+        taken: Занятые имена (в os.path.normcase), дополняется выбранным
+
+    Returns:
+        Свободное имя или None
+    """
+    stem, ext = os.path.splitext(name)
+    for counter in range(MAX_NAME_ATTEMPTS):
+        candidate = name if counter == 0 else f"{stem}_{counter}{ext}"
+        key = os.path.normcase(candidate)
+        if key not in taken:
+            taken.add(key)
+            return candidate
+    return None
+
+
+class SorterPlan:
+    """Кэшированная классификация файлов и итоговые пути сортировки."""
+
+    def __init__(
+        self,
+        target_folder: str,
+        filters: Sequence[Dict[str, Any]],
+        exif_reader: Callable[[str], Dict[str, str]] = read_exif
+    ):
+        """Инициализация.
+
+        Args:
+            target_folder: Папка, в которой создаются подпапки
+            filters: Список фильтров
+            exif_reader: Функция чтения EXIF
+        """
+        self.target_folder = target_folder
+        self.exif_reader = exif_reader
+        self.filters: List[Dict[str, Any]] = []
+        self._compiled: List[Optional[SortRule]] = []
+        self.rules = RuleSet.from_rules([], exif_reader)
+        self._entries: Dict[str, PlanEntry] = {}
+        self._records: Dict[str, FileRecord] = {}
+        self._order: List[str] = []
+        self._listings: Dict[str, Set[str]] = {}
+        self.set_filters(filters)
+
+    @property
+    def entries(self) -> List[PlanEntry]:
+        """Строки плана в порядке добавления файлов."""
+        return [self._entries[path] for path in self._order]
+
+    def entry(self, file_path: str) -> Optional[PlanEntry]:
+        """Строка плана для файла."""
+        return self._entries.get(file_path)
+
+    def build(self, files: Sequence[str], cancel_check: Optional[Callable[[], bool]] = None) -> bool:
+        """Построение плана для списка файлов.
+
+        Args:
+            files: Список путей к файлам
+            cancel_check: Функция, возвращающая True при отмене
+
+        Returns:
+            False, если построение было отменено
+        """
+        self._entries.clear()
+        self._records.clear()
+        self._order = []
+        self._listings.clear()
+        return self.add_files(files, cancel_check)
+
+    def add_files(self, files: Iterable[str], cancel_check: Optional[Callable[[], bool]] = None) -> bool:
+        """Добавление файлов в план.
+
+        Returns:
+            False, если добавление было отменено
+        """
+        added = []
+        for file_path in files:
+            if cancel_check and cancel_check():
+                return False
+            if file_path in self._entries:
+                continue
+            self._records[file_path] = self.rules.record(file_path)
+            self._entries[file_path] = self._classify(file_path)
+            self._order.append(file_path)
+            added.append(file_path)
+        self._resolve_folders({self._entries[path].folder for path in added})
+        return True
+
+    def remove_files(self, files: Iterable[str]) -> None:
+        """Удаление файлов из плана (освободившиеся имена пересчитываются)."""
+        removed = set(files) & set(self._entries)
+        if not removed:
+            return
+        folders = {self._entries[path].folder for path in removed}
+        for path in removed:
+            del self._entries[path]
+            del self._records[path]
+        self._order = [path for path in self._order if path not in removed]
+        self._resolve_folders(folders)
+
+    def set_filters(self, filters: Sequence[Dict[str, Any]]) -> List[str]:
+        """Замена фильтров с частичной переклассификацией.
+
+        Правила неизменившихся фильтров переиспользуются. Файл
+        классифицируется заново, только если новое, измененное или
+        перемещенное правило стоит в порядке проверки раньше правила,
+        которое ему подошло, либо если подошедшее правило изменилось или
+        удалено.
+
+        Args:
+            filters: Новый список фильтров
+
+        Returns:
+            Файлы, у которых изменилась папка назначения
+        """
+        previous = list(zip(self.filters, self._compiled))
+        filters = [copy.deepcopy(filter_data) for filter_data in filters]
+        compiled: List[Optional[SortRule]] = []
+        for filter_data in filters:
+            for index, (old_filter, old_rule) in enumerate(previous):
+                if old_filter == filter_data:
+                    compiled.append(old_rule)
+                    del previous[index]
+                    break
+            else:
+                compiled.append(compile_rule(filter_data))
+
+        old_positions = {id(rule): position for position, rule in enumerate(self.rules.rules)}
+        self.filters = filters
+        self._compiled = compiled
+        self.rules.set_rules(compiled)
+
+        positions = {id(rule): position for position, rule in enumerate(self.rules.rules)}
+        fresh = [position for position, rule in enumerate(self.rules.rules) if id(rule) not in old_positions]
+        # Правила до первого нового или перемещенного стоят в прежнем порядке
+        moved = [position for position, rule in enumerate(self.rules.rules)
+                 if old_positions.get(id(rule), position) != position]
+        threshold = min(fresh + moved, default=len(self.rules.rules))
+
+        changed = []
+        folders: Set[str] = set()
+        for path in self._order:
+            entry = self._entries[path]
+            if entry.rule is None:
+                affected = bool(fresh)
+            else:
+                position = positions.get(id(entry.rule))
+                affected = position is None or position > threshold
+            if not affected:
+                continue
+            new_entry = self._classify(path)
+            if new_entry.folder == entry.folder:
+                # Папка та же - итоговое имя остается прежним
+                entry.rule = new_entry.rule
+                continue
+            folders.update((entry.folder, new_entry.folder))
+            changed.append(path)
+            self._entries[path] = new_entry
+        self._resolve_folders(folders)
+        return changed
+
+    def update_filter(self, index: int, filter_data: Dict[str, Any]) -> List[str]:
+        """Изменение одного фильтра.
+
+        Args:
+            index: Индекс фильтра
+            filter_data: Новые данные фильтра
+
+        Returns:
+            Файлы, у которых изменилась папка назначения
+        """
+        filters = list(self.filters)
+        filters[index] = filter_data
+        return self.set_filters(filters)
+
+    def set_target_folder(self, target_folder: str) -> None:
+        """Смена папки назначения (классификация сохраняется, имена пересчитываются)."""
+        if target_folder == self.target_folder:
+            return
+        self.target_folder = target_folder
+        self.refresh()
+
+    def refresh(self) -> None:
+        """Повторное чтение папок назначения и пересчет имен.
+
+        Вызывается перед выполнением плана, чтобы учесть файлы,
+        появившиеся в папках после построения плана.
+        """
+        self._listings.clear()
+        self._resolve_folders({entry.folder for entry in self._entries.values()})
+
+    def moves(self) -> List[SortMove]:
+        """Перемещения для выполнения."""
+        return [
+            SortMove(entry.source, entry.destination, entry.folder)
+            for entry in self.entries if entry.destination
+        ]
+
+    def errors(self) -> List[SortResult]:
+        """Файлы, которые не будут перемещены."""
+        return [
+            SortResult(entry.source, False, entry.error or "Не определен фильтр")
+            for entry in self.entries if not entry.destination
+        ]
+
+    def _classify(self, file_path: str) -> PlanEntry:
+        """Классификация файла по сохраненной записи."""
+        rule, folder = self.rules.match(self._records[file_path])
+        if not folder:
+            return PlanEntry(file_path, error="Не определен фильтр")
+        return PlanEntry(file_path, folder, rule=rule)
+
+    def _resolve_folders(self, folders: Set[str]) -> None:
+        """Пересчет итоговых имен файлов в папках (в порядке файлов плана)."""
+        folders.discard('')
+        if not folders:
+            return
+        taken_by_folder: Dict[str, Set[str]] = {}
+        for folder in folders:
+            # Каждая папка читается один раз; несуществующая папка пуста
+            absolute = os.path.join(self.target_folder, folder)
+            listing = self._listings.get(absolute)
+            if listing is None:
+                try:
+                    listing = {os.path.normcase(name) for name in os.listdir(absolute)}
+                except OSError:
+                    listing = set()
+                self._listings[absolute] = listing
+            taken_by_folder[folder] = set(listing)
+
+        for path in self._order:
+            entry = self._entries[path]
+            if entry.folder not in taken_by_folder:
+                continue
+            name = reserve_name(os.path.basename(path), taken_by_folder[entry.folder])
+            if name is None:
+                entry.destination = None
+                entry.error = "Не удалось подобрать свободное имя"
+            else:
+                entry.destination = os.path.join(self.target_folder, entry.folder, name)
+                entry.error = None
@@ -0,0 +1,497 @@
+"""Правила сортировки файлов.
+
+Фильтр сортировки компилируется в правило с набором условий:
+расширение, регулярное выражение по имени, диапазон размера, дата
+(изменения, создания или EXIF), MIME тип по сигнатуре файла и модель
+камеры из EXIF. Имя папки правила может быть шаблоном, например
+``{year}/{month}`` или ``Фото/{camera}``.
+
+Для каждого файла создается одна запись FileRecord: stat, начальные
+байты и EXIF читаются не больше одного раза и только если они нужны
+проверяемому условию. Правила проверяются в порядке приоритета до
+первого совпадения, условия внутри правила - от дешевых к дорогим.
+"""
+
+import fnmatch
+import logging
+import os
+import re
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Сколько байт читать для определения MIME типа
+MIME_HEAD_SIZE = 32
+
+# Стоимость проверки условия: имя < stat < чтение файла < EXIF
+COST_NAME = 0
+COST_STAT = 1
+COST_READ = 2
+COST_EXIF = 3
+
+# Единицы размера (двоичные, как в проводнике)
+_SIZE_UNITS = {
+    '': 1, 'b': 1, 'б': 1,
+    'kb': 1024, 'k': 1024, 'кб': 1024,
+    'mb': 1024 ** 2, 'm': 1024 ** 2, 'мб': 1024 ** 2,
+    'gb': 1024 ** 3, 'g': 1024 ** 3, 'гб': 1024 ** 3,
+    'tb': 1024 ** 4, 't': 1024 ** 4, 'тб': 1024 ** 4,
+}
+_SIZE_PATTERN = re.compile(r'^\s*(\d+(?:[.,]\d+)?)\s*([a-zа-я]*)\s*$', re.IGNORECASE)
+
+# Сигнатуры файлов: (смещение, байты, MIME тип)
+_MAGIC_SIGNATURES: Tuple[Tuple[int, bytes, str], ...] = (
+    (0, b'\xff\xd8\xff', 'image/jpeg'),
+    (0, b'\x89PNG\r\n\x1a\n', 'image/png'),
+    (0, b'GIF87a', 'image/gif'),
+    (0, b'GIF89a', 'image/gif'),
+    (0, b'II*\x00', 'image/tiff'),
+    (0, b'MM\x00*', 'image/tiff'),
+    (0, b'BM', 'image/bmp'),
+    (0, b'%PDF', 'application/pdf'),
+    (0, b'PK\x03\x04', 'application/zip'),
+    (0, b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1', 'application/x-ole-storage'),
+    (0, b'{\\rtf', 'application/rtf'),
+    (0, b'7z\xbc\xaf\x27\x1c', 'application/x-7z-compressed'),
+    (0, b'Rar!\x1a\x07', 'application/vnd.rar'),
+    (0, b'\x1f\x8b', 'application/gzip'),
+    (0, b'ID3', 'audio/mpeg'),
+    (0, b'\xff\xfb', 'audio/mpeg'),
+    (0, b'fLaC', 'audio/flac'),
+    (0, b'OggS', 'audio/ogg'),
+    (0, b'\x1a\x45\xdf\xa3', 'video/x-matroska'),
+)
+
+# Формы RIFF контейнера (байты 8-12)
+_RIFF_TYPES = {b'WEBP': 'image/webp', b'WAVE': 'audio/wav', b'AVI ': 'video/x-msvideo'}
+
+# Бренды ISO BMFF контейнера (байты 8-12)
+_FTYP_BRANDS = {b'heic': 'image/heic', b'heix': 'image/heic', b'mif1': 'image/heif', b'qt  ': 'video/quicktime'}
+
+# Символы, недопустимые в имени папки, подставляемом из метаданных
+_INVALID_FOLDER_CHARS = re.compile(r'[<>:"/\\|?*\x00-\x1f]')
+
+# Теги EXIF
+_EXIF_MAKE = 271
+_EXIF_MODEL = 272
+_EXIF_DATETIME = 306
+_EXIF_IFD = 0x8769
+_EXIF_DATETIME_ORIGINAL = 36867
+
+
+def parse_size(text: str) -> int:
+    """Разбор размера вида ``10``, ``1.5 MB``, ``500КБ``.
+
+    Raises:
+        ValueError: Некорректный размер
+    """
+    match = _SIZE_PATTERN.match(text)
+    if not match or match.group(2).lower() not in _SIZE_UNITS:
+        raise ValueError(f"Некорректный размер: {text}")
+    return int(float(match.group(1).replace(',', '.')) * _SIZE_UNITS[match.group(2).lower()])
+
+
+def parse_size_range(text: str) -> Tuple[Optional[int], Optional[int]]:
+    """Разбор диапазона размеров: ``1MB-10MB``, ``-500KB``, ``1GB-``, ``>1GB``, ``<10KB``.
+
+    Returns:
+        Tuple[минимум или None, максимум или None]
+
+    Raises:
+        ValueError: Некорректный диапазон
+    """
+    text = text.strip()
+    if text.startswith('>'):
+        return parse_size(text[1:]), None
+    if text.startswith('<'):
+        return None, parse_size(text[1:])
+    if '-' not in text:
+        raise ValueError(f"Некорректный диапазон размеров: {text}")
+    low, high = text.split('-', 1)
+    minimum = parse_size(low) if low.strip() else None
+    maximum = parse_size(high) if high.strip() else None
+    if minimum is None and maximum is None:
+        raise ValueError(f"Некорректный диапазон размеров: {text}")
+    return minimum, maximum
+
+
+def detect_mime(head: bytes) -> str:
+    """MIME тип по начальным байтам файла.
+
+    Args:
+        head: Первые байты файла
+
+    Returns:
+        MIME тип (application/octet-stream, если не распознан)
+    """
+    if head[:4] == b'RIFF' and head[8:12] in _RIFF_TYPES:
+        return _RIFF_TYPES[head[8:12]]
+    if head[4:8] == b'ftyp':
+        return _FTYP_BRANDS.get(head[8:12], 'video/mp4')
+    for offset, signature, mime in _MAGIC_SIGNATURES:
+        if head[offset:offset + len(signature)] == signature:
+            return mime
+    if not head:
+        return 'application/x-empty'
+    if b'\x00' not in head:
+        try:
+            head.decode('utf-8')
+            return 'text/plain'
+        except UnicodeDecodeError:
+            # Многобайтовый символ мог оборваться на границе прочитанного
+            try:
+                head[:-3].decode('utf-8')
+                return 'text/plain'
+            except UnicodeDecodeError:
+                pass
+    return 'application/octet-stream'
+
+
+def read_exif(file_path: str) -> Dict[str, str]:
+    """Чтение модели камеры и даты съемки из EXIF (требуется Pillow).
+
+    Args:
+        file_path: Путь к изображению
+
+    Returns:
+        Словарь с ключами make, model, datetime (только найденные)
+    """
+    try:
+        from PIL import Image
+    except ImportError:
+        return {}
+
+    try:
+        # Image.open читает только заголовок, данные пикселей не загружаются
+        with Image.open(file_path) as img:
+            exif = img.getexif()
+            values = {
+                'make': exif.get(_EXIF_MAKE),
+                'model': exif.get(_EXIF_MODEL),
+                'datetime': exif.get_ifd(_EXIF_IFD).get(_EXIF_DATETIME_ORIGINAL) or exif.get(_EXIF_DATETIME),
+            }
+    except (OSError, ValueError, TypeError, AttributeError, SyntaxError) as e:
+        logger.debug(f"Не удалось прочитать EXIF {file_path}: {e}")
+        return {}
+    return {key: str(value).strip('\x00 ') for key, value in values.items() if value}
+
+
+class FileRecord:
+    """Сведения о файле, читаемые лениво и не больше одного раза."""
+
+    __slots__ = ('path', 'name', 'ext', '_exif_reader', '_stat', '_head', '_exif', '_loaded')
+
+    def __init__(self, path: str, exif_reader: Callable[[str], Dict[str, str]] = read_exif):
+        """Инициализация.
+
+        Args:
+            path: Путь к файлу
+            exif_reader: Функция чтения EXIF
+        """
+        self.path = path
+        self.name = os.path.basename(path)
+        self.ext = os.path.splitext(self.name)[1].lower()
+        self._exif_reader = exif_reader
+        self._stat = None
+        self._head = b''
+        self._exif: Dict[str, str] = {}
+        self._loaded = set()
+
+    def stat(self) -> Optional[os.stat_result]:
+        """Результат os.stat (None, если файл недоступен)."""
+        if 'stat' not in self._loaded:
+            self._loaded.add('stat')
+            try:
+                self._stat = os.stat(self.path)
+            except OSError:
+                self._stat = None
+        return self._stat
+
+    def head(self) -> bytes:
+        """Первые MIME_HEAD_SIZE байт файла."""
+        if 'head' not in self._loaded:
+            self._loaded.add('head')
+            try:
+                with open(self.path, 'rb') as f:
+                    self._head = f.read(MIME_HEAD_SIZE)
+            except OSError:
+                self._head = b''
+        return self._head
+
+    def mime(self) -> str:
+        """MIME тип по сигнатуре."""
+        return detect_mime(self.head())
+
+    def exif(self) -> Dict[str, str]:
+        """EXIF данные (make, model, datetime)."""
+        if 'exif' not in self._loaded:
+            self._loaded.add('exif')
+            self._exif = self._exif_reader(self.path) or {}
+        return self._exif
+
+    def date(self, source: str) -> Optional[datetime]:
+        """Дата файла.
+
+        Args:
+            source: mtime, ctime или exif (без EXIF - дата изменения)
+
+        Returns:
+            Дата или None
+        """
+        if source == 'exif':
+            value = self.exif().get('datetime')
+            if value:
+                try:
+                    return datetime.strptime(value[:19], '%Y:%m:%d %H:%M:%S')
+                except ValueError:
+                    logger.debug(f"Некорректная дата EXIF в {self.path}: {value}")
+            source = 'mtime'
+        stat = self.stat()
+        if stat is None:
+            return None
+        return datetime.fromtimestamp(stat.st_ctime if source == 'ctime' else stat.st_mtime)
+
+
+class _Condition:
+    """Скомпилированное условие правила."""
+
+    __slots__ = ('cost', 'check')
+
+    def __init__(self, cost: int, check: Callable[[FileRecord], bool]):
+        self.cost = cost
+        self.check = check
+
+
+def _compile_condition(condition_type: str, value: str, date_source: str) -> _Condition:
+    """Компиляция условия.
+
+    Raises:
+        ValueError: Неизвестный тип или некорректное значение
+    """
+    if condition_type == 'extension':
+        extensions = frozenset(
+            ext if ext.startswith('.') else f'.{ext}'
+            for ext in (part.strip().lower() for part in value.split(','))
+            if ext
+        )
+        return _Condition(COST_NAME, lambda record: record.ext in extensions)
+
+    if condition_type == 'regex':
+        try:
+            pattern = re.compile(value)
+        except re.error as e:
+            raise ValueError(f"Некорректное регулярное выражение {value}: {e}") from e
+        return _Condition(COST_NAME, lambda record: pattern.search(record.name) is not None)
+
+    if condition_type == 'size':
+        minimum, maximum = parse_size_range(value)
+
+        def check_size(record: FileRecord) -> bool:
+            stat = record.stat()
+            if stat is None:
+                return False
+            return ((minimum is None or stat.st_size >= minimum)
+                    and (maximum is None or stat.st_size <= maximum))
+        return _Condition(COST_STAT, check_size)
+
+    if condition_type == 'date':
+        source = value.strip().lower() or date_source
+        if source not in ('mtime', 'ctime', 'exif'):
+            raise ValueError(f"Неизвестный источник даты: {value}")
+        cost = COST_EXIF if source == 'exif' else COST_STAT
+        return _Condition(cost, lambda record: record.date(source) is not None)
+
+    if condition_type == 'mime':
+        patterns = [part.strip().lower() for part in value.split(',') if part.strip()]
+        if not patterns:
+            raise ValueError("Не указан MIME тип")
+        return _Condition(COST_READ, lambda record: any(
+            fnmatch.fnmatchcase(record.mime(), pattern) for pattern in patterns
+        ))
+
+    if condition_type == 'camera':
+        needle = value.strip().lower()
+
+        def check_camera(record: FileRecord) -> bool:
+            exif = record.exif()
+            camera = f"{exif.get('make', '')} {exif.get('model', '')}".strip().lower()
+            return bool(camera) and needle in camera
+        return _Condition(COST_EXIF, check_camera)
+
+    raise ValueError(f"Неизвестный тип фильтра: {condition_type}")
+
+
+class _TemplateFields(dict):
+    """Поля шаблона папки, вычисляемые по требованию."""
+
+    def __init__(self, record: FileRecord, date_source: str):
+        super().__init__()
+        self.record = record
+        self.date_source = date_source
+
+    def __missing__(self, key: str) -> str:
+        record = self.record
+        if key in ('year', 'month', 'day'):
+            date = record.date(self.date_source)
+            if date is None:
+                raise LookupError(key)
+            value = {'year': f'{date.year:04d}', 'month': f'{date.month:02d}', 'day': f'{date.day:02d}'}[key]
+        elif key == 'ext':
+            value = record.ext.lstrip('.')
+        elif key == 'camera':
+            value = record.exif().get('model', '')
+        elif key == 'make':
+            value = record.exif().get('make', '')
+        elif key == 'mime':
+            value = record.mime().split('/')[0]
+        else:
+            raise LookupError(key)
+        value = _INVALID_FOLDER_CHARS.sub('_', value).strip(' .')
+        if not value:
+            raise LookupError(key)
+        self[key] = value
+        return value
+
+
+class SortRule:
+    """Скомпилированное правило сортировки."""
+
+    def __init__(
+        self,
+        folder_template: str,
+        conditions: List[_Condition],
+        date_source: str = 'mtime',
+        priority: int = 0
+    ):
+        """Инициализация.
+
+        Args:
+            folder_template: Имя папки или шаблон ({year}, {month}, {day},
+                             {ext}, {camera}, {make}, {mime})
+            conditions: Условия (все должны выполняться)
+            date_source: Источник даты для шаблона
+            priority: Приоритет (больше - раньше)
+        """
+        self.folder_template = folder_template
+        self.conditions = sorted(conditions, key=lambda condition: condition.cost)
+        self.date_source = date_source
+        self.priority = priority
+        self.is_template = '{' in folder_template
+
+    def match(self, record: FileRecord) -> str:
+        """Папка для файла или пустая строка, если правило не подходит."""
+        for condition in self.conditions:
+            if not condition.check(record):
+                return ''
+        if not self.is_template:
+            return self.folder_template
+        try:
+            folder = self.folder_template.format_map(_TemplateFields(record, self.date_source))
+        except (LookupError, ValueError, IndexError):
+            # Нет данных для шаблона (например, у файла нет EXIF) - правило не подходит
+            return ''
+        return os.path.normpath(folder)
+
+
+def compile_rule(filter_data: Dict[str, Any]) -> Optional[SortRule]:
+    """Компиляция фильтра в правило.
+
+    Фильтр задает одно условие (``type``/``value``) или несколько
+    (``conditions``: список ``{'type', 'value'}``, объединенных по И).
+
+    Args:
+        filter_data: Данные фильтра
+
+    Returns:
+        Правило или None, если фильтр выключен или некорректен
+    """
+    if not filter_data.get('enabled', True):
+        return None
+    folder_template = (filter_data.get('folder_name') or '').strip()
+    if not folder_template:
+        return None
+
+    date_source = filter_data.get('date_source', 'mtime')
+    raw_conditions = filter_data.get('conditions') or [
+        {'type': filter_data.get('type', 'extension'), 'value': filter_data.get('value', '')}
+    ]
+    try:
+        conditions = [
+            _compile_condition(raw.get('type', 'extension'), raw.get('value', ''), date_source)
+            for raw in raw_conditions
+        ]
+        # Дата в шаблоне берется из условия date, если оно задано
+        for raw in raw_conditions:
+            if raw.get('type') == 'date' and raw.get('value', '').strip():
+                date_source = raw['value'].strip().lower()
+        priority = int(filter_data.get('priority', 0))
+    except (ValueError, TypeError) as e:
+        logger.warning(f"Фильтр '{folder_template}' пропущен: {e}")
+        return None
+    return SortRule(folder_template, conditions, date_source, priority)
+
+
+class RuleSet:
+    """Набор правил сортировки, проверяемых в порядке приоритета."""
+
+    def __init__(
+        self,
+        filters: Sequence[Dict[str, Any]],
+        exif_reader: Callable[[str], Dict[str, str]] = read_exif
+    ):
+        """Инициализация.
+
+        Args:
+            filters: Список фильтров
+            exif_reader: Функция чтения EXIF
+        """
+        self.exif_reader = exif_reader
+        self.set_rules(compile_rule(filter_data) for filter_data in filters)
+
+    @classmethod
+    def from_rules(
+        cls,
+        rules: Iterable[Optional[SortRule]],
+        exif_reader: Callable[[str], Dict[str, str]] = read_exif
+    ) -> 'RuleSet':
+        """Набор из уже скомпилированных правил (None пропускаются)."""
+        rule_set = cls([], exif_reader)
+        rule_set.set_rules(rules)
+        return rule_set
+
+    def set_rules(self, rules: Iterable[Optional[SortRule]]) -> None:
+        """Замена правил набора."""
+        # Устойчивая сортировка: при равном приоритете сохраняется порядок фильтров
+        self.rules = sorted((rule for rule in rules if rule), key=lambda rule: -rule.priority)
+
+    def record(self, file_path: str) -> FileRecord:
+        """Запись о файле для классификации."""
+        return FileRecord(file_path, self.exif_reader)
+
+    def classify(self, file_path: str) -> str:
+        """Папка назначения для файла.
+
+        Args:
+            file_path: Путь к файлу
+
+        Returns:
+            Относительный путь папки или пустая строка
+        """
+        return self.classify_record(self.record(file_path))
+
+    def classify_record(self, record: FileRecord) -> str:
+        """Папка назначения для записи о файле."""
+        return self.match(record)[1]
+
+    def match(self, record: FileRecord) -> Tuple[Optional[SortRule], str]:
+        """Первое подходящее правило и папка для записи о файле.
+
+        Returns:
+            Tuple[правило или None, относительный путь папки или пустая строка]
+        """
+        for rule in self.rules:
+            folder = rule.match(record)
+            if folder:
+                return rule, folder
+        return None, ''
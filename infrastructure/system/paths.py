@@ -12,6 +12,8 @@ try:
         LOG_FILE,
         SETTINGS_FILE,
         TEMPLATES_FILE,
+        CONVERSION_CACHE_FILE,
+        RENAME_JOURNAL_DIR,
         WINDOWS_MAX_PATH_LENGTH
     )
 except ImportError:
@@ -19,6 +21,8 @@ except ImportError:
     LOG_FILE = "re-file-plus.log"
     SETTINGS_FILE = "re-file-plus_settings.json"
     TEMPLATES_FILE = "re-file-plus_templates.json"
+    CONVERSION_CACHE_FILE = "re-file-plus_conversion_cache.json"
+    RENAME_JOURNAL_DIR = "rename_journal"
     WINDOWS_MAX_PATH_LENGTH = 260
 
 logger = logging.getLogger(__name__)
@@ -145,6 +149,16 @@ def get_templates_file_path() -> str:
     return str(Path(get_data_dir()) / TEMPLATES_FILE)
 
 
+def get_conversion_cache_file_path() -> str:
+    """Получение полного пути к файлу кеша конвертации."""
+    return str(Path(get_data_dir()) / CONVERSION_CACHE_FILE)
+
+
+def get_rename_journal_dir() -> str:
+    """Получение пути к папке журналов пакетного переименования."""
+    return str(Path(get_data_dir()) / RENAME_JOURNAL_DIR)
+
+
 def ensure_directory_exists(path: str) -> bool:
     """Создание директории если не существует.
     
@@ -115,7 +115,7 @@ class StatisticsManager:
             success_count: Количество успешных операций
             error_count: Количество ошибок
             methods_used: Список использованных методов
-            files: Список файлов
+            files: Список файлов (словари или FileBatch)
         """
         self.stats['total_operations'] += 1
         self.stats['total_renamed'] += success_count
@@ -128,7 +128,13 @@ class StatisticsManager:
                     self.stats['methods_used'].get(method, 0) + 1
         
         # Статистика по расширениям
-        if files:
+        if hasattr(files, 'extension_counts'):
+            # Столбцовое хранилище (FileBatch): подсчет без обхода файлов
+            for ext, count in files.extension_counts().items():
+                if ext:
+                    self.stats['files_by_extension'][ext] = \
+                        self.stats['files_by_extension'].get(ext, 0) + count
+        elif files:
             for file_data in files:
                 ext = file_data.get('extension', '').lower()
                 if ext:
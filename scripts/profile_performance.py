@@ -10,6 +10,8 @@ import io
 import os
 import sys
 import tempfile
+import time
+import tracemalloc
 from pathlib import Path
 
 # Добавляем корневую директорию в путь
@@ -27,6 +29,7 @@ from core.re_file_methods import (
 )
 from core.managers.methods_manager import MethodsManager
 from core.services.re_file_service import ReFileService
+from core.domain.file_batch import FileBatch
 from core.domain.file_info import FileInfo
 
 
@@ -184,6 +187,58 @@ def profile_re_file_service():
         print(s.getvalue())
 
 
+def profile_file_info_memory(count: int = 100000):
+    """Память и время построения списка FileInfo (файлы не создаются)."""
+    print(f"\n=== Память FileInfo ({count} файлов) ===")
+    
+    paths = [
+        os.path.join(tempfile.gettempdir(), "photos", f"album_{i % 50:02d}", f"IMG_{i:06d}.jpg")
+        for i in range(count)
+    ]
+    
+    tracemalloc.start()
+    start = time.perf_counter()
+    file_infos = [FileInfo.from_path(p) for p in paths]
+    elapsed = time.perf_counter() - start
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    
+    print(f"Построение списка: {elapsed:.3f} с")
+    print(f"Память на файл: {current / count:.0f} байт (всего {current / 1024 / 1024:.1f} МБ)")
+    
+    start = time.perf_counter()
+    for file_info in file_infos:
+        file_info.path
+    print(f"Первое обращение к path (создание Path): {time.perf_counter() - start:.3f} с")
+
+
+def profile_file_batch_memory(count: int = 1000000):
+    """Память FileBatch и время операций по столбцам."""
+    print(f"\n=== Память FileBatch ({count} файлов) ===")
+    
+    paths = [
+        os.path.join(tempfile.gettempdir(), "photos", f"album_{i % 500:03d}", f"IMG_{i:07d}.jpg")
+        for i in range(count)
+    ]
+    
+    tracemalloc.start()
+    batch = FileBatch()
+    for p in paths:
+        batch.add_path(p)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"Память на файл: {current / count:.0f} байт (всего {current / 1024 / 1024:.0f} МБ)")
+    
+    for title, operation in (
+        ("Проверка конфликтов", batch.find_conflicts),
+        ("Статистика расширений", batch.extension_counts),
+        ("Строки для списка", lambda: sum(1 for _ in batch.iter_rows())),
+    ):
+        start = time.perf_counter()
+        operation()
+        print(f"{title}: {time.perf_counter() - start:.3f} с")
+
+
 def main():
     """Главная функция для запуска профилирования."""
     print("=" * 60)
@@ -196,6 +251,8 @@ def main():
         profile_validate_filename()
         profile_methods_application()
         profile_re_file_service()
+        profile_file_info_memory()
+        profile_file_batch_memory()
         
         print("\n" + "=" * 60)
         print("Профилирование завершено!")
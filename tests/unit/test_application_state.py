@@ -115,3 +115,56 @@ class TestApplicationState:
         
         assert result == file_info
 
+    
+    def test_undo_redo_restores_changes(self, temp_file):
+        """Тест: отмена и повтор изменения имен."""
+        state = ApplicationState()
+        for i in range(5):
+            state.add_file(FileInfo.from_path(temp_file(f"file{i}.txt")))
+        snapshot = state.snapshot_files()
+        state.files[1].new_name = "renamed"
+        state.files[3].set_error("Конфликт имен")
+        
+        assert state.push_undo(snapshot) is True
+        assert len(state.undo_stack[0]) == 2
+        
+        assert state.undo() is True
+        assert state.files[1].new_name == "file1"
+        assert state.files[3].status == FileStatus.READY
+        assert state.files[3].error_message is None
+        
+        assert state.redo() is True
+        assert state.files[1].new_name == "renamed"
+        assert state.files[3].error_message == "Конфликт имен"
+        assert state.redo() is False
+    
+    def test_push_undo_without_changes(self, temp_file):
+        """Тест: изменение без отличий не попадает в стек."""
+        state = ApplicationState()
+        state.add_file(FileInfo.from_path(temp_file("test.txt")))
+        
+        assert state.push_undo(state.snapshot_files()) is False
+        assert state.undo_stack == []
+    
+    def test_undo_stack_evicted_by_memory(self, temp_file, monkeypatch):
+        """Тест: старые записи вытесняются по объему памяти."""
+        from core.domain import application_state
+        state = ApplicationState()
+        for i in range(20):
+            state.add_file(FileInfo.from_path(temp_file(f"file{i}.txt")))
+        
+        for step in range(10):
+            snapshot = state.snapshot_files()
+            for f in state.files:
+                f.new_name = f"{f.old_name}_{step}"
+            state.push_undo(snapshot)
+        entry_size = state.undo_stack[-1].nbytes
+        monkeypatch.setattr(application_state, 'UNDO_MEMORY_BUDGET', entry_size * 3)
+        snapshot = state.snapshot_files()
+        state.files[0].new_name = "last"
+        state.push_undo(snapshot)
+        
+        assert len(state.undo_stack) == 3
+        assert state.undo_memory() <= entry_size * 3
+        assert state.undo() is True
+        assert state.files[0].new_name == "file0_9"
@@ -0,0 +1,119 @@
+"""Тесты для форматов архивов и сравнения форматов."""
+
+import os
+import tarfile
+
+import pytest
+
+from core.archive import backends
+from core.archive.backends import TarGzBackend, TarXzBackend, create_backend, resolve_preset
+from core.archive.benchmark import run_benchmark, sample_entries
+from core.archive.scanner import iter_entries
+
+
+def _tree(tmp_path):
+    (tmp_path / "src" / "вложенная").mkdir(parents=True)
+    (tmp_path / "src" / "a.txt").write_bytes(b"line\n" * 60000)
+    (tmp_path / "src" / "вложенная" / "b.bin").write_bytes(os.urandom(200000))
+    return str(tmp_path / "src")
+
+
+class TestTarBackends:
+    """Тесты tar архивов с блочным сжатием."""
+
+    @pytest.mark.parametrize("backend_class", [TarGzBackend, TarXzBackend])
+    def test_multi_block_archive_readable(self, tmp_path, backend_class):
+        src = _tree(tmp_path)
+        output = str(tmp_path / f"out{backend_class.extension}")
+        results = []
+        progress = []
+        backend = backend_class(6, workers=3)
+        # Маленький блок: архив состоит из многих независимо сжатых частей
+        backend.block_size = 64 * 1024
+
+        completed = backend.archive(
+            iter_entries([src]), output, lambda entry, error: results.append(error), bytes_callback=progress.append
+        )
+
+        assert completed
+        assert results == [None, None]
+        assert progress[-1] == 300000 + 200000
+        with tarfile.open(output) as tar:
+            assert tar.getnames() == ["src/a.txt", "src/вложенная/b.bin"]
+            assert tar.extractfile("src/a.txt").read() == b"line\n" * 60000
+
+    def test_cancel_removes_partial_archive(self, tmp_path):
+        src = _tree(tmp_path)
+
+        completed = TarGzBackend(6, workers=2).archive(
+            iter_entries([src]), str(tmp_path / "out.tar.gz"), cancel_check=lambda: True
+        )
+
+        assert not completed
+        assert os.listdir(tmp_path) == ["src"]
+
+    def test_archive_mode_follows_umask(self, tmp_path):
+        src = _tree(tmp_path)
+        output = tmp_path / "out.tar.gz"
+        umask = os.umask(0o027)
+        try:
+            TarGzBackend(6, workers=2).archive(iter_entries([src]), str(output))
+        finally:
+            os.umask(umask)
+
+        assert output.stat().st_mode & 0o777 == 0o640
+
+    def test_volumes_not_supported(self, tmp_path):
+        with pytest.raises(ValueError):
+            TarGzBackend().archive([], str(tmp_path / "out.tar.gz"), volume_size=10 ** 6)
+
+    def test_base_backends_abstract(self):
+        with pytest.raises(TypeError):
+            backends.ArchiveBackend()
+        with pytest.raises(TypeError):
+            backends.TarBackend()
+
+
+class TestBackendSelection:
+    """Тесты выбора формата и пресетов."""
+
+    def test_unavailable_backend(self, monkeypatch):
+        monkeypatch.setattr(backends, 'zstandard', None)
+
+        assert 'tar.zst' not in backends.available_backends()
+        with pytest.raises(ValueError):
+            create_backend('tar.zst')
+        with pytest.raises(ValueError):
+            create_backend('rar')
+
+    def test_preset_falls_back(self, monkeypatch):
+        monkeypatch.setattr(backends, 'zstandard', None)
+        monkeypatch.setattr(backends, 'ARCHIVE_PRESETS', {"Быстро": [("tar.zst", 1), ("tar.gz", 1)]})
+
+        assert resolve_preset("Быстро") == ("tar.gz", 1)
+        with pytest.raises(ValueError):
+            resolve_preset("Нет такого")
+
+
+class TestBenchmark:
+    """Тесты сравнения форматов."""
+
+    def test_sample_limited(self, tmp_path):
+        for i in range(20):
+            (tmp_path / f"{i:02d}.txt").write_bytes(b"x" * 1000)
+        (tmp_path / "big.bin").write_bytes(b"x" * 50000)
+
+        sample = sample_entries([str(tmp_path)], max_files=5, max_bytes=10000)
+
+        assert len(sample) == 5
+        assert all(entry.size == 1000 for entry in sample)
+        assert sample == sorted(sample, key=lambda entry: entry.arcname)
+
+    def test_results_per_candidate(self, tmp_path):
+        sample = sample_entries([_tree(tmp_path)])
+
+        results = run_benchmark(sample, [("zip", 1), ("tar.xz", 6), ("rar", 5)], workers=2)
+
+        assert [(result.backend, result.level) for result in results] == [("zip", 1), ("tar.xz", 6)]
+        assert all(result.error is None and 0 < result.ratio < 1 for result in results)
+        assert results[1].output_size < results[0].output_size
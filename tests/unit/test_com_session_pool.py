@@ -0,0 +1,241 @@
+"""Тесты для пула COM сессий."""
+
+import threading
+
+import pytest
+
+from core.converter import document_converter
+from core.converter.com_session_pool import ComAppFactory, ComSessionPool
+from core.converter.com_utils import convert_docx_with_word_com
+
+
+class _FakeApp:
+    def __init__(self, number):
+        self.number = number
+        self.alive = True
+        self.quit_called = False
+
+
+class _FakeFactory(ComAppFactory):
+    """Фабрика без COM: считает создания и закрытия."""
+
+    def __init__(self, fail_create=False):
+        self.created = []
+        self.initialized = 0
+        self.uninitialized = 0
+        self.fail_create = fail_create
+
+    def initialize_thread(self):
+        self.initialized += 1
+
+    def uninitialize_thread(self):
+        self.uninitialized += 1
+
+    def create(self, prog_id):
+        if self.fail_create:
+            raise RuntimeError("Word не установлен")
+        app = _FakeApp(len(self.created))
+        self.created.append(app)
+        return app
+
+    def is_alive(self, app):
+        return app.alive
+
+    def quit(self, app):
+        app.quit_called = True
+
+
+class TestComSessionPool:
+    """Тесты переиспользования и пересоздания сессий."""
+
+    def test_app_reused_within_thread(self):
+        factory = _FakeFactory()
+        pool = ComSessionPool('Word.Application', factory, max_documents=10)
+
+        apps = []
+        for _ in range(3):
+            with pool.session() as session:
+                apps.append(session.app)
+
+        assert len(factory.created) == 1
+        assert apps[0] is apps[1] is apps[2]
+        assert factory.initialized == 1
+
+    def test_recycled_after_max_documents(self):
+        factory = _FakeFactory()
+        pool = ComSessionPool('Word.Application', factory, max_documents=2)
+
+        for _ in range(5):
+            with pool.session():
+                pass
+
+        assert len(factory.created) == 3
+        assert factory.created[0].quit_called and factory.created[1].quit_called
+        assert pool.stats()['recycled'] == 2
+
+    def test_recycled_after_failure(self):
+        factory = _FakeFactory()
+        pool = ComSessionPool('Word.Application', factory)
+
+        with pool.session() as session:
+            session.mark_failed()
+        with pytest.raises(OSError):
+            with pool.session():
+                raise OSError("RPC сервер недоступен")
+        with pool.session():
+            pass
+
+        assert len(factory.created) == 3
+
+    def test_dead_app_replaced(self):
+        factory = _FakeFactory()
+        pool = ComSessionPool('Word.Application', factory)
+        with pool.session() as session:
+            session.app.alive = False
+
+        with pool.session() as session:
+            assert session.app is factory.created[1]
+
+    def test_one_app_per_thread(self):
+        factory = _FakeFactory()
+        pool = ComSessionPool('Word.Application', factory)
+        seen = {}
+
+        def work(name):
+            for _ in range(3):
+                with pool.session() as session:
+                    seen.setdefault(name, set()).add(id(session.app))
+            pool.release_thread()
+
+        threads = [threading.Thread(target=work, args=(i,)) for i in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(factory.created) == 2
+        assert all(len(ids) == 1 for ids in seen.values())
+        assert all(app.quit_called for app in factory.created)
+        assert factory.uninitialized == 2
+        assert pool.stats()['active'] == 0
+
+    def test_shutdown_does_not_close_other_threads_sessions(self):
+        factory = _FakeFactory()
+        pool = ComSessionPool('Word.Application', factory)
+        created = threading.Event()
+        done = threading.Event()
+
+        def work():
+            with pool.session():
+                pass
+            created.set()
+            done.wait(5)
+
+        thread = threading.Thread(target=work)
+        thread.start()
+        assert created.wait(5)
+        with pool.session():
+            pass
+
+        pool.shutdown()
+        done.set()
+        thread.join()
+
+        # Закрыта только сессия вызывающего потока, учет очищен
+        assert [app.quit_called for app in factory.created] == [False, True]
+        assert pool.stats()['active'] == 0
+
+    def test_factory_requires_create(self):
+        class _Incomplete(ComAppFactory):
+            pass
+
+        with pytest.raises(TypeError):
+            _Incomplete()
+
+    def test_create_failure_propagates(self):
+        pool = ComSessionPool('Word.Application', _FakeFactory(fail_create=True))
+        with pytest.raises(RuntimeError):
+            with pool.session():
+                pass
+
+
+class TestWordConversionWithPool:
+    """Тесты конвертации через Word с подставным пулом."""
+
+    def test_failed_conversion_recycles_word(self, tmp_path):
+        factory = _FakeFactory()
+        pool = ComSessionPool('Word.Application', factory)
+
+        success, _, _ = convert_docx_with_word_com(
+            str(tmp_path / "a.docx"), str(tmp_path / "a.pdf"), 17, session_pool=pool
+        )
+
+        # У подставного приложения нет Documents - конвертация не удалась
+        assert not success
+        assert factory.created[0].quit_called
+
+    def test_create_error_returned_as_message(self, tmp_path):
+        pool = ComSessionPool('Word.Application', _FakeFactory(fail_create=True))
+
+        success, message, path = convert_docx_with_word_com(
+            str(tmp_path / "a.docx"), str(tmp_path / "a.pdf"), 17, session_pool=pool
+        )
+
+        assert not success
+        assert message == "Word не установлен"
+        assert path is None
+
+
+class _FakeDocument:
+    def __init__(self, app):
+        self.app = app
+
+    def SaveAs(self, FileName, FileFormat):
+        with open(FileName, 'wb') as f:
+            f.write(b'docx')
+
+
+class _FakeDocuments:
+    def __init__(self, app):
+        self.app = app
+
+    def Open(self, FileName, **kwargs):
+        self.app.opened.append(FileName)
+        return _FakeDocument(self.app)
+
+
+class _WordFactory(_FakeFactory):
+    """Фабрика с подставным Word, умеющим открывать и сохранять документы."""
+
+    def create(self, prog_id):
+        app = super().create(prog_id)
+        app.opened = []
+        app.Documents = _FakeDocuments(app)
+        return app
+
+
+class TestPdfToDocxWithPool:
+    """Тесты конвертации PDF в DOCX через пул сессий Word."""
+
+    def test_word_reused_for_batch(self, tmp_path, monkeypatch):
+        factory = _WordFactory()
+        pool = ComSessionPool('Word.Application', factory)
+        monkeypatch.setattr(document_converter.sys, 'platform', 'win32')
+        monkeypatch.setattr(
+            'core.converter.com_session_pool.get_com_session_pool', lambda prog_id: pool
+        )
+        closed = []
+
+        results = [
+            document_converter.convert_pdf_to_docx(
+                str(tmp_path / f"{i}.pdf"), str(tmp_path / f"{i}.docx"),
+                object(), None, None, closed.append, None
+            )
+            for i in range(3)
+        ]
+
+        assert [success for success, _, _ in results] == [True, True, True]
+        assert len(factory.created) == 1
+        assert len(factory.created[0].opened) == 3
+        assert len(closed) == 3
+        assert not factory.created[0].quit_called
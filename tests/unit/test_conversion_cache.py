@@ -0,0 +1,110 @@
+"""Тесты для кеша результатов конвертации."""
+
+import os
+from unittest.mock import patch
+
+from core.converter.conversion_cache import (
+    FINGERPRINT_CONTENT,
+    LINK_COPY,
+    ConversionCache,
+)
+from core.file_converter import FileConverter
+
+
+def _write(path, content):
+    path.write_bytes(content)
+    return str(path)
+
+
+class TestConversionCache:
+    """Тесты для класса ConversionCache."""
+
+    def test_hit_after_store(self, tmp_path):
+        source = _write(tmp_path / "a.png", b"image")
+        output = _write(tmp_path / "a.jpg", b"converted")
+        cache = ConversionCache()
+
+        assert cache.lookup(source, '.jpg', 95, 'image', output) is None
+        cache.store(source, '.jpg', 95, 'image', output)
+
+        assert cache.lookup(source, '.jpg', 95, 'image', output) == output
+        assert cache.lookup(source, '.jpg', 80, 'image', output) is None
+        assert cache.stats()['hits'] == 1
+
+    def test_modified_output_is_miss(self, tmp_path):
+        source = _write(tmp_path / "a.png", b"image")
+        output = _write(tmp_path / "a.jpg", b"converted")
+        cache = ConversionCache()
+        cache.store(source, '.jpg', 95, 'image', output)
+
+        _write(tmp_path / "a.jpg", b"changed by user")
+
+        assert cache.lookup(source, '.jpg', 95, 'image', output) is None
+
+    def test_modified_source_is_miss(self, tmp_path):
+        source = _write(tmp_path / "a.png", b"image")
+        output = _write(tmp_path / "a.jpg", b"converted")
+        cache = ConversionCache()
+        cache.store(source, '.jpg', 95, 'image', output)
+
+        _write(tmp_path / "a.png", b"new image content")
+
+        assert cache.lookup(source, '.jpg', 95, 'image', output) is None
+
+    def test_duplicate_source_reuses_output(self, tmp_path):
+        first = _write(tmp_path / "first.png", b"same")
+        second = _write(tmp_path / "second.png", b"same")
+        output = _write(tmp_path / "first.jpg", b"converted")
+        cache = ConversionCache(fingerprint_mode=FINGERPRINT_CONTENT, link_mode=LINK_COPY)
+        cache.store(first, '.jpg', 95, 'image', output)
+
+        second_output = str(tmp_path / "second.jpg")
+        assert cache.lookup(second, '.jpg', 95, 'image', second_output) == second_output
+        with open(second_output, 'rb') as f:
+            assert f.read() == b"converted"
+        # Повторный запуск - результат второго файла тоже в кеше
+        assert cache.lookup(second, '.jpg', 95, 'image', second_output) == second_output
+
+    def test_persistence(self, tmp_path):
+        source = _write(tmp_path / "a.png", b"image")
+        output = _write(tmp_path / "a.jpg", b"converted")
+        cache_file = str(tmp_path / "cache.json")
+        cache = ConversionCache(cache_file)
+        cache.store(source, '.jpg', 95, 'image', output)
+        assert cache.save()
+
+        reloaded = ConversionCache(cache_file)
+        assert reloaded.lookup(source, '.jpg', 95, 'image', output) == output
+
+    def test_max_entries(self, tmp_path):
+        cache = ConversionCache(max_entries=2)
+        for i in range(3):
+            source = _write(tmp_path / f"{i}.png", b"x")
+            output = _write(tmp_path / f"{i}.jpg", b"y")
+            cache.store(source, '.jpg', 95, 'image', output)
+        assert len(cache.entries) == 2
+
+
+class TestFileConverterCache:
+    """Тесты использования кеша в FileConverter.convert."""
+
+    def test_second_convert_skipped(self, tmp_path):
+        source = _write(tmp_path / "a.png", b"image")
+        output = str(tmp_path / "a.jpg")
+        converter = FileConverter()
+        converter.conversion_cache = ConversionCache()
+
+        def fake_convert(file_path, source_ext, target_ext, output_path, quality):
+            with open(output_path, 'wb') as f:
+                f.write(b"converted")
+            return True, "ok", output_path
+
+        with patch.object(converter, 'can_convert', return_value=True), \
+                patch.object(converter, '_convert_file', side_effect=fake_convert) as mock_convert:
+            assert converter.convert(source, '.jpg', output)[0]
+            success, message, path = converter.convert(source, '.jpg', output)
+
+        assert success
+        assert path == output
+        assert mock_convert.call_count == 1
+        assert os.path.exists(output)
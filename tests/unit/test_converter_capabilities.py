@@ -0,0 +1,93 @@
+"""Тесты для реестра возможностей конвертера."""
+
+import json
+from unittest.mock import patch
+
+from core.converter.capabilities import BackendInfo, ConverterCapabilities
+from core.file_converter import FileConverter
+
+
+def _backends(*available):
+    """Создание набора бэкендов, где доступны только указанные."""
+    names = ['pillow', 'pymupdf', 'pdf2docx', 'docx2pdf', 'python-docx',
+             'win32com', 'comtypes', 'word', 'ffmpeg', 'libreoffice']
+    return {name: BackendInfo(name, name in available) for name in names}
+
+
+class TestConverterCapabilities:
+    """Тесты для класса ConverterCapabilities."""
+
+    def _make(self, *available):
+        converter = FileConverter()
+        capabilities = converter.capabilities
+        with patch.object(capabilities, '_probe_backends', return_value=_backends(*available)):
+            capabilities.probe()
+        return converter, capabilities
+
+    def test_image_pairs_require_pillow(self):
+        """Тест: пары изображений доступны только с Pillow."""
+        _, capabilities = self._make()
+        assert not capabilities.supports('.png', '.jpg')
+
+        _, capabilities = self._make('pillow')
+        assert capabilities.supports('.png', '.jpg')
+        assert not capabilities.supports('.png', '.png')
+        assert not capabilities.supports('.png', '.pdf')
+
+        _, capabilities = self._make('pillow', 'pymupdf')
+        assert capabilities.supports('.png', '.pdf')
+
+    def test_document_pairs(self):
+        """Тест: пары документов зависят от бэкендов."""
+        _, capabilities = self._make('pdf2docx', 'docx2pdf')
+        assert capabilities.supports('.pdf', '.docx')
+        assert capabilities.supports('.docx', '.pdf')
+        assert not capabilities.supports('.doc', '.pdf')
+        # ODT без Word: только fallback форматы
+        assert capabilities.supports('.odt', '.txt')
+        assert not capabilities.supports('.odt', '.pdf')
+
+    def test_audio_video_require_ffmpeg(self):
+        """Тест: аудио/видео пары зависят от ffmpeg."""
+        _, capabilities = self._make()
+        assert not capabilities.supports('.mp3', '.wav')
+
+        _, capabilities = self._make('ffmpeg')
+        assert capabilities.supports('.mp3', '.wav')
+        assert capabilities.supports('.mkv', '.mp4')
+
+    def test_can_convert_is_table_lookup(self, tmp_path):
+        """Тест: can_convert не обращается к диску и не запускает процессы."""
+        converter, _ = self._make('ffmpeg')
+        with patch('subprocess.run') as mock_run, patch('os.path.exists') as mock_exists:
+            for _ in range(100):
+                assert converter.can_convert(str(tmp_path / "song.mp3"), '.ogg')
+            mock_run.assert_not_called()
+            mock_exists.assert_not_called()
+
+    def test_probe_once_on_first_lookup(self):
+        """Тест: проверка бэкендов выполняется один раз."""
+        capabilities = FileConverter().capabilities
+        with patch.object(capabilities, '_probe_backends', return_value=_backends('pillow')) as mock_probe:
+            capabilities.supports('.png', '.gif')
+            capabilities.supports('.gif', '.png')
+            capabilities.targets_for('.webp')
+            assert mock_probe.call_count == 1
+
+    def test_refresh_async(self):
+        """Тест: фоновая проверка заполняет реестр."""
+        capabilities = FileConverter().capabilities
+        with patch.object(capabilities, '_probe_backends', return_value=_backends('pillow')):
+            capabilities.refresh_async().join(timeout=5)
+        assert capabilities.is_probed
+        assert capabilities.is_available('pillow')
+
+    def test_dump(self, tmp_path):
+        """Тест: снимок реестра сериализуется в JSON."""
+        _, capabilities = self._make('pillow')
+        dump_path = tmp_path / "capabilities.json"
+        capabilities.dump_json(str(dump_path))
+
+        data = json.loads(dump_path.read_text(encoding='utf-8'))
+        assert data['backends']['pillow']['available'] is True
+        assert '.jpg' in data['pairs']['.png']
@@ -0,0 +1,115 @@
+"""Тесты для столбцового хранилища файлов."""
+
+from pathlib import Path
+
+import pytest
+
+from core.domain.application_state import ApplicationState
+from core.domain.file_batch import FileBatch, FileRecord
+from core.domain.file_info import FileInfo, FileStatus
+from core.re_file_methods import check_conflicts
+from infrastructure.system.statistics import StatisticsManager
+
+
+def _batch(*paths):
+    return FileBatch(FileInfo.from_path(path) for path in paths)
+
+
+class TestFileBatchColumns:
+    """Тесты хранения по столбцам."""
+
+    def test_views_match_file_info(self):
+        original = FileInfo("/data/a.txt", "a", "b", ".txt", metadata={'size': 3}, error_message=None)
+        batch = FileBatch([original])
+
+        view = batch[0]
+
+        assert isinstance(view, FileRecord)
+        assert view == original
+        assert view.path == Path("/data/a.txt")
+        assert view.new_path == Path("/data/b.txt")
+        assert view.is_renamed()
+        assert list(batch.sizes) == [3]
+
+    def test_view_writes_to_columns(self):
+        batch = _batch("/data/a.txt", "/data/b.txt")
+
+        view = batch[1]
+        view.new_name = "c"
+        view.set_error("ошибка")
+        view.metadata['is_folder'] = False
+
+        assert batch.new_names == ["a", "c"]
+        assert batch.status(1) == FileStatus.ERROR
+        assert batch[1].error_message == "ошибка"
+        assert batch[1].metadata == {'is_folder': False}
+
+    def test_rename_through_view(self):
+        batch = _batch("/data/a.txt")
+
+        view = batch[0]
+        view.path = Path("/data/c.txt")
+        view.full_path = "/data/c.txt"
+        view.old_name = "c"
+
+        assert batch.path_str(0) == "/data/c.txt"
+        assert batch.find_full_path("/data/c.txt") == 0
+        assert batch.find_full_path("/data/a.txt") == -1
+        assert batch._names == {} and batch._full_paths == {}
+
+    def test_directories_shared(self):
+        batch = FileBatch()
+        for i in range(100):
+            batch.add_path(f"/data/photos/{i}.jpg")
+
+        assert len(batch._dirs) == 1
+        assert batch.find_path("/data/photos/42.jpg") == 42
+
+
+class TestFileBatchSequence:
+    """Тесты интерфейса списка."""
+
+    def test_list_operations(self):
+        batch = _batch("/a/1.txt", "/a/2.txt", "/a/3.txt")
+        batch[1].set_error("ошибка")
+
+        batch.remove(FileInfo.from_path("/a/1.txt"))
+        batch.insert(0, FileInfo.from_path("/a/0.txt"))
+
+        assert [f.full_path for f in batch] == ["/a/0.txt", "/a/2.txt", "/a/3.txt"]
+        assert batch[1].error_message == "ошибка"
+        assert batch[-1].old_name == "3"
+        assert batch != _batch("/a/0.txt", "/a/2.txt", "/a/3.txt")
+        batch[1].set_ready()
+        assert batch == _batch("/a/0.txt", "/a/2.txt", "/a/3.txt")
+        with pytest.raises(TypeError):
+            batch.append({'full_path': "/a/4.txt"})
+
+    def test_application_state_uses_batch(self, temp_file):
+        state = ApplicationState()
+        path = temp_file("test.txt")
+
+        assert state.add_file(FileInfo.from_path(path)) is True
+        assert state.add_file(FileInfo.from_path(path)) is False
+        assert isinstance(state.files, FileBatch)
+        assert state.get_file_by_path(path).full_path == path
+
+
+class TestFileBatchConsumers:
+    """Тесты операций по столбцам."""
+
+    def test_conflicts(self):
+        batch = _batch("/a/x.txt", "/b/y.txt", "/c/z.txt")
+        batch[1].new_name = "x"
+
+        check_conflicts(batch)
+
+        assert [batch.status(i) for i in range(3)] == [FileStatus.ERROR, FileStatus.ERROR, FileStatus.READY]
+        assert batch[0].error_message == "Конфликт: 2 файла с именем 'x.txt'"
+
+    def test_statistics(self, tmp_path):
+        manager = StatisticsManager(str(tmp_path / "stats.json"))
+
+        manager.record_operation('rename', 3, 0, files=_batch("/a/1.TXT", "/a/2.txt", "/a/3.md"))
+
+        assert manager.stats['files_by_extension'] == {'.txt': 2, '.md': 1}
@@ -72,3 +72,35 @@ class TestFileConverter:
         assert pdf_path == expected_pdf
     
 
+    def test_backends_not_imported_on_init(self):
+        """Тест: библиотеки конвертации не загружаются при создании."""
+        converter = FileConverter()
+        
+        assert converter.backends.loaded_names() == []
+    
+    def test_backend_loaded_once_with_timing(self):
+        """Тест: бэкенд загружается при первом обращении и один раз."""
+        converter = FileConverter()
+        fake_image = object()
+        loader = Mock(return_value=fake_image)
+        converter.backends.register('pillow', loader)
+        
+        assert converter.Image is fake_image
+        assert converter.Image is fake_image
+        assert loader.call_count == 1
+        assert 'pillow' in converter.backends.import_times
+        assert converter.backends.dump()['pillow']['available'] is True
+    
+    def test_backend_import_failure_updates_capabilities(self):
+        """Тест: ошибка импорта убирает пары форматов бэкенда."""
+        from core.converter.capabilities import BackendInfo
+        
+        converter = FileConverter()
+        backends = {name: BackendInfo(name, True) for name in ('pillow', 'pymupdf', 'word', 'ffmpeg', 'libreoffice')}
+        with patch.object(converter.capabilities, '_probe_backends', return_value=backends):
+            converter.capabilities.probe()
+        assert converter.can_convert("image.png", '.jpg')
+        
+        converter.backends.register('pillow', Mock(side_effect=ImportError("broken")))
+        assert converter.Image is None
+        assert not converter.can_convert("image.png", '.jpg')
@@ -0,0 +1,51 @@
+"""Тесты для компактных изменений списка файлов."""
+
+from pathlib import Path
+
+from core.domain.file_delta import FileDelta, FileSnapshot
+from core.domain.file_info import FileInfo, FileStatus
+
+
+def _files(count):
+    return [FileInfo(Path(f"/tmp/f{i}.txt"), f"f{i}", f"f{i}", ".txt") for i in range(count)]
+
+
+class TestFileDelta:
+    """Тесты записи изменений."""
+
+    def test_only_changed_files_stored(self):
+        files = _files(1000)
+        before = FileSnapshot(files)
+        files[10].new_name = "a"
+        files[500].extension = ".md"
+        files[999].status = FileStatus.CONFLICT
+
+        delta = FileDelta.between(before, files)
+
+        assert list(delta.indices) == [10, 500, 999]
+        assert delta.new_extensions[1] == ".md"
+
+    def test_revert_and_apply(self):
+        files = _files(3)
+        before = FileSnapshot(files)
+        files[2].new_name = "new"
+        files[2].set_error("ошибка")
+        delta = FileDelta.between(before, files)
+
+        delta.revert(files)
+        assert (files[2].new_name, files[2].status, files[2].error_message) == ("f2", FileStatus.READY, None)
+
+        delta.apply(files)
+        assert (files[2].new_name, files[2].status, files[2].error_message) == ("new", FileStatus.ERROR, "ошибка")
+
+    def test_size_grows_with_changes(self):
+        files = _files(100)
+        before = FileSnapshot(files)
+        files[0].new_name = "x"
+        small = FileDelta.between(before, files)
+        for f in files:
+            f.new_name = f.new_name + "_renamed"
+        large = FileDelta.between(before, files)
+
+        assert len(FileDelta.between(before, _files(100))) == 0
+        assert large.nbytes > small.nbytes * 10
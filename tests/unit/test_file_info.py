@@ -145,6 +145,48 @@ class TestFileInfo:
         assert file_info.new_full_name == "newtest.txt"
 
 
+class TestFileInfoCompact:
+    """Тесты компактного представления FileInfo."""
+    
+    def test_slots_and_lazy_fields(self):
+        """Тест: нет __dict__, Path и метаданные создаются по требованию."""
+        file_info = FileInfo.from_path("/data/photos/IMG_0001.jpg")
+        
+        assert not hasattr(file_info, '__dict__')
+        assert file_info._path is None
+        assert file_info._metadata is None
+        assert file_info._full_path is None
+        assert file_info.path == Path("/data/photos/IMG_0001.jpg")
+        file_info.metadata['is_folder'] = False
+        assert file_info.metadata == {'is_folder': False}
+    
+    def test_directory_interned(self):
+        """Тест: файлы одной папки разделяют строку папки."""
+        first = FileInfo.from_path("/data/" + "photos" + "/a.jpg")
+        second = FileInfo.from_path("/data/photo" + "s/b.jpg")
+        
+        assert first._directory is second._directory
+        assert first.extension is second.extension
+    
+    def test_path_change_keeps_full_path(self):
+        """Тест: смена path не меняет full_path (как у поля dataclass)."""
+        file_info = FileInfo.from_path("/data/a.txt")
+        
+        file_info.path = Path("/data/b.txt")
+        
+        assert file_info.path == Path("/data/b.txt")
+        assert file_info.full_path == "/data/a.txt"
+    
+    def test_equality(self):
+        """Тест: сравнение по значениям полей."""
+        first = FileInfo(Path("/data/a.txt"), "a", "b", ".txt")
+        second = FileInfo("/data/a.txt", "a", "b", ".txt", metadata={})
+        
+        assert first == second
+        second.new_name = "c"
+        assert first != second
+
+
 class TestFileStatus:
     """Тесты для класса FileStatus."""
     
@@ -0,0 +1,98 @@
+"""Тесты для перемещения файлов между устройствами."""
+
+import errno
+import os
+
+import pytest
+
+from core.file_mover import FileMover, MoveCancelled, MoveOptions
+
+
+def _cross_device_rename(src, dst):
+    raise OSError(errno.EXDEV, "Invalid cross-device link")
+
+
+def _make(path, size):
+    data = os.urandom(size)
+    path.write_bytes(data)
+    return str(path), data
+
+
+class TestFileMover:
+    """Тесты копирования с проверкой."""
+
+    def test_same_device_uses_rename(self, tmp_path):
+        source, data = _make(tmp_path / "a.bin", 100)
+        destination = str(tmp_path / "b.bin")
+
+        FileMover().move(source, destination)
+
+        assert not os.path.exists(source)
+        assert (tmp_path / "b.bin").read_bytes() == data
+
+    def test_cross_device_chunked_progress(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(os, 'rename', _cross_device_rename)
+        source, data = _make(tmp_path / "big.bin", 300 * 1024)
+        destination = str(tmp_path / "out" / "big.bin")
+        (tmp_path / "out").mkdir()
+        os.utime(source, (1_000_000, 1_000_000))
+        progress = []
+
+        mover = FileMover(MoveOptions(chunk_size=64 * 1024, verify_hash=True))
+        mover.move(source, destination, lambda path, copied, total: progress.append((copied, total)))
+
+        assert (tmp_path / "out" / "big.bin").read_bytes() == data
+        assert not os.path.exists(source)
+        assert progress[-1] == (len(data), len(data))
+        assert len(progress) == 5
+        assert os.path.getmtime(destination) == 1_000_000
+        assert os.listdir(tmp_path / "out") == ["big.bin"]
+
+    def test_buffered_fallback(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(os, 'rename', _cross_device_rename)
+
+        def unsupported(*args):
+            raise OSError(errno.ENOSYS, "Function not implemented")
+
+        monkeypatch.setattr(FileMover, '_kernel_copy_chunk', staticmethod(unsupported))
+        source, data = _make(tmp_path / "a.bin", 200 * 1024)
+        destination = str(tmp_path / "b.bin")
+
+        FileMover(MoveOptions(chunk_size=64 * 1024)).move(source, destination)
+
+        assert (tmp_path / "b.bin").read_bytes() == data
+
+    def test_failed_verification_keeps_source(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(os, 'rename', _cross_device_rename)
+        source, data = _make(tmp_path / "a.bin", 1000)
+        destination = str(tmp_path / "b.bin")
+        mover = FileMover(MoveOptions(verify_hash=True))
+        monkeypatch.setattr(mover, 'file_hash', lambda path: path)
+
+        with pytest.raises(OSError):
+            mover.move(source, destination)
+
+        assert (tmp_path / "a.bin").read_bytes() == data
+        assert os.listdir(tmp_path) == ["a.bin"]
+
+    def test_cancel_keeps_source(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(os, 'rename', _cross_device_rename)
+        source, _ = _make(tmp_path / "a.bin", 1000)
+
+        with pytest.raises(MoveCancelled):
+            FileMover().move(source, str(tmp_path / "b.bin"), cancel_check=lambda: True)
+
+        assert os.listdir(tmp_path) == ["a.bin"]
+
+    def test_move_many_concurrent(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(os, 'rename', _cross_device_rename)
+        (tmp_path / "out").mkdir()
+        moves = [(_make(tmp_path / f"{i}.bin", 5000)[0], str(tmp_path / "out" / f"{i}.bin")) for i in range(8)]
+        moves.append((str(tmp_path / "missing.bin"), str(tmp_path / "out" / "missing.bin")))
+
+        results = list(FileMover(MoveOptions(workers=3)).move_many(moves))
+
+        errors = {source: error for source, _, error in results}
+        assert len(results) == 9
+        assert isinstance(errors[str(tmp_path / "missing.bin")], FileNotFoundError)
+        assert sorted(os.listdir(tmp_path / "out")) == sorted(f"{i}.bin" for i in range(8))
@@ -0,0 +1,72 @@
+"""Тесты для журнала истории операций."""
+
+import json
+
+from core.managers import history_manager
+from core.managers.history_manager import HistoryManager
+
+
+def _files(count):
+    return [{'old': f"/tmp/{i}.txt", 'new': f"/tmp/файл_{i}.txt"} for i in range(count)]
+
+
+class TestHistoryJournal:
+    """Тесты записи и чтения журнала."""
+
+    def test_all_files_saved_and_paged(self, tmp_path):
+        manager = HistoryManager(str(tmp_path / "history.json"))
+
+        operation_id = manager.add_operation('rename', _files(2500), 2500, 0)
+
+        reloaded = HistoryManager(str(tmp_path / "history.json"))
+        summary = reloaded.get_history()[0]
+        assert summary['id'] == operation_id and summary['files_count'] == 2500
+        assert 'files' not in summary
+        page = reloaded.get_operation_files(operation_id, offset=1995, limit=10)
+        assert [f['old'] for f in page] == [f"/tmp/{i}.txt" for i in range(1995, 2005)]
+        assert len(list(reloaded.iter_operation_files(operation_id))) == 2500
+
+    def test_append_only(self, tmp_path):
+        manager = HistoryManager(str(tmp_path / "history.json"))
+        manager.add_operation('rename', _files(3), 3, 0)
+        before = (tmp_path / "history.jsonl").read_bytes()
+
+        manager.add_operation('undo', _files(1), 1, 0)
+
+        assert (tmp_path / "history.jsonl").read_bytes().startswith(before)
+
+    def test_torn_tail_discarded(self, tmp_path):
+        manager = HistoryManager(str(tmp_path / "history.json"))
+        manager.add_operation('rename', _files(3), 3, 0)
+        with open(tmp_path / "history.jsonl", 'ab') as f:
+            f.write(b'{"op": "begin", "id": 2, "type": "rename"}\n{"op": "files", "id": 2, "fi')
+
+        reloaded = HistoryManager(str(tmp_path / "history.json"))
+
+        assert [summary['id'] for summary in reloaded.get_history()] == [1]
+        assert reloaded.add_operation('undo', [], 0, 0) == 2
+        assert [summary['id'] for summary in HistoryManager(str(tmp_path / "history.json")).get_history()] == [1, 2]
+
+    def test_compaction_keeps_latest(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(history_manager, 'MAX_HISTORY_ITEMS', 3)
+        monkeypatch.setattr(history_manager, 'HISTORY_COMPACT_SLACK', 2)
+        manager = HistoryManager(str(tmp_path / "history.json"))
+
+        for i in range(6):
+            manager.add_operation('rename', _files(i + 1), i + 1, 0)
+
+        lines = (tmp_path / "history.jsonl").read_text(encoding='utf-8').splitlines()
+        assert sum(1 for line in lines if '"op": "begin"' in line) == 3
+        assert [summary['id'] for summary in manager.get_history()] == [4, 5, 6]
+        assert len(manager.get_operation_files(6)) == 6
+
+    def test_legacy_history_imported(self, tmp_path):
+        legacy = [{'timestamp': '2024-01-01T00:00:00', 'type': 'rename', 'files_count': 2,
+                   'success_count': 2, 'error_count': 0, 'files': _files(2)}]
+        (tmp_path / "history.json").write_text(json.dumps(legacy), encoding='utf-8')
+
+        manager = HistoryManager(str(tmp_path / "history.json"))
+
+        assert manager.get_history()[0]['timestamp'] == '2024-01-01T00:00:00'
+        assert manager.get_operation_files(1) == _files(2)
+        assert (tmp_path / "history.jsonl").exists()
@@ -0,0 +1,200 @@
+"""Тесты для конвертации изображений."""
+
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from core.converter.image_converter import convert_image_to_image, convert_images_to_pdf
+from core.converter.image_profiles import ImageProfile, get_image_profile
+
+
+class _FakePage:
+    def __init__(self, log):
+        self.log = log
+
+    def insert_image(self, rect, filename=None, stream=None):
+        self.log.append(('direct', filename) if filename else ('stream', len(stream)))
+
+
+class _FakeDocument:
+    def __init__(self, log, path=None):
+        self.log = log
+        self.path = path
+
+    def new_page(self, width, height):
+        return _FakePage(self.log)
+
+    def delete_page(self, index):
+        self.log.append(('delete', index))
+
+    def save(self, path):
+        self.log.append(('save', path))
+
+    def saveIncr(self):
+        self.log.append(('save_incr', self.path))
+
+    def close(self):
+        pass
+
+
+def _fake_fitz(log):
+    return SimpleNamespace(
+        Rect=lambda *args: args,
+        open=lambda path=None: _FakeDocument(log, path),
+    )
+
+
+def _fake_image(modes):
+    def open_image(path):
+        img = MagicMock()
+        img.mode = modes[path]
+        img.size = (10, 20)
+        img.__enter__.return_value = img
+        img.save.side_effect = lambda buffer, format: buffer.write(b'png')
+        return img
+    return SimpleNamespace(open=open_image)
+
+
+class TestConvertImagesToPdf:
+    """Тесты потоковой сборки PDF из изображений."""
+
+    def test_jpeg_inserted_without_reencoding(self, tmp_path):
+        jpeg = tmp_path / "scan.jpg"
+        jpeg.write_bytes(b'\xff\xd8\xff\xe0rest')
+        png = tmp_path / "logo.png"
+        png.write_bytes(b'\x89PNG')
+        log = []
+        image_module = _fake_image({str(jpeg): 'RGB', str(png): 'RGB'})
+
+        success, message, path = convert_images_to_pdf(
+            [str(jpeg), str(png)], str(tmp_path / "out.pdf"), _fake_fitz(log), image_module
+        )
+
+        assert success
+        assert path == str(tmp_path / "out.pdf")
+        assert ('direct', str(jpeg)) in log
+        assert ('stream', 3) in log
+
+    def test_pages_flushed_incrementally(self, tmp_path):
+        files = []
+        for i in range(5):
+            jpeg = tmp_path / f"{i}.jpg"
+            jpeg.write_bytes(b'\xff\xd8\xff')
+            files.append(str(jpeg))
+        log = []
+        output = str(tmp_path / "out.pdf")
+        progress = []
+
+        success, _, _ = convert_images_to_pdf(
+            files, output, _fake_fitz(log), _fake_image({f: 'L' for f in files}),
+            progress_callback=lambda done, total: progress.append(done), flush_every=2
+        )
+
+        assert success
+        saves = [entry for entry in log if entry[0] in ('save', 'save_incr')]
+        assert saves == [('save', output), ('save_incr', output), ('save_incr', output)]
+        assert progress == [1, 2, 3, 4, 5]
+
+    def test_cancel_removes_partial_pdf(self, tmp_path):
+        files = []
+        for i in range(5):
+            jpeg = tmp_path / f"{i}.jpg"
+            jpeg.write_bytes(b'\xff\xd8\xff')
+            files.append(str(jpeg))
+        output = tmp_path / "out.pdf"
+        output.write_bytes(b'%PDF')
+        progress = []
+
+        success, message, path = convert_images_to_pdf(
+            files, str(output), _fake_fitz([]), _fake_image({f: 'L' for f in files}),
+            progress_callback=lambda done, total: progress.append(done), flush_every=2,
+            cancel_check=lambda: len(progress) >= 3
+        )
+
+        assert (success, path) == (False, None)
+        assert progress == [1, 2, 3]
+        assert not output.exists()
+
+    def test_empty_list(self, tmp_path):
+        success, _, path = convert_images_to_pdf([], str(tmp_path / "out.pdf"), _fake_fitz([]), _fake_image({}))
+        assert not success
+        assert path is None
+
+
+def _fake_single_image(source_format, mode='RGB', size=(4000, 3000)):
+    img = MagicMock()
+    img.format = source_format
+    img.mode = mode
+    img.width, img.height = size
+    img.__enter__.return_value = img
+    return img, SimpleNamespace(open=lambda path: img)
+
+
+FORMATS = {'.jpg': 'JPEG', '.jpeg': 'JPEG', '.png': 'PNG', '.webp': 'WEBP'}
+
+
+class TestConvertImageToImage:
+    """Тесты быстрых путей конвертации изображений."""
+
+    def test_same_codec_copied_without_decoding(self, tmp_path):
+        source = tmp_path / "photo.jpg"
+        source.write_bytes(b'\xff\xd8\xff jpeg data')
+        output = tmp_path / "photo.jpeg"
+        img, image_module = _fake_single_image('JPEG')
+
+        success, _, path = convert_image_to_image(
+            str(source), str(output), '.jpeg', 95, image_module, FORMATS, ImageProfile('test')
+        )
+
+        assert success
+        assert output.read_bytes() == source.read_bytes()
+        img.save.assert_not_called()
+        img.load.assert_not_called()
+
+    def test_default_profile_reencodes_same_codec(self, tmp_path):
+        img, image_module = _fake_single_image('JPEG')
+
+        convert_image_to_image(
+            str(tmp_path / "a.jpg"), str(tmp_path / "a.jpeg"), '.jpeg', 95, image_module, FORMATS
+        )
+
+        img.save.assert_called_once_with(str(tmp_path / "a.jpeg"), format='JPEG', quality=95, optimize=True)
+
+    def test_low_quality_reencodes(self, tmp_path):
+        img, image_module = _fake_single_image('JPEG')
+        profile = ImageProfile('test', jpeg_optimize=False)
+
+        convert_image_to_image(
+            str(tmp_path / "a.jpg"), str(tmp_path / "a.jpeg"), '.jpeg', 50, image_module, FORMATS, profile
+        )
+
+        img.save.assert_called_once_with(str(tmp_path / "a.jpeg"), format='JPEG', quality=50, optimize=False)
+
+    def test_resize_uses_draft_for_jpeg(self, tmp_path):
+        img, image_module = _fake_single_image('JPEG')
+        profile = ImageProfile('test', max_size=(256, 256), png_optimize=False, png_compress_level=1)
+
+        success, _, _ = convert_image_to_image(
+            str(tmp_path / "a.jpg"), str(tmp_path / "a.png"), '.png', 95, image_module, FORMATS, profile
+        )
+
+        assert success
+        img.draft.assert_called_once_with('RGB', (256, 256))
+        img.thumbnail.assert_called_once_with((256, 256), reducing_gap=2.0)
+        img.save.assert_called_once_with(str(tmp_path / "a.png"), format='PNG', compress_level=1)
+
+    def test_profile_records_time(self, tmp_path):
+        _, image_module = _fake_single_image('PNG')
+        profile = ImageProfile('test')
+
+        convert_image_to_image(
+            str(tmp_path / "a.png"), str(tmp_path / "a.webp"), '.webp', 80, image_module, FORMATS, profile
+        )
+
+        assert profile.files == 1
+        assert profile.total_time >= 0
+
+    def test_default_profile_keeps_max_compression(self):
+        profile = get_image_profile()
+        assert profile.jpeg_optimize and profile.png_optimize
+        assert profile.webp_method == 6
+        assert get_image_profile('fast').webp_method < profile.webp_method
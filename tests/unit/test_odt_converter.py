@@ -0,0 +1,88 @@
+"""Тесты для конвертации ODT без LibreOffice."""
+
+import io
+import zipfile
+
+from core.converter.odt_converter import convert_odt_without_libreoffice, iter_odt_paragraphs
+
+CONTENT_XML = (
+    '<?xml version="1.0" encoding="UTF-8"?>'
+    '<office:document-content'
+    ' xmlns:office="urn:oasis:names:tc:opendocument:xmlns:office:1.0"'
+    ' xmlns:text="urn:oasis:names:tc:opendocument:xmlns:text:1.0"'
+    ' xmlns:table="urn:oasis:names:tc:opendocument:xmlns:table:1.0">'
+    '<office:body><office:text>'
+    '<text:h>Заголовок</text:h>'
+    '<text:p>Первый <text:span>абзац</text:span><text:s text:c="2"/>и<text:tab/>табуляция</text:p>'
+    '<table:table><table:table-row>'
+    '<table:table-cell><text:p>Ячейка &lt;1&gt;</text:p></table:table-cell>'
+    '</table:table-row></table:table>'
+    '<text:p>До сноски<text:note><text:note-body><text:p>Сноска</text:p></text:note-body></text:note> после</text:p>'
+    '</office:text></office:body></office:document-content>'
+)
+
+
+def _make_odt(path, content=CONTENT_XML):
+    with zipfile.ZipFile(path, 'w') as odt:
+        odt.writestr('mimetype', 'application/vnd.oasis.opendocument.text')
+        odt.writestr('content.xml', content)
+    return str(path)
+
+
+class TestIterOdtParagraphs:
+    """Тесты потокового чтения параграфов."""
+
+    def test_paragraphs_in_order(self):
+        paragraphs = list(iter_odt_paragraphs(io.BytesIO(CONTENT_XML.encode('utf-8'))))
+
+        assert paragraphs == [
+            'Заголовок',
+            'Первый абзац  и\tтабуляция',
+            'Ячейка <1>',
+            'Сноска',
+            'До сноски после',
+        ]
+
+    def test_many_paragraphs(self):
+        rows = ''.join(f'<text:p>Строка {i}</text:p>' for i in range(2000))
+        content = CONTENT_XML.replace('<text:h>Заголовок</text:h>', rows)
+        stream = io.BytesIO(content.encode('utf-8'))
+
+        count = 0
+        for count, _ in enumerate(iter_odt_paragraphs(stream), 1):
+            pass
+
+        assert count == 2004
+
+
+class TestConvertOdtWithoutLibreoffice:
+    """Тесты fallback конвертации ODT."""
+
+    def test_to_txt(self, tmp_path):
+        odt = _make_odt(tmp_path / "doc.odt")
+        output = tmp_path / "doc.txt"
+
+        success, _, path = convert_odt_without_libreoffice(odt, str(output), '.txt')
+
+        assert success
+        assert path == str(output)
+        assert output.read_text(encoding='utf-8').splitlines()[0] == 'Заголовок'
+
+    def test_to_html_escapes_text(self, tmp_path):
+        odt = _make_odt(tmp_path / "doc.odt")
+        output = tmp_path / "doc.html"
+
+        success, _, _ = convert_odt_without_libreoffice(odt, str(output), '.html')
+
+        assert success
+        assert '<p>Ячейка &lt;1&gt;</p>' in output.read_text(encoding='utf-8')
+
+    def test_empty_document_to_txt(self, tmp_path):
+        empty = CONTENT_XML.split('<office:body>')[0] + '<office:body/></office:document-content>'
+        odt = _make_odt(tmp_path / "empty.odt", empty)
+        output = tmp_path / "empty.txt"
+
+        success, _, _ = convert_odt_without_libreoffice(odt, str(output), '.txt')
+
+        assert not success
+        assert not output.exists()
@@ -0,0 +1,59 @@
+"""Тесты для планировщика выходных путей конвертации."""
+
+import os
+
+from core.converter.output_planner import OutputPlanner, reserve_unique_folder
+
+
+class TestOutputPlanner:
+    """Тесты расчета выходных путей пакета."""
+
+    def test_same_output_gets_suffix(self, tmp_path):
+        a_png = str(tmp_path / "a.png")
+        a_bmp = str(tmp_path / "a.bmp")
+        planner = OutputPlanner()
+
+        outputs = planner.plan([(a_png, '.jpg'), (a_bmp, '.jpg')])
+
+        assert outputs == [str(tmp_path / "a.jpg"), str(tmp_path / "a_001.jpg")]
+
+    def test_batch_source_not_overwritten(self, tmp_path):
+        a_png = str(tmp_path / "a.png")
+        a_jpg = str(tmp_path / "a.jpg")
+
+        outputs = OutputPlanner().plan([(a_png, '.jpg'), (a_jpg, '.webp')])
+
+        assert outputs == [str(tmp_path / "a_001.jpg"), str(tmp_path / "a.webp")]
+
+    def test_same_format_has_no_output(self, tmp_path):
+        assert OutputPlanner().plan([(str(tmp_path / "a.png"), '.png'), (str(tmp_path / "b.png"), None)]) == [None, None]
+
+    def test_existing_files(self, tmp_path):
+        (tmp_path / "a.jpg").write_bytes(b"old")
+        source = str(tmp_path / "a.png")
+
+        assert OutputPlanner().plan([(source, '.jpg')]) == [str(tmp_path / "a.jpg")]
+        assert OutputPlanner(overwrite_existing=False).plan([(source, '.jpg')]) == [str(tmp_path / "a_001.jpg")]
+
+    def test_directory_listed_once(self, tmp_path, monkeypatch):
+        calls = []
+        real_listdir = os.listdir
+        monkeypatch.setattr(os, 'listdir', lambda path: calls.append(path) or real_listdir(path))
+        planner = OutputPlanner(overwrite_existing=False)
+
+        planner.plan([(str(tmp_path / f"{i}.png"), '.jpg') for i in range(20)])
+
+        assert len(calls) == 1
+
+    def test_converted_folder_skips_existing(self, tmp_path):
+        converted = tmp_path / "Конвертированные"
+        (converted / "doc").mkdir(parents=True)
+        (converted / "doc_001").mkdir()
+        source = str(tmp_path / "doc.pdf")
+        planner = OutputPlanner()
+
+        folder = planner.plan_converted_folder(source)
+
+        assert folder == str(converted / "doc_002")
+        assert planner.folder_for(source) == folder
+        assert reserve_unique_folder(str(converted), "new") == str(converted / "new")
@@ -0,0 +1,163 @@
+"""Тесты для параллельного создания ZIP архива."""
+
+import errno
+import io
+import os
+import zipfile
+
+import pytest
+
+from core.archive.parallel import ArchiveWriteError, ParallelZipArchiver, collect_entries
+from core.archive.zip_writer import ZIP_STORED, CompressedEntry, ZipWriter
+
+
+def _tree(tmp_path):
+    (tmp_path / "папка" / "вложенная").mkdir(parents=True)
+    (tmp_path / "папка" / "a.txt").write_bytes(b"abc" * 10000)
+    (tmp_path / "папка" / "вложенная" / "b.bin").write_bytes(os.urandom(50000))
+    (tmp_path / "отчет.txt").write_text("Отчет " * 1000, encoding='utf-8')
+    (tmp_path / "empty.txt").write_bytes(b"")
+    return [str(tmp_path / "отчет.txt"), str(tmp_path / "папка"), str(tmp_path / "empty.txt")]
+
+
+class TestParallelZipArchiver:
+    """Тесты архиватора."""
+
+    def test_archive_is_standard_zip(self, tmp_path):
+        paths = _tree(tmp_path)
+        output = str(tmp_path / "out.zip")
+        entries, errors = collect_entries(paths + [str(tmp_path / "нет.txt")])
+        results = []
+
+        completed = ParallelZipArchiver(6, workers=3, spill_threshold=1024).archive(
+            entries, output, lambda entry, error: results.append((entry.arcname, error))
+        )
+
+        assert completed
+        assert errors == [(str(tmp_path / "нет.txt"), "Файл не найден")]
+        # Результаты сообщаются в исходном порядке
+        assert [name for name, _ in results] == [entry.arcname for entry in entries]
+        with zipfile.ZipFile(output) as zf:
+            assert zf.testzip() is None
+            names = zf.namelist()
+            assert names[0] == "отчет.txt"
+            assert sorted(names[1:]) == sorted(["папка/a.txt", "папка/вложенная/b.bin", "empty.txt"])
+            assert zf.read("папка/a.txt") == b"abc" * 10000
+            assert zf.getinfo("папка/a.txt").compress_type == zipfile.ZIP_DEFLATED
+
+    def test_level_zero_stores(self, tmp_path):
+        paths = _tree(tmp_path)
+        output = str(tmp_path / "out.zip")
+
+        ParallelZipArchiver(0, workers=2).archive(collect_entries(paths)[0], output)
+
+        with zipfile.ZipFile(output) as zf:
+            assert all(info.compress_type == zipfile.ZIP_STORED for info in zf.infolist())
+            assert zf.testzip() is None
+
+    def test_unreadable_entry_reported(self, tmp_path):
+        paths = _tree(tmp_path)
+        entries, _ = collect_entries(paths)
+        os.remove(paths[0])
+        results = []
+
+        ParallelZipArchiver(6, workers=2).archive(
+            entries, str(tmp_path / "out.zip"), lambda entry, error: results.append(error)
+        )
+
+        assert results[0] is not None
+        assert results[1:] == [None] * (len(entries) - 1)
+
+    def test_cancel_removes_partial_archive(self, tmp_path):
+        paths = _tree(tmp_path)
+
+        completed = ParallelZipArchiver(6, workers=2).archive(
+            collect_entries(paths)[0], str(tmp_path / "out.zip"), cancel_check=lambda: True
+        )
+
+        assert not completed
+        assert not any(name.endswith(('.zip', '.part')) for name in os.listdir(tmp_path))
+
+    def test_large_entries_compressed_by_workers(self, tmp_path):
+        (tmp_path / "big.log").write_bytes(b"line\n" * 50000)
+        (tmp_path / "big.dat").write_bytes(os.urandom(200000))
+        entries, _ = collect_entries([str(tmp_path / "big.log"), str(tmp_path / "big.dat")])
+        output = str(tmp_path / "out.zip")
+
+        completed = ParallelZipArchiver(6, workers=2, spill_threshold=1024).archive(entries, output)
+
+        assert completed
+        with zipfile.ZipFile(output) as zf:
+            assert zf.testzip() is None
+            big_log, big_dat = zf.infolist()
+            # Сжатый в рабочем потоке файл пишется с известными размерами,
+            # несжимаемый - сразу в архив с дескриптором после данных
+            assert big_log.compress_type == zipfile.ZIP_DEFLATED and not big_log.flag_bits & 0x08
+            assert big_dat.compress_type == ZIP_STORED and big_dat.flag_bits & 0x08
+            assert zf.read("big.log") == b"line\n" * 50000
+
+    def test_output_error_aborts_archive(self, tmp_path, monkeypatch):
+        paths = _tree(tmp_path)
+
+        def write_entry(self, entry):
+            raise OSError(errno.ENOSPC, "No space left on device")
+
+        monkeypatch.setattr(ZipWriter, 'write_entry', write_entry)
+        results = []
+
+        with pytest.raises(ArchiveWriteError):
+            ParallelZipArchiver(6, workers=2).archive(
+                collect_entries(paths)[0], str(tmp_path / "out.zip"), lambda entry, error: results.append(error)
+            )
+
+        # Ошибка записи не выдается за пропуск исходного файла
+        assert results == []
+        assert not any(name.endswith(('.zip', '.part')) for name in os.listdir(tmp_path))
+
+    def test_archive_mode_follows_umask_or_replaced_archive(self, tmp_path):
+        paths = _tree(tmp_path)
+        output = tmp_path / "out.zip"
+        umask = os.umask(0o022)
+        try:
+            ParallelZipArchiver(6, workers=2).archive(collect_entries(paths)[0], str(output))
+            assert output.stat().st_mode & 0o777 == 0o644
+
+            output.chmod(0o640)
+            ParallelZipArchiver(6, workers=2).archive(collect_entries(paths)[0], str(output))
+            assert output.stat().st_mode & 0o777 == 0o640
+        finally:
+            os.umask(umask)
+
+
+class TestZipWriter:
+    """Тесты формата."""
+
+    def test_zip64_end_record_for_many_entries(self):
+        buffer = io.BytesIO()
+        writer = ZipWriter(buffer)
+        for i in range(70000):
+            writer.write_entry(CompressedEntry(f"{i}.txt", ZIP_STORED, 0, 0, 0, 0.0))
+        writer.close()
+
+        with zipfile.ZipFile(buffer) as zf:
+            assert len(zf.infolist()) == 70000
+
+
+class TestCompressionPolicy:
+    """Тесты выбора метода сжатия."""
+
+    def test_methods_recorded_per_entry(self, tmp_path):
+        (tmp_path / "photo.jpg").write_bytes(b"\xff\xd8\xff" + b"a" * 5000)
+        (tmp_path / "random.dat").write_bytes(os.urandom(100000))
+        (tmp_path / "text.log").write_bytes(b"line\n" * 20000)
+        paths = [str(tmp_path / name) for name in ("photo.jpg", "random.dat", "text.log")]
+        entries, _ = collect_entries(paths)
+        output = str(tmp_path / "out.zip")
+
+        ParallelZipArchiver(6, workers=2).archive(entries, output)
+
+        assert [entry.method for entry in entries] == [ZIP_STORED, ZIP_STORED, zipfile.ZIP_DEFLATED]
+        with zipfile.ZipFile(output) as zf:
+            assert [info.compress_type for info in zf.infolist()] == [entry.method for entry in entries]
+            assert zf.testzip() is None
+            assert zf.read("random.dat") == (tmp_path / "random.dat").read_bytes()
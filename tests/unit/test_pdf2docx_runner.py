@@ -0,0 +1,132 @@
+"""Тесты для изолированной конвертации PDF в DOCX."""
+
+import os
+import time
+
+import pytest
+
+from core.converter.pdf2docx_runner import (
+    Pdf2DocxOptions,
+    Pdf2DocxRunner,
+    get_process_rss,
+    plan_page_chunks,
+)
+
+
+def _fake_chunk_worker(file_path, output_path, start, end, conn):
+    """Процесс-заглушка: записывает диапазон страниц вместо DOCX."""
+    with open(output_path, 'w') as f:
+        f.write(f"{start}-{end}")
+    conn.send((True, None))
+    conn.close()
+
+
+def _crashing_worker(file_path, output_path, start, end, conn):
+    """Процесс, аварийно завершающийся без ответа."""
+    os._exit(3)
+
+
+def _memory_hungry_worker(file_path, output_path, start, end, conn):
+    """Процесс, превышающий лимит памяти."""
+    data = b'x' * (256 * 1024 * 1024)
+    time.sleep(30)
+    conn.send((True, len(data)))
+
+
+def _fake_merge(part_paths, output_path, docx_module):
+    """Объединение частей без python-docx: содержимое через '|'."""
+    contents = []
+    for path in part_paths:
+        with open(path) as f:
+            contents.append(f.read())
+    with open(output_path, 'w') as f:
+        f.write('|'.join(contents))
+
+
+class TestPlanPageChunks:
+    """Тесты разбиения на диапазоны страниц."""
+
+    def test_small_document_single_chunk(self):
+        assert plan_page_chunks(10, 50) == [(0, None)]
+        assert plan_page_chunks(0, 50) == [(0, None)]
+
+    def test_large_document(self):
+        assert plan_page_chunks(120, 50) == [(0, 50), (50, 100), (100, 120)]
+
+
+class TestPdf2DocxRunner:
+    """Тесты запуска диапазонов в отдельных процессах."""
+
+    def test_chunks_merged_in_page_order(self, tmp_path, monkeypatch):
+        monkeypatch.setattr('core.converter.pdf2docx_runner.merge_docx_parts', _fake_merge)
+        runner = Pdf2DocxRunner(
+            Pdf2DocxOptions(chunk_pages=2, workers=2), docx_module=object(), worker=_fake_chunk_worker
+        )
+        output = tmp_path / "out.docx"
+        progress = []
+
+        success, _, path = runner.convert(
+            str(tmp_path / "in.pdf"), str(output), page_count=5,
+            progress_callback=lambda done, total: progress.append(total)
+        )
+
+        assert success
+        assert path == str(output)
+        assert output.read_text() == "0-2|2-4|4-5"
+        assert progress == [3, 3, 3]
+        # Временные части удалены
+        assert os.listdir(tmp_path) == ["out.docx"]
+
+    def test_without_docx_module_single_process(self, tmp_path):
+        runner = Pdf2DocxRunner(Pdf2DocxOptions(chunk_pages=2), worker=_fake_chunk_worker)
+        output = tmp_path / "out.docx"
+
+        success, _, _ = runner.convert(str(tmp_path / "in.pdf"), str(output), page_count=5)
+
+        assert success
+        assert output.read_text() == "0-None"
+
+    def test_crash_reported_as_failure(self, tmp_path):
+        runner = Pdf2DocxRunner(worker=_crashing_worker)
+
+        success, message, path = runner.convert(str(tmp_path / "in.pdf"), str(tmp_path / "out.docx"))
+
+        assert not success
+        assert "код 3" in message
+        assert path is None
+        assert os.listdir(tmp_path) == []
+
+    @pytest.mark.skipif(get_process_rss(os.getpid()) is None, reason="Память процесса недоступна")
+    def test_memory_limit(self, tmp_path):
+        runner = Pdf2DocxRunner(Pdf2DocxOptions(max_rss_mb=64), worker=_memory_hungry_worker)
+        started = time.monotonic()
+
+        success, message, _ = runner.convert(str(tmp_path / "in.pdf"), str(tmp_path / "out.docx"))
+
+        assert not success
+        assert "лимит памяти" in message
+        assert time.monotonic() - started < 20
+
+
+class TestFileConverterPdfToDocx:
+    """Тесты перехода FileConverter на изолированный pdf2docx."""
+
+    def test_falls_back_to_isolated_runner(self, tmp_path, monkeypatch):
+        from core.file_converter import FileConverter
+
+        class _FakeRunner(Pdf2DocxRunner):
+            def __init__(self, options=None, docx_module=None):
+                super().__init__(options, None, worker=_fake_chunk_worker)
+
+        converter = FileConverter()
+        monkeypatch.setattr(converter.capabilities, 'is_available', lambda name: name == 'pdf2docx')
+        monkeypatch.setattr('core.converter.pdf2docx_runner.Pdf2DocxRunner', _FakeRunner)
+        output = tmp_path / "out.docx"
+
+        success, message, path = converter._convert_file(
+            str(tmp_path / "in.pdf"), '.pdf', '.docx', str(output), 95
+        )
+
+        assert success, message
+        assert path == str(output)
+        assert output.read_text() == "0-None"
@@ -0,0 +1,128 @@
+"""Тесты для движка растеризации PDF."""
+
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+from core.converter.pdf_rasterizer import (
+    PdfRasterizer,
+    RasterOptions,
+    build_save_kwargs,
+    parse_page_range,
+    split_into_chunks,
+)
+
+
+def _fake_fitz(saved):
+    """Минимальная замена модуля fitz для рендеринга в текущем процессе."""
+    def get_pixmap(matrix, colorspace, alpha):
+        pix = SimpleNamespace(n=1 if colorspace == 'gray' else 3, width=2, height=2,
+                              samples=b'\x00' * 12, matrix=matrix)
+        pix.save = lambda path: saved.append(('fitz', path, pix.matrix))
+        return pix
+
+    document = MagicMock()
+    document.__getitem__.side_effect = lambda page_num: SimpleNamespace(get_pixmap=get_pixmap)
+    return SimpleNamespace(
+        csGRAY='gray', csRGB='rgb',
+        Matrix=lambda x, y: (x, y),
+        open=lambda path: document,
+    )
+
+
+def _fake_image(saved):
+    """Минимальная замена модуля PIL.Image."""
+    def frombytes(mode, size, data):
+        img = MagicMock()
+        img.save.side_effect = lambda path, format, **kwargs: saved.append((mode, path, format, kwargs))
+        return img
+    return SimpleNamespace(frombytes=frombytes)
+
+
+class TestParsePageRange:
+    """Тесты разбора диапазона страниц."""
+
+    def test_all_pages(self):
+        assert parse_page_range(None, 3) == [0, 1, 2]
+        assert parse_page_range("", 3) == [0, 1, 2]
+
+    def test_ranges(self):
+        assert parse_page_range("1-3,7", 10) == [0, 1, 2, 6]
+        assert parse_page_range("8-", 10) == [7, 8, 9]
+        assert parse_page_range("2,2,1", 5) == [0, 1]
+
+    def test_out_of_document(self):
+        assert parse_page_range("3-100", 4) == [2, 3]
+        with pytest.raises(ValueError):
+            parse_page_range("50", 4)
+
+    def test_invalid(self):
+        with pytest.raises(ValueError):
+            parse_page_range("5-2", 10)
+        with pytest.raises(ValueError):
+            parse_page_range("abc", 10)
+
+
+class TestPdfRasterizer:
+    """Тесты движка растеризации."""
+
+    def test_save_kwargs_fast_mode(self):
+        assert build_save_kwargs('PNG', 95, False) == {'optimize': True}
+        assert 'optimize' not in build_save_kwargs('PNG', 95, True)
+        assert build_save_kwargs('WEBP', 80, True)['method'] < build_save_kwargs('WEBP', 80, False)['method']
+        assert build_save_kwargs('JPEG', 80, True) == {'quality': 80, 'optimize': False}
+
+    def test_split_into_chunks(self):
+        chunks = split_into_chunks(list(range(10)), 2)
+        assert [item for chunk in chunks for item in chunk] == list(range(10))
+        assert len(chunks) <= 8
+        assert split_into_chunks([], 4) == []
+
+    def test_small_document_renders_in_process(self):
+        rasterizer = PdfRasterizer(None, None, RasterOptions())
+        assert rasterizer.get_worker_count(3) == 1
+        assert PdfRasterizer(None, None, RasterOptions(workers=4)).get_worker_count(100) == 4
+
+    def test_render_sequential(self):
+        saved = []
+        options = RasterOptions(dpi=72, grayscale=True, workers=1)
+        rasterizer = PdfRasterizer(_fake_fitz(saved), _fake_image(saved), options)
+        progress = []
+        jobs = [(0, 'p1.jpg'), (2, 'p3.jpg')]
+
+        result = rasterizer.render('doc.pdf', jobs, 'JPEG', lambda done, total: progress.append((done, total)))
+
+        assert result == ['p1.jpg', 'p3.jpg']
+        assert [entry[0] for entry in saved] == ['L', 'L']
+        assert progress == [(1, 2), (2, 2)]
+
+    def test_fast_png_saved_by_fitz(self):
+        saved = []
+        options = RasterOptions(dpi=144, fast_save=True, workers=1)
+        rasterizer = PdfRasterizer(_fake_fitz(saved), _fake_image(saved), options)
+
+        rasterizer.render('doc.pdf', [(0, 'page.png')], 'PNG')
+
+        assert saved == [('fitz', 'page.png', (2.0, 2.0))]
+
+
+class TestConvertPdfToImage:
+    """Тесты конвертации PDF в изображение с параметрами растеризации."""
+
+    def test_quality_argument_overrides_options(self, tmp_path):
+        from core.converter.image_converter import convert_pdf_to_image
+
+        saved = []
+        fitz = _fake_fitz(saved)
+        fitz.open('doc.pdf').__len__.return_value = 1
+        options = RasterOptions(dpi=72, workers=1)
+
+        success, _, _ = convert_pdf_to_image(
+            'doc.pdf', str(tmp_path / 'page.jpg'), '.jpg', 40,
+            fitz, _fake_image(saved), {'.jpg': 'JPEG'}, options
+        )
+
+        assert success
+        assert saved[0][3]['quality'] == 40
+        assert options.quality == 95
@@ -99,3 +99,45 @@ class TestReFileService:
         # Если имя не изменилось, файл должен быть пропущен
         assert result.success_count == 0 or result.success_count == 1
 
+
+
+class TestReFileServiceJournal:
+    """Тесты журнала переименования в ReFileService."""
+
+    def _files(self, tmp_path):
+        files = []
+        for name in ("a.txt", "b.txt"):
+            (tmp_path / name).write_text(name)
+            files.append(FileInfo.from_path(str(tmp_path / name)))
+        return files
+
+    def test_journal_marked_and_removed(self, tmp_path, monkeypatch):
+        from core.rename_journal import RenameJournal
+
+        marks = []
+        original = RenameJournal.mark_done
+        monkeypatch.setattr(
+            RenameJournal, 'mark_done',
+            lambda self, index, old, new: marks.append((index, os.path.basename(new))) or original(self, index, old, new)
+        )
+        service = ReFileService(journal_dir=str(tmp_path / "journal"))
+        methods = [AddRemoveMethod(operation="add", text="prefix_", position="before")]
+
+        result = service.re_file_files(self._files(tmp_path), methods, dry_run=False)
+
+        assert result.success_count == 2
+        assert marks == [(0, "prefix_a.txt"), (1, "prefix_b.txt")]
+        assert os.listdir(tmp_path / "journal") == []
+
+    def test_journal_removed_on_interrupt(self, tmp_path, monkeypatch):
+        def interrupt(self, target):
+            raise KeyboardInterrupt
+
+        monkeypatch.setattr(Path, 'rename', interrupt)
+        service = ReFileService(journal_dir=str(tmp_path / "journal"))
+        methods = [AddRemoveMethod(operation="add", text="prefix_", position="before")]
+
+        with pytest.raises(KeyboardInterrupt):
+            service.re_file_files(self._files(tmp_path), methods, dry_run=False)
+
+        assert os.listdir(tmp_path / "journal") == []
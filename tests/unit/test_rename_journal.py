@@ -0,0 +1,188 @@
+"""Тесты для журнала пакетного переименования."""
+
+import os
+import threading
+
+from core import rename_journal
+from core.methods.file_renamer import _plan_renames, re_file_files_thread
+from core.rename_journal import (
+    STATE_DONE, STATE_PENDING, RenameJournal, find_interrupted
+)
+
+
+def _make_files(tmp_path, count):
+    pairs = []
+    for i in range(count):
+        old = tmp_path / f"old_{i}.txt"
+        old.write_text(str(i))
+        pairs.append((i, str(old), str(tmp_path / f"new_{i}.txt")))
+    return pairs
+
+
+def _crash_after(tmp_path, pairs, executed):
+    """Пакет, прерванный после executed переименований (журнал не завершен)."""
+    journal = RenameJournal(str(tmp_path / "journal"))
+    journal.begin(pairs)
+    for index, old, new in pairs[:executed]:
+        os.rename(old, new)
+        journal.mark_done(index, old, new)
+    return journal
+
+
+class TestRenameJournal:
+    """Тесты записи журнала."""
+
+    def test_finish_removes_journal(self, tmp_path):
+        journal = _crash_after(tmp_path, _make_files(tmp_path, 3), 3)
+
+        journal.finish()
+
+        assert find_interrupted(str(tmp_path / "journal")) == []
+
+    def test_group_commit(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(rename_journal, 'RENAME_JOURNAL_SYNC_EVERY', 4)
+        monkeypatch.setattr(rename_journal, 'RENAME_JOURNAL_SYNC_INTERVAL', 3600)
+        syncs = []
+        original = os.fsync
+        monkeypatch.setattr(rename_journal.os, 'fsync', lambda fd: syncs.append(fd) or original(fd))
+
+        _crash_after(tmp_path, _make_files(tmp_path, 10), 10)
+
+        # План + по одной синхронизации на каждые 4 отметки
+        assert len(syncs) == 3
+
+
+def _case_insensitive(monkeypatch, directory):
+    """Имитация файловой системы без учета регистра имен в каталоге."""
+    def actual(path):
+        name = os.path.basename(path).lower()
+        return next((entry for entry in os.listdir(directory) if entry.lower() == name), None)
+
+    monkeypatch.setattr(os.path, 'lexists', lambda path: actual(path) is not None)
+    monkeypatch.setattr(os.path, 'samefile', lambda first, second: actual(first) == actual(second) is not None)
+
+
+class TestInterruptedBatch:
+    """Тесты восстановления прерванного пакета."""
+
+    def test_state_from_markers_and_filesystem(self, tmp_path):
+        pairs = _make_files(tmp_path, 4)
+        _crash_after(tmp_path, pairs, 2)
+        # Переименование выполнено, но отметка не успела записаться
+        os.rename(pairs[2][1], pairs[2][2])
+
+        batch, = find_interrupted(str(tmp_path / "journal"))
+
+        assert [batch.state(pair) for pair in batch.pairs] == [STATE_DONE, STATE_DONE, STATE_DONE, STATE_PENDING]
+
+    def test_torn_marker_ignored(self, tmp_path):
+        pairs = _make_files(tmp_path, 2)
+        journal = _crash_after(tmp_path, pairs, 1)
+        journal._file.write(b'{"op": "done", "i": 1, "ol')
+        journal._file.flush()
+
+        batch, = find_interrupted(str(tmp_path / "journal"))
+
+        assert [pair.marked for pair in batch.pairs] == [True, False]
+
+    def test_resume(self, tmp_path):
+        pairs = _make_files(tmp_path, 5)
+        _crash_after(tmp_path, pairs, 2)
+
+        batch, = find_interrupted(str(tmp_path / "journal"))
+        count, errors = batch.resume()
+
+        assert (count, errors) == (3, [])
+        assert sorted(os.listdir(tmp_path)) == ["journal"] + [f"new_{i}.txt" for i in range(5)]
+        assert find_interrupted(str(tmp_path / "journal")) == []
+
+    def _case_only_batch(self, tmp_path, monkeypatch):
+        pairs = [(0, str(tmp_path / "report.txt"), str(tmp_path / "Report.txt")),
+                 (1, str(tmp_path / "photo.jpg"), str(tmp_path / "PHOTO.jpg"))]
+        for _, old, _ in pairs:
+            open(old, 'w').close()
+        _crash_after(tmp_path, pairs, 0)
+        os.rename(pairs[0][1], pairs[0][2])
+        _case_insensitive(monkeypatch, str(tmp_path))
+        batch, = find_interrupted(str(tmp_path / "journal"))
+        return batch
+
+    def test_case_only_state(self, tmp_path, monkeypatch):
+        batch = self._case_only_batch(tmp_path, monkeypatch)
+
+        # Оба пути существуют, но это один файл - не конфликт
+        assert [batch.state(pair) for pair in batch.pairs] == [STATE_DONE, STATE_PENDING]
+
+    def test_case_only_resume(self, tmp_path, monkeypatch):
+        batch = self._case_only_batch(tmp_path, monkeypatch)
+
+        assert batch.resume() == (1, [])
+        assert sorted(os.listdir(tmp_path)) == ["PHOTO.jpg", "Report.txt", "journal"]
+
+    def test_case_only_rollback(self, tmp_path, monkeypatch):
+        batch = self._case_only_batch(tmp_path, monkeypatch)
+
+        assert batch.rollback() == (1, [])
+        assert sorted(os.listdir(tmp_path)) == ["journal", "photo.jpg", "report.txt"]
+
+    def test_rollback(self, tmp_path):
+        pairs = _make_files(tmp_path, 5)
+        _crash_after(tmp_path, pairs, 3)
+
+        batch, = find_interrupted(str(tmp_path / "journal"))
+        count, errors = batch.rollback()
+
+        assert (count, errors) == (3, [])
+        assert sorted(os.listdir(tmp_path)) == ["journal"] + [f"old_{i}.txt" for i in range(5)]
+        assert (tmp_path / "old_1.txt").read_text() == "1"
+        assert find_interrupted(str(tmp_path / "journal")) == []
+
+
+class TestRenameThreadJournal:
+    """Тесты журнала при переименовании в потоке."""
+
+    def test_journal_written_and_removed(self, tmp_path, monkeypatch):
+        (tmp_path / "a.txt").write_text("a")
+        (tmp_path / "b.txt").write_text("b")
+        files = [
+            {'full_path': str(tmp_path / "a.txt"), 'old_name': 'a', 'new_name': 'c', 'extension': '.txt'},
+            {'full_path': str(tmp_path / "b.txt"), 'old_name': 'b', 'new_name': 'b', 'extension': '.txt'},
+        ]
+        journals = []
+        original_begin = RenameJournal.begin
+
+        def begin(self, pairs):
+            pairs = list(pairs)
+            journals.append(pairs)
+            original_begin(self, pairs)
+
+        monkeypatch.setattr(RenameJournal, 'begin', begin)
+        finished = threading.Event()
+        results = []
+
+        re_file_files_thread(
+            files, lambda *args: (results.append(args), finished.set()),
+            journal_dir=str(tmp_path / "journal")
+        )
+
+        assert finished.wait(5)
+
+        assert journals == [[(0, str(tmp_path / "a.txt"), str(tmp_path / "c.txt"))]]
+        assert results[0][:2] == (2, 0)
+        assert (tmp_path / "c.txt").read_text() == "a"
+        assert os.listdir(tmp_path / "journal") == []
+
+    def test_plan_skips_pairs_rejected_by_loop(self, tmp_path):
+        (tmp_path / "a.txt").write_text("a")
+        (tmp_path / "folder").mkdir()
+        files = [
+            {'full_path': str(tmp_path / "a.txt"), 'old_name': 'a', 'new_name': 'c', 'extension': '.txt'},
+            # Ожидается папка, а по пути файл
+            {'full_path': str(tmp_path / "a.txt"), 'old_name': 'a', 'new_name': 'd', 'extension': '.txt',
+             'is_folder': True},
+            # Ожидается файл, а по пути папка
+            {'full_path': str(tmp_path / "folder"), 'old_name': 'folder', 'new_name': 'e', 'extension': ''},
+            {'full_path': str(tmp_path / "missing.txt"), 'old_name': 'missing', 'new_name': 'f', 'extension': '.txt'},
+        ]
+
+        assert _plan_renames(files) == [(0, str(tmp_path / "a.txt"), str(tmp_path / "c.txt"))]
@@ -0,0 +1,69 @@
+"""Тесты для оценки размера после сжатия."""
+
+import os
+
+from core.archive.backends import TarXzBackend
+from core.archive.estimator import CompressedSizeEstimator
+
+
+class TestCompressedSizeEstimator:
+    """Тесты оценки и кэширования."""
+
+    def test_estimates_by_content(self, tmp_path):
+        text = tmp_path / "log.txt"
+        text.write_text("2024-01-01 INFO запрос обработан\n" * 50000, encoding='utf-8')
+        noise = tmp_path / "noise.bin"
+        noise.write_bytes(os.urandom(300000))
+        photo = tmp_path / "photo.jpg"
+        photo.write_bytes(b"\xff\xd8\xff" + b"\x00" * 10000)
+        estimator = CompressedSizeEstimator()
+
+        text_estimate = estimator.estimate(str(text), 6)
+        noise_estimate = estimator.estimate(str(noise), 6)
+        photo_estimate = estimator.estimate(str(photo), 6)
+
+        assert text_estimate.estimated_size < text_estimate.size * 0.1
+        assert noise_estimate.estimated_size == noise_estimate.size
+        assert photo_estimate.estimated_size == photo_estimate.size
+
+    def test_missing_and_directory(self, tmp_path):
+        estimator = CompressedSizeEstimator()
+
+        missing = estimator.estimate(str(tmp_path / "нет.txt"), 6)
+        folder = estimator.estimate(str(tmp_path), 6)
+
+        assert not missing.exists
+        assert folder.exists and not folder.is_file
+
+    def test_cached_by_size_and_mtime(self, tmp_path, monkeypatch):
+        path = tmp_path / "a.txt"
+        path.write_bytes(b"abc" * 1000)
+        estimator = CompressedSizeEstimator()
+        reads = []
+        original = estimator._estimate_file
+        monkeypatch.setattr(estimator, '_estimate_file', lambda *args: reads.append(args) or original(*args))
+
+        estimator.estimate(str(path), 6)
+        estimator.estimate(str(path), 6)
+        estimator.estimate(str(path), 1)
+        path.write_bytes(b"abcd" * 1000)
+        estimator.estimate(str(path), 6)
+
+        assert len(reads) == 3
+
+    def test_estimate_uses_backend_compressor(self, tmp_path, monkeypatch):
+        path = tmp_path / "a.txt"
+        path.write_bytes(b"abc" * 1000)
+        estimator = CompressedSizeEstimator()
+        blocks = []
+        original = TarXzBackend.compress_block
+        monkeypatch.setattr(
+            TarXzBackend, 'compress_block', lambda self, block: blocks.append(block) or original(self, block)
+        )
+
+        zip_estimate = estimator.estimate(str(path), 6)
+        xz_estimate = estimator.estimate(str(path), 6, 'tar.xz')
+
+        assert blocks == [b"abc" * 1000]
+        assert xz_estimate.estimated_size == len(original(TarXzBackend(6), b"abc" * 1000))
+        assert zip_estimate.estimated_size != xz_estimate.estimated_size
@@ -0,0 +1,94 @@
+"""Тесты для движка сортировки файлов."""
+
+import errno
+import os
+
+from core.sorter.engine import SorterEngine
+
+FILTERS = [
+    {'folder_name': 'Изображения', 'type': 'extension', 'value': '.jpg, .PNG', 'enabled': True},
+    {'folder_name': 'Документы', 'type': 'extension', 'value': '.pdf,.txt', 'enabled': True},
+    {'folder_name': 'Отключено', 'type': 'extension', 'value': '.zip', 'enabled': False},
+    {'folder_name': 'Дубль', 'type': 'extension', 'value': '.jpg', 'enabled': True},
+]
+
+
+def _make(path, text="data"):
+    path.write_text(text, encoding='utf-8')
+    return str(path)
+
+
+class TestSorterEngine:
+    """Тесты планирования и выполнения сортировки."""
+
+    def test_classify_first_enabled_filter_wins(self):
+        engine = SorterEngine("dst", FILTERS)
+
+        assert engine.classify("a/photo.JPG") == 'Изображения'
+        assert engine.classify("a/image.png") == 'Изображения'
+        assert engine.classify("a/archive.zip") == ''
+
+    def test_plan_resolves_collisions_in_memory(self, tmp_path):
+        source = tmp_path / "src"
+        (source / "a").mkdir(parents=True)
+        (source / "b").mkdir()
+        target = tmp_path / "dst"
+        (target / "Документы").mkdir(parents=True)
+        _make(target / "Документы" / "report.txt", "old")
+        files = [_make(source / "a" / "report.txt"), _make(source / "b" / "report.txt"),
+                 _make(source / "a" / "data.bin")]
+
+        moves, errors = SorterEngine(str(target), FILTERS).plan(files)
+
+        assert [os.path.basename(m.destination) for m in moves] == ['report_1.txt', 'report_2.txt']
+        assert [(e.source, e.message) for e in errors] == [(files[2], "Не определен фильтр")]
+
+    def test_execute_moves_files(self, tmp_path):
+        files = [_make(tmp_path / "photo.JPG"), _make(tmp_path / "doc.pdf")]
+        target = tmp_path / "sorted"
+        target.mkdir()
+        engine = SorterEngine(str(target), FILTERS)
+        results = []
+
+        moves, _ = engine.plan(files)
+        completed = engine.execute(moves, results.append)
+
+        assert completed
+        assert all(result.success for result in results)
+        assert (target / "Изображения" / "photo.JPG").exists()
+        assert (target / "Документы" / "doc.pdf").read_text(encoding='utf-8') == "data"
+        assert not os.path.exists(files[0])
+
+    def test_cross_device_fallback(self, tmp_path, monkeypatch):
+        files = [_make(tmp_path / f"doc{i}.txt", str(i)) for i in range(5)]
+        target = tmp_path / "sorted"
+        target.mkdir()
+
+        def fake_rename(src, dst):
+            raise OSError(errno.EXDEV, "Invalid cross-device link")
+
+        monkeypatch.setattr(os, 'rename', fake_rename)
+        engine = SorterEngine(str(target), FILTERS, workers=3)
+        results = []
+
+        moves, _ = engine.plan(files)
+        engine.execute(moves, results.append)
+
+        assert len(results) == 5 and all(result.success for result in results)
+        assert sorted(p.name for p in (target / "Документы").iterdir()) == [f"doc{i}.txt" for i in range(5)]
+        assert not any(os.path.exists(path) for path in files)
+
+    def test_missing_file_and_cancel(self, tmp_path):
+        files = [str(tmp_path / "missing.txt"), _make(tmp_path / "a.txt"), _make(tmp_path / "b.txt")]
+        target = tmp_path / "sorted"
+        target.mkdir()
+        engine = SorterEngine(str(target), FILTERS)
+        results = []
+
+        moves, _ = engine.plan(files)
+        completed = engine.execute(moves, results.append, cancel_check=lambda: len(results) >= 2)
+
+        assert not completed
+        assert results[0].message == "Файл не найден"
+        assert len(results) == 2
+        assert os.path.exists(files[2])
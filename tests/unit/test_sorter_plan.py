@@ -0,0 +1,99 @@
+"""Тесты для плана сортировки."""
+
+import os
+
+from core.sorter.engine import SorterEngine
+from core.sorter.plan import SorterPlan
+
+FILTERS = [
+    {'folder_name': 'Изображения', 'type': 'extension', 'value': '.jpg,.png'},
+    {'folder_name': 'Документы', 'type': 'extension', 'value': '.txt,.pdf'},
+]
+
+
+def _make(path, data=b"data"):
+    path.write_bytes(data)
+    return str(path)
+
+
+def _names(plan):
+    return [os.path.basename(entry.destination) if entry.destination else None for entry in plan.entries]
+
+
+class TestSorterPlan:
+    """Тесты построения и обновления плана."""
+
+    def test_dry_run_does_not_touch_disk(self, tmp_path):
+        (tmp_path / "a").mkdir()
+        (tmp_path / "b").mkdir()
+        files = [_make(tmp_path / "a" / "x.txt"), _make(tmp_path / "b" / "x.txt"), _make(tmp_path / "a" / "y.bin")]
+        target = tmp_path / "dst"
+
+        plan = SorterPlan(str(target), FILTERS)
+        plan.build(files)
+
+        assert _names(plan) == ['x.txt', 'x_1.txt', None]
+        assert plan.entries[2].error == "Не определен фильтр"
+        assert not target.exists()
+
+    def test_update_filter_reclassifies_only_affected(self, tmp_path, monkeypatch):
+        files = [_make(tmp_path / "a.jpg"), _make(tmp_path / "b.txt"), _make(tmp_path / "c.txt")]
+        plan = SorterPlan(str(tmp_path / "dst"), FILTERS)
+        plan.build(files)
+        classified = []
+        original = plan._classify
+        monkeypatch.setattr(plan, '_classify', lambda path: classified.append(path) or original(path))
+
+        changed = plan.update_filter(1, {'folder_name': 'Тексты', 'type': 'extension', 'value': '.txt'})
+
+        # Файл a.jpg подходит под неизменившийся фильтр, стоящий раньше
+        assert classified == files[1:]
+        assert changed == files[1:]
+        assert plan.entry(files[1]).destination == os.path.join(str(tmp_path / "dst"), 'Тексты', 'b.txt')
+
+    def test_higher_priority_filter_takes_over(self, tmp_path):
+        files = [_make(tmp_path / "a.jpg"), _make(tmp_path / "b.txt")]
+        plan = SorterPlan(str(tmp_path / "dst"), FILTERS)
+        plan.build(files)
+
+        changed = plan.set_filters(FILTERS + [{'folder_name': 'Все', 'type': 'regex', 'value': '.', 'priority': 1}])
+
+        assert changed == files
+        assert {entry.folder for entry in plan.entries} == {'Все'}
+
+    def test_reordered_filters_reclassify(self, tmp_path):
+        filters = FILTERS + [{'folder_name': 'Все', 'type': 'regex', 'value': '.'}]
+        files = [_make(tmp_path / "a.jpg"), _make(tmp_path / "b.bin")]
+        plan = SorterPlan(str(tmp_path / "dst"), filters)
+        plan.build(files)
+
+        changed = plan.set_filters([filters[2], filters[0], filters[1]])
+
+        # Содержимое фильтров то же, но первым проверяется "Все"
+        assert changed == [files[0]]
+        assert [entry.folder for entry in plan.entries] == ['Все', 'Все']
+
+    def test_remove_file_frees_name(self, tmp_path):
+        (tmp_path / "a").mkdir()
+        (tmp_path / "b").mkdir()
+        files = [_make(tmp_path / "a" / "x.txt"), _make(tmp_path / "b" / "x.txt")]
+        plan = SorterPlan(str(tmp_path / "dst"), FILTERS)
+        plan.build(files)
+
+        plan.remove_files([files[0]])
+
+        assert _names(plan) == ['x.txt']
+
+    def test_refresh_sees_new_files_and_engine_executes(self, tmp_path):
+        files = [_make(tmp_path / "x.txt")]
+        target = tmp_path / "dst"
+        plan = SorterPlan(str(target), FILTERS)
+        plan.build(files)
+        (target / "Документы").mkdir(parents=True)
+        _make(target / "Документы" / "x.txt", b"old")
+
+        plan.refresh()
+        SorterEngine(str(target), FILTERS).execute(plan.moves())
+
+        assert (target / "Документы" / "x_1.txt").read_bytes() == b"data"
+        assert (target / "Документы" / "x.txt").read_bytes() == b"old"
@@ -0,0 +1,118 @@
+"""Тесты для правил сортировки."""
+
+import os
+from datetime import datetime
+
+import pytest
+
+from core.sorter.rules import FileRecord, RuleSet, detect_mime, parse_size_range
+
+
+def _make(path, data=b"data", mtime=None):
+    path.write_bytes(data)
+    if mtime is not None:
+        os.utime(path, (mtime, mtime))
+    return str(path)
+
+
+class TestParsing:
+    """Тесты разбора значений фильтров."""
+
+    @pytest.mark.parametrize("text, expected", [
+        ("1MB-10MB", (1024 ** 2, 10 * 1024 ** 2)),
+        ("-500KB", (None, 500 * 1024)),
+        ("1,5 ГБ-", (int(1.5 * 1024 ** 3), None)),
+        (">100", (100, None)),
+    ])
+    def test_size_range(self, text, expected):
+        assert parse_size_range(text) == expected
+
+    def test_invalid_size_range(self):
+        with pytest.raises(ValueError):
+            parse_size_range("много")
+
+    @pytest.mark.parametrize("head, mime", [
+        (b'\xff\xd8\xff\xe0\x00\x10JFIF', 'image/jpeg'),
+        (b'RIFF\x00\x00\x00\x00WEBPVP8 ', 'image/webp'),
+        (b'\x00\x00\x00\x18ftypheic', 'image/heic'),
+        (b'%PDF-1.7', 'application/pdf'),
+        ('Привет'.encode('utf-8'), 'text/plain'),
+        (b'\x00\x01\x02', 'application/octet-stream'),
+    ])
+    def test_detect_mime(self, head, mime):
+        assert detect_mime(head) == mime
+
+
+class TestRuleSet:
+    """Тесты классификации файлов по правилам."""
+
+    def test_priority_and_conditions(self, tmp_path):
+        big = _make(tmp_path / "big.bin", b"x" * 2048)
+        small = _make(tmp_path / "small.bin", b"x" * 10)
+        report = _make(tmp_path / "report_2024.txt")
+        rules = RuleSet([
+            {'folder_name': 'Мелкие', 'type': 'size', 'value': '-1KB'},
+            {'folder_name': 'Отчеты', 'type': 'regex', 'value': r'^report_\d+', 'priority': 10},
+            {'folder_name': 'Крупные', 'conditions': [
+                {'type': 'extension', 'value': 'bin'},
+                {'type': 'size', 'value': '>1KB'},
+            ]},
+        ])
+
+        assert rules.classify(report) == 'Отчеты'
+        assert rules.classify(small) == 'Мелкие'
+        assert rules.classify(big) == 'Крупные'
+
+    def test_date_template(self, tmp_path):
+        mtime = datetime(2023, 3, 7, 12, 0).timestamp()
+        path = _make(tmp_path / "a.txt", mtime=mtime)
+        rules = RuleSet([{'folder_name': '{year}/{month}', 'type': 'date', 'value': 'mtime'}])
+
+        assert rules.classify(path) == os.path.join('2023', '03')
+
+    def test_exif_date_and_camera(self, tmp_path):
+        photo = _make(tmp_path / "img.jpg", b'\xff\xd8\xff\xe1' + b'\x00' * 28)
+        plain = _make(tmp_path / "note.jpg")
+        exif = {photo: {'model': 'NIKON Z/6', 'datetime': '2021:12:31 23:59:00'}}
+        calls = []
+
+        def reader(path):
+            calls.append(path)
+            return exif.get(path, {})
+
+        rules = RuleSet([
+            {'folder_name': 'Камера/{camera}/{year}', 'date_source': 'exif', 'conditions': [
+                {'type': 'mime', 'value': 'image/*'},
+                {'type': 'camera', 'value': 'nikon'},
+            ]},
+        ], exif_reader=reader)
+
+        assert rules.classify(photo) == os.path.join('Камера', 'NIKON Z_6', '2021')
+        # Файл без сигнатуры JPEG отсекается до чтения EXIF
+        assert rules.classify(plain) == ''
+        assert calls == [photo]
+
+    def test_one_stat_per_file(self, tmp_path, monkeypatch):
+        path = _make(tmp_path / "a.txt", mtime=datetime(2020, 1, 1).timestamp())
+        rules = RuleSet([
+            {'folder_name': 'Крупные', 'type': 'size', 'value': '>1MB'},
+            {'folder_name': 'Новые', 'type': 'date', 'value': 'mtime', 'priority': -1},
+            {'folder_name': '{year}', 'type': 'size', 'value': '-1MB', 'priority': -2},
+        ])
+        calls = []
+        real_stat = os.stat
+        monkeypatch.setattr(os, 'stat', lambda p, *a, **k: calls.append(p) or real_stat(p, *a, **k))
+
+        record = FileRecord(path)
+        assert rules.classify_record(record) == 'Новые'
+        assert calls == [path]
+
+    def test_invalid_filter_skipped(self, tmp_path):
+        path = _make(tmp_path / "a.txt")
+        rules = RuleSet([
+            {'folder_name': 'Ошибка', 'type': 'regex', 'value': '('},
+            {'folder_name': 'Тексты', 'type': 'extension', 'value': '.txt'},
+        ])
+
+        assert len(rules.rules) == 1
+        assert rules.classify(path) == 'Тексты'
@@ -0,0 +1,119 @@
+"""Тесты для потоковой архивации с разбиением на тома."""
+
+import os
+import struct
+import zipfile
+import zlib
+
+from core.archive.parallel import ParallelZipArchiver
+from core.archive.scanner import EntryProducer, iter_entries
+from core.archive.zip_writer import volume_paths
+
+
+def _tree(tmp_path):
+    (tmp_path / "src" / "вложенная").mkdir(parents=True)
+    (tmp_path / "src" / "b.txt").write_bytes(b"line\n" * 40000)
+    (tmp_path / "src" / "a.bin").write_bytes(os.urandom(250000))
+    (tmp_path / "src" / "вложенная" / "c.txt").write_text("Отчет " * 20000, encoding='utf-8')
+    return str(tmp_path / "src")
+
+
+def _read_split(paths):
+    """Чтение разбитого архива: {имя: данные} по центральному каталогу."""
+    volumes = [open(path, 'rb').read() for path in paths]
+    last = volumes[-1]
+    end = last.rindex(b"PK\x05\x06")
+    _, disk, cd_disk, _, count, cd_size, cd_offset, _ = struct.unpack('<IHHHHIIH', last[end:end + 22])
+    assert disk == len(volumes) - 1
+    data = b"".join(volumes[cd_disk:])
+    position = cd_offset
+    files = {}
+    for _ in range(count):
+        fields = struct.unpack('<IHHHHHHIIIHHHHHII', data[position:position + 46])
+        method, crc, csize, name_len, extra_len, comment_len = (
+            fields[4], fields[7], fields[8], fields[10], fields[11], fields[12]
+        )
+        header_disk, header_offset = fields[13], fields[16]
+        name = data[position + 46:position + 46 + name_len].decode('utf-8')
+        position += 46 + name_len + extra_len + comment_len
+
+        stream = b"".join(volumes[header_disk:])
+        local_name_len, local_extra_len = struct.unpack('<HH', stream[header_offset + 26:header_offset + 30])
+        start = header_offset + 30 + local_name_len + local_extra_len
+        payload = stream[start:start + csize]
+        content = zlib.decompress(payload, -15) if method == 8 else payload
+        assert zlib.crc32(content) == crc
+        files[name] = content
+    return files
+
+
+class TestScanner:
+    """Тесты перечисления файлов."""
+
+    def test_iter_entries_order_and_errors(self, tmp_path):
+        src = _tree(tmp_path)
+        errors = []
+
+        entries = list(iter_entries([src, str(tmp_path / "нет.txt")], lambda path, error: errors.append(error)))
+
+        assert [entry.arcname for entry in entries] == [
+            os.path.join("src", "a.bin"), os.path.join("src", "b.txt"), os.path.join("src", "вложенная", "c.txt")
+        ]
+        assert entries[0].size == 250000
+        assert errors == ["Файл не найден"]
+
+    def test_producer_stops_early(self, tmp_path):
+        for i in range(50):
+            (tmp_path / f"{i}.txt").write_bytes(b"x")
+        producer = EntryProducer([str(tmp_path / f"{i}.txt") for i in range(50)], max_queued=2)
+
+        first = next(iter(producer))
+        producer.stop()
+
+        assert first.arcname == "0.txt"
+        assert producer.scanned_files < 50
+
+
+class TestSplitArchive:
+    """Тесты разбиения на тома и потоковых записей."""
+
+    def test_volumes_limited_and_readable(self, tmp_path):
+        src = _tree(tmp_path)
+        output = str(tmp_path / "out.zip")
+        progress = []
+
+        completed = ParallelZipArchiver(6, workers=2, spill_threshold=64 * 1024).archive(
+            EntryProducer([src]), output, volume_size=100000, bytes_callback=progress.append
+        )
+
+        assert completed
+        paths = [path for path in volume_paths(output, 10) if os.path.exists(path)]
+        assert len(paths) > 1 and paths[-1] == output
+        assert all(os.path.getsize(path) <= 100000 for path in paths)
+        assert progress == sorted(progress) and progress[-1] == 250000 + 200000 + len("Отчет ".encode('utf-8')) * 20000
+        files = _read_split(paths)
+        assert files["src/a.bin"] == (tmp_path / "src" / "a.bin").read_bytes()
+        assert files["src/вложенная/c.txt"] == (tmp_path / "src" / "вложенная" / "c.txt").read_bytes()
+
+    def test_single_volume_is_regular_zip(self, tmp_path):
+        src = _tree(tmp_path)
+        output = str(tmp_path / "out.zip")
+
+        ParallelZipArchiver(6, spill_threshold=64 * 1024).archive(EntryProducer([src]), output, volume_size=10 ** 8)
+
+        assert sorted(os.listdir(tmp_path)) == ["out.zip", "src"]
+        with zipfile.ZipFile(output) as zf:
+            assert zf.testzip() is None
+            assert zf.read("src/b.txt") == b"line\n" * 40000
+
+    def test_cancel_removes_volumes(self, tmp_path):
+        src = _tree(tmp_path)
+        calls = []
+
+        completed = ParallelZipArchiver(6, spill_threshold=1024).archive(
+            EntryProducer([src]), str(tmp_path / "out.zip"), volume_size=70000,
+            cancel_check=lambda: calls.append(1) or len(calls) > 3,
+        )
+
+        assert not completed
+        assert os.listdir(tmp_path) == ["src"]
@@ -0,0 +1,190 @@
+"""Тесты для обновления существующего ZIP архива."""
+
+import os
+import struct
+import time
+import zipfile
+import zlib
+
+import pytest
+
+from core.archive.parallel import ParallelZipArchiver
+from core.archive.scanner import iter_entries
+from core.archive.update import ZipSource, ZipUpdater
+
+
+def _build(tmp_path):
+    (tmp_path / "src" / "вложенная").mkdir(parents=True)
+    (tmp_path / "src" / "a.txt").write_bytes(b"abc" * 10000)
+    (tmp_path / "src" / "b.txt").write_bytes(b"old content")
+    (tmp_path / "src" / "вложенная" / "c.bin").write_bytes(os.urandom(80000))
+    archive = str(tmp_path / "out.zip")
+    ParallelZipArchiver(6, workers=2, spill_threshold=32 * 1024).archive(iter_entries([str(tmp_path / "src")]), archive)
+    return str(tmp_path / "src"), archive
+
+
+def _legacy_zip(path, raw_name, data, extra=b''):
+    """Архив из одной записи без флага UTF-8 (как у zip в Linux или Проводника Windows)."""
+    crc = zlib.crc32(data)
+    local = struct.pack(
+        '<IHHHHHIIIHH', 0x04034B50, 20, 0, 0, 0, 0x21, crc, len(data), len(data), len(raw_name), len(extra)
+    ) + raw_name + extra
+    central = struct.pack(
+        '<IHHHHHHIIIHHHHHII', 0x02014B50, 20, 20, 0, 0, 0, 0x21, crc, len(data), len(data),
+        len(raw_name), len(extra), 0, 0, 0, 0o100644 << 16, 0
+    ) + raw_name + extra
+    end = struct.pack('<IHHHHIIH', 0x06054B50, 0, 0, 1, 1, len(central), len(local) + len(data), 0)
+    path.write_bytes(local + data + central + end)
+    return str(path)
+
+
+def _update(src, archive, **kwargs):
+    results = {}
+    completed = ZipUpdater(ParallelZipArchiver(6, workers=2, spill_threshold=32 * 1024)).update(
+        archive, iter_entries([src]),
+        lambda entry, error: results.__setitem__(entry.arcname.replace(os.sep, '/'), (entry.reused, error)),
+        **kwargs
+    )
+    return completed, results
+
+
+class TestZipSource:
+    """Тесты чтения центрального каталога."""
+
+    def test_reads_entries(self, tmp_path):
+        _, archive = _build(tmp_path)
+
+        source = ZipSource(archive)
+        source.close()
+
+        with zipfile.ZipFile(archive) as zf:
+            expected = {info.filename: (info.CRC, info.file_size, info.compress_size) for info in zf.infolist()}
+        assert {e.arcname: (e.crc, e.file_size, e.compressed_size) for e in source.entries} == expected
+
+    def test_rejects_non_zip(self, tmp_path):
+        path = tmp_path / "bad.zip"
+        path.write_bytes(b"not a zip")
+
+        with pytest.raises(ValueError):
+            ZipSource(str(path))
+
+    def test_rejects_missing_zip64_sizes(self, tmp_path):
+        path = tmp_path / "bad.zip"
+        _legacy_zip(path, b"a.txt", b"abc")
+        data = bytearray(path.read_bytes())
+        # Размер в центральном каталоге отмечен как ZIP64, но поля ZIP64 нет
+        central = data.index(b"PK\x01\x02")
+        data[central + 20:central + 28] = b"\xff" * 8
+        path.write_bytes(bytes(data))
+
+        with pytest.raises(ValueError):
+            ZipSource(str(path))
+
+
+class TestZipUpdater:
+    """Тесты обновления архива."""
+
+    def test_only_changed_files_compressed(self, tmp_path, monkeypatch):
+        src, archive = _build(tmp_path)
+        (tmp_path / "src" / "b.txt").write_bytes(b"new content")
+        (tmp_path / "src" / "d.txt").write_bytes(b"added")
+        # Время изменилось у обоих файлов того же размера: решает CRC
+        later = time.time() + 100
+        os.utime(tmp_path / "src" / "a.txt", (later, later))
+        os.utime(tmp_path / "src" / "b.txt", (later, later))
+        compressed = []
+        original = ParallelZipArchiver.compress_entry
+        monkeypatch.setattr(
+            ParallelZipArchiver, 'compress_entry',
+            lambda self, entry: compressed.append(entry.arcname) or original(self, entry)
+        )
+
+        completed, results = _update(src, archive)
+
+        assert completed
+        assert results["src/a.txt"] == (True, None)
+        assert results["src/вложенная/c.bin"] == (True, None)
+        assert results["src/b.txt"] == (False, None)
+        assert sorted(name.replace(os.sep, '/') for name in compressed) == ["src/b.txt", "src/d.txt"]
+        with zipfile.ZipFile(archive) as zf:
+            assert zf.testzip() is None
+            assert zf.read("src/b.txt") == b"new content"
+            assert zf.read("src/a.txt") == b"abc" * 10000
+            assert zf.read("src/вложенная/c.bin") == (tmp_path / "src" / "вложенная" / "c.bin").read_bytes()
+        assert [name for name in os.listdir(tmp_path) if name.endswith('.part')] == []
+
+    def test_missing_files_kept_or_removed(self, tmp_path):
+        src, archive = _build(tmp_path)
+        os.remove(tmp_path / "src" / "b.txt")
+
+        _update(src, archive)
+        with zipfile.ZipFile(archive) as zf:
+            assert zf.read("src/b.txt") == b"old content"
+
+        updater = ZipUpdater()
+        updater.update(archive, iter_entries([src]), remove_missing=True)
+        with zipfile.ZipFile(archive) as zf:
+            assert "src/b.txt" not in zf.namelist()
+        assert updater.removed_count == 1
+
+    def test_cancel_keeps_original(self, tmp_path):
+        src, archive = _build(tmp_path)
+        original = open(archive, 'rb').read()
+
+        completed, _ = _update(src, archive, cancel_check=lambda: True)
+
+        assert not completed
+        assert open(archive, 'rb').read() == original
+
+
+class TestLegacyNames:
+    """Тесты имен записей без флага UTF-8."""
+
+    @pytest.mark.parametrize('encoding', ['utf-8', 'cp866'])
+    def test_legacy_name_matched_and_kept(self, tmp_path, encoding):
+        (tmp_path / "src").mkdir()
+        (tmp_path / "src" / "пример.txt").write_bytes(b"data")
+        raw_name = "src/пример.txt".encode(encoding)
+        archive = _legacy_zip(tmp_path / "out.zip", raw_name, b"data")
+
+        completed, results = _update(str(tmp_path / "src"), archive)
+
+        assert completed
+        assert results["src/пример.txt"] == (True, None)
+        with zipfile.ZipFile(archive) as zf:
+            info, = zf.infolist()
+            assert info.flag_bits & 0x800 == 0
+            assert info.orig_filename.encode('cp437') == raw_name
+            assert zf.read(info) == b"data"
+
+    def test_unicode_path_extra(self, tmp_path):
+        (tmp_path / "src").mkdir()
+        (tmp_path / "src" / "пример.txt").write_bytes(b"data")
+        raw_name = b"src/??????.txt"
+        unicode_name = "src/пример.txt".encode('utf-8')
+        extra = struct.pack('<HHBI', 0x7075, 5 + len(unicode_name), 1, zlib.crc32(raw_name)) + unicode_name
+        archive = _legacy_zip(tmp_path / "out.zip", raw_name, b"data", extra)
+
+        completed, results = _update(str(tmp_path / "src"), archive)
+
+        assert completed
+        assert results["src/пример.txt"] == (True, None)
+        with zipfile.ZipFile(archive) as zf:
+            info, = zf.infolist()
+            assert info.orig_filename == "src/??????.txt"
+            assert extra in info.extra
+
+    def test_retained_entry_keeps_raw_name(self, tmp_path):
+        (tmp_path / "src").mkdir()
+        (tmp_path / "src" / "новый.txt").write_bytes(b"new")
+        raw_name = "src/старый.txt".encode('cp866')
+        archive = _legacy_zip(tmp_path / "out.zip", raw_name, b"old")
+
+        completed, _ = _update(str(tmp_path / "src"), archive)
+
+        assert completed
+        with zipfile.ZipFile(archive) as zf:
+            infos = {info.orig_filename.encode('cp437') if not info.flag_bits & 0x800 else info.filename: info
+                     for info in zf.infolist()}
+            assert set(infos) == {raw_name, "src/новый.txt"}
+            assert zf.read(infos[raw_name]) == b"old"
@@ -1,6 +1,7 @@
 """Диалоги для приложения."""
 
 import logging
+from typing import List, Optional
 from PyQt6.QtWidgets import (
     QMessageBox, QDialog, QVBoxLayout, QLabel, QPushButton,
     QProgressDialog, QDialogButtonBox
@@ -52,6 +53,34 @@ class ConfirmationDialog:
             QMessageBox.StandardButton.Ok | QMessageBox.StandardButton.Cancel
         )
         return reply == QMessageBox.StandardButton.Ok
+    
+    @staticmethod
+    def askchoice(parent, title: str, message: str, choices: List[str],
+                  cancel_text: str = "Отмена") -> Optional[int]:
+        """Показать диалог выбора одного из нескольких действий.
+        
+        Args:
+            parent: Родительский виджет
+            title: Заголовок диалога
+            message: Сообщение
+            choices: Подписи кнопок действий
+            cancel_text: Подпись кнопки отказа
+            
+        Returns:
+            Индекс выбранного действия или None при отказе
+        """
+        box = QMessageBox(parent)
+        box.setIcon(QMessageBox.Icon.Warning)
+        box.setWindowTitle(title)
+        box.setText(message)
+        buttons = [box.addButton(text, QMessageBox.ButtonRole.AcceptRole) for text in choices]
+        box.addButton(cancel_text, QMessageBox.ButtonRole.RejectRole)
+        box.exec()
+        clicked = box.clickedButton()
+        for index, button in enumerate(buttons):
+            if clicked is button:
+                return index
+        return None
 
 
 class InfoDialog:
@@ -6,6 +6,7 @@ from pathlib import Path
 from typing import List, Optional
 from PyQt6.QtWidgets import QFileDialog, QMessageBox
 
+from core.domain.file_batch import FileBatch
 from utils.path_processing import normalize_path
 
 logger = logging.getLogger(__name__)
@@ -138,7 +139,12 @@ class FileAdder:
             
             # Проверка на дубликаты
             files_list = self._get_files_list()
-            for file_data in files_list:
+            if isinstance(files_list, FileBatch):
+                # Поиск по столбцам, без обхода объектов
+                if files_list.find_full_path(normalized_path) >= 0:
+                    return False
+            else:
+                for file_data in files_list:
                     if hasattr(file_data, 'full_path'):
                         if file_data.full_path == normalized_path:
                             return False
@@ -180,7 +186,12 @@ class FileAdder:
             
             # Проверка на дубликаты
             files_list = self._get_files_list()
-            for file_data in files_list:
+            if isinstance(files_list, FileBatch):
+                # Поиск по столбцам, без обхода объектов
+                if files_list.find_full_path(normalized_path) >= 0:
+                    return False
+            else:
+                for file_data in files_list:
                     if hasattr(file_data, 'full_path'):
                         if file_data.full_path == normalized_path:
                             return False
@@ -56,21 +56,9 @@ class TreeViewManager:
             return
         
         # Добавляем файлы в дерево
-        for file_data in files:
+        for old_name, new_name, extension, full_path in self._iter_rows(files):
             item = QTreeWidgetItem(tree)
             
-            # Получаем данные файла
-            if hasattr(file_data, 'old_name'):
-                old_name = file_data.old_name or ''
-                new_name = file_data.new_name if hasattr(file_data, 'new_name') and file_data.new_name else old_name
-                extension = file_data.extension or ''
-                full_path = file_data.full_path or (str(file_data.path) if hasattr(file_data, 'path') else '')
-            else:
-                old_name = file_data.get('old_name', '')
-                new_name = file_data.get('new_name', old_name)
-                extension = file_data.get('extension', '')
-                full_path = file_data.get('full_path', '')
-            
             # Устанавливаем значения колонок
             item.setText(0, os.path.basename(full_path) if full_path else old_name)
             item.setText(1, old_name)
@@ -86,6 +74,31 @@ class TreeViewManager:
             count = len(files)
             self.app.files_label.setText(f"Список файлов (Файлов: {count})")
     
+    @staticmethod
+    def _iter_rows(files):
+        """Данные строк: (старое имя, новое имя, расширение, полный путь).
+        
+        FileBatch отдает столбцы напрямую, без создания объектов FileInfo.
+        """
+        if hasattr(files, 'iter_rows'):
+            for old_name, new_name, extension, full_path in files.iter_rows():
+                old_name = old_name or ''
+                yield old_name, new_name or old_name, extension or '', full_path or ''
+            return
+        for file_data in files:
+            # Получаем данные файла
+            if hasattr(file_data, 'old_name'):
+                old_name = file_data.old_name or ''
+                new_name = file_data.new_name if hasattr(file_data, 'new_name') and file_data.new_name else old_name
+                extension = file_data.extension or ''
+                full_path = file_data.full_path or (str(file_data.path) if hasattr(file_data, 'path') else '')
+            else:
+                old_name = file_data.get('old_name', '')
+                new_name = file_data.get('new_name', old_name)
+                extension = file_data.get('extension', '')
+                full_path = file_data.get('full_path', '')
+            yield old_name, new_name, extension, full_path
+    
     def update_status(self) -> None:
         """Обновление статуса (для совместимости)."""
         self.refresh_treeview()
@@ -48,6 +48,46 @@ class ConverterWorker(QThread):
         """Отмена операции."""
         self.cancelled = True
     
+    def _save_conversion_cache(self):
+        """Сохранение кеша конвертации (повторный запуск пропустит готовые файлы)."""
+        cache = getattr(self.app.file_converter, 'conversion_cache', None)
+        if cache is not None:
+            cache.save()
+    
+    def _release_com_sessions(self):
+        """Закрытие Word/PowerPoint, открытых этим потоком (COM привязан к потоку)."""
+        try:
+            from core.converter.com_session_pool import release_com_sessions
+            release_com_sessions()
+        except ImportError:
+            pass
+    
+    def _plan_outputs(self) -> List[Optional[str]]:
+        """Расчет всех выходных путей пакета до начала конвертации.
+        
+        Коллизии имен разрешаются заранее (имя_001, имя_002...), папки
+        для страниц PDF резервируются сразу - рабочий цикл не проверяет
+        файловую систему в поисках свободного имени.
+        
+        Returns:
+            Выходные пути в порядке файлов (None - формат не меняется)
+        """
+        from core.converter.output_planner import OutputPlanner
+        
+        converter = self.app.file_converter
+        planner = OutputPlanner()
+        jobs = [
+            (f.file_path, f.target_format if f.target_format != f.source_format else None)
+            for f in self.files
+        ]
+        output_paths = planner.plan(jobs)
+        image_formats = getattr(converter, 'supported_image_formats', {})
+        for converter_file in self.files:
+            if converter_file.source_format == '.pdf' and converter_file.target_format in image_formats:
+                planner.plan_converted_folder(converter_file.file_path)
+        converter.output_planner = planner
+        return output_paths
+    
     def run(self):
         """Выполнение конвертации."""
         try:
@@ -58,25 +98,26 @@ class ConverterWorker(QThread):
             total = len(self.files)
             success_count = 0
             error_count = 0
+            output_paths = self._plan_outputs()
             
             for i, converter_file in enumerate(self.files):
                 if self.cancelled:
+                    self._save_conversion_cache()
                     self.finished.emit(False, "Операция отменена")
                     return
                 
                 try:
-                    # Определяем путь для сохранения
-                    output_path = None
-                    if converter_file.target_format != converter_file.source_format:
-                        base_name = os.path.splitext(converter_file.file_path)[0]
-                        output_path = base_name + converter_file.target_format
-                    
-                    # Выполняем конвертацию
-                    success, message, converted_path = self.app.file_converter.convert(
-                        converter_file.file_path,
-                        converter_file.target_format,
-                        output_path
-                    )
+                    # Путь для сохранения рассчитан заранее планировщиком
+                    output_path = output_paths[i]
+                    if output_path is None and converter_file.target_format != converter_file.source_format:
+                        success, message, converted_path = False, "Не удалось подобрать свободное имя файла", None
+                    else:
+                        # Выполняем конвертацию
+                        success, message, converted_path = self.app.file_converter.convert(
+                            converter_file.file_path,
+                            converter_file.target_format,
+                            output_path
+                        )
                     
                     if success:
                         success_count += 1
@@ -108,10 +149,55 @@ class ConverterWorker(QThread):
                 
                 self.progress.emit(i + 1, total)
             
+            self._save_conversion_cache()
             message = f"Конвертировано: {success_count}, ошибок: {error_count}"
             self.finished.emit(success_count > 0, message)
             
         except Exception as e:
             logger.error(f"Критическая ошибка при конвертации: {e}", exc_info=True)
             self.finished.emit(False, f"Критическая ошибка: {str(e)}")
+        finally:
+            if hasattr(self.app, 'file_converter') and self.app.file_converter:
+                self.app.file_converter.output_planner = None
+            self._release_com_sessions()
+
 
+class ImagesToPdfWorker(QThread):
+    """Поток для объединения изображений в один PDF."""
+    
+    progress = pyqtSignal(int, int)  # current, total
+    finished = pyqtSignal(bool, str)  # success, message
+    
+    def __init__(self, app, file_paths: List[str], output_path: str):
+        """Инициализация потока.
+        
+        Args:
+            app: Экземпляр приложения
+            file_paths: Пути к изображениям (в порядке страниц)
+            output_path: Путь для сохранения PDF
+        """
+        super().__init__()
+        self.app = app
+        self.file_paths = list(file_paths)
+        self.output_path = output_path
+        self.cancelled = False
+    
+    def cancel(self):
+        """Отмена операции."""
+        self.cancelled = True
+    
+    def run(self):
+        """Сборка PDF."""
+        try:
+            if not hasattr(self.app, 'file_converter') or not self.app.file_converter:
+                self.finished.emit(False, "Конвертер файлов не инициализирован")
+                return
+            success, message, _ = self.app.file_converter.convert_images_to_pdf(
+                self.file_paths, self.output_path,
+                progress_callback=self.progress.emit,
+                cancel_check=lambda: self.cancelled
+            )
+            self.finished.emit(success, message)
+        except Exception as e:
+            logger.error(f"Критическая ошибка при сборке PDF: {e}", exc_info=True)
+            self.finished.emit(False, f"Критическая ошибка: {str(e)}")
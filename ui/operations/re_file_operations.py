@@ -3,7 +3,8 @@
 import logging
 from typing import List, Optional
 from PyQt6.QtCore import QThread, pyqtSignal
-from core.domain.file_info import FileInfo
+from core.domain.file_batch import FileBatch
+from core.domain.file_info import FileInfo, FileStatus
 from core.re_file_methods import ReFileMethod
 
 logger = logging.getLogger(__name__)
@@ -138,6 +139,11 @@ class ApplyMethodsWorker(QThread):
         try:
             total = len(self.files)
             
+            if isinstance(self.files, FileBatch):
+                self._apply_to_batch(self.files, total)
+                self.finished.emit()
+                return
+            
             for i, file_info in enumerate(self.files):
                 try:
                     # Применяем методы
@@ -164,4 +170,23 @@ class ApplyMethodsWorker(QThread):
         except Exception as e:
             logger.error(f"Критическая ошибка при применении методов: {e}", exc_info=True)
             self.finished.emit()
-
+    
+    def _apply_to_batch(self, files: FileBatch, total: int) -> None:
+        """Применение методов по столбцам FileBatch (без создания объектов FileInfo)."""
+        for i in range(total):
+            # Применяем методы
+            new_name = files.old_names[i]
+            new_ext = files.extensions[i]
+            path = files.path_str(i)
+            try:
+                for method in self.methods:
+                    new_name, new_ext = method.apply(new_name, new_ext, path)
+                
+                files.set_names(i, new_name, new_ext)
+                files.set_status(i, FileStatus.READY)
+                
+            except Exception as e:
+                logger.error(f"Ошибка при применении методов к {path}: {e}", exc_info=True)
+                files.set_status(i, FileStatus.ERROR, f"Ошибка: {str(e)}")
+            
+            self.progress.emit(i + 1, total)
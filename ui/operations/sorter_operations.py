@@ -2,10 +2,11 @@
 
 import logging
 import os
-import shutil
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from PyQt6.QtCore import QThread, pyqtSignal
 
+from core.sorter import SorterEngine, SorterPlan, SortResult
+
 logger = logging.getLogger(__name__)
 
 
@@ -15,8 +16,16 @@ class SorterWorker(QThread):
     progress = pyqtSignal(int, int)  # current, total
     file_processed = pyqtSignal(str, bool, str)  # file_path, success, message
     finished = pyqtSignal(bool, str)  # success, message
+    copy_progress = pyqtSignal(str, int, int)  # file_path, copied bytes, total bytes
     
-    def __init__(self, app, files: List[str], target_folder: str, filters: List[Dict[str, Any]]):
+    def __init__(
+        self,
+        app,
+        files: List[str],
+        target_folder: str,
+        filters: List[Dict[str, Any]],
+        plan: Optional[SorterPlan] = None
+    ):
         """Инициализация потока.
         
         Args:
@@ -24,43 +33,20 @@ class SorterWorker(QThread):
             files: Список путей к файлам для сортировки
             target_folder: Целевая папка для сортировки
             filters: Список фильтров
+            plan: Готовый план сортировки из предпросмотра (если None, строится заново)
         """
         super().__init__()
         self.app = app
         self.files = files
         self.target_folder = target_folder
         self.filters = filters
+        self.plan = plan
         self.cancelled = False
     
     def cancel(self):
         """Отмена операции."""
         self.cancelled = True
     
-    def _get_target_subfolder(self, file_path: str) -> str:
-        """Определение подпапки для файла.
-        
-        Args:
-            file_path: Путь к файлу
-            
-        Returns:
-            Имя подпапки или пустая строка
-        """
-        file_ext = os.path.splitext(file_path)[1].lower()
-        
-        for filter_data in self.filters:
-            if not filter_data.get('enabled', True):
-                continue
-            
-            filter_type = filter_data.get('type', 'extension')
-            filter_value = filter_data.get('value', '')
-            
-            if filter_type == 'extension':
-                extensions = [ext.strip().lower() for ext in filter_value.split(',')]
-                if file_ext in extensions:
-                    return filter_data.get('folder_name', '')
-        
-        return ""
-    
     def run(self):
         """Выполнение сортировки."""
         try:
@@ -73,74 +59,74 @@ class SorterWorker(QThread):
                 return
             
             total = len(self.files)
-            success_count = 0
-            error_count = 0
+            counts = {'success': 0, 'error': 0}
             
-            for i, file_path in enumerate(self.files):
-                if self.cancelled:
-                    self.finished.emit(False, "Операция отменена")
-                    return
-                
-                try:
-                    if not os.path.exists(file_path):
-                        error_count += 1
-                        self.file_processed.emit(
-                            file_path,
-                            False,
-                            "Файл не найден"
-                        )
-                        continue
-                    
-                    # Определяем подпапку
-                    subfolder_name = self._get_target_subfolder(file_path)
-                    if not subfolder_name:
-                        error_count += 1
-                        self.file_processed.emit(
-                            file_path,
-                            False,
-                            "Не определен фильтр"
-                        )
-                        continue
-                    
-                    # Создаем подпапку если нужно
-                    target_subfolder = os.path.join(self.target_folder, subfolder_name)
-                    os.makedirs(target_subfolder, exist_ok=True)
-                    
-                    # Определяем путь назначения
-                    target_path = os.path.join(target_subfolder, os.path.basename(file_path))
-                    
-                    # Если файл уже существует, добавляем номер
-                    counter = 1
-                    base_target = target_path
-                    while os.path.exists(target_path):
-                        base_name, ext = os.path.splitext(base_target)
-                        target_path = f"{base_name}_{counter}{ext}"
-                        counter += 1
-                    
-                    # Перемещаем файл
-                    shutil.move(file_path, target_path)
-                    success_count += 1
-                    self.file_processed.emit(
-                        file_path,
-                        True,
-                        f"Перемещен в {subfolder_name}"
-                    )
-                    
-                except Exception as e:
-                    error_count += 1
-                    logger.error(f"Ошибка при сортировке {file_path}: {e}", exc_info=True)
-                    self.file_processed.emit(
-                        file_path,
-                        False,
-                        f"Ошибка: {str(e)}"
-                    )
-                
-                self.progress.emit(i + 1, total)
+            def on_result(result: SortResult):
+                counts['success' if result.success else 'error'] += 1
+                self.file_processed.emit(result.source, result.success, result.message)
+                self.progress.emit(counts['success'] + counts['error'], total)
+            
+            # Фильтры компилируются, папки создаются и читаются один раз на весь пакет
+            engine = SorterEngine(self.target_folder, self.filters)
+            if self.plan is not None:
+                # План из предпросмотра: классификация не повторяется,
+                # перечитываются только папки назначения
+                plan = self.plan
+                plan.set_target_folder(self.target_folder)
+                plan.refresh()
+            else:
+                plan = engine.create_plan(self.files)
+            for result in plan.errors():
+                on_result(result)
+            
+            # Прогресс копирования больших файлов на другой диск
+            if not engine.execute(plan.moves(), on_result, lambda: self.cancelled, self.copy_progress.emit):
+                self.finished.emit(False, "Операция отменена")
+                return
             
-            message = f"Отсортировано: {success_count}, ошибок: {error_count}"
-            self.finished.emit(success_count > 0, message)
+            message = f"Отсортировано: {counts['success']}, ошибок: {counts['error']}"
+            self.finished.emit(counts['success'] > 0, message)
             
         except Exception as e:
             logger.error(f"Критическая ошибка при сортировке: {e}", exc_info=True)
             self.finished.emit(False, f"Критическая ошибка: {str(e)}")
 
+
+class SorterPlanWorker(QThread):
+    """Поток для построения и обновления плана сортировки."""
+    
+    plan_ready = pyqtSignal(object)  # SorterPlan
+    
+    def __init__(
+        self,
+        plan: SorterPlan,
+        files: List[str],
+        filters: List[Dict[str, Any]],
+        target_folder: str
+    ):
+        """Инициализация потока.
+        
+        Args:
+            plan: План для обновления
+            files: Актуальный список файлов
+            filters: Актуальный список фильтров
+            target_folder: Актуальная папка назначения
+        """
+        super().__init__()
+        self.plan = plan
+        self.files = list(files)
+        self.filters = list(filters)
+        self.target_folder = target_folder
+    
+    def run(self):
+        """Синхронизация плана с файлами, фильтрами и папкой назначения."""
+        try:
+            current = set(self.files)
+            removed = [entry.source for entry in self.plan.entries if entry.source not in current]
+            self.plan.remove_files(removed)
+            self.plan.set_filters(self.filters)
+            self.plan.set_target_folder(self.target_folder)
+            self.plan.add_files(self.files)
+        except Exception as e:
+            logger.error(f"Ошибка при построении плана сортировки: {e}", exc_info=True)
+        self.plan_ready.emit(self.plan)
@@ -2,34 +2,53 @@
 
 import logging
 import os
-import zipfile
-from typing import List
+from typing import List, Optional
 from PyQt6.QtCore import QThread, pyqtSignal
 
+from core.archive import ArchiveEntry, EntryProducer, create_backend, run_benchmark, sample_entries
+from core.archive.estimator import CompressedSizeEstimator
+from core.archive.zip_writer import ZIP_STORED
+
 logger = logging.getLogger(__name__)
 
 
 class ZipWorker(QThread):
     """Поток для выполнения сжатия файлов."""
     
-    progress = pyqtSignal(int, int)  # current, total
+    progress = pyqtSignal(int, int)  # обработано КБ, всего КБ (растет во время обхода)
     file_processed = pyqtSignal(str, bool, str)  # file_path, success, message
     finished = pyqtSignal(bool, str, str)  # success, message, zip_path
     
-    def __init__(self, app, files: List[str], compression_level: int = 6, output_path: str = None):
+    def __init__(
+        self,
+        app,
+        files: List[str],
+        compression_level: int = 6,
+        output_path: str = None,
+        volume_size: Optional[int] = None,
+        backend: str = 'zip',
+        update: bool = False
+    ):
         """Инициализация потока.
         
         Args:
             app: Экземпляр приложения
             files: Список путей к файлам для сжатия
             compression_level: Уровень сжатия (0-9)
-            output_path: Путь для сохранения ZIP файла
+            output_path: Путь для сохранения архива
+            volume_size: Размер тома в байтах (None - архив одним файлом)
+            backend: Формат архива (см. core.archive.backends)
+            update: Обновить существующий архив (сжимаются только
+                    новые и измененные файлы)
         """
         super().__init__()
         self.app = app
         self.files = files
         self.compression_level = compression_level
         self.output_path = output_path
+        self.volume_size = volume_size
+        self.backend = backend
+        self.update = update
         self.cancelled = False
     
     def cancel(self):
@@ -43,83 +62,120 @@ class ZipWorker(QThread):
                 self.finished.emit(False, "Нет файлов для сжатия", "")
                 return
             
-            # Определяем путь для сохранения ZIP
+            try:
+                backend = create_backend(self.backend, self.compression_level)
+            except ValueError as e:
+                self.finished.emit(False, str(e), "")
+                return
+            
+            # Определяем путь для сохранения архива
             if not self.output_path:
                 # Используем директорию первого файла
                 first_file_dir = os.path.dirname(self.files[0])
-                zip_name = "Архив.zip"
-                self.output_path = os.path.join(first_file_dir, zip_name)
+                base_path = os.path.join(first_file_dir, "Архив")
+                self.output_path = base_path + backend.extension
                 
                 # Если файл существует, добавляем номер
                 counter = 1
-                base_path = self.output_path
                 while os.path.exists(self.output_path):
-                    base_name = os.path.splitext(base_path)[0]
-                    self.output_path = f"{base_name}_{counter}.zip"
+                    self.output_path = f"{base_path}_{counter}{backend.extension}"
                     counter += 1
             
-            total = len(self.files)
+            update = (
+                self.update and backend.supports_update and not self.volume_size
+                and os.path.isfile(self.output_path)
+            )
+            
+            # Файлы перечисляются в отдельном потоке по мере архивации
+            producer = EntryProducer(self.files)
             success_count = 0
             error_count = 0
+            unchanged_count = 0
+            file_groups = set(self.files)
+            seen_groups = set()
+            # Текущий исходный элемент: записи одного элемента идут подряд
+            current_group: Optional[str] = None
+            current_error: Optional[str] = None
+            current_stored = False
+            current_reused = True
+            current_is_dir = False
+            
+            def finish_group():
+                nonlocal success_count, error_count, unchanged_count
+                if current_group is None:
+                    return
+                if current_error:
+                    error_count += 1
+                    self.file_processed.emit(current_group, False, f"Ошибка: {current_error}")
+                    return
+                success_count += 1
+                if current_reused:
+                    unchanged_count += 1
+                    message = "Без изменений"
+                elif current_is_dir:
+                    message = "Директория добавлена в архив"
+                elif current_stored:
+                    message = "Добавлен в архив (без сжатия)"
+                else:
+                    message = "Добавлен в архив"
+                self.file_processed.emit(current_group, True, message)
+            
+            def on_entry(entry: ArchiveEntry, error: Optional[str]):
+                nonlocal current_group, current_error, current_stored, current_reused, current_is_dir
+                if entry.group not in file_groups:
+                    # Сохраненная запись обновляемого архива
+                    return
+                if entry.group != current_group:
+                    finish_group()
+                    seen_groups.add(entry.group)
+                    current_group = entry.group
+                    current_error = None
+                    current_reused = True
+                    current_is_dir = entry.group != entry.source
+                if error and not current_error:
+                    current_error = error
+                current_stored = entry.method == ZIP_STORED
+                current_reused = current_reused and entry.reused
+            
+            def on_bytes(done_bytes: int):
+                # Прогресс в КБ: сигнал передает 32-битные значения
+                total_bytes = max(producer.scanned_bytes, done_bytes)
+                self.progress.emit(done_bytes // 1024, max(1, total_bytes // 1024))
             
             try:
-                with zipfile.ZipFile(self.output_path, 'w', zipfile.ZIP_DEFLATED, compresslevel=self.compression_level) as zipf:
-                    for i, file_path in enumerate(self.files):
-                        if self.cancelled:
-                            self.finished.emit(False, "Операция отменена", "")
-                            return
-                        
-                        try:
-                            if os.path.exists(file_path):
-                                if os.path.isfile(file_path):
-                                    # Добавляем файл в архив
-                                    arcname = os.path.basename(file_path)
-                                    zipf.write(file_path, arcname)
-                                    success_count += 1
-                                    self.file_processed.emit(
-                                        file_path,
-                                        True,
-                                        "Добавлен в архив"
-                                    )
-                                elif os.path.isdir(file_path):
-                                    # Добавляем директорию в архив
-                                    for root, dirs, filenames in os.walk(file_path):
-                                        for filename in filenames:
-                                            file_full_path = os.path.join(root, filename)
-                                            arcname = os.path.relpath(file_full_path, os.path.dirname(file_path))
-                                            zipf.write(file_full_path, arcname)
-                                    success_count += 1
-                                    self.file_processed.emit(
-                                        file_path,
-                                        True,
-                                        "Директория добавлена в архив"
-                                    )
-                                else:
-                                    error_count += 1
-                                    self.file_processed.emit(
-                                        file_path,
-                                        False,
-                                        "Неизвестный тип"
-                                    )
-                            else:
-                                error_count += 1
-                                self.file_processed.emit(
-                                    file_path,
-                                    False,
-                                    "Файл не найден"
-                                )
-                        except Exception as e:
-                            error_count += 1
-                            logger.error(f"Ошибка при добавлении {file_path} в архив: {e}", exc_info=True)
-                            self.file_processed.emit(
-                                file_path,
-                                False,
-                                f"Ошибка: {str(e)}"
-                            )
-                        
-                        self.progress.emit(i + 1, total)
+                try:
+                    if update:
+                        completed = backend.update(
+                            self.output_path, producer, on_entry, lambda: self.cancelled, on_bytes
+                        )
+                    else:
+                        completed = backend.archive(
+                            producer, self.output_path, on_entry, lambda: self.cancelled,
+                            volume_size=self.volume_size, bytes_callback=on_bytes,
+                        )
+                finally:
+                    producer.stop()
+                if not completed:
+                    self.finished.emit(False, "Операция отменена", "")
+                    return
+                finish_group()
+                
+                for file_path, message in producer.errors:
+                    error_count += 1
+                    self.file_processed.emit(file_path, False, message)
+                for file_path in self.files:
+                    if file_path not in seen_groups and os.path.isdir(file_path):
+                        # Пустая директория
+                        success_count += 1
+                        self.file_processed.emit(file_path, True, "Директория добавлена в архив")
                 
-                message = f"Создан архив: {os.path.basename(self.output_path)}. Файлов: {success_count}, ошибок: {error_count}"
+                if update:
+                    message = (
+                        f"Обновлен архив: {os.path.basename(self.output_path)}. "
+                        f"Файлов: {success_count}, без изменений: {unchanged_count}, ошибок: {error_count}"
+                    )
+                else:
+                    message = f"Создан архив: {os.path.basename(self.output_path)}. Файлов: {success_count}, ошибок: {error_count}"
                 self.finished.emit(success_count > 0, message, self.output_path)
                 
             except Exception as e:
@@ -130,3 +186,73 @@ class ZipWorker(QThread):
             logger.error(f"Критическая ошибка при сжатии: {e}", exc_info=True)
             self.finished.emit(False, f"Критическая ошибка: {str(e)}", "")
 
+
+
+class ZipEstimateWorker(QThread):
+    """Поток для оценки размера файлов после сжатия."""
+    
+    estimated = pyqtSignal(object)  # SizeEstimate
+    
+    def __init__(self, estimator: CompressedSizeEstimator, files: List[str], compression_level: int,
+                 backend: str = 'zip'):
+        """Инициализация потока.
+        
+        Args:
+            estimator: Оценщик с кэшем (общий для всех обновлений списка)
+            files: Список путей к файлам и папкам
+            compression_level: Уровень сжатия (0-9)
+            backend: Формат архива
+        """
+        super().__init__()
+        self.estimator = estimator
+        self.files = list(files)
+        self.compression_level = compression_level
+        self.backend = backend
+        self.cancelled = False
+    
+    def cancel(self):
+        """Отмена операции."""
+        self.cancelled = True
+    
+    def run(self):
+        """Оценка размеров; результаты передаются по мере готовности."""
+        for file_path in self.files:
+            if self.cancelled:
+                return
+            try:
+                estimate = self.estimator.estimate(file_path, self.compression_level, self.backend)
+            except Exception as e:
+                logger.debug(f"Ошибка оценки размера {file_path}: {e}")
+                continue
+            self.estimated.emit(estimate)
+
+
+class ZipBenchmarkWorker(QThread):
+    """Поток для сравнения форматов архивов на выборке файлов."""
+    
+    result_ready = pyqtSignal(object)  # BenchmarkResult
+    finished = pyqtSignal(list)  # список BenchmarkResult
+    
+    def __init__(self, files: List[str]):
+        """Инициализация потока.
+        
+        Args:
+            files: Список путей к файлам и папкам
+        """
+        super().__init__()
+        self.files = list(files)
+        self.cancelled = False
+    
+    def cancel(self):
+        """Отмена операции."""
+        self.cancelled = True
+    
+    def run(self):
+        """Архивация выборки каждым форматом."""
+        try:
+            sample = sample_entries(self.files)
+            results = run_benchmark(sample, result_callback=self.result_ready.emit, cancel_check=lambda: self.cancelled)
+        except Exception as e:
+            logger.error(f"Ошибка сравнения форматов: {e}", exc_info=True)
+            results = []
+        self.finished.emit(results)
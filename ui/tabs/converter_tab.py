@@ -6,7 +6,7 @@ from typing import List
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout,
     QTreeWidget, QTreeWidgetItem, QPushButton, QLabel,
-    QComboBox, QHeaderView
+    QComboBox, QHeaderView, QSpinBox, QLineEdit, QCheckBox
 )
 from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QFont
@@ -14,6 +14,14 @@ from ui.components.drag_drop import DragDropMixin
 
 logger = logging.getLogger(__name__)
 
+# Подписи профилей конвертации изображений
+IMAGE_PROFILE_LABELS = {
+    'quality': "Качество",
+    'balanced': "Баланс",
+    'fast': "Быстро",
+    'thumbnail': "Миниатюры",
+}
+
 
 class ConverterTab(QWidget, DragDropMixin):
     """Вкладка Конвертация."""
@@ -89,6 +97,45 @@ class ConverterTab(QWidget, DragDropMixin):
             self.format_combo.addItems(unique_formats)
         control_layout.addWidget(self.format_combo, 1)  # stretch=1
         
+        # Параметры растеризации PDF (видны при конвертации в изображение)
+        self.pdf_dpi_spin = QSpinBox()
+        self.pdf_dpi_spin.setRange(36, 600)
+        self.pdf_dpi_spin.setSingleStep(24)
+        self.pdf_dpi_spin.setValue(144)
+        self.pdf_dpi_spin.setSuffix(" dpi")
+        self.pdf_dpi_spin.setToolTip("Разрешение страниц PDF")
+        control_layout.addWidget(self.pdf_dpi_spin)
+        
+        self.pdf_pages_edit = QLineEdit()
+        self.pdf_pages_edit.setPlaceholderText("Все страницы")
+        self.pdf_pages_edit.setToolTip("Страницы PDF, например 1-3,7")
+        self.pdf_pages_edit.setFixedWidth(90)
+        control_layout.addWidget(self.pdf_pages_edit)
+        
+        self.pdf_grayscale_check = QCheckBox("Ч/Б")
+        self.pdf_grayscale_check.setToolTip("Страницы PDF в оттенках серого")
+        control_layout.addWidget(self.pdf_grayscale_check)
+        
+        # Профиль конвертации изображений (скорость/сжатие)
+        from core.converter.image_profiles import DEFAULT_IMAGE_PROFILE, IMAGE_PROFILES
+        self.image_profile_combo = QComboBox()
+        for name in IMAGE_PROFILES:
+            self.image_profile_combo.addItem(IMAGE_PROFILE_LABELS.get(name, name), name)
+        self.image_profile_combo.setCurrentIndex(self.image_profile_combo.findData(DEFAULT_IMAGE_PROFILE))
+        self.image_profile_combo.setToolTip("Профиль конвертации изображений")
+        self.image_profile_combo.currentIndexChanged.connect(lambda index: self._on_image_profile_changed())
+        control_layout.addWidget(self.image_profile_combo)
+        
+        self.profiles_report_btn = QPushButton("⏱")
+        self.profiles_report_btn.setFixedSize(15, 15)
+        self.profiles_report_btn.setObjectName("profilesReportButton")
+        self.profiles_report_btn.setToolTip("Время конвертации по профилям")
+        self.profiles_report_btn.clicked.connect(self._show_profiles_report)
+        control_layout.addWidget(self.profiles_report_btn)
+        
+        self.format_combo.currentTextChanged.connect(self._update_pdf_options_visibility)
+        self._update_pdf_options_visibility(self.format_combo.currentText())
+        
         # Кнопка конвертации
         convert_btn = QPushButton("✓")
         convert_btn.setFixedSize(15, 15)
@@ -97,6 +144,14 @@ class ConverterTab(QWidget, DragDropMixin):
         convert_btn.clicked.connect(self._convert_files)
         control_layout.addWidget(convert_btn)
         
+        # Кнопка объединения изображений в один PDF
+        merge_pdf_btn = QPushButton("⧉")
+        merge_pdf_btn.setFixedSize(15, 15)
+        merge_pdf_btn.setObjectName("mergePdfButton")
+        merge_pdf_btn.setToolTip("Объединить изображения в один PDF")
+        merge_pdf_btn.clicked.connect(self._merge_images_to_pdf)
+        control_layout.addWidget(merge_pdf_btn)
+        
         parent.addLayout(control_layout)
     
     def _on_filter_changed(self, filter_text: str):
@@ -129,6 +184,70 @@ class ConverterTab(QWidget, DragDropMixin):
         self.format_combo.clear()
         self.format_combo.addItems(sorted(set(formats)))
     
+    def _is_image_format(self, target_format: str) -> bool:
+        """Является ли формат форматом изображения."""
+        converter = getattr(self.app, 'file_converter', None)
+        if not converter:
+            return False
+        if not target_format.startswith('.'):
+            target_format = '.' + target_format
+        return target_format.lower() in converter.supported_image_formats
+    
+    def _update_pdf_options_visibility(self, target_format: str):
+        """Показ параметров растеризации PDF только для форматов изображений.
+        
+        Args:
+            target_format: Выбранный формат
+        """
+        visible = self._is_image_format(target_format)
+        for widget in (self.pdf_dpi_spin, self.pdf_pages_edit, self.pdf_grayscale_check,
+                       self.image_profile_combo, self.profiles_report_btn):
+            widget.setVisible(visible)
+    
+    def _on_image_profile_changed(self):
+        """Передача выбранного профиля изображений конвертеру."""
+        converter = getattr(self.app, 'file_converter', None)
+        if not converter:
+            return
+        from core.converter.image_profiles import get_image_profile
+        converter.image_profile = get_image_profile(self.image_profile_combo.currentData())
+    
+    def _show_profiles_report(self):
+        """Отчет об измеренном времени конвертации по профилям."""
+        from core.converter.image_profiles import get_profiles_report
+        from ui.components.dialogs import InfoDialog
+        
+        lines = []
+        for name, stats in get_profiles_report().items():
+            label = IMAGE_PROFILE_LABELS.get(name, name)
+            if stats['files']:
+                lines.append(
+                    f"{label}: файлов {stats['files']}, "
+                    f"всего {stats['total_time']:.2f} с, в среднем {stats['average_time']:.3f} с"
+                )
+            else:
+                lines.append(f"{label}: нет конвертаций")
+        InfoDialog.showinfo(self, "Профили изображений", "\n".join(lines))
+    
+    def _apply_pdf_raster_options(self, target_format: str):
+        """Передача параметров растеризации PDF конвертеру.
+        
+        Args:
+            target_format: Целевой формат
+        """
+        converter = getattr(self.app, 'file_converter', None)
+        if not converter:
+            return
+        if not self._is_image_format(target_format):
+            converter.pdf_raster_options = None
+            return
+        from core.converter.pdf_rasterizer import RasterOptions
+        converter.pdf_raster_options = RasterOptions(
+            dpi=self.pdf_dpi_spin.value(),
+            grayscale=self.pdf_grayscale_check.isChecked(),
+            pages=self.pdf_pages_edit.text().strip() or None
+        )
+    
     def _create_files_panel(self, parent):
         """Создание панели со списком файлов."""
         # Таблица файлов
@@ -221,6 +340,8 @@ class ConverterTab(QWidget, DragDropMixin):
         for converter_file in self.app.converter_files:
             converter_file.target_format = target_format
         
+        self._apply_pdf_raster_options(target_format)
+        
         # Обновляем список
         self._refresh_files_list()
         
@@ -256,6 +377,63 @@ class ConverterTab(QWidget, DragDropMixin):
         worker.start()
         progress_dialog.exec()
     
+    def _merge_images_to_pdf(self):
+        """Объединение изображений из списка в один PDF (страницы в порядке списка)."""
+        from ui.components.dialogs import InfoDialog
+        
+        converter = getattr(self.app, 'file_converter', None)
+        image_formats = converter.supported_image_formats if converter else {}
+        images = [
+            cf.file_path for cf in getattr(self.app, 'converter_files', [])
+            if cf.source_format in image_formats
+        ]
+        if not images:
+            InfoDialog.showinfo(self, "Информация", "Нет изображений для объединения в PDF")
+            return
+        
+        from PyQt6.QtWidgets import QFileDialog
+        default_path = os.path.splitext(images[0])[0] + '.pdf'
+        output_path, _ = QFileDialog.getSaveFileName(
+            self, "Сохранить PDF", default_path, "PDF (*.pdf)"
+        )
+        if not output_path:
+            return
+        
+        from ui.operations.converter_operations import ImagesToPdfWorker
+        from ui.components.dialogs import ProgressDialog
+        
+        progress_dialog = ProgressDialog(
+            self,
+            "Объединение в PDF",
+            f"Изображений: {len(images)}"
+        )
+        
+        worker = ImagesToPdfWorker(self.app, images, output_path)
+        worker.progress.connect(lambda curr, total: progress_dialog.set_progress(curr, total))
+        worker.finished.connect(lambda success, msg: (
+            progress_dialog.close(),
+            self._on_merge_finished(success, msg)
+        ))
+        
+        progress_dialog.button_box.rejected.connect(worker.cancel)
+        
+        worker.start()
+        progress_dialog.exec()
+    
+    def _on_merge_finished(self, success: bool, message: str):
+        """Обработка завершения объединения в PDF.
+        
+        Args:
+            success: Успешно ли завершено
+            message: Сообщение
+        """
+        from ui.components.dialogs import InfoDialog
+        
+        if success:
+            InfoDialog.showinfo(self, "Успешно", message)
+        else:
+            InfoDialog.showerror(self, "Ошибка", message)
+    
     def _on_convert_finished(self, success: bool, message: str):
         """Обработка завершения конвертации.
         
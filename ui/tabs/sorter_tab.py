@@ -11,6 +11,7 @@ from PyQt6.QtWidgets import (
 )
 from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QFont
+from core.sorter import SorterPlan
 from ui.components.drag_drop import DragDropMixin
 
 logger = logging.getLogger(__name__)
@@ -30,6 +31,11 @@ class SorterTab(QWidget, DragDropMixin):
         DragDropMixin.__init__(self)
         self.app = app
         
+        # План сортировки строится в фоне и используется предпросмотром и сортировкой
+        self.sorter_plan = None
+        self._plan_worker = None
+        self._plan_pending = False
+        
         # Основной layout
         main_layout = QHBoxLayout(self)
         main_layout.setContentsMargins(5, 5, 5, 5)
@@ -180,6 +186,7 @@ class SorterTab(QWidget, DragDropMixin):
         
         # Загружаем фильтры из настроек
         self._load_filters()
+        self.filters_list.itemChanged.connect(lambda item, column: self._schedule_plan_update())
     
     def _load_filters(self):
         """Загрузка фильтров из настроек."""
@@ -228,6 +235,7 @@ class SorterTab(QWidget, DragDropMixin):
     def _add_filter(self):
         """Добавление нового фильтра."""
         self._add_filter_item()
+        self._schedule_plan_update()
     
     def _remove_filter(self):
         """Удаление выбранного фильтра."""
@@ -235,12 +243,14 @@ class SorterTab(QWidget, DragDropMixin):
         if current_item:
             index = self.filters_list.indexOfTopLevelItem(current_item)
             self.filters_list.takeTopLevelItem(index)
+            self._schedule_plan_update()
     
     def _browse_folder(self):
         """Выбор папки для сортировки."""
         folder = QFileDialog.getExistingDirectory(self, "Выберите папку для сортировки")
         if folder:
             self.folder_path.setText(folder)
+            self._schedule_plan_update()
     
     def _add_files(self):
         """Добавление файлов."""
@@ -276,41 +286,81 @@ class SorterTab(QWidget, DragDropMixin):
         for file_path in self.app.sorter_files:
             item = QTreeWidgetItem(self.tree)
             item.setText(0, os.path.basename(file_path))
-            
-            # Определяем папку назначения по фильтрам
-            target_folder = self._get_target_folder(file_path)
-            item.setText(1, target_folder if target_folder else "Не определено")
+            # Папка назначения заполняется после построения плана
+            item.setText(1, "...")
             item.setText(2, "Готов")
             item.setData(0, Qt.ItemDataRole.UserRole, file_path)
         
         if hasattr(self.app, 'sorter_files_label'):
             count = len(self.app.sorter_files)
             self.app.sorter_files_label.setText(f"Список файлов (Файлов: {count})")
+        
+        self._schedule_plan_update()
     
-    def _get_target_folder(self, file_path: str) -> str:
-        """Определение папки назначения для файла.
+    def _schedule_plan_update(self):
+        """Обновление плана сортировки в фоновом потоке.
+        
+        Если поток уже работает, обновление выполняется после его завершения
+        с актуальными файлами и фильтрами.
+        """
+        if self._plan_worker is not None:
+            self._plan_pending = True
+            return
+        
+        from ui.operations.sorter_operations import SorterPlanWorker
+        
+        filters = self._collect_filters()
+        target_folder = self.folder_path.text()
+        if self.sorter_plan is None:
+            self.sorter_plan = SorterPlan(target_folder, [])
+        
+        self._plan_pending = False
+        self._plan_worker = SorterPlanWorker(
+            self.sorter_plan, getattr(self.app, 'sorter_files', []), filters, target_folder
+        )
+        self._plan_worker.plan_ready.connect(self._on_plan_ready)
+        self._plan_worker.start()
+    
+    def _on_plan_ready(self, plan):
+        """Отображение плана сортировки в списке файлов.
         
         Args:
-            file_path: Путь к файлу
-            
-        Returns:
-            Имя папки назначения или пустая строка
+            plan: Обновленный план
         """
-        file_ext = os.path.splitext(file_path)[1].lower()
+        self._plan_worker = None
+        if self._plan_pending:
+            self._schedule_plan_update()
+            return
+        
+        for i in range(self.tree.topLevelItemCount()):
+            item = self.tree.topLevelItem(i)
+            entry = plan.entry(item.data(0, Qt.ItemDataRole.UserRole))
+            if entry is None or not entry.destination:
+                item.setText(1, "Не определено")
+            else:
+                item.setText(1, os.path.relpath(entry.destination, plan.target_folder))
+    
+    def _collect_filters(self) -> List[Dict[str, Any]]:
+        """Сбор активных фильтров из списка.
         
+        Returns:
+            Список фильтров в порядке списка
+        """
+        filters = []
         for i in range(self.filters_list.topLevelItemCount()):
             item = self.filters_list.topLevelItem(i)
             if item.checkState(3) == Qt.CheckState.Checked:
-                folder_name = item.text(0)
-                filter_type = item.text(1)
-                filter_value = item.text(2)
-                
-                if filter_type == "extension":
-                    extensions = [ext.strip().lower() for ext in filter_value.split(',')]
-                    if file_ext in extensions:
-                        return folder_name
-        
-        return ""
+                filter_data = item.data(0, Qt.ItemDataRole.UserRole)
+                if filter_data:
+                    filters.append(filter_data)
+                else:
+                    filters.append({
+                        'folder_name': item.text(0),
+                        'type': item.text(1),
+                        'value': item.text(2),
+                        'enabled': True
+                    })
+        return filters
     
     def _clear_files(self):
         """Очистка списка файлов."""
@@ -319,6 +369,7 @@ class SorterTab(QWidget, DragDropMixin):
         self.tree.clear()
         if hasattr(self.app, 'sorter_files_label'):
             self.app.sorter_files_label.setText("Список файлов (Файлов: 0)")
+        self._schedule_plan_update()
     
     def _sort_files(self):
         """Сортировка файлов."""
@@ -343,20 +394,7 @@ class SorterTab(QWidget, DragDropMixin):
             return
         
         # Собираем активные фильтры
-        filters = []
-        for i in range(self.filters_list.topLevelItemCount()):
-            item = self.filters_list.topLevelItem(i)
-            if item.checkState(3) == Qt.CheckState.Checked:
-                filter_data = item.data(0, Qt.ItemDataRole.UserRole)
-                if filter_data:
-                    filters.append(filter_data)
-                else:
-                    filters.append({
-                        'folder_name': item.text(0),
-                        'type': item.text(1),
-                        'value': item.text(2),
-                        'enabled': True
-                    })
+        filters = self._collect_filters()
         
         # Создаем поток для сортировки
         from ui.operations.sorter_operations import SorterWorker
@@ -368,9 +406,19 @@ class SorterTab(QWidget, DragDropMixin):
             "Выполняется сортировка..."
         )
         
-        worker = SorterWorker(self.app, self.app.sorter_files, folder_path, filters)
+        # Актуальный план из предпросмотра выполняется без повторной классификации
+        plan = self.sorter_plan if self._plan_worker is None and not self._plan_pending else None
+        if plan is not None and [entry.source for entry in plan.entries] != self.app.sorter_files:
+            plan = None
+        if plan is not None and plan.filters != filters:
+            plan = None
+        
+        worker = SorterWorker(self.app, self.app.sorter_files, folder_path, filters, plan)
         worker.progress.connect(lambda curr, total: progress_dialog.set_progress(curr, total))
         worker.file_processed.connect(lambda path, success, msg: progress_dialog.set_message(f"{'✓' if success else '✗'} {os.path.basename(path)}"))
+        worker.copy_progress.connect(lambda path, copied, total: progress_dialog.set_message(
+            f"Копирование {os.path.basename(path)}: {copied * 100 // max(total, 1)}%"
+        ))
         worker.finished.connect(lambda success, msg: (
             progress_dialog.close(),
             self._on_sort_finished(success, msg)
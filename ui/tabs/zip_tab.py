@@ -6,14 +6,26 @@ from typing import List
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout,
     QTreeWidget, QTreeWidgetItem, QPushButton, QLabel, QComboBox,
-    QHeaderView, QFileDialog
+    QHeaderView, QFileDialog, QCheckBox
 )
 from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QFont
+from core.archive import available_backends, resolve_preset
+from core.archive.backends import BACKENDS
+from core.archive.estimator import CompressedSizeEstimator
 from ui.components.drag_drop import DragDropMixin
 
 logger = logging.getLogger(__name__)
 
+try:
+    from config.constants import ARCHIVE_PRESETS, ARCHIVE_VOLUME_SIZES
+except ImportError:
+    ARCHIVE_PRESETS = {}
+    ARCHIVE_VOLUME_SIZES = {"Не разбивать": None}
+
+# Пункт списка пресетов, при котором формат и уровень выбираются вручную
+CUSTOM_PRESET = "Свой"
+
 
 class ZipTab(QWidget, DragDropMixin):
     """Вкладка Сжатие."""
@@ -29,6 +41,11 @@ class ZipTab(QWidget, DragDropMixin):
         DragDropMixin.__init__(self)
         self.app = app
         
+        # Оценка размера после сжатия выполняется в фоне, результаты кэшируются
+        self._estimator = CompressedSizeEstimator()
+        self._estimate_worker = None
+        self._items = {}
+        
         # Основной layout - вертикальный
         main_layout = QVBoxLayout(self)
         main_layout.setContentsMargins(5, 5, 5, 5)
@@ -65,6 +82,33 @@ class ZipTab(QWidget, DragDropMixin):
         clear_btn.clicked.connect(self._clear_files)
         control_layout.addWidget(clear_btn)
         
+        # Пресет скорость/сжатие (выбирает формат и уровень)
+        preset_label = QLabel("Пресет:")
+        preset_label.setFont(QFont("Robot", 9))
+        control_layout.addWidget(preset_label)
+        
+        self.preset_combo = QComboBox()
+        self.preset_combo.addItem(CUSTOM_PRESET)
+        for preset in ARCHIVE_PRESETS:
+            try:
+                resolve_preset(preset)
+            except ValueError:
+                continue
+            self.preset_combo.addItem(preset)
+        self.preset_combo.currentTextChanged.connect(self._apply_preset)
+        control_layout.addWidget(self.preset_combo)
+        
+        # Формат архива (недоступные форматы не показываются)
+        format_label = QLabel("Формат:")
+        format_label.setFont(QFont("Robot", 9))
+        control_layout.addWidget(format_label)
+        
+        self.format_combo = QComboBox()
+        for name in available_backends():
+            self.format_combo.addItem(BACKENDS[name].description, name)
+        self.format_combo.currentIndexChanged.connect(lambda index: self._on_format_changed())
+        control_layout.addWidget(self.format_combo)
+        
         # Метка "Сжатие:"
         compression_label = QLabel("Сжатие:")
         compression_label.setFont(QFont("Robot", 9))
@@ -81,8 +125,34 @@ class ZipTab(QWidget, DragDropMixin):
             "9 - Максимальное"
         ])
         self.compression_combo.setCurrentText("6 - Стандартное")
+        self.compression_combo.currentIndexChanged.connect(lambda index: self._on_level_changed())
         control_layout.addWidget(self.compression_combo)
         
+        # Размер тома (архив разбивается на части name.z01, ..., name.zip)
+        volume_label = QLabel("Тома:")
+        volume_label.setFont(QFont("Robot", 9))
+        control_layout.addWidget(volume_label)
+        
+        self.volume_combo = QComboBox()
+        self.volume_combo.addItems(list(ARCHIVE_VOLUME_SIZES))
+        control_layout.addWidget(self.volume_combo)
+        
+        # Обновление существующего архива вместо пересоздания
+        self.update_checkbox = QCheckBox("Обновить")
+        self.update_checkbox.setFont(QFont("Robot", 9))
+        self.update_checkbox.setToolTip(
+            "Если архив существует, сжимать только новые и измененные файлы"
+        )
+        control_layout.addWidget(self.update_checkbox)
+        
+        # Кнопка сравнения форматов на выборке файлов
+        benchmark_btn = QPushButton("⏱")
+        benchmark_btn.setFixedSize(15, 15)
+        benchmark_btn.setObjectName("benchmarkButton")
+        benchmark_btn.setToolTip("Сравнить форматы на выборке файлов")
+        benchmark_btn.clicked.connect(self._run_benchmark)
+        control_layout.addWidget(benchmark_btn)
+        
         # Кнопка сжатия
         compress_btn = QPushButton("📦")
         compress_btn.setFixedSize(15, 15)
@@ -129,54 +199,208 @@ class ZipTab(QWidget, DragDropMixin):
         if not hasattr(self.app, 'zip_files'):
             self.app.zip_files = []
         
+        # Существование файлов проверяется в фоне при оценке размера
+        known = set(self.app.zip_files)
         for file_path in file_paths:
-            if os.path.exists(file_path):
-                # Проверяем на дубликаты
-                if file_path not in self.app.zip_files:
-                    self.app.zip_files.append(file_path)
+            # Проверяем на дубликаты
+            if file_path not in known:
+                known.add(file_path)
+                self.app.zip_files.append(file_path)
         
         self._refresh_files_list()
     
     def _refresh_files_list(self):
         """Обновление списка файлов."""
         self.tree.clear()
+        self._items = {}
         
         if not hasattr(self.app, 'zip_files'):
             return
         
-        def format_size(size_bytes):
-            """Форматирование размера файла."""
-            for unit in ['Б', 'КБ', 'МБ', 'ГБ']:
-                if size_bytes < 1024.0:
-                    return f"{size_bytes:.1f} {unit}"
-                size_bytes /= 1024.0
-            return f"{size_bytes:.1f} ТБ"
-        
         for file_path in self.app.zip_files:
             item = QTreeWidgetItem(self.tree)
-            item.setText(0, os.path.basename(file_path) if os.path.isfile(file_path) else file_path)
-            
-            # Размер файла
-            if os.path.isfile(file_path):
-                file_size = os.path.getsize(file_path)
-                item.setText(1, format_size(file_size))
-                
-                # Примерный размер после сжатия (зависит от типа файла и уровня сжатия)
-                # Для простоты используем примерную оценку 50% для большинства файлов
-                estimated_size = file_size * 0.5
-                item.setText(2, format_size(estimated_size))
-            else:
-                item.setText(1, "—")
-                item.setText(2, "—")
-            
+            item.setText(0, os.path.basename(file_path) or file_path)
+            # Размеры заполняются по мере оценки в фоновом потоке
+            item.setText(1, "...")
+            item.setText(2, "...")
             item.setData(0, Qt.ItemDataRole.UserRole, file_path)
+            self._items[file_path] = item
         
         if hasattr(self.app, 'zip_files_label'):
             count = len(self.app.zip_files)
             self.app.zip_files_label.setText(f"Список файлов (Файлов: {count})")
+        
+        self._start_estimation()
+    
+    @staticmethod
+    def _format_size(size_bytes: float) -> str:
+        """Форматирование размера файла."""
+        for unit in ['Б', 'КБ', 'МБ', 'ГБ']:
+            if size_bytes < 1024.0:
+                return f"{size_bytes:.1f} {unit}"
+            size_bytes /= 1024.0
+        return f"{size_bytes:.1f} ТБ"
+    
+    def _on_level_changed(self):
+        """Смена уровня сжатия вручную."""
+        self.preset_combo.blockSignals(True)
+        self.preset_combo.setCurrentText(CUSTOM_PRESET)
+        self.preset_combo.blockSignals(False)
+        self._start_estimation()
+    
+    def _get_compression_level(self) -> int:
+        """Выбранный уровень сжатия (0-9)."""
+        compression_text = self.compression_combo.currentText()
+        try:
+            return int(compression_text.split()[0])
+        except (ValueError, IndexError):
+            return 6
+    
+    def _get_backend(self) -> str:
+        """Выбранный формат архива."""
+        return self.format_combo.currentData() or 'zip'
+    
+    def _apply_preset(self, preset: str):
+        """Выбор формата и уровня по пресету.
+        
+        Args:
+            preset: Название пресета
+        """
+        if preset == CUSTOM_PRESET:
+            return
+        try:
+            backend, level = resolve_preset(preset)
+        except ValueError as e:
+            logger.warning(str(e))
+            return
+        # Пресет остается выбранным, пока пользователь не изменит формат или уровень
+        self.format_combo.blockSignals(True)
+        self.compression_combo.blockSignals(True)
+        self.format_combo.setCurrentIndex(self.format_combo.findData(backend))
+        self.compression_combo.setCurrentIndex(level)
+        self.format_combo.blockSignals(False)
+        self.compression_combo.blockSignals(False)
+        self._on_format_changed(keep_preset=True)
+    
+    def _on_format_changed(self, keep_preset: bool = False):
+        """Обновление элементов управления после смены формата."""
+        if not keep_preset:
+            self.preset_combo.blockSignals(True)
+            self.preset_combo.setCurrentText(CUSTOM_PRESET)
+            self.preset_combo.blockSignals(False)
+        backend = BACKENDS[self._get_backend()]
+        if not backend.supports_volumes:
+            self.volume_combo.setCurrentIndex(0)
+        self.volume_combo.setEnabled(backend.supports_volumes)
+        if not backend.supports_update:
+            self.update_checkbox.setChecked(False)
+        self.update_checkbox.setEnabled(backend.supports_update)
+        # Оценка зависит от компрессора формата
+        self._start_estimation()
+    
+    def _run_benchmark(self):
+        """Сравнение форматов на выборке файлов из списка."""
+        if not hasattr(self.app, 'zip_files') or not self.app.zip_files:
+            from ui.components.dialogs import InfoDialog
+            InfoDialog.showinfo(self, "Информация", "Нет файлов для сравнения")
+            return
+        
+        from ui.operations.zip_operations import ZipBenchmarkWorker
+        from ui.components.dialogs import ProgressDialog
+        
+        progress_dialog = ProgressDialog(
+            self,
+            "Сравнение форматов",
+            "Архивация выборки файлов..."
+        )
+        progress_dialog.set_range(0, 0)
+        
+        worker = ZipBenchmarkWorker(self.app.zip_files)
+        worker.result_ready.connect(lambda result: progress_dialog.set_message(
+            f"{BACKENDS[result.backend].description}, уровень {result.level}"
+        ))
+        worker.finished.connect(lambda results: (
+            progress_dialog.close(),
+            self._on_benchmark_finished(results)
+        ))
+        progress_dialog.button_box.rejected.connect(worker.cancel)
+        worker.setParent(self)
+        
+        worker.start()
+        progress_dialog.exec()
+    
+    def _on_benchmark_finished(self, results):
+        """Отображение результатов сравнения форматов.
+        
+        Args:
+            results: Список BenchmarkResult
+        """
+        from ui.components.dialogs import InfoDialog
+        
+        if not results:
+            InfoDialog.showinfo(self, "Сравнение форматов", "Нет результатов")
+            return
+        lines = [f"Выборка: {self._format_size(results[0].input_size)}"]
+        for result in results:
+            name = f"{BACKENDS[result.backend].description} ({result.level})"
+            if result.error:
+                lines.append(f"{name}: ошибка - {result.error}")
+            else:
+                lines.append(
+                    f"{name}: {result.ratio:.0%} от исходного, "
+                    f"{self._format_size(result.speed)}/с"
+                )
+        InfoDialog.showinfo(self, "Сравнение форматов", "\n".join(lines))
+    
+    def _stop_estimation(self):
+        """Остановка текущей оценки размеров."""
+        if self._estimate_worker is not None:
+            self._estimate_worker.cancel()
+            self._estimate_worker.estimated.disconnect()
+            self._estimate_worker = None
+    
+    def _start_estimation(self):
+        """Запуск оценки размеров после сжатия в фоновом потоке."""
+        self._stop_estimation()
+        if not self._items:
+            return
+        
+        from ui.operations.zip_operations import ZipEstimateWorker
+        
+        worker = ZipEstimateWorker(
+            self._estimator, list(self._items), self._get_compression_level(), self._get_backend()
+        )
+        worker.estimated.connect(self._on_size_estimated)
+        # Поток удаляется после завершения, даже если его результаты уже не нужны
+        worker.finished.connect(worker.deleteLater)
+        worker.setParent(self)
+        self._estimate_worker = worker
+        worker.start()
+    
+    def _on_size_estimated(self, estimate):
+        """Отображение оценки размера.
+        
+        Args:
+            estimate: Оценка SizeEstimate
+        """
+        item = self._items.get(estimate.path)
+        if item is None:
+            return
+        if not estimate.exists:
+            item.setText(1, "Не найден")
+            item.setText(2, "—")
+        elif not estimate.is_file:
+            item.setText(0, estimate.path)
+            item.setText(1, "—")
+            item.setText(2, "—")
+        else:
+            item.setText(1, self._format_size(estimate.size))
+            item.setText(2, self._format_size(estimate.estimated_size))
     
     def _clear_files(self):
         """Очистка списка файлов."""
+        self._stop_estimation()
+        self._items = {}
         if hasattr(self.app, 'zip_files'):
             self.app.zip_files.clear()
         self.tree.clear()
@@ -190,41 +414,36 @@ class ZipTab(QWidget, DragDropMixin):
             InfoDialog.showinfo(self, "Информация", "Нет файлов для сжатия")
             return
         
-        # Получаем уровень сжатия
-        compression_text = self.compression_combo.currentText()
-        compression_level = 6  # По умолчанию
-        if compression_text.startswith("0"):
-            compression_level = 0
-        elif compression_text.startswith("1"):
-            compression_level = 1
-        elif compression_text.startswith("9"):
-            compression_level = 9
-        else:
-            try:
-                compression_level = int(compression_text.split()[0])
-            except (ValueError, IndexError):
-                compression_level = 6
+        # Получаем формат, уровень сжатия и размер тома
+        backend = self._get_backend()
+        extension = BACKENDS[backend].extension
+        compression_level = self._get_compression_level()
+        volume_size = ARCHIVE_VOLUME_SIZES.get(self.volume_combo.currentText())
+        update = self.update_checkbox.isChecked() and not volume_size
         
-        # Выбираем путь для сохранения
+        # Выбираем путь для сохранения (при обновлении существующий архив не перезаписывается)
         output_path, _ = QFileDialog.getSaveFileName(
             self,
             "Сохранить архив как",
             "",
-            "ZIP архивы (*.zip);;Все файлы (*.*)"
+            f"Архивы {BACKENDS[backend].description} (*{extension});;Все файлы (*.*)",
+            options=QFileDialog.Option.DontConfirmOverwrite if update else QFileDialog.Option(0)
         )
         
         if not output_path:
             return
         
-        if not output_path.endswith('.zip'):
-            output_path += '.zip'
+        if not output_path.endswith(extension):
+            output_path += extension
         
         # Подтверждение
         from ui.components.dialogs import ConfirmationDialog
         if not ConfirmationDialog.askyesno(
             self,
             "Подтверждение",
-            f"Создать архив из {len(self.app.zip_files)} файл(ов)?"
+            f"Обновить архив из {len(self.app.zip_files)} файл(ов)?"
+            if update and os.path.isfile(output_path)
+            else f"Создать архив из {len(self.app.zip_files)} файл(ов)?"
         ):
             return
         
@@ -238,7 +457,9 @@ class ZipTab(QWidget, DragDropMixin):
             "Создание архива..."
         )
         
-        worker = ZipWorker(self.app, self.app.zip_files, compression_level, output_path)
+        worker = ZipWorker(
+            self.app, self.app.zip_files, compression_level, output_path, volume_size, backend, update
+        )
         worker.progress.connect(lambda curr, total: progress_dialog.set_progress(curr, total))
         worker.file_processed.connect(lambda path, success, msg: progress_dialog.set_message(f"{'✓' if success else '✗'} {os.path.basename(path)}"))
         worker.finished.connect(lambda success, msg, zip_path: (
@@ -76,40 +76,46 @@ if sys.platform == 'win32':
     except Exception:
         pass
 
-# Импорт и запуск приложения
-try:
-    logger.info("=" * 60)
-    logger.info("Запуск приложения Ре-Файл+ (PyQt6)")
-    logger.info("=" * 60)
+# Импорт и запуск приложения.
+# Защита __main__ нужна для multiprocessing (spawn): дочерние процессы
+# импортируют этот файл повторно и не должны запускать GUI.
+if __name__ == '__main__':
+    import multiprocessing
+    multiprocessing.freeze_support()
     
-    from app.entry_point import main
+    try:
+        logger.info("=" * 60)
+        logger.info("Запуск приложения Ре-Файл+ (PyQt6)")
+        logger.info("=" * 60)
     
-    logger.info("Запуск главной функции...")
-    main()
+        from app.entry_point import main
     
-except KeyboardInterrupt:
-    logger.info("Получен сигнал прерывания (Ctrl+C)")
-except Exception as e:
-    logger.error(f"Критическая ошибка при запуске приложения: {e}", exc_info=True)
+        logger.info("Запуск главной функции...")
+        main()
     
-    # Показываем диалог с ошибкой (если возможно)
-    try:
-        from PyQt6.QtWidgets import QApplication, QMessageBox
-        import sys as sys_module
+    except KeyboardInterrupt:
+        logger.info("Получен сигнал прерывания (Ctrl+C)")
+    except Exception as e:
+        logger.error(f"Критическая ошибка при запуске приложения: {e}", exc_info=True)
+    
+        # Показываем диалог с ошибкой (если возможно)
+        try:
+            from PyQt6.QtWidgets import QApplication, QMessageBox
+            import sys as sys_module
         
-        app = QApplication(sys_module.argv)
-        msg = QMessageBox()
-        msg.setIcon(QMessageBox.Icon.Critical)
-        msg.setWindowTitle("Критическая ошибка")
-        msg.setText(f"Произошла критическая ошибка при запуске приложения:\n\n{str(e)}")
-        msg.setDetailedText(str(e))
-        msg.exec()
-    except Exception:
-        # Если не удалось показать диалог, выводим в консоль
-        print(f"Критическая ошибка: {e}")
-        input("Нажмите Enter для выхода...")
+            app = QApplication(sys_module.argv)
+            msg = QMessageBox()
+            msg.setIcon(QMessageBox.Icon.Critical)
+            msg.setWindowTitle("Критическая ошибка")
+            msg.setText(f"Произошла критическая ошибка при запуске приложения:\n\n{str(e)}")
+            msg.setDetailedText(str(e))
+            msg.exec()
+        except Exception:
+            # Если не удалось показать диалог, выводим в консоль
+            print(f"Критическая ошибка: {e}")
+            input("Нажмите Enter для выхода...")
     
-    sys.exit(1)
-finally:
-    logger.info("Приложение завершено")
+        sys.exit(1)
+    finally:
+        logger.info("Приложение завершено")
 